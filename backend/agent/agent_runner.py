@@ -125,6 +125,7 @@ TOOL_TIMEOUTS = {
     "detect_chart_patterns": 20,
     "detect_key_levels": 20,
     "detect_divergences": 20,
+    "detect_patterns_batch": 30,
     "create_chart_script": 15,
     "manage_chart_scripts": 5,
     "apply_chart_snippet": 10,
@@ -183,6 +184,7 @@ AUTO_APPROVED_TOOLS = {
     "detect_chart_patterns",
     "detect_key_levels",
     "detect_divergences",
+    "detect_patterns_batch",
     "manage_holdings",
     "manage_alerts",
     # Phase 2: Read tools (instant, read-only)
@@ -403,7 +405,7 @@ async def run_agent_stream(
     # Dynamic per-request context (chart, page, news, profile, alerts) does not.
     dynamic_parts = []
 
-    dynamic_parts.append(f"CRITICAL — Current Chart Context: The user is viewing {symbol} on {interval} candles right now. ALL analysis, chart scripts, pattern detection, and level drawing MUST target {symbol}. When calling ANY tool that takes a symbol parameter, pass symbol=\"{symbol}\". When calling detection tools (detect_chart_patterns, detect_key_levels, detect_divergences), pass symbol=\"{symbol}\" and interval=\"{interval}\". Do NOT reference or draw levels for any other symbol unless the user explicitly asks.")
+    dynamic_parts.append(f"CRITICAL — Current Chart Context: The user is viewing {symbol} on {interval} candles right now. ALL analysis, chart scripts, pattern detection, and level drawing MUST target {symbol}. When calling ANY tool that takes a symbol parameter, pass symbol=\"{symbol}\". When calling detection tools (detect_chart_patterns, detect_key_levels, detect_divergences, detect_patterns_batch), pass symbol=\"{symbol}\" and interval=\"{interval}\". Do NOT reference or draw levels for any other symbol unless the user explicitly asks.")
     if current_page:
         dynamic_parts.append(f"The user is currently on the '{current_page}' page of aFindr.")
     if news_headlines:
@@ -1022,7 +1024,7 @@ async def run_agent_stream(
                 if cs:
                     cs.setdefault("symbol", symbol)  # stamp with current chart symbol
                     chart_script_results.append(cs)
-            elif tool_name in ("detect_chart_patterns", "detect_key_levels", "detect_divergences", "apply_chart_snippet") and "error" not in result_data:
+            elif tool_name in ("detect_chart_patterns", "detect_key_levels", "detect_divergences", "detect_patterns_batch", "apply_chart_snippet") and "error" not in result_data:
                 cs = result_data.get("chart_script")
                 if cs:
                     cs.setdefault("symbol", symbol)  # stamp with current chart symbol
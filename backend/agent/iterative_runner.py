@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+import os
 import time
 import uuid
 from dataclasses import dataclass, field, asdict
@@ -21,6 +22,10 @@ from agent.strategy_agent import generate_strategy, generate_vbt_strategy
 from data.fetcher import fetch_ohlcv
 from data.contracts import get_contract_config
 
+# Processes for full-mode Monte Carlo (the three methods run concurrently);
+# 1 keeps it in-process inside the API server
+MONTE_CARLO_WORKERS = int(os.getenv("AFINDR_MONTE_CARLO_WORKERS", "1"))
+
 
 @dataclass
 class IterationResult:
@@ -178,7 +183,7 @@ async def run_iteration(state: IterationState, feedback: str = "") -> IterationR
         try:
             mc = await asyncio.to_thread(
                 run_monte_carlo, trade_pnls, state.initial_balance,
-                method="full",
+                method="full", workers=MONTE_CARLO_WORKERS,
             )
             mc_data = mc.to_dict()
         except Exception:
@@ -15,7 +15,7 @@ tools.py. Zero business logic duplication — only schema translation.
                  get_backtest_history, get_trading_summary, query_trade_history
   charting     — create_chart_script, manage_chart_scripts, apply_chart_snippet,
                  list_chart_snippets, detect_chart_patterns, detect_key_levels,
-                 detect_divergences
+                 detect_divergences, detect_patterns_batch
   ui_control   — control_ui, manage_holdings, manage_alerts
 """
 from __future__ import annotations
@@ -181,8 +181,8 @@ async def sdk_fetch_news(args: dict) -> dict:
 
 
 @tool("search_news",
-      "Search for news articles on any topic using Google News.",
-      {"query": str, "limit": int})
+      "Search for news articles on any topic (local news index, backed by Google News).",
+      {"query": str, "limit": int, "days": int})
 async def sdk_search_news(args: dict) -> dict:
     return await _simple_handler("search_news", args)
 
@@ -412,6 +412,13 @@ async def sdk_detect_divergences(args: dict) -> dict:
     return await _simple_handler("detect_divergences", args)
 
 
+@tool("detect_patterns_batch",
+      "Run several pattern/level/divergence detectors on one data fetch and merge them into one overlay.",
+      {"detectors": list, "symbol": str, "period": str, "interval": str, "swing_lookback": int})
+async def sdk_detect_patterns_batch(args: dict) -> dict:
+    return await _simple_handler("detect_patterns_batch", args)
+
+
 def _create_charting_server():
     return create_sdk_mcp_server(
         name="charting",
@@ -424,6 +431,7 @@ def _create_charting_server():
             sdk_detect_chart_patterns,
             sdk_detect_key_levels,
             sdk_detect_divergences,
+            sdk_detect_patterns_batch,
         ],
     )
 
@@ -494,7 +502,7 @@ _SERVER_TOOLS: Dict[str, List[str]] = {
     "charting": [
         "create_chart_script", "manage_chart_scripts", "apply_chart_snippet",
         "list_chart_snippets", "detect_chart_patterns", "detect_key_levels",
-        "detect_divergences",
+        "detect_divergences", "detect_patterns_batch",
     ],
     "ui_control": [
         "control_ui", "manage_holdings", "manage_alerts",
@@ -512,7 +512,8 @@ class _ResultTracker:
                 cs.setdefault("symbol", self.symbol)
                 self.chart_scripts.append(cs)
         elif tool_name in ("detect_chart_patterns", "detect_key_levels",
-                           "detect_divergences", "apply_chart_snippet"):
+                           "detect_divergences", "detect_patterns_batch",
+                           "apply_chart_snippet"):
             cs = result_data.get("chart_script")
             if cs:
                 cs.setdefault("symbol", self.symbol)
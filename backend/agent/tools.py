@@ -8,6 +8,8 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import os
+import time
 import uuid
 from typing import Any
 
@@ -38,16 +40,30 @@ from engine.chart_patterns import (
     detect_round_numbers, detect_vwap_bands,
     detect_rsi_divergence, detect_macd_divergence,
     detect_volume_profile, detect_volume_spikes,
+    frame_context,
 )
 from agent.sandbox import validate_strategy_code, execute_strategy_code
-from agent.resilience import yfinance_breaker, finnhub_breaker, CircuitOpenError
+from agent.resilience import yfinance_breaker, CircuitOpenError
 from engine.chart_scripts.snippet_library import build_chart_script, list_snippets
 from db import trades_repo, backtest_repo
+from routers.ws import generate_run_id, send_complete, send_error, send_progress
 
 logger = logging.getLogger("afindr.tools")
 
+# Process-pool size for walk-forward in-sample grids (1 = serial)
+WALK_FORWARD_WORKERS = int(os.getenv("AFINDR_WALK_FORWARD_WORKERS", "1"))
+
 # ─── Tool Definitions (Anthropic tool_use schema) ───
 
+# Intervals of the backtest and pattern tools: time frames, or activity bars
+# built from Databento ticks (data.bars), e.g. "volume:5000" or "renko:10"
+_TOOL_INTERVALS = ["5m", "15m", "30m", "1h", "4h", "1d"]
+_BAR_INTERVAL_PATTERN = r"^(tick|volume|dollar|range|renko):\d+(\.\d+)?$"
+_BAR_INTERVAL_HELP = (
+    ". Futures with Databento tick data (NQ=F, ES=F, GC=F, CL=F) also accept activity bars as "
+    "'<type>:<threshold>' with type tick, volume, dollar, range or renko, e.g. 'volume:5000', 'renko:10'"
+)
+
 TOOLS = [
     {
         "name": "fetch_market_data",
@@ -136,8 +152,8 @@ TOOLS = [
                 },
                 "interval": {
                     "type": "string",
-                    "description": "Candle interval for backtest",
-                    "enum": ["5m", "15m", "30m", "1h", "4h", "1d"],
+                    "description": "Candle interval for backtest" + _BAR_INTERVAL_HELP,
+                    "anyOf": [{"enum": _TOOL_INTERVALS}, {"pattern": _BAR_INTERVAL_PATTERN}],
                     "default": "1d",
                 },
                 "initial_balance": {
@@ -183,8 +199,8 @@ TOOLS = [
                 },
                 "interval": {
                     "type": "string",
-                    "description": "Candle interval",
-                    "enum": ["5m", "15m", "30m", "1h", "4h", "1d"],
+                    "description": "Candle interval" + _BAR_INTERVAL_HELP,
+                    "anyOf": [{"enum": _TOOL_INTERVALS}, {"pattern": _BAR_INTERVAL_PATTERN}],
                     "default": "1d",
                 },
                 "optimization_metric": {
@@ -301,8 +317,8 @@ TOOLS = [
                 },
                 "interval": {
                     "type": "string",
-                    "description": "Candle interval",
-                    "enum": ["5m", "15m", "30m", "1h", "4h", "1d"],
+                    "description": "Candle interval" + _BAR_INTERVAL_HELP,
+                    "anyOf": [{"enum": _TOOL_INTERVALS}, {"pattern": _BAR_INTERVAL_PATTERN}],
                     "default": "1d",
                 },
                 "num_windows": {
@@ -310,11 +326,20 @@ TOOLS = [
                     "description": "Number of IS/OOS windows",
                     "default": 5,
                 },
+                "anchored": {
+                    "type": "boolean",
+                    "description": "Anchored (expanding) windows: every in-sample range starts at the first bar instead of rolling forward",
+                    "default": False,
+                },
                 "initial_balance": {
                     "type": "number",
                     "description": "Starting account balance",
                     "default": 25000,
                 },
+                "run_id": {
+                    "type": "string",
+                    "description": "Id to stream per-window progress on (/ws/backtest/{run_id}); generated if omitted and returned in the result",
+                },
             },
             "required": ["strategy_description", "param_grid"],
         },
@@ -344,8 +369,8 @@ TOOLS = [
                 },
                 "interval": {
                     "type": "string",
-                    "description": "Interval matching the backtest data",
-                    "enum": ["5m", "15m", "30m", "1h", "4h", "1d"],
+                    "description": "Interval matching the backtest data" + _BAR_INTERVAL_HELP,
+                    "anyOf": [{"enum": _TOOL_INTERVALS}, {"pattern": _BAR_INTERVAL_PATTERN}],
                     "default": "1d",
                 },
             },
@@ -678,8 +703,8 @@ TOOLS = [
                 },
                 "interval": {
                     "type": "string",
-                    "description": "Override the default interval",
-                    "enum": ["5m", "15m", "30m", "1h", "4h", "1d"],
+                    "description": "Override the default interval" + _BAR_INTERVAL_HELP,
+                    "anyOf": [{"enum": _TOOL_INTERVALS}, {"pattern": _BAR_INTERVAL_PATTERN}],
                 },
                 "initial_balance": {
                     "type": "number",
@@ -730,8 +755,8 @@ TOOLS = [
                 },
                 "interval": {
                     "type": "string",
-                    "description": "Candle interval/timeframe",
-                    "enum": ["5m", "15m", "30m", "1h", "4h", "1d"],
+                    "description": "Candle interval/timeframe" + _BAR_INTERVAL_HELP,
+                    "anyOf": [{"enum": _TOOL_INTERVALS}, {"pattern": _BAR_INTERVAL_PATTERN}],
                     "default": "15m",
                 },
                 "swing_lookback": {
@@ -797,8 +822,8 @@ TOOLS = [
                 },
                 "interval": {
                     "type": "string",
-                    "description": "Candle interval/timeframe",
-                    "enum": ["5m", "15m", "30m", "1h", "4h", "1d"],
+                    "description": "Candle interval/timeframe" + _BAR_INTERVAL_HELP,
+                    "anyOf": [{"enum": _TOOL_INTERVALS}, {"pattern": _BAR_INTERVAL_PATTERN}],
                     "default": "15m",
                 },
                 "sensitivity": {
@@ -866,8 +891,8 @@ TOOLS = [
                 },
                 "interval": {
                     "type": "string",
-                    "description": "Candle interval/timeframe",
-                    "enum": ["5m", "15m", "30m", "1h", "4h", "1d"],
+                    "description": "Candle interval/timeframe" + _BAR_INTERVAL_HELP,
+                    "anyOf": [{"enum": _TOOL_INTERVALS}, {"pattern": _BAR_INTERVAL_PATTERN}],
                     "default": "1h",
                 },
                 "rsi_period": {
@@ -915,6 +940,59 @@ TOOLS = [
             "required": ["pattern_type", "symbol"],
         },
     },
+    {
+        "name": "detect_patterns_batch",
+        "description": (
+            "Run several pattern, key-level and divergence detectors on one symbol in a single call and draw "
+            "them as one combined chart overlay. Use this instead of calling detect_chart_patterns / "
+            "detect_key_levels / detect_divergences repeatedly (e.g. 'full ICT analysis', 'annotate everything'): "
+            "price data is fetched once and shared calculations (ATR, swings, RSI, MACD) are done once. "
+            "Accepts the same per-detector options as the single-detector tools."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "detectors": {
+                    "type": "array",
+                    "description": "Detectors to run, or ['all'] for every one",
+                    "items": {
+                        "type": "string",
+                        "enum": [
+                            "all",
+                            "fvg", "order_blocks", "liquidity_sweeps", "bos_choch", "swing_points",
+                            "killzone_ranges", "support_resistance", "session_levels", "round_numbers",
+                            "vwap_bands", "rsi_divergence", "macd_divergence", "volume_profile",
+                            "volume_spikes",
+                        ],
+                    },
+                },
+                "symbol": {
+                    "type": "string",
+                    "description": "The futures symbol to analyze",
+                    "enum": list(CONTRACTS.keys()),
+                    "default": "NQ=F",
+                },
+                "period": {
+                    "type": "string",
+                    "description": "How far back to fetch data",
+                    "enum": ["5d", "60d", "1y"],
+                    "default": "60d",
+                },
+                "interval": {
+                    "type": "string",
+                    "description": "Candle interval/timeframe" + _BAR_INTERVAL_HELP,
+                    "anyOf": [{"enum": _TOOL_INTERVALS}, {"pattern": _BAR_INTERVAL_PATTERN}],
+                    "default": "15m",
+                },
+                "swing_lookback": {
+                    "type": "integer",
+                    "description": "Number of bars on each side to confirm a swing point",
+                    "default": 5,
+                },
+            },
+            "required": ["detectors", "symbol"],
+        },
+    },
     # ─── Finance Data Tools ───
     {
         "name": "fetch_options_chain",
@@ -1039,7 +1117,7 @@ TOOLS = [
     {
         "name": "search_news",
         "description": (
-            "Search for news articles on any topic using Google News. "
+            "Search for news articles on any topic (local news index, backed by Google News). "
             "Works for broad topics (tariffs, OPEC, Fed rate decision), "
             "specific companies (AAPL news), sectors (tech stocks), or events (earnings season). "
             "Use this when the user asks about news that isn't company-specific, "
@@ -1057,6 +1135,10 @@ TOOLS = [
                     "description": "Max number of articles to return",
                     "default": 10,
                 },
+                "days": {
+                    "type": "integer",
+                    "description": "Only articles published in the last N days",
+                },
             },
             "required": ["query"],
         },
@@ -1460,7 +1542,7 @@ async def handle_fetch_news(args: dict) -> str:
     ticker = args.get("ticker")
     limit = args.get("limit", 10)
 
-    items = fetch_all_news(category=category, ticker=ticker, limit=limit)
+    items = await fetch_all_news(category=category, ticker=ticker, limit=limit)
     # Slim down for the LLM context
     slim_items = []
     for item in items:
@@ -1665,7 +1747,8 @@ async def handle_run_backtest(args: dict, strategy_generator, vbt_strategy_gener
 async def handle_run_parameter_sweep(args: dict, vbt_strategy_generator) -> str:
     """Handle run_parameter_sweep tool call.
 
-    Uses VectorBT to test thousands of parameter combos in seconds.
+    Uses VectorBT to test thousands of parameter combos in seconds, or the
+    native signal simulator when VectorBT is not installed.
     """
     description = args["strategy_description"]
     param_grid = args["param_grid"]
@@ -1675,9 +1758,6 @@ async def handle_run_parameter_sweep(args: dict, vbt_strategy_generator) -> str:
     optimization_metric = args.get("optimization_metric", "sharpe_ratio")
     initial_balance = args.get("initial_balance", 25000)
 
-    if not HAS_VBT:
-        return json.dumps({"error": "VectorBT is not installed. Cannot run parameter sweep."})
-
     # Generate VBT strategy code (run in thread to avoid blocking the event loop)
     strategy_result = await asyncio.to_thread(vbt_strategy_generator, description, [])
     if "error" in strategy_result:
@@ -1790,7 +1870,10 @@ async def handle_run_walk_forward(args: dict, strategy_generator) -> str:
     period = args.get("period", "2y")
     interval = args.get("interval", "1d")
     num_windows = args.get("num_windows", 5)
+    anchored = args.get("anchored", False)
     initial_balance = args.get("initial_balance", 25000)
+    # Per-window progress goes to /ws/backtest/{run_id}
+    progress_run_id = args.get("run_id") or generate_run_id()
 
     # Generate strategy code (run in thread to avoid blocking the event loop)
     strategy_result = await asyncio.to_thread(strategy_generator, description, [])
@@ -1807,6 +1890,8 @@ async def handle_run_walk_forward(args: dict, strategy_generator) -> str:
     except Exception as e:
         return json.dumps({"error": f"Strategy compilation failed: {str(e)}"})
 
+    loop = asyncio.get_running_loop()
+    updates = []
     try:
         df = await fetch_ohlcv(symbol, period, interval)
         contract = get_contract_config(symbol)
@@ -1815,6 +1900,14 @@ async def handle_run_walk_forward(args: dict, strategy_generator) -> str:
             point_value=contract["point_value"],
             tick_size=contract["tick_size"],
         )
+
+        def on_progress(done: int, total: int, window: dict) -> None:
+            updates.append(asyncio.run_coroutine_threadsafe(send_progress(
+                progress_run_id, "walk_forward", done / total * 100,
+                f"Window {done}/{total} complete",
+                data={"window": window},
+            ), loop))
+
         result = await asyncio.to_thread(
             run_walk_forward,
             strategy_class=strategy_class,
@@ -1822,11 +1915,18 @@ async def handle_run_walk_forward(args: dict, strategy_generator) -> str:
             config=config,
             param_grid=param_grid,
             num_windows=num_windows,
+            anchored=anchored,
+            workers=WALK_FORWARD_WORKERS,
+            on_progress=on_progress,
+            strategy_code=code,
         )
+        # Let queued window updates land before the run's state is cleared
+        await asyncio.gather(*(asyncio.wrap_future(f) for f in updates))
+
+        wf_dict = result.to_dict()
 
         # Persist walk-forward run + OOS trades
         try:
-            wf_dict = result.to_dict()
             run_id = backtest_repo.insert_backtest_run(
                 strategy_name=f"WF: {strategy_result.get('name', 'Walk-Forward')}",
                 symbol=symbol,
@@ -1849,9 +1949,12 @@ async def handle_run_walk_forward(args: dict, strategy_generator) -> str:
         except Exception:
             pass
 
-        return json.dumps(result.to_dict())
+        await send_complete(progress_run_id, wf_dict)
+        return json.dumps({**wf_dict, "run_id": progress_run_id})
     except Exception as e:
-        return json.dumps({"error": f"Walk-forward failed: {str(e)}"})
+        await asyncio.gather(*(asyncio.wrap_future(f) for f in updates))
+        await send_error(progress_run_id, str(e))
+        return json.dumps({"error": f"Walk-forward failed: {str(e)}", "run_id": progress_run_id})
 
 
 async def handle_analyze_trades(args: dict) -> str:
@@ -2573,7 +2676,9 @@ async def _run_pattern_detection(args: dict, dispatch: dict, type_key: str) -> s
         return json.dumps({"error": f"Failed to fetch data for {symbol}: {str(e)}"})
 
     try:
-        result = await asyncio.to_thread(dispatch[pattern_type], df, args)
+        # Detectors share ATR/swings/RSI/... computed on this frame by earlier calls
+        with frame_context(symbol, interval):
+            result = await asyncio.to_thread(dispatch[pattern_type], df, args)
     except Exception as e:
         return json.dumps({"error": f"Pattern detection failed: {str(e)}"})
 
@@ -2590,6 +2695,88 @@ async def _run_pattern_detection(args: dict, dispatch: dict, type_key: str) -> s
     })
 
 
+_ALL_DETECTORS = {**_CHART_PATTERN_DISPATCH, **_KEY_LEVEL_DISPATCH, **_DIVERGENCE_DISPATCH}
+
+
+def _timed_detection(detector, df, args: dict):
+    """(result, error, seconds) of one detector, run on a worker thread."""
+    t0 = time.perf_counter()
+    try:
+        return detector(df, args), None, time.perf_counter() - t0
+    except Exception as e:
+        return None, str(e), time.perf_counter() - t0
+
+
+async def handle_detect_patterns_batch(args: dict) -> str:
+    """Handle detect_patterns_batch — many detectors on one fetched frame, merged into one chart script.
+
+    Detectors run concurrently on worker threads inside one frame_context, so
+    the shared features (ATR, swings, RSI, ...) are computed once — the
+    feature cache's single-flight makes concurrent detectors wait for the
+    first computation instead of repeating it. A failing detector is
+    reported in its metadata and does not fail the batch.
+    """
+    requested = args.get("detectors") or []
+    if isinstance(requested, str):
+        requested = [requested]
+    if "all" in requested:
+        requested = list(_ALL_DETECTORS)
+    unknown = [d for d in requested if d not in _ALL_DETECTORS]
+    if not requested or unknown:
+        return json.dumps({"error": f"Unknown detectors: {unknown}. Valid: {list(_ALL_DETECTORS.keys())}"})
+    requested = list(dict.fromkeys(requested))
+
+    symbol = args.get("symbol", "NQ=F")
+    period = args.get("period", "60d")
+    interval = args.get("interval", "15m")
+
+    t0 = time.perf_counter()
+    try:
+        df = await fetch_ohlcv(symbol, period, interval)
+    except Exception as e:
+        return json.dumps({"error": f"Failed to fetch data for {symbol}: {str(e)}"})
+    fetch_ms = (time.perf_counter() - t0) * 1000
+
+    t1 = time.perf_counter()
+    with frame_context(symbol, interval):
+        outcomes = await asyncio.gather(*(
+            asyncio.to_thread(_timed_detection, _ALL_DETECTORS[name], df, args) for name in requested
+        ))
+    detect_ms = (time.perf_counter() - t1) * 1000
+
+    elements = []
+    detectors = {}
+    for name, (result, error, seconds) in zip(requested, outcomes):
+        if error is not None:
+            detectors[name] = {"error": f"Pattern detection failed: {error}", "ms": round(seconds * 1000, 2)}
+            continue
+        script = result.to_chart_script(_PATTERN_NAMES.get(name, name), name)
+        # Detectors number their elements independently (both divergence
+        # detectors emit div_<i>_start), so ids are namespaced per detector
+        elements.extend({**el, "id": f"{name}:{el['id']}"} for el in script["elements"])
+        detectors[name] = {**result.metadata, "elements": len(script["elements"]),
+                           "ms": round(seconds * 1000, 2)}
+
+    if len(detectors) == sum("error" in d for d in detectors.values()):
+        return json.dumps({"error": "All detectors failed", "detectors": detectors})
+
+    script_id = f"cp_{uuid.uuid4().hex[:8]}"
+    return json.dumps({
+        "chart_script": {
+            "id": script_id,
+            "name": f"Chart Patterns — {symbol} {interval}",
+            "visible": True,
+            "elements": elements,
+            "generators": [],
+        },
+        "pattern_types": requested,
+        "detectors": detectors,
+        "timing": {"fetch_ms": round(fetch_ms, 2), "detect_ms": round(detect_ms, 2), "bars": len(df)},
+        "symbol": symbol,
+        "interval": interval,
+    })
+
+
 async def handle_detect_chart_patterns(args: dict) -> str:
     """Handle detect_chart_patterns tool call."""
     return await _run_pattern_detection(args, _CHART_PATTERN_DISPATCH, "pattern_type")
@@ -2632,17 +2819,14 @@ async def handle_fetch_insider_activity(args: dict) -> str:
 
     # SEC EDGAR (always available, no key)
     try:
-        edgar_data = fetch_insider_trades(ticker, limit=limit)
+        edgar_data = await fetch_insider_trades(ticker, limit=limit)
         result["edgar"] = edgar_data
     except Exception as e:
         result["edgar"] = {"error": str(e)}
 
-    # Finnhub sentiment (optional, needs key — wrapped with circuit breaker)
-    async def _fetch_sentiment():
-        return fetch_insider_sentiment(ticker)
-
+    # Finnhub sentiment (optional, needs key — requests go through its circuit breaker)
     try:
-        sentiment = await finnhub_breaker.call(_fetch_sentiment)
+        sentiment = await fetch_insider_sentiment(ticker)
         result["sentiment"] = sentiment
     except CircuitOpenError:
         result["sentiment"] = {"error": "Finnhub temporarily unavailable"}
@@ -2663,7 +2847,7 @@ async def handle_fetch_economic_data(args: dict) -> str:
     # Special case: yield curve
     if series_id.lower() == "yield_curve":
         try:
-            result = fetch_treasury_yields()
+            result = await fetch_treasury_yields()
             if not result.get("error"):
                 return json.dumps(result)
         except Exception:
@@ -2677,7 +2861,7 @@ async def handle_fetch_economic_data(args: dict) -> str:
 
     # Try FRED first
     try:
-        result = fetch_economic_indicator(series_id, limit=limit)
+        result = await fetch_economic_indicator(series_id, limit=limit)
         if not result.get("error"):
             return json.dumps(result)
     except Exception:
@@ -2700,11 +2884,8 @@ async def handle_fetch_earnings_calendar(args: dict) -> str:
     ticker = args["ticker"]
 
     # Try Finnhub first (with circuit breaker)
-    async def _fetch_earnings():
-        return fetch_earnings_calendar(ticker)
-
     try:
-        result = await finnhub_breaker.call(_fetch_earnings)
+        result = await fetch_earnings_calendar(ticker)
         if result.get("earnings") and not result.get("error"):
             return json.dumps(result)
     except CircuitOpenError:
@@ -2730,11 +2911,8 @@ async def handle_fetch_company_news_feed(args: dict) -> str:
     days = args.get("days", 7)
 
     # Try Finnhub first (with circuit breaker)
-    async def _fetch_news():
-        return fetch_company_news(ticker, days=days)
-
     try:
-        result = await finnhub_breaker.call(_fetch_news)
+        result = await fetch_company_news(ticker, days=days)
         if result.get("news") and not result.get("error"):
             return json.dumps(result)
     except CircuitOpenError:
@@ -2750,7 +2928,7 @@ async def handle_fetch_company_news_feed(args: dict) -> str:
 
     # Last resort: Google News RSS
     from data.news_fetcher import fetch_google_news_rss
-    google_articles = fetch_google_news_rss(f"{ticker} stock")
+    google_articles = await fetch_google_news_rss(f"{ticker} stock")
     if google_articles:
         return json.dumps({
             "ticker": ticker,
@@ -2763,12 +2941,12 @@ async def handle_fetch_company_news_feed(args: dict) -> str:
 
 
 async def handle_search_news(args: dict) -> str:
-    """Handle search_news tool call — Google News RSS search for any topic."""
+    """Handle search_news tool call — local news index, Google News RSS on a cold miss."""
     query = args["query"]
     limit = args.get("limit", 10)
 
-    from data.news_fetcher import fetch_google_news_rss
-    articles = fetch_google_news_rss(query, limit=limit)
+    from data.news_fetcher import search_news
+    articles = await search_news(query, limit=limit, days=args.get("days"))
 
     if not articles:
         return json.dumps({"query": query, "articles": [], "count": 0, "error": "No results found"})
@@ -2792,19 +2970,14 @@ async def handle_query_prediction_markets(args: dict) -> str:
     query = args["query"]
     limit = args.get("limit", 5)
 
-    polymarket_results = []
-    kalshi_results = []
-
-    # Query both sources
-    try:
-        polymarket_results = poly_search(query, limit=limit)
-    except Exception:
-        pass
-
-    try:
-        kalshi_results = kalshi_search(query, limit=limit)
-    except Exception:
-        pass
+    # Query both sources concurrently; a failing source contributes nothing
+    polymarket_results, kalshi_results = await asyncio.gather(
+        poly_search(query, limit=limit), kalshi_search(query, limit=limit), return_exceptions=True,
+    )
+    if isinstance(polymarket_results, Exception):
+        polymarket_results = []
+    if isinstance(kalshi_results, Exception):
+        kalshi_results = []
 
     # Do NOT fall back to trending — that returns unrelated results.
     # Only return markets that actually match the query.
@@ -2838,14 +3011,14 @@ async def handle_fetch_labor_data(args: dict) -> str:
 
         # Multi-series comparison mode
         if compare and isinstance(compare, list) and len(compare) > 0:
-            result = fetch_bls_multi(compare, years=years)
+            result = await fetch_bls_multi(compare, years=years)
             return json.dumps(result)
 
         # Single indicator mode
         if not indicator:
             return json.dumps({"error": "Provide 'indicator' (shorthand or series ID) or 'compare' (list of shorthands). Use indicator='list_categories' to see all available."})
 
-        result = fetch_bls_indicator(indicator, years=years)
+        result = await fetch_bls_indicator(indicator, years=years)
         return json.dumps(result)
     except Exception as e:
         return json.dumps({"error": f"BLS data fetch failed: {str(e)}"})
@@ -3177,6 +3350,7 @@ TOOL_HANDLERS = {
     "detect_chart_patterns": handle_detect_chart_patterns,
     "detect_key_levels": handle_detect_key_levels,
     "detect_divergences": handle_detect_divergences,
+    "detect_patterns_batch": handle_detect_patterns_batch,
     "fetch_options_chain": handle_fetch_options_chain,
     "fetch_insider_activity": handle_fetch_insider_activity,
     "fetch_economic_data": handle_fetch_economic_data,
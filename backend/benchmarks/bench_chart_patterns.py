@@ -0,0 +1,178 @@
+"""Benchmark: chart-pattern utilities on a 100k-bar frame.
+
+Times the original per-bar loops (legacy) against engine.chart_patterns._utils
+for swing-point detection, ATR and RSI, with the Wilder smoothing run both
+through scipy.signal.lfilter and (if installed) the numba kernel. Then times
+the detectors that sit on top of them over the full history, with the FVG /
+order-block fill search done by CrossingIndex and by the old forward scan.
+Last, the cost of one more bar for a live chart: a streaming detector's
+update(bar) against rerunning the batch detector over the whole frame.
+
+Usage (from backend/):
+    python -m benchmarks.bench_chart_patterns [--bars 100000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from engine.chart_patterns import (
+    create_streaming_detector,
+    detect_bos_choch,
+    detect_fvg,
+    detect_liquidity_sweeps,
+    detect_order_blocks,
+    detect_rsi_divergence,
+    detect_support_resistance,
+    detect_swing_points_with_labels,
+    ict_patterns,
+)
+from engine.chart_patterns._utils import HAS_NUMBA, compute_atr, compute_rsi, detect_swing_points
+
+
+def legacy_swings(df, lookback=5, lookforward=5):
+    highs, lows = df["high"].values, df["low"].values
+    out = 0
+    for i in range(lookback, len(df) - lookforward):
+        window = highs[i - lookback : i + lookforward + 1]
+        if highs[i] == window.max() and np.sum(window == highs[i]) == 1:
+            out += 1
+        window = lows[i - lookback : i + lookforward + 1]
+        if lows[i] == window.min() and np.sum(window == lows[i]) == 1:
+            out += 1
+    return out
+
+
+def legacy_atr(df, period=14):
+    high, low, close = (df[c].values.astype(float) for c in ("high", "low", "close"))
+    tr = np.empty(len(df))
+    tr[0] = high[0] - low[0]
+    for i in range(1, len(df)):
+        tr[i] = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+    atr = np.full(len(df), np.nan)
+    atr[period - 1] = np.mean(tr[:period])
+    for i in range(period, len(df)):
+        atr[i] = (atr[i - 1] * (period - 1) + tr[i]) / period
+    return atr
+
+
+def legacy_rsi(closes, period=14):
+    deltas = np.diff(closes)
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    rsi = np.full(len(closes), np.nan)
+    avg_gain, avg_loss = np.mean(gains[:period]), np.mean(losses[:period])
+    for i in range(period, len(deltas)):
+        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+        rsi[i + 1] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return rsi
+
+
+class ScanCrossing:
+    """The per-candidate forward scan CrossingIndex replaced."""
+
+    def __init__(self, values, below=True):
+        self.values, self.below, self.n = np.asarray(values, dtype=float), below, len(values)
+
+    def first(self, start, level):
+        for j in range(start, self.n):
+            if (self.values[j] <= level) if self.below else (self.values[j] >= level):
+                return j
+        return self.n
+
+    def first_many(self, starts, levels):
+        return np.array([self.first(int(s), float(lv)) for s, lv in zip(starts, levels)])
+
+
+def synthetic_bars(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    close = np.round((15000 + np.cumsum(rng.normal(0, 4, n))) * 4) / 4
+    high = close + np.round(rng.uniform(0, 3, n) * 4) / 4
+    low = close - np.round(rng.uniform(0, 3, n) * 4) / 4
+    open_ = np.clip(np.roll(close, 1), low, high)
+    index = pd.date_range("2025-01-02 09:30", periods=n, freq="1min", tz="UTC")
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close,
+                         "volume": rng.integers(1, 500, n).astype(float)}, index=index)
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bars", type=int, default=100_000, help="synthetic 1-min bars")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats (best of)")
+    args = parser.parse_args()
+
+    df = synthetic_bars(args.bars)
+    closes = df["close"].to_numpy()
+    kernels = [("lfilter", False)] + ([("numba", True)] if HAS_NUMBA else [])
+    compute_atr(df.iloc[:100], use_numba=HAS_NUMBA)  # JIT compile
+
+    print(f"{len(df):,} bars")
+    print(f"{'function':<26}{'legacy s':>10}{'new s':>10}{'speedup':>10}")
+    rows = [("detect_swing_points", lambda: legacy_swings(df), lambda: detect_swing_points(df))]
+    for name, use_numba in kernels:
+        rows.append((f"compute_atr [{name}]", lambda: legacy_atr(df),
+                     lambda u=use_numba: compute_atr(df, use_numba=u)))
+        rows.append((f"compute_rsi [{name}]", lambda: legacy_rsi(closes),
+                     lambda u=use_numba: compute_rsi(closes, use_numba=u)))
+    for name, legacy, new in rows:
+        t_legacy = _time(legacy, 1)
+        t_new = _time(new, args.repeat)
+        print(f"{name:<26}{t_legacy:>10.3f}{t_new:>10.4f}{t_legacy / t_new:>9.0f}x")
+
+    print(f"\n{'detector (full history)':<26}{'seconds':>10}{'scan s':>10}")
+    detectors = [
+        (detect_fvg, {"max_age_bars": len(df)}),
+        (detect_order_blocks, {}),
+        (detect_bos_choch, {}),
+        (detect_rsi_divergence, {}),
+        (detect_support_resistance, {}),
+    ]
+    for detector, kwargs in detectors:
+        elapsed = _time(lambda: detector(df, **kwargs), 1)
+        scan = ""
+        if detector in (detect_fvg, detect_order_blocks):
+            ict_patterns.CrossingIndex, fast = ScanCrossing, ict_patterns.CrossingIndex
+            try:
+                scan = f"{_time(lambda: detector(df, **kwargs), 1):>10.3f}"
+            finally:
+                ict_patterns.CrossingIndex = fast
+        print(f"{detector.__name__:<26}{elapsed:>10.3f}{scan}")
+
+    live = min(1000, len(df) // 10)
+    history, tail = df.iloc[:-live], df.iloc[-live:]
+    bars = [{"time": t, "open": o, "high": h, "low": l, "close": c}
+            for t, o, h, l, c in zip(tail.index, tail["open"], tail["high"], tail["low"], tail["close"])]
+    print(f"\n{'per new bar':<26}{'rescan ms':>10}{'update us':>10}{'speedup':>10}")
+    streaming = [
+        ("fvg", detect_fvg),
+        ("order_blocks", detect_order_blocks),
+        ("liquidity_sweeps", detect_liquidity_sweeps),
+        ("bos_choch", detect_bos_choch),
+        ("swing_points", detect_swing_points_with_labels),
+    ]
+    for name, detector in streaming:
+        rescan = _time(lambda: detector(df), 1)
+        det = create_streaming_detector(name)
+        det.feed(history)
+        t0 = time.perf_counter()
+        for bar in bars:
+            det.update(bar)
+        update = (time.perf_counter() - t0) / live
+        print(f"{name:<26}{rescan * 1e3:>10.1f}{update * 1e6:>10.1f}{rescan / update:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark: streaming indicators vs. recomputing ``ta`` over history.
+
+Replays Databento 1-min bars the way ``Backtester.run`` does and times
+the indicator work per bar two ways:
+
+  legacy    — rebuild the ``ta`` series over ``history`` (bars 0..i) on
+              every bar, which is what the presets did before
+  streaming — advance an ``engine.indicators`` object by one bar
+
+Then runs every preset strategy end-to-end over the full file with the
+streaming implementation.
+
+Usage (from backend/):
+    python -m benchmarks.bench_indicators [--symbol nq] [--bars 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import ta
+
+from data.fetcher import _load_symbol_data
+from engine.backtester import Backtester, BacktestConfig
+from engine.indicators import ADX, ATR, EMA, MACD, RSI, BollingerBands, Stochastic
+from engine.preset_strategies import PRESET_STRATEGIES
+
+LEGACY = {
+    "EMA(21)": lambda h: ta.trend.EMAIndicator(h["close"], window=21).ema_indicator().iloc[-1],
+    "RSI(14)": lambda h: ta.momentum.RSIIndicator(h["close"], window=14).rsi().iloc[-1],
+    "ATR(14)": lambda h: ta.volatility.AverageTrueRange(
+        h["high"], h["low"], h["close"], window=14).average_true_range().iloc[-1],
+    "BB(20)": lambda h: ta.volatility.BollingerBands(h["close"], window=20).bollinger_hband().iloc[-1],
+    "MACD": lambda h: ta.trend.MACD(h["close"]).macd_diff().iloc[-1],
+    "Stoch(14,3)": lambda h: ta.momentum.StochasticOscillator(
+        h["high"], h["low"], h["close"]).stoch_signal().iloc[-1],
+    "ADX(14)": lambda h: ta.trend.ADXIndicator(h["high"], h["low"], h["close"]).adx().iloc[-1],
+}
+
+STREAMING = {
+    "EMA(21)": lambda: EMA(21),
+    "RSI(14)": lambda: RSI(14),
+    "ATR(14)": lambda: ATR(14),
+    "BB(20)": lambda: BollingerBands(20),
+    "MACD": lambda: MACD(),
+    "Stoch(14,3)": lambda: Stochastic(14, 3),
+    "ADX(14)": lambda: ADX(14),
+}
+
+
+def bench_indicators(df, n_bars: int) -> None:
+    df = df.iloc[:n_bars]
+    bars = df.reset_index(drop=True).to_dict("records")
+    print(f"\nPer-indicator cost over {n_bars:,} bars")
+    print(f"{'indicator':<14}{'legacy s':>12}{'streaming s':>14}{'speedup':>10}")
+    for name, legacy in LEGACY.items():
+        t0 = time.perf_counter()
+        for i in range(30, n_bars):
+            legacy(df.iloc[:i + 1])
+        t_legacy = time.perf_counter() - t0
+
+        ind = STREAMING[name]()
+        t0 = time.perf_counter()
+        for bar in bars:
+            ind.update(bar)
+        t_stream = time.perf_counter() - t0
+        print(f"{name:<14}{t_legacy:>12.3f}{t_stream:>14.4f}{t_legacy / t_stream:>9.0f}x")
+
+
+def bench_presets(df) -> None:
+    config = BacktestConfig()
+    print(f"\nPreset backtests over the full file ({len(df):,} bars, streaming indicators)")
+    print(f"{'preset':<26}{'seconds':>10}{'bars/s':>12}{'trades':>8}")
+    for preset in PRESET_STRATEGIES:
+        strategy = preset["class"](dict(preset["default_params"]))
+        t0 = time.perf_counter()
+        result = Backtester(strategy, df, config).run()
+        elapsed = time.perf_counter() - t0
+        print(f"{preset['name']:<26}{elapsed:>10.2f}{len(df) / elapsed:>12,.0f}"
+              f"{len(result.trades):>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbol", default="nq", help="Databento file prefix (nq, es, gc, cl)")
+    parser.add_argument("--bars", type=int, default=2000, help="bars for the legacy comparison")
+    args = parser.parse_args()
+
+    df = _load_symbol_data(args.symbol)
+    bench_indicators(df, min(args.bars, len(df)))
+    bench_presets(df)
+
+
+if __name__ == "__main__":
+    main()
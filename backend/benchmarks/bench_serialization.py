@@ -0,0 +1,100 @@
+"""Benchmark: /api/data candle and tick payload serialization.
+
+Times building and encoding the response body three ways:
+
+  legacy   — ``df.iterrows()`` into row dicts, then FastAPI's
+             ``jsonable_encoder`` + JSON encoding (what the endpoints did)
+  rows     — data.payload column conversion transposed to row dicts,
+             encoded directly (``?format=rows``, the default)
+  columns  — data.payload columnar layout (``?format=columns``)
+
+Candles are the full 1-min file for a symbol; ticks are synthetic.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization [--symbol nq] [--ticks 50000]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from data.fetcher import _load_symbol_data
+from data.payload import HAS_ORJSON, json_response, ohlcv_columns, tick_columns, to_rows
+
+
+def legacy_candles(df):
+    candles = []
+    for ts, row in df.iterrows():
+        candles.append({
+            "time": int(ts.timestamp()),
+            "open": round(row["open"], 2),
+            "high": round(row["high"], 2),
+            "low": round(row["low"], 2),
+            "close": round(row["close"], 2),
+            "volume": int(row["volume"]),
+        })
+    return json.dumps(jsonable_encoder({"candles": candles})).encode()
+
+
+def legacy_ticks(df):
+    ticks = []
+    for ts, row in df.iterrows():
+        ticks.append({
+            "time": ts.timestamp(),
+            "price": round(float(row["price"]), 2),
+            "size": int(row["size"]),
+            "side": str(row["side"]),
+        })
+    return json.dumps(jsonable_encoder({"ticks": ticks})).encode()
+
+
+def synthetic_ticks(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp("2026-01-05 14:30", tz="UTC").value
+    ts = start + np.sort(rng.integers(0, 6 * 3600 * 10**9, n))
+    return pd.DataFrame({
+        "price": 21000 + np.round(np.cumsum(rng.normal(0, 1, n)) * 4) / 4,
+        "size": rng.integers(1, 20, n),
+        "side": rng.choice(["A", "B", "N"], n),
+    }, index=pd.DatetimeIndex(ts.view("M8[ns]"), name="ts_event").tz_localize("UTC"))
+
+
+def _time(fn, repeat: int = 3) -> tuple:
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, len(out)
+
+
+def bench(label: str, df, legacy, to_columns, key: str) -> None:
+    print(f"\n{label}: {len(df):,} rows (orjson={'yes' if HAS_ORJSON else 'no'})")
+    print(f"{'path':<10}{'seconds':>10}{'MB':>8}{'speedup':>10}")
+    t_legacy, size = _time(lambda: legacy(df), repeat=1)
+    print(f"{'legacy':<10}{t_legacy:>10.3f}{size / 1e6:>8.1f}{'1x':>10}")
+    for name, build in [
+        ("rows", lambda: json_response({key: to_rows(to_columns(df))}).body),
+        ("columns", lambda: json_response({key: to_columns(df)}).body),
+    ]:
+        elapsed, size = _time(build)
+        print(f"{name:<10}{elapsed:>10.3f}{size / 1e6:>8.1f}{t_legacy / elapsed:>9.0f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbol", default="nq", help="Databento file prefix (nq, es, gc, cl)")
+    parser.add_argument("--ticks", type=int, default=50_000, help="synthetic tick count")
+    args = parser.parse_args()
+
+    bench("1-min candles", _load_symbol_data(args.symbol), legacy_candles, ohlcv_columns, "candles")
+    bench("ticks", synthetic_ticks(args.ticks), legacy_ticks, tick_columns, "ticks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark: signal simulator kernels on Databento 1-min bars.
+
+Times engine.signal_simulator's NumPy trade walk and (if installed) the
+numba kernel on an EMA-crossover long/short signal set with ATR-based
+SL/TP levels, then the full run_signals_backtest() wrapper.
+
+Usage (from backend/):
+    python -m benchmarks.bench_signal_simulator [--symbol nq] [--repeat 20]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from data.fetcher import _load_symbol_data
+from engine.backtester import BacktestConfig
+from engine.signal_simulator import HAS_NUMBA, simulate_signals
+from engine.vbt_backtester import run_signals_backtest
+from engine.vbt_strategy import TradeSignal, VectorBTStrategy
+
+
+class EMACrossStops(VectorBTStrategy):
+    def generate_signals(self, df):
+        fast = df["close"].ewm(span=9, adjust=False).mean()
+        slow = df["close"].ewm(span=21, adjust=False).mean()
+        above = (fast > slow).to_numpy()
+        cross_up = above & ~np.roll(above, 1)
+        cross_dn = ~above & np.roll(above, 1)
+        cross_up[0] = cross_dn[0] = False
+        rng = (df["high"] - df["low"]).rolling(14).mean().bfill().to_numpy()
+        close = df["close"].to_numpy()
+        return TradeSignal(
+            entries=cross_up, exits=cross_dn, short_entries=cross_dn, short_exits=cross_up,
+            stop_loss=np.where(cross_dn, close + 2 * rng, close - 2 * rng),
+            take_profit=np.where(cross_dn, close - 3 * rng, close + 3 * rng),
+        )
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbol", default="nq", help="Databento file prefix (nq, es, gc, cl)")
+    parser.add_argument("--repeat", type=int, default=20, help="timing repeats (best of)")
+    args = parser.parse_args()
+
+    df = _load_symbol_data(args.symbol)
+    strategy = EMACrossStops({})
+    sig = strategy.generate_signals(df)
+    h, l, c = (df[col].to_numpy(dtype=np.float64) for col in ("high", "low", "close"))
+    kwargs = dict(short_entries=sig.short_entries, short_exits=sig.short_exits,
+                  stop_loss=sig.stop_loss, take_profit=sig.take_profit,
+                  slippage=0.25, commission=2.5, point_value=20.0, initial_balance=25_000.0)
+
+    print(f"{len(df):,} bars, {int(sig.entries.sum() + sig.short_entries.sum()):,} entry signals")
+    print(f"{'kernel':<22}{'seconds':>10}{'Mbars/s':>10}{'trades':>8}")
+    kernels = [("numpy trade walk", False)] + ([("numba", True)] if HAS_NUMBA else [])
+    for name, use_numba in kernels:
+        run = lambda: simulate_signals(h, l, c, sig.entries, sig.exits, use_numba=use_numba, **kwargs)
+        trades = run().num_trades  # warm-up / JIT compile
+        elapsed = _time(run, args.repeat)
+        print(f"{name:<22}{elapsed:>10.4f}{len(df) / elapsed / 1e6:>10.1f}{trades:>8}")
+
+    config = BacktestConfig()
+    elapsed = _time(lambda: run_signals_backtest(strategy, df, config), max(1, args.repeat // 4))
+    print(f"{'run_signals_backtest':<22}{elapsed:>10.4f}{len(df) / elapsed / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""Activity-based bars built from the tick store.
+
+Besides time bars (``fetcher._resample``), ticks can be aggregated into:
+
+  tick    — a bar every ``threshold`` trades
+  volume  — a bar once traded contracts reach ``threshold``
+  dollar  — a bar once traded notional (price × size × point value)
+            reaches ``threshold``
+  range   — a bar once high − low reaches ``threshold`` points
+  renko   — fixed ``threshold``-point bricks; a brick is added each time
+            price closes a full brick above/below the last brick
+
+Each bar is stamped with its first tick (the last for renko bricks), and
+the accumulator resets when a bar closes. Bars are built in one pass over
+the day segments of data.tick_store. Ticks of the bar still open at the end
+of a segment are carried into the next one, so segment boundaries never
+split a bar; the trailing partial bar is emitted (except for renko). Renko
+carries only its anchor and the volume traded since the last brick, so a
+wide brick over a long stretch of chop does not re-copy its ticks.
+
+Two interchangeable kernels produce identical bars: a per-tick loop compiled
+with numba when installed, and a NumPy walk that jumps from one bar close
+to the next (searchsorted on cumulative weights, block scans for range and
+renko).
+
+``fetch_ohlcv`` accepts these as ``<type>:<threshold>`` interval codes,
+e.g. ``volume:5000`` or ``renko:10``.
+"""
+from __future__ import annotations
+
+import os
+import re
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data.cache import LRUCache
+from data.ohlcv_store import DATA_DIR
+from data.tick_store import TICK_STORE_DIR, iter_segments, sync_ticks
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+BAR_TYPES = {"tick": 0, "volume": 1, "dollar": 2, "range": 3, "renko": 4}
+_TICK, _VOLUME, _DOLLAR, _RANGE, _RENKO = range(5)
+
+_INTERVAL = re.compile(r"^(tick|volume|dollar|range|renko):(\d+(?:\.\d+)?)$")
+
+# Built bars per (prefix, bar type, threshold, multiplier, source files)
+BAR_CACHE_MB = float(os.getenv("AFINDR_BAR_CACHE_MB", "256"))
+_bar_cache = LRUCache(max_bytes=int(BAR_CACHE_MB * 1024 * 1024))
+
+
+def parse_bar_interval(interval: str) -> Optional[Tuple[str, float]]:
+    """``"volume:5000"`` -> ``("volume", 5000.0)``; None for time intervals."""
+    match = _INTERVAL.match(interval)
+    if not match:
+        return None
+    threshold = float(match.group(2))
+    if threshold <= 0:
+        raise ValueError(f"Bar threshold must be positive: '{interval}'")
+    return match.group(1), threshold
+
+
+def _bar_loop(ts, price, size, kind, threshold, multiplier, anchor, carried_vol,
+              out_ts, out_o, out_h, out_l, out_c, out_v):
+    """Per-tick kernel. Returns (bars written, first unconsumed tick, renko anchor).
+
+    ``carried_vol`` is renko volume traded since the last brick in earlier segments.
+    """
+    n = len(price)
+    nb = 0
+    start = 0
+    if kind == _RENKO:
+        vol = carried_vol
+        for i in range(n):
+            p = price[i]
+            vol += size[i]
+            if anchor != anchor:
+                anchor = p
+                continue
+            while p >= anchor + threshold:
+                out_ts[nb] = ts[i]
+                out_o[nb] = anchor
+                out_l[nb] = anchor
+                anchor = anchor + threshold
+                out_h[nb] = anchor
+                out_c[nb] = anchor
+                out_v[nb] = vol
+                vol = 0.0
+                nb += 1
+                start = i + 1
+            while p <= anchor - threshold:
+                out_ts[nb] = ts[i]
+                out_o[nb] = anchor
+                out_h[nb] = anchor
+                anchor = anchor - threshold
+                out_l[nb] = anchor
+                out_c[nb] = anchor
+                out_v[nb] = vol
+                vol = 0.0
+                nb += 1
+                start = i + 1
+        return nb, start, anchor
+
+    total = 0.0
+    base = 0.0
+    hi = -np.inf
+    lo = np.inf
+    vol = 0.0
+    for i in range(n):
+        p = price[i]
+        if p > hi:
+            hi = p
+        if p < lo:
+            lo = p
+        vol += size[i]
+        if kind == _TICK:
+            total += 1.0
+        elif kind == _VOLUME:
+            total += size[i]
+        elif kind == _DOLLAR:
+            total += p * size[i] * multiplier
+        if (kind == _RANGE and hi - lo >= threshold) or (kind != _RANGE and total - base >= threshold):
+            out_ts[nb] = ts[start]
+            out_o[nb] = price[start]
+            out_h[nb] = hi
+            out_l[nb] = lo
+            out_c[nb] = p
+            out_v[nb] = vol
+            nb += 1
+            start = i + 1
+            base = total
+            hi = -np.inf
+            lo = np.inf
+            vol = 0.0
+    return nb, start, anchor
+
+
+if HAS_NUMBA:
+    _bar_loop_jit = njit(cache=True, nogil=True)(_bar_loop)
+
+
+def _first_true(cond_at, start: int, n: int) -> int:
+    """First index >= start where ``cond_at(lo, hi)`` (a block mask) is True, else n."""
+    block = 256
+    lo = start
+    while lo < n:
+        hi = min(n, lo + block)
+        hits = np.flatnonzero(cond_at(lo, hi))
+        if len(hits):
+            return lo + int(hits[0])
+        lo = hi
+        block *= 4
+    return n
+
+
+def _bar_walk(ts, price, size, kind, threshold, multiplier, anchor, carried_vol,
+              out_ts, out_o, out_h, out_l, out_c, out_v):
+    """NumPy kernel with the same contract as _bar_loop."""
+    n = len(price)
+    nb = 0
+    start = 0
+
+    if kind == _RENKO:
+        scan = 0
+        if anchor != anchor and n:
+            anchor = float(price[0])
+            scan = 1
+        while scan < n:
+            a = anchor
+            j = _first_true(lambda lo, hi: (price[lo:hi] >= a + threshold) | (price[lo:hi] <= a - threshold),
+                            scan, n)
+            if j == n:
+                break
+            p = price[j]
+            vol = float(size[start:j + 1].sum()) + carried_vol
+            carried_vol = 0.0
+            while p >= anchor + threshold:
+                out_ts[nb], out_o[nb], out_l[nb] = ts[j], anchor, anchor
+                anchor = anchor + threshold
+                out_h[nb], out_c[nb], out_v[nb] = anchor, anchor, vol
+                vol = 0.0
+                nb += 1
+            while p <= anchor - threshold:
+                out_ts[nb], out_o[nb], out_h[nb] = ts[j], anchor, anchor
+                anchor = anchor - threshold
+                out_l[nb], out_c[nb], out_v[nb] = anchor, anchor, vol
+                vol = 0.0
+                nb += 1
+            start = scan = j + 1
+        return nb, start, anchor
+
+    ends = []
+    if kind == _RANGE:
+        while start < n:
+            s = start
+            j = _first_true(
+                lambda lo, hi: (np.maximum.accumulate(price[s:hi])[lo - s:]
+                                - np.minimum.accumulate(price[s:hi])[lo - s:]) >= threshold,
+                s, n)
+            if j == n:
+                break
+            ends.append(j)
+            start = j + 1
+    elif kind == _TICK:
+        per_bar = int(np.ceil(threshold))
+        ends = list(range(per_bar - 1, n, per_bar))
+        if ends:
+            start = ends[-1] + 1
+    else:
+        if kind == _VOLUME:
+            weights = size.astype(np.float64)
+        else:
+            weights = price * size * multiplier
+        cum = np.cumsum(weights)
+        base = 0.0
+        while start < n:
+            # Candidate from the sorted running total, then nudged so the
+            # test is the same ``total - base >= threshold`` as the loop
+            j = int(np.searchsorted(cum, base + threshold))
+            j = max(j, start)
+            while j < n and cum[j] - base < threshold:
+                j += 1
+            while j > start and cum[j - 1] - base >= threshold:
+                j -= 1
+            if j >= n:
+                break
+            ends.append(j)
+            base = cum[j]
+            start = j + 1
+
+    if ends:
+        ends = np.asarray(ends)
+        starts = np.r_[0, ends[:-1] + 1]
+        closed = slice(0, ends[-1] + 1)
+        nb = len(ends)
+        out_ts[:nb] = ts[starts]
+        out_o[:nb] = price[starts]
+        out_h[:nb] = np.maximum.reduceat(price[closed], starts)
+        out_l[:nb] = np.minimum.reduceat(price[closed], starts)
+        out_c[:nb] = price[ends]
+        out_v[:nb] = np.add.reduceat(size[closed], starts)
+    return nb, start, anchor
+
+
+def _capacity(price: np.ndarray, kind: int, threshold: float, anchor: float) -> int:
+    if kind != _RENKO or len(price) == 0:
+        return len(price)
+    first = price[0] if anchor != anchor else anchor
+    moves = np.abs(np.diff(price)).sum() + abs(price[0] - first)
+    return len(price) + int(moves / threshold) + 2
+
+
+def _to_frame(ts, o, h, l, c, v) -> pd.DataFrame:
+    index = pd.DatetimeIndex(np.asarray(ts, dtype=np.int64).view("M8[ns]"), name="ts_event").tz_localize("UTC")
+    return pd.DataFrame({
+        "open": o, "high": h, "low": l, "close": c, "volume": np.asarray(v).astype(np.int64),
+    }, index=index)
+
+
+def aggregate_ticks(
+    segments,
+    bar_type: str,
+    threshold: float,
+    multiplier: float = 1.0,
+    use_numba: Optional[bool] = None,
+) -> pd.DataFrame:
+    """Build ``bar_type`` bars from an iterable of tick segments (dicts of ts/price/size arrays)."""
+    kind = BAR_TYPES[bar_type]
+    if use_numba is None:
+        use_numba = HAS_NUMBA
+    if use_numba and not HAS_NUMBA:
+        raise ImportError("numba is not installed")
+    kernel = _bar_loop_jit if use_numba else _bar_walk
+
+    anchor = np.nan
+    renko_vol = 0.0
+    carry = None
+    frames = []
+    for seg in segments:
+        ts = np.asarray(seg["ts"], dtype=np.int64)
+        price = np.asarray(seg["price"], dtype=np.float64)
+        size = np.asarray(seg["size"], dtype=np.float64)
+        if carry is not None:
+            ts, price, size = (np.concatenate(pair) for pair in zip(carry, (ts, price, size)))
+        cap = _capacity(price, kind, threshold, anchor)
+        out = [np.empty(cap, dtype=np.int64)] + [np.empty(cap) for _ in range(5)]
+        nb, start, anchor = kernel(ts, price, size, kind, float(threshold), float(multiplier),
+                                   float(anchor), renko_vol, *out)
+        if nb:
+            frames.append(_to_frame(*(a[:nb] for a in out)))
+        if kind == _RENKO:
+            renko_vol = (0.0 if nb else renko_vol) + float(size[start:].sum())
+        else:
+            carry = (ts[start:], price[start:], size[start:])
+
+    if carry is not None and len(carry[0]):
+        ts, price, size = carry
+        frames.append(_to_frame(ts[:1], price[:1], [price.max()], [price.min()], price[-1:], [size.sum()]))
+
+    if not frames:
+        return _to_frame([], [], [], [], [], [])
+    return pd.concat(frames)
+
+
+def build_bars(
+    prefix: str,
+    bar_type: str,
+    threshold: float,
+    multiplier: float = 1.0,
+    data_dir: str = DATA_DIR,
+    store_dir: str = TICK_STORE_DIR,
+) -> pd.DataFrame:
+    """``bar_type`` bars over all ticks of ``prefix``, cached until the tick files change."""
+    manifest = sync_ticks(prefix, data_dir, store_dir)
+    if manifest is None:
+        return _to_frame([], [], [], [], [], [])
+
+    key = (prefix, bar_type, float(threshold), float(multiplier), store_dir,
+           tuple((f["name"], f["size"], f["mtime_ns"]) for f in manifest["files"]))
+    bars = _bar_cache.get(key)
+    if bars is None:
+        bars = aggregate_ticks(iter_segments(prefix, data_dir, store_dir), bar_type, threshold, multiplier)
+        _bar_cache.set(key, bars)
+    return bars
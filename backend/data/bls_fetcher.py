@@ -11,12 +11,11 @@ import os
 from datetime import datetime
 from typing import Any
 
-import httpx
-
-from data.cache import TTLCache
+from data.cache import make_cache
+from data.http_client import request_json
 
 # 60-minute TTL cache for BLS API calls (data updates monthly at most)
-_bls_cache = TTLCache(default_ttl=3600.0, max_size=200)
+_bls_cache = make_cache("bls", default_ttl=3600.0, max_size=200, stale_ttl=3600.0)
 
 _BASE = "https://api.bls.gov/publicAPI/v2/timeseries/data/"
 
@@ -380,7 +379,7 @@ def _get_key() -> str | None:
     return os.environ.get("BLS_API_KEY")
 
 
-def fetch_bls_series(
+async def fetch_bls_series(
     series_ids: list[str],
     start_year: int | None = None,
     end_year: int | None = None,
@@ -395,10 +394,18 @@ def fetch_bls_series(
     Returns dict per series with observations in the same shape as FRED.
     """
     cache_key = f"bls:{','.join(sorted(series_ids))}:{start_year}:{end_year}"
-    cached = _bls_cache.get(cache_key)
-    if cached is not None:
-        return cached
+    return await _bls_cache.get_or_load(
+        cache_key,
+        lambda: _load_bls_series(series_ids, start_year, end_year),
+        cache_if=lambda result: "error" not in result,
+    )
+
 
+async def _load_bls_series(
+    series_ids: list[str],
+    start_year: int | None,
+    end_year: int | None,
+) -> dict[str, Any]:
     key = _get_key()
     if not key:
         return {"error": "BLS_API_KEY not configured. Get a free key at https://www.bls.gov/developers/"}
@@ -417,9 +424,7 @@ def fetch_bls_series(
     }
 
     try:
-        resp = httpx.post(_BASE, json=payload, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
+        data = await request_json("POST", _BASE, provider="bls", json=payload, timeout=15)
     except Exception as e:
         return {"error": f"BLS API request failed: {str(e)}"}
 
@@ -471,16 +476,12 @@ def fetch_bls_series(
 
     # If single series, unwrap
     if len(series_ids) == 1 and series_ids[0] in results:
-        result = results[series_ids[0]]
-        _bls_cache.set(cache_key, result)
-        return result
+        return results[series_ids[0]]
 
-    multi_result = {"series": results, "count": len(results)}
-    _bls_cache.set(cache_key, multi_result)
-    return multi_result
+    return {"series": results, "count": len(results)}
 
 
-def fetch_bls_indicator(shorthand: str, years: int = 3) -> dict[str, Any]:
+async def fetch_bls_indicator(shorthand: str, years: int = 3) -> dict[str, Any]:
     """Fetch a BLS indicator by shorthand or raw series ID.
 
     See POPULAR_SERIES keys for all available shorthands.
@@ -493,14 +494,14 @@ def fetch_bls_indicator(shorthand: str, years: int = 3) -> dict[str, Any]:
         series_id = shorthand
 
     now = datetime.now()
-    return fetch_bls_series(
+    return await fetch_bls_series(
         [series_id],
         start_year=now.year - years,
         end_year=now.year,
     )
 
 
-def fetch_bls_multi(shorthands: list[str], years: int = 3) -> dict[str, Any]:
+async def fetch_bls_multi(shorthands: list[str], years: int = 3) -> dict[str, Any]:
     """Fetch multiple BLS series in a single API call (max 50).
 
     Returns a dict with each series keyed by shorthand.
@@ -519,7 +520,7 @@ def fetch_bls_multi(shorthands: list[str], years: int = 3) -> dict[str, Any]:
         id_to_shorthand[sid] = key
 
     now = datetime.now()
-    result = fetch_bls_series(
+    result = await fetch_bls_series(
         series_ids,
         start_year=now.year - years,
         end_year=now.year,
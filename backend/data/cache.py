@@ -1,41 +1,367 @@
-"""Simple in-memory TTL cache for market data fetchers.
+"""In-memory caches for market data fetchers.
 
-Eliminates redundant external API calls within a conversation by caching
-results with per-key TTL expiration. No external dependencies (no Redis).
+``LRUCache`` bounds a cache by the estimated size of its values as well as
+by entry count: each ``set`` charges the value's footprint (``nbytes`` for
+NumPy arrays, ``memory_usage(deep=True)`` for pandas objects, a recursive
+``sys.getsizeof`` walk for plain containers) and evicts least-recently-used
+entries until the total fits the budget. A value larger than the whole
+budget is returned to the caller but not kept. Hit/miss/eviction counters
+are exposed through ``stats()``.
+
+Every operation is O(1) apart from a heap push per ``set``: recency lives
+in an OrderedDict, and expiry times in a min-heap that is consumed lazily
+(an entry's heap item is ignored if the entry was replaced or dropped).
+
+Entries may carry a TTL and a stale window after it. ``get`` treats an
+expired entry as a miss; ``get_or_load`` / ``get_or_load_sync`` instead
+serve it while the stale window lasts and refresh it in the background
+(stale-while-revalidate). Concurrent misses for the same key share a single
+call to the loader.
+
+``TTLCache`` is the same cache with a TTL on every entry, used to avoid
+redundant external API calls within a conversation. No external
+dependencies (no Redis).
 """
 from __future__ import annotations
 
+import asyncio
+import heapq
+import itertools
+import os
+import sys
+import threading
 import time
-from typing import Any, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
 
+import numpy as np
+import pandas as pd
 
-class TTLCache:
-    """In-memory cache with per-key TTL expiration."""
+# Default per-cache budget for API response caches (MiB)
+DEFAULT_MAX_MB = float(os.getenv("AFINDR_CACHE_MB", "64"))
 
-    def __init__(self, default_ttl: float = 60.0, max_size: int = 500):
-        self._store: dict[str, tuple[float, Any]] = {}
-        self._default_ttl = default_ttl
+_MB = 1024 * 1024
+
+
+def sizeof(value: Any, _depth: int = 0) -> int:
+    """Estimated bytes held by ``value``."""
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    size = sys.getsizeof(value)
+    if _depth >= 8:
+        return size
+    if isinstance(value, dict):
+        size += sum(sizeof(k, _depth + 1) + sizeof(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(sizeof(v, _depth + 1) for v in value)
+    return size
+
+
+def _always(value: Any) -> bool:
+    return True
+
+
+@dataclass
+class _Entry:
+    value: Any
+    nbytes: int
+    expires_at: float  # fresh until
+    stale_until: float  # kept (and servable by get_or_load) until
+
+
+@dataclass
+class _Flight:
+    """One in-progress synchronous load that concurrent callers wait on."""
+    done: threading.Event = field(default_factory=threading.Event)
+    value: Any = None
+    error: Optional[BaseException] = None
+
+
+class CacheBase:
+    """Single-flight / stale-while-revalidate loading shared by the cache backends.
+
+    Subclasses provide ``_probe(key)`` -> ("fresh" | "stale" | "miss", value)
+    and ``set(key, value, ttl)``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, "asyncio.Future"] = {}
+        self._inflight_sync: Dict[Hashable, _Flight] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.loads = 0
+
+    def _probe(self, key: Hashable) -> Tuple[str, Any]:
+        raise NotImplementedError
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        cache_if: Callable[[Any], bool] = _always,
+    ) -> Any:
+        """Cached value for ``key``, else ``await loader()`` once for all concurrent callers.
+
+        Results failing ``cache_if`` are returned but not stored; exceptions
+        from the loader propagate to every waiter and nothing is cached.
+        """
+        state, value = self._probe(key)
+        if state == "fresh":
+            return value
+        if state == "stale":
+            if key not in self._inflight:
+                self._start_load(key, loader, ttl, cache_if)
+            return value
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = self._start_load(key, loader, ttl, cache_if)
+        return await asyncio.shield(flight)
+
+    def get_or_load_sync(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+        cache_if: Callable[[Any], bool] = _always,
+    ) -> Any:
+        """Blocking counterpart of get_or_load for synchronous fetchers (threads share loads)."""
+        state, value = self._probe(key)
+        if state == "fresh":
+            return value
+
+        with self._lock:
+            flight = self._inflight_sync.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight_sync[key] = _Flight()
+
+        if state == "stale":
+            if leader:
+                threading.Thread(target=self._run_sync, args=(key, flight, loader, ttl, cache_if),
+                                 daemon=True).start()
+            return value
+        if leader:
+            self._run_sync(key, flight, loader, ttl, cache_if)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _start_load(self, key, loader, ttl, cache_if) -> "asyncio.Future":
+        async def run():
+            try:
+                return await self._fill(key, loader, ttl, cache_if)
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.ensure_future(run())
+        # A background refresh nobody awaits must not log "exception never retrieved"
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._inflight[key] = task
+        return task
+
+    async def _fill(self, key, loader, ttl, cache_if) -> Any:
+        value = await loader()
+        self.loads += 1
+        if cache_if(value):
+            self.set(key, value, ttl)
+        return value
+
+    def _fill_sync(self, key, loader, ttl, cache_if) -> Any:
+        value = loader()
+        self.loads += 1
+        if cache_if(value):
+            self.set(key, value, ttl)
+        return value
+
+    def _run_sync(self, key, flight: _Flight, loader, ttl, cache_if) -> None:
+        try:
+            flight.value = self._fill_sync(key, loader, ttl, cache_if)
+        except BaseException as exc:  # re-raised in every waiting caller
+            flight.error = exc
+        finally:
+            with self._lock:
+                self._inflight_sync.pop(key, None)
+            flight.done.set()
+
+
+class LRUCache(CacheBase):
+    """Size-bounded in-memory cache with LRU eviction, TTLs and single-flight loads."""
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        max_size: Optional[int] = None,
+        default_ttl: Optional[float] = None,
+        stale_ttl: float = 0.0,
+    ):
+        self._store: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._expiry: List[Tuple[float, int, Hashable]] = []
+        self._seq = itertools.count()
+        self._max_bytes = int(DEFAULT_MAX_MB * _MB) if max_bytes is None else int(max_bytes)
         self._max_size = max_size
+        self._default_ttl = default_ttl
+        self._stale_ttl = stale_ttl
+        self._bytes = 0
+        super().__init__()
+
+    # -- basic operations -------------------------------------------------
 
-    def get(self, key: str) -> Optional[Any]:
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None or entry.expires_at < time.time():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry.value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        nbytes = sizeof(value)
+        ttl = ttl or self._default_ttl
+        expires_at = time.time() + ttl if ttl else float("inf")
+        entry = _Entry(value, nbytes, expires_at, expires_at + self._stale_ttl)
+        with self._lock:
+            if key in self._store:
+                self._drop(key)
+            if nbytes > self._max_bytes:
+                return
+            self._store[key] = entry
+            self._bytes += nbytes
+            if entry.stale_until != float("inf"):
+                heapq.heappush(self._expiry, (entry.stale_until, next(self._seq), key))
+            self._evict()
+
+    def delete(self, key: Hashable) -> bool:
+        """Drop ``key``; True if it was cached."""
+        with self._lock:
+            if key not in self._store:
+                return False
+            self._drop(key)
+            return True
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._store.get(key)
+        return entry is not None and entry.expires_at >= time.time()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+            self._expiry.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._store),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "loads": self.loads,
+        }
+
+    def _probe(self, key: Hashable) -> Tuple[str, Any]:
+        """("fresh" | "stale" | "miss", value), updating counters and recency."""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self.misses += 1
+                return "miss", None
+            if entry.expires_at >= time.time():
+                self.hits += 1
+                return "fresh", entry.value
+            self.stale_hits += 1
+            return "stale", entry.value
+
+    # -- internals (call with the lock held) ------------------------------
+
+    def _lookup(self, key: Hashable) -> Optional[_Entry]:
         entry = self._store.get(key)
         if entry is None:
             return None
-        expires_at, value = entry
-        if time.time() > expires_at:
-            del self._store[key]
+        if entry.stale_until < time.time():
+            self._drop(key)
             return None
-        return value
+        self._store.move_to_end(key)
+        return entry
+
+    def _drop(self, key: Hashable) -> None:
+        self._bytes -= self._store.pop(key).nbytes
 
-    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
-        if len(self._store) >= self._max_size:
-            self._evict_expired()
-            if len(self._store) >= self._max_size:
-                # Evict oldest entry by insertion order
-                oldest_key = next(iter(self._store))
-                del self._store[oldest_key]
-        self._store[key] = (time.time() + (ttl or self._default_ttl), value)
+    def _over(self) -> bool:
+        return self._bytes > self._max_bytes or (
+            self._max_size is not None and len(self._store) > self._max_size)
 
-    def _evict_expired(self) -> None:
+    def _evict(self) -> None:
+        # Lazily discard expired entries from the heap top, then LRU
         now = time.time()
-        self._store = {k: v for k, v in self._store.items() if v[0] > now}
+        while self._expiry and self._expiry[0][0] < now:
+            stale_until, _, key = heapq.heappop(self._expiry)
+            entry = self._store.get(key)
+            if entry is not None and entry.stale_until == stale_until:
+                self._drop(key)
+        while self._over():
+            self._bytes -= self._store.popitem(last=False)[1].nbytes
+            self.evictions += 1
+        # Heap items of replaced/evicted entries are skipped when popped; compact
+        # when they outnumber live entries
+        if len(self._expiry) > 2 * len(self._store) + 64:
+            self._expiry = [(e.stale_until, next(self._seq), k) for k, e in self._store.items()
+                            if e.stale_until != float("inf")]
+            heapq.heapify(self._expiry)
+
+
+class TTLCache(LRUCache):
+    """LRU cache with per-key TTL expiration."""
+
+    def __init__(
+        self,
+        default_ttl: float = 60.0,
+        max_size: int = 500,
+        max_bytes: Optional[int] = None,
+        stale_ttl: float = 0.0,
+    ):
+        super().__init__(max_bytes=max_bytes, max_size=max_size, default_ttl=default_ttl, stale_ttl=stale_ttl)
+
+
+# "memory": one cache per process. "sqlite": a WAL database shared by every
+# worker on the host (data.shared_cache), so N workers make one upstream call.
+CACHE_BACKEND = os.getenv("AFINDR_CACHE_BACKEND", "memory")
+
+
+def make_cache(
+    namespace: str,
+    default_ttl: float = 60.0,
+    max_size: int = 500,
+    stale_ttl: float = 0.0,
+    backend: Optional[str] = None,
+) -> CacheBase:
+    """TTL cache for a fetcher's upstream responses on the configured backend."""
+    backend = backend or CACHE_BACKEND
+    if backend == "sqlite":
+        from data.shared_cache import SqliteCache
+        return SqliteCache(namespace, default_ttl=default_ttl, max_size=max_size, stale_ttl=stale_ttl)
+    if backend != "memory":
+        raise ValueError(f"Unknown cache backend '{backend}' (expected 'memory' or 'sqlite')")
+    return TTLCache(default_ttl=default_ttl, max_size=max_size, stale_ttl=stale_ttl)
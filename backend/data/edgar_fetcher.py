@@ -7,11 +7,12 @@ from __future__ import annotations
 
 from typing import Any
 
-import httpx
+from data.http_client import get_json
 
 _USER_AGENT = "aFindr/1.0 (contact@afindr.app)"
 _BASE = "https://efts.sec.gov/LATEST"
 _SUBMISSIONS = "https://data.sec.gov/submissions"
+_TICKERS = "https://www.sec.gov/files/company_tickers.json"
 
 _HEADERS = {
     "User-Agent": _USER_AGENT,
@@ -19,13 +20,10 @@ _HEADERS = {
 }
 
 
-def _get_cik(ticker: str) -> str | None:
+async def _get_cik(ticker: str) -> str | None:
     """Resolve a ticker symbol to a zero-padded CIK number."""
-    url = "https://www.sec.gov/files/company_tickers.json"
     try:
-        resp = httpx.get(url, headers=_HEADERS, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
+        data = await get_json(_TICKERS, provider="edgar", headers=_HEADERS)
         for entry in data.values():
             if entry.get("ticker", "").upper() == ticker.upper():
                 return str(entry["cik_str"]).zfill(10)
@@ -34,38 +32,21 @@ def _get_cik(ticker: str) -> str | None:
     return None
 
 
-def fetch_insider_trades(ticker: str, limit: int = 20) -> dict[str, Any]:
+async def fetch_insider_trades(ticker: str, limit: int = 20) -> dict[str, Any]:
     """Fetch recent insider transactions (Form 4) from SEC EDGAR full-text search.
 
     Returns transaction details: insider name, title, transaction type,
     shares, price, date, ownership type.
     """
-    # Use EDGAR full-text search for Form 4 filings
-    params = {
-        "q": f'"{ticker}"',
-        "dateRange": "custom",
-        "startdt": "2024-01-01",
-        "forms": "4",
-        "hits.hits.total.value": limit,
-    }
-    try:
-        resp = httpx.get(
-            f"{_BASE}/search-index", params=params, headers=_HEADERS, timeout=15
-        )
-        resp.raise_for_status()
-    except Exception:
-        pass
-
-    # Approach: use the submissions endpoint for the company
-    cik = _get_cik(ticker)
+    # Form 4s come from the company's submissions (the full-text search
+    # result was never used, so it is no longer requested)
+    cik = await _get_cik(ticker)
     if not cik:
         return {"ticker": ticker, "trades": [], "error": "Could not resolve CIK for ticker"}
 
     url = f"{_SUBMISSIONS}/CIK{cik}.json"
     try:
-        resp = httpx.get(url, headers=_HEADERS, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
+        data = await get_json(url, provider="edgar", headers=_HEADERS, timeout=15)
     except Exception as e:
         return {"ticker": ticker, "trades": [], "error": f"EDGAR request failed: {str(e)}"}
 
@@ -101,12 +82,12 @@ def fetch_insider_trades(ticker: str, limit: int = 20) -> dict[str, Any]:
     }
 
 
-def fetch_institutional_holdings(ticker: str, limit: int = 20) -> dict[str, Any]:
+async def fetch_institutional_holdings(ticker: str, limit: int = 20) -> dict[str, Any]:
     """Fetch institutional holdings (13F filings) from SEC EDGAR.
 
     Returns recent 13F filings for the company (filed by institutional managers).
     """
-    cik = _get_cik(ticker)
+    cik = await _get_cik(ticker)
     if not cik:
         return {"ticker": ticker, "holdings": [], "error": "Could not resolve CIK for ticker"}
 
@@ -122,12 +103,10 @@ def fetch_institutional_holdings(ticker: str, limit: int = 20) -> dict[str, Any]
     }
 
     try:
-        resp = httpx.get(url, params=params, headers=_HEADERS, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
+        data = await get_json(url, provider="edgar", params=params, headers=_HEADERS, timeout=15)
     except Exception:
         # Fallback: get 13F filings from the company's own submissions
-        return _fetch_13f_from_submissions(ticker, cik, limit)
+        return await _fetch_13f_from_submissions(ticker, cik, limit)
 
     hits = data.get("hits", {}).get("hits", [])
     holdings = []
@@ -148,13 +127,11 @@ def fetch_institutional_holdings(ticker: str, limit: int = 20) -> dict[str, Any]
     }
 
 
-def _fetch_13f_from_submissions(ticker: str, cik: str, limit: int) -> dict[str, Any]:
+async def _fetch_13f_from_submissions(ticker: str, cik: str, limit: int) -> dict[str, Any]:
     """Fallback: get 13F filings from the company's submission history."""
     url = f"{_SUBMISSIONS}/CIK{cik}.json"
     try:
-        resp = httpx.get(url, headers=_HEADERS, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
+        data = await get_json(url, provider="edgar", headers=_HEADERS, timeout=15)
     except Exception as e:
         return {"ticker": ticker, "holdings": [], "error": str(e)}
 
@@ -1,18 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 import os
-import glob
 from typing import Optional, List, Dict
 
 import pandas as pd
 
-from data.cache import TTLCache
+from data.bars import build_bars, parse_bar_interval
+from data.cache import LRUCache, make_cache
+from data.contracts import get_contract_config
+from data.payload import tick_columns, to_rows
+from data.tick_store import empty_ticks, read_day, read_tail, read_tick_csv, tick_files
+from data.ohlcv_store import (
+    ROLLUP_RULES, load_rollup, load_store, read_csv_files, resample_ohlcv, slice_rollup, source_files,
+)
 
-# TTL cache for yfinance OHLCV fetches (5 min TTL)
-_yf_cache = TTLCache(default_ttl=300.0, max_size=200)
+# TTL cache for yfinance OHLCV fetches (5 min TTL; served stale for another
+# 5 min while a refresh runs)
+_yf_cache = make_cache("yfinance", default_ttl=300.0, max_size=200, stale_ttl=300.0)
 
-# Directory containing Databento CSV files
+# Directory containing Databento CSV files, and the columnar store built from them
 DATA_DIR = os.path.join(os.path.dirname(__file__), "databento")
+STORE_DIR = os.path.join(DATA_DIR, ".store")
+TICK_STORE_DIR = os.path.join(STORE_DIR, "ticks")
 
 # Map frontend symbols to Databento file prefixes
 SYMBOL_PREFIX = {
@@ -36,123 +46,107 @@ RESAMPLE_MAP = {
     "1wk": "1W",
 }
 
-# Cache loaded DataFrames in memory
-_ohlcv_cache: Dict[str, pd.DataFrame] = {}
-_tick_cache: Dict[str, pd.DataFrame] = {}
+# Loaded DataFrames (1-min bars, ticks, rollups) share one LRU budget so a
+# long-running worker stays bounded however many symbols it touches.
+# Memory-mapped columns are charged at their full mapped size.
+FRAME_CACHE_MB = float(os.getenv("AFINDR_FRAME_CACHE_MB", "1024"))
+_frame_cache = LRUCache(max_bytes=int(FRAME_CACHE_MB * 1024 * 1024))
 
 
 def _load_symbol_data(prefix: str) -> pd.DataFrame:
-    """Load and concatenate all 1-min CSV files for a given symbol prefix."""
-    if prefix in _ohlcv_cache:
-        return _ohlcv_cache[prefix]
+    """Load all 1-min bars for a symbol prefix from the columnar store.
 
-    pattern = os.path.join(DATA_DIR, f"{prefix}_*_1min.csv")
-    files = sorted(glob.glob(pattern))
+    The first call per prefix converts (or incrementally updates) the
+    ``.npy`` column store from the Databento CSVs; the frame itself is
+    memory-mapped. Falls back to parsing the CSVs when the store cannot be
+    written (e.g. a read-only data directory).
+    """
+    cached = _frame_cache.get(("ohlcv", prefix))
+    if cached is not None:
+        return cached
 
-    if not files:
-        raise ValueError(f"No Databento data found for prefix '{prefix}' in {DATA_DIR}")
-
-    frames = []
-    for f in files:
-        df = pd.read_csv(
-            f,
-            parse_dates=["ts_event"],
-            usecols=["ts_event", "open", "high", "low", "close", "volume"],
-        )
-        frames.append(df)
-
-    combined = pd.concat(frames, ignore_index=True)
-    combined = combined.sort_values("ts_event").drop_duplicates(subset=["ts_event"])
-    combined = combined.set_index("ts_event")
-
-    for col in ["open", "high", "low", "close"]:
-        combined[col] = pd.to_numeric(combined[col], errors="coerce")
-    combined["volume"] = pd.to_numeric(combined["volume"], errors="coerce").fillna(0).astype(int)
-    combined = combined.dropna(subset=["open", "high", "low", "close"])
-
-    _ohlcv_cache[prefix] = combined
+    try:
+        combined = load_store(prefix, DATA_DIR, STORE_DIR)
+    except OSError:
+        files = source_files(prefix, DATA_DIR)
+        if not files:
+            raise ValueError(f"No Databento data found for prefix '{prefix}' in {DATA_DIR}")
+        combined = read_csv_files(files)
+
+    _frame_cache.set(("ohlcv", prefix), combined)
     return combined
 
 
 def _load_tick_data(prefix: str) -> pd.DataFrame:
-    """Load tick (trades) data for a given symbol prefix.
+    """Load all tick (trades) files for a prefix into one in-memory frame.
 
+    Only used when the tick store cannot be written; see data.tick_store.
     Returns empty DataFrame if no tick files exist (tick data is optional).
     """
-    if prefix in _tick_cache:
-        return _tick_cache[prefix]
+    cached = _frame_cache.get(("ticks", prefix))
+    if cached is not None:
+        return cached
 
-    pattern = os.path.join(DATA_DIR, f"{prefix}_tick_*.csv")
-    files = sorted(glob.glob(pattern))
+    files = tick_files(prefix, DATA_DIR)
 
     if not files:
         # Tick data is optional — return empty DataFrame instead of crashing
-        empty = pd.DataFrame(columns=["price", "size", "side"])
-        empty.index.name = "ts_event"
-        _tick_cache[prefix] = empty
+        empty = empty_ticks()
+        _frame_cache.set(("ticks", prefix), empty)
         return empty
 
-    frames = []
-    for f in files:
-        df = pd.read_csv(
-            f,
-            usecols=["ts_event", "price", "size", "side"],
-        )
-        df["ts_event"] = pd.to_datetime(df["ts_event"], format="ISO8601", utc=True)
-        frames.append(df)
-
-    combined = pd.concat(frames, ignore_index=True)
-    combined = combined.sort_values("ts_event")
-    combined = combined.set_index("ts_event")
+    combined = pd.concat([read_tick_csv(f) for f in files])
+    combined = combined.sort_index(kind="stable")
 
-    combined["price"] = pd.to_numeric(combined["price"], errors="coerce")
-    combined["size"] = pd.to_numeric(combined["size"], errors="coerce").fillna(0).astype(int)
-    combined = combined.dropna(subset=["price"])
-
-    _tick_cache[prefix] = combined
+    _frame_cache.set(("ticks", prefix), combined)
     return combined
 
 
 def _resample(df: pd.DataFrame, rule: str) -> pd.DataFrame:
     """Resample 1-min OHLCV data to a higher timeframe."""
-    if rule == "1min":
-        return df
+    return resample_ohlcv(df, rule)
+
+
+# Lookback per period string (unknown periods fall back to 1y)
+PERIOD_DELTAS = {
+    "1d": pd.Timedelta(days=1),
+    "5d": pd.Timedelta(days=5),
+    "1mo": pd.Timedelta(days=30),
+    "3mo": pd.Timedelta(days=90),
+    "6mo": pd.Timedelta(days=180),
+    "60d": pd.Timedelta(days=60),
+    "1y": pd.Timedelta(days=365),
+    "2y": pd.Timedelta(days=730),
+    "5y": pd.Timedelta(days=1825),
+    "max": pd.Timedelta(days=99999),
+}
 
-    resampled = df.resample(rule).agg({
-        "open": "first",
-        "high": "max",
-        "low": "min",
-        "close": "last",
-        "volume": "sum",
-    }).dropna(subset=["open"])
 
-    return resampled
+def _period_start(df: pd.DataFrame, period: str) -> pd.Timestamp:
+    return df.index.max() - PERIOD_DELTAS.get(period, pd.Timedelta(days=365))
 
 
 def _trim_by_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
     """Trim DataFrame to the most recent N period of data."""
     if df.empty:
         return df
+    return df.iloc[df.index.searchsorted(_period_start(df, period)):]
 
-    end = df.index.max()
-
-    period_map = {
-        "1d": pd.Timedelta(days=1),
-        "5d": pd.Timedelta(days=5),
-        "1mo": pd.Timedelta(days=30),
-        "3mo": pd.Timedelta(days=90),
-        "6mo": pd.Timedelta(days=180),
-        "60d": pd.Timedelta(days=60),
-        "1y": pd.Timedelta(days=365),
-        "2y": pd.Timedelta(days=730),
-        "5y": pd.Timedelta(days=1825),
-        "max": pd.Timedelta(days=99999),
-    }
 
-    delta = period_map.get(period, pd.Timedelta(days=365))
-    start = end - delta
+def _load_rollup(prefix: str, rule: str) -> pd.DataFrame:
+    """Materialized ``rule`` rollup of a symbol's 1-min bars (see data.ohlcv_store)."""
+    key = ("rollup", prefix, rule)
+    cached = _frame_cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        rollup = load_rollup(prefix, rule, DATA_DIR, STORE_DIR)
+    except OSError:
+        rollup = resample_ohlcv(_load_symbol_data(prefix), rule)
 
-    return df[df.index >= start]
+    _frame_cache.set(key, rollup)
+    return rollup
 
 
 async def _fetch_yfinance_ohlcv(
@@ -165,12 +159,12 @@ async def _fetch_yfinance_ohlcv(
     yfinance period values: 1d,5d,1mo,3mo,6mo,1y,2y,5y,10y,max
     yfinance interval values: 1m,2m,5m,15m,30m,60m,90m,1h,1d,5d,1wk,1mo,3mo
     """
-    # Check cache first
+    # Concurrent requests for the same key share one download
     cache_key = f"{symbol}:{interval}:{period}"
-    cached = _yf_cache.get(cache_key)
-    if cached is not None:
-        return cached
+    return await _yf_cache.get_or_load(cache_key, lambda: _download_yfinance(symbol, period, interval))
 
+
+async def _download_yfinance(symbol: str, period: str, interval: str) -> pd.DataFrame:
     import yfinance as yf
 
     # Map our period strings to yfinance format
@@ -213,7 +207,8 @@ async def _fetch_yfinance_ohlcv(
         yf_period = "3mo"
 
     ticker = yf.Ticker(symbol)
-    df = ticker.history(period=yf_period, interval=yf_interval)
+    # Off the event loop, so other requests (and waiters on this key) keep running
+    df = await asyncio.to_thread(ticker.history, period=yf_period, interval=yf_interval)
 
     if df.empty:
         raise ValueError(f"No data returned from Yahoo Finance for '{symbol}'")
@@ -235,10 +230,23 @@ async def _fetch_yfinance_ohlcv(
             "open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum",
         }).dropna(subset=["open"])
 
-    _yf_cache.set(cache_key, df)
     return df
 
 
+def _fetch_tick_bars(symbol: str, period: str, bar_type: str, threshold: float) -> pd.DataFrame:
+    prefix = SYMBOL_PREFIX.get(symbol)
+    if not prefix:
+        raise ValueError(f"Tick bars need Databento tick data; no mapping for symbol '{symbol}'")
+
+    # Dollar bars measure contract notional
+    multiplier = get_contract_config(symbol)["point_value"]
+    bars = build_bars(prefix, bar_type, threshold, multiplier, DATA_DIR, TICK_STORE_DIR)
+    if bars.empty:
+        raise ValueError(f"No tick data for {symbol}")
+
+    return _trim_by_period(bars, period).rename_axis("timestamp")
+
+
 async def fetch_ohlcv(
     symbol: str,
     period: str = "1y",
@@ -254,7 +262,15 @@ async def fetch_ohlcv(
 
     Loads 1-minute data and resamples to the requested interval.
     Period parameter is used to trim the date range.
+
+    Activity bars from Databento ticks use "<type>:<threshold>" intervals
+    (tick, volume, dollar, range, renko — see data.bars), e.g. "volume:5000".
     """
+    bar_spec = parse_bar_interval(interval)
+    if bar_spec is not None:
+        # A cold build syncs the tick store and aggregates every segment
+        return await asyncio.to_thread(_fetch_tick_bars, symbol, period, *bar_spec)
+
     # Try Polygon for stock tickers or when explicitly requested
     if source == "polygon" or (source == "auto" and symbol not in SYMBOL_PREFIX):
         try:
@@ -274,16 +290,50 @@ async def fetch_ohlcv(
         return await _fetch_yfinance_ohlcv(symbol, period, interval)
 
     raw = _load_symbol_data(prefix)
-    trimmed = _trim_by_period(raw, period)
-
-    if trimmed.empty:
+    if raw.empty:
         raise ValueError(f"No data for {symbol} in period {period}")
 
+    # Serve the period from the 1-min bars or a materialized rollup; only the
+    # bucket the period start cuts through is resampled on the fly.
+    start = _period_start(raw, period)
     rule = RESAMPLE_MAP.get(interval, "1D")
-    result = _resample(trimmed, rule)
+    if rule in ROLLUP_RULES:
+        result = slice_rollup(raw, _load_rollup(prefix, rule), start, rule)
+    else:
+        result = _resample(_trim_by_period(raw, period), rule)
 
-    result.index.name = "timestamp"
-    return result
+    return result.rename_axis("timestamp")
+
+
+def _select_ticks(symbol: str, date: Optional[str], limit: int) -> pd.DataFrame:
+    prefix = SYMBOL_PREFIX.get(symbol)
+    if not prefix:
+        raise ValueError(f"No Databento data mapping for symbol '{symbol}'")
+
+    try:
+        # Day-partitioned store: only the requested day's (or the most
+        # recent) segments are mapped
+        if date:
+            filtered = read_day(prefix, date, DATA_DIR, TICK_STORE_DIR)
+        else:
+            filtered = read_tail(prefix, limit, DATA_DIR, TICK_STORE_DIR)
+    except OSError:
+        # The store could not be written (read-only checkout, full disk);
+        # a segment swapped by a concurrent sync is retried inside read_*
+        raw = _load_tick_data(prefix)
+        if raw.empty:
+            return raw
+        if date:
+            target = pd.Timestamp(date).tz_localize("UTC")
+            filtered = raw.loc[target:target + pd.Timedelta(days=1)]
+        else:
+            filtered = raw.tail(limit)
+
+    # Limit to prevent memory issues
+    if len(filtered) > limit:
+        filtered = filtered.tail(limit)
+
+    return filtered
 
 
 async def fetch_ticks(
@@ -296,35 +346,23 @@ async def fetch_ticks(
     Returns list of {time, price, size, side} dicts.
     If date is provided (YYYY-MM-DD), returns only ticks for that date.
     """
-    prefix = SYMBOL_PREFIX.get(symbol)
-    if not prefix:
-        raise ValueError(f"No Databento data mapping for symbol '{symbol}'")
+    return to_rows(await fetch_tick_columns(symbol, date, limit))
 
-    raw = _load_tick_data(prefix)
 
-    if raw.empty:
-        return []
-
-    if date:
-        # Filter to specific date
-        target = pd.Timestamp(date).tz_localize("UTC")
-        end_target = target + pd.Timedelta(days=1)
-        filtered = raw.loc[target:end_target]
-    else:
-        # Return most recent data
-        filtered = raw.tail(limit)
-
-    # Limit to prevent memory issues
-    if len(filtered) > limit:
-        filtered = filtered.tail(limit)
+async def fetch_tick_frame(
+    symbol: str,
+    date: Optional[str] = None,
+    limit: int = 50000,
+) -> pd.DataFrame:
+    """Same selection as fetch_ticks, as the underlying price/size/side frame."""
+    # May sync the tick store first, which parses new tick files
+    return await asyncio.to_thread(_select_ticks, symbol, date, limit)
 
-    ticks = []
-    for ts, row in filtered.iterrows():
-        ticks.append({
-            "time": ts.timestamp(),
-            "price": round(float(row["price"]), 2),
-            "size": int(row["size"]),
-            "side": str(row["side"]),
-        })
 
-    return ticks
+async def fetch_tick_columns(
+    symbol: str,
+    date: Optional[str] = None,
+    limit: int = 50000,
+) -> Dict[str, list]:
+    """Same selection as fetch_ticks, as {time: [...], price: [...], size: [...], side: [...]}."""
+    return tick_columns(await fetch_tick_frame(symbol, date, limit))
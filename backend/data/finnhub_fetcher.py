@@ -9,7 +9,8 @@ import os
 from datetime import datetime, timedelta
 from typing import Any
 
-import httpx
+from agent.resilience import CircuitOpenError
+from data.http_client import get_json
 
 _BASE = "https://finnhub.io/api/v1"
 
@@ -18,20 +19,22 @@ def _get_key() -> str | None:
     return os.environ.get("FINNHUB_API_KEY")
 
 
-def _request(endpoint: str, params: dict | None = None) -> dict | list | None:
+async def _request(endpoint: str, params: dict | None = None) -> dict | list | None:
+    """JSON for ``endpoint``, None on failure; CircuitOpenError propagates so
+    callers can fall back to another source."""
     key = _get_key()
     if not key:
         return None
     p = {"token": key, **(params or {})}
     try:
-        resp = httpx.get(f"{_BASE}/{endpoint}", params=p, timeout=10)
-        resp.raise_for_status()
-        return resp.json()
+        return await get_json(f"{_BASE}/{endpoint}", provider="finnhub", params=p)
+    except CircuitOpenError:
+        raise
     except Exception:
         return None
 
 
-def fetch_insider_sentiment(ticker: str) -> dict[str, Any]:
+async def fetch_insider_sentiment(ticker: str) -> dict[str, Any]:
     """Fetch insider transaction sentiment aggregated monthly.
 
     Returns monthly MSPR (Monthly Share Purchase Ratio) and change values.
@@ -39,7 +42,7 @@ def fetch_insider_sentiment(ticker: str) -> dict[str, Any]:
     if not _get_key():
         return {"ticker": ticker, "error": "FINNHUB_API_KEY not configured", "sentiment": []}
 
-    data = _request("stock/insider-sentiment", {"symbol": ticker, "from": "2024-01-01"})
+    data = await _request("stock/insider-sentiment", {"symbol": ticker, "from": "2024-01-01"})
     if not data or "data" not in data:
         return {"ticker": ticker, "sentiment": [], "error": "No insider sentiment data"}
 
@@ -60,7 +63,7 @@ def fetch_insider_sentiment(ticker: str) -> dict[str, Any]:
     }
 
 
-def fetch_earnings_calendar(ticker: str) -> dict[str, Any]:
+async def fetch_earnings_calendar(ticker: str) -> dict[str, Any]:
     """Fetch upcoming and recent earnings dates for a ticker.
 
     Returns expected EPS, actual EPS (if reported), revenue estimates.
@@ -72,7 +75,7 @@ def fetch_earnings_calendar(ticker: str) -> dict[str, Any]:
     from_date = (today - timedelta(days=90)).strftime("%Y-%m-%d")
     to_date = (today + timedelta(days=90)).strftime("%Y-%m-%d")
 
-    data = _request("calendar/earnings", {"symbol": ticker, "from": from_date, "to": to_date})
+    data = await _request("calendar/earnings", {"symbol": ticker, "from": from_date, "to": to_date})
     if not data or "earningsCalendar" not in data:
         return {"ticker": ticker, "earnings": []}
 
@@ -97,7 +100,7 @@ def fetch_earnings_calendar(ticker: str) -> dict[str, Any]:
     }
 
 
-def fetch_company_news(ticker: str, days: int = 7) -> dict[str, Any]:
+async def fetch_company_news(ticker: str, days: int = 7) -> dict[str, Any]:
     """Fetch recent company news articles from Finnhub.
 
     Returns headline, source, summary, sentiment, and URL.
@@ -109,7 +112,7 @@ def fetch_company_news(ticker: str, days: int = 7) -> dict[str, Any]:
     from_date = (today - timedelta(days=days)).strftime("%Y-%m-%d")
     to_date = today.strftime("%Y-%m-%d")
 
-    data = _request("company-news", {"symbol": ticker, "from": from_date, "to": to_date})
+    data = await _request("company-news", {"symbol": ticker, "from": from_date, "to": to_date})
     if not data or not isinstance(data, list):
         return {"ticker": ticker, "news": []}
 
@@ -5,10 +5,11 @@ Requires FRED_API_KEY environment variable (free at https://fred.stlouisfed.org/
 """
 from __future__ import annotations
 
+import asyncio
 import os
 from typing import Any
 
-import httpx
+from data.http_client import get_json
 
 _BASE = "https://api.stlouisfed.org/fred"
 
@@ -48,20 +49,18 @@ def _get_key() -> str | None:
     return os.environ.get("FRED_API_KEY")
 
 
-def _request(endpoint: str, params: dict | None = None) -> dict | None:
+async def _request(endpoint: str, params: dict | None = None) -> dict | None:
     key = _get_key()
     if not key:
         return None
     p = {"api_key": key, "file_type": "json", **(params or {})}
     try:
-        resp = httpx.get(f"{_BASE}/{endpoint}", params=p, timeout=10)
-        resp.raise_for_status()
-        return resp.json()
+        return await get_json(f"{_BASE}/{endpoint}", provider="fred", params=p)
     except Exception:
         return None
 
 
-def fetch_economic_indicator(series_id: str, limit: int = 24) -> dict[str, Any]:
+async def fetch_economic_indicator(series_id: str, limit: int = 24) -> dict[str, Any]:
     """Fetch an economic indicator time series from FRED.
 
     Args:
@@ -80,7 +79,7 @@ def fetch_economic_indicator(series_id: str, limit: int = 24) -> dict[str, Any]:
         resolved = meta["id"]
 
     # Get series info
-    info_data = _request("series", {"series_id": resolved})
+    info_data = await _request("series", {"series_id": resolved})
     series_info = {}
     if info_data and "seriess" in info_data and info_data["seriess"]:
         s = info_data["seriess"][0]
@@ -94,7 +93,7 @@ def fetch_economic_indicator(series_id: str, limit: int = 24) -> dict[str, Any]:
         }
 
     # Get observations
-    obs_data = _request("series/observations", {
+    obs_data = await _request("series/observations", {
         "series_id": resolved,
         "sort_order": "desc",
         "limit": limit,
@@ -122,7 +121,7 @@ def fetch_economic_indicator(series_id: str, limit: int = 24) -> dict[str, Any]:
     }
 
 
-def fetch_treasury_yields() -> dict[str, Any]:
+async def fetch_treasury_yields() -> dict[str, Any]:
     """Fetch current treasury yield curve data across all maturities.
 
     Returns the latest yield for each maturity (3M through 30Y),
@@ -131,13 +130,18 @@ def fetch_treasury_yields() -> dict[str, Any]:
     if not _get_key():
         return {"error": "FRED_API_KEY not configured"}
 
-    yields_data: dict[str, float | None] = {}
-    for label, series_id in TREASURY_SERIES.items():
-        obs = _request("series/observations", {
+    # All maturities requested concurrently over the shared client
+    responses = await asyncio.gather(*(
+        _request("series/observations", {
             "series_id": series_id,
             "sort_order": "desc",
             "limit": 1,
         })
+        for series_id in TREASURY_SERIES.values()
+    ))
+
+    yields_data: dict[str, float | None] = {}
+    for label, obs in zip(TREASURY_SERIES, responses):
         val = None
         date = None
         if obs and "observations" in obs and obs["observations"]:
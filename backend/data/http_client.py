@@ -0,0 +1,148 @@
+"""Shared async HTTP client for the data fetchers.
+
+The FRED, BLS, Finnhub, EDGAR, Kalshi and Polymarket fetchers used to open
+a fresh blocking ``httpx`` connection per call from inside async tool
+handlers. They now share one pooled ``httpx.AsyncClient`` per event loop
+(keep-alive, HTTP connection reuse) through ``request_json``, which adds:
+
+  - a per-host concurrency cap (``HOST_CONCURRENCY``), so a fan-out such
+    as the nine treasury series cannot exceed a provider's rate limit
+  - retry with exponential backoff + jitter on transport errors and
+    429/5xx responses (same policy as agent.resilience.retry_api_call)
+  - a per-provider agent.resilience.CircuitBreaker around the whole
+    retried call; only exhausted retries count as breaker failures, not
+    4xx answers such as an unknown ticker
+
+Errors are raised (``httpx.HTTPError`` or ``CircuitOpenError``); the
+fetchers decide how to surface them.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import weakref
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from agent.resilience import RETRYABLE_STATUS_CODES, CircuitBreaker, finnhub_breaker
+
+logger = logging.getLogger("afindr.http")
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_RETRIES = 2
+RETRY_BASE_DELAY = 0.5
+
+# Concurrent requests allowed per host (others wait for a slot)
+DEFAULT_HOST_CONCURRENCY = int(os.getenv("AFINDR_HTTP_HOST_CONCURRENCY", "8"))
+HOST_CONCURRENCY = {
+    "api.bls.gov": 2,
+    "finnhub.io": 4,       # free tier: 60 calls/min
+    "www.sec.gov": 4,      # SEC fair-access policy: 10 req/s
+    "data.sec.gov": 4,
+    "efts.sec.gov": 4,
+}
+
+_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30.0)
+_RETRY_STATUS = RETRYABLE_STATUS_CODES | {504}
+
+# Clients and host semaphores are bound to the loop that created them
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_host_slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+_breakers: Dict[str, CircuitBreaker] = {"finnhub": finnhub_breaker}
+
+
+def get_client() -> httpx.AsyncClient:
+    """The pooled client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = httpx.AsyncClient(limits=_LIMITS, timeout=DEFAULT_TIMEOUT)
+    return client
+
+
+async def aclose() -> None:
+    """Close the running loop's client (application shutdown)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def breaker_for(provider: str) -> CircuitBreaker:
+    if provider not in _breakers:
+        _breakers[provider] = CircuitBreaker(provider, failure_threshold=5, recovery_timeout=30.0)
+    return _breakers[provider]
+
+
+def _host_slot(host: str) -> asyncio.Semaphore:
+    slots = _host_slots.setdefault(asyncio.get_running_loop(), {})
+    if host not in slots:
+        slots[host] = asyncio.Semaphore(HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY))
+    return slots[host]
+
+
+async def _send(method: str, url: str, retries: int, base_delay: float, **kwargs) -> httpx.Response:
+    """Response for ``url``, retrying transport errors and retryable statuses."""
+    client = get_client()
+    slot = _host_slot(urlsplit(url).netloc)
+    for attempt in range(retries + 1):
+        try:
+            async with slot:
+                resp = await client.request(method, url, **kwargs)
+            if resp.status_code not in _RETRY_STATUS:
+                return resp
+            error: Exception = httpx.HTTPStatusError(
+                f"{resp.status_code} from {url}", request=resp.request, response=resp)
+        except httpx.TransportError as e:
+            error = e
+        if attempt == retries:
+            raise error
+        delay = base_delay * (2 ** attempt) + random.uniform(0, base_delay / 2)
+        logger.warning("Retrying %s %s in %.2fs: %s", method, url, delay, error)
+        await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+async def request(
+    method: str,
+    url: str,
+    *,
+    provider: str,
+    retries: int = DEFAULT_RETRIES,
+    base_delay: float = RETRY_BASE_DELAY,
+    **kwargs,
+) -> httpx.Response:
+    """Response to ``method url`` after retries, through the provider's breaker.
+
+    The status is not checked beyond retrying, so callers can handle e.g.
+    304 Not Modified. ``kwargs`` go to ``httpx.AsyncClient.request``.
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    return await breaker_for(provider).call(lambda: _send(method, url, retries, base_delay, **kwargs))
+
+
+async def request_json(
+    method: str,
+    url: str,
+    *,
+    provider: str,
+    params: Optional[dict] = None,
+    json: Any = None,
+    headers: Optional[dict] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    retries: int = DEFAULT_RETRIES,
+    base_delay: float = RETRY_BASE_DELAY,
+) -> Any:
+    """Decoded JSON body of ``method url``; raises on failure (see module docstring)."""
+    resp = await request(method, url, provider=provider, retries=retries, base_delay=base_delay,
+                         params=params, json=json, headers=headers, timeout=timeout)
+    resp.raise_for_status()
+    return resp.json()
+
+
+async def get_json(url: str, *, provider: str, **kwargs) -> Any:
+    return await request_json("GET", url, provider=provider, **kwargs)
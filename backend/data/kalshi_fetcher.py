@@ -8,28 +8,25 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import httpx
-
-from data.cache import TTLCache
+from data.cache import make_cache
+from data.http_client import get_json
 
 logger = logging.getLogger("afindr.kalshi")
 
 # 5-minute TTL cache for market searches
-_market_cache = TTLCache(default_ttl=300.0, max_size=100)
+_market_cache = make_cache("kalshi", default_ttl=300.0, max_size=100, stale_ttl=300.0)
 
 _BASE = "https://api.elections.kalshi.com/trade-api/v2"
 
 
-def _request(endpoint: str, params: dict | None = None) -> dict | None:
+async def _request(endpoint: str, params: dict | None = None) -> dict | None:
     try:
-        resp = httpx.get(
+        return await get_json(
             f"{_BASE}/{endpoint}",
+            provider="kalshi",
             params=params or {},
-            timeout=10,
             headers={"Accept": "application/json"},
         )
-        resp.raise_for_status()
-        return resp.json()
     except Exception as e:
         logger.warning(f"Kalshi API error: {e}")
         return None
@@ -77,13 +74,13 @@ def _parse_market(m: dict) -> dict[str, Any]:
     }
 
 
-def search_markets(query: str, limit: int = 10) -> list[dict[str, Any]]:
+async def search_markets(query: str, limit: int = 10) -> list[dict[str, Any]]:
     """Search Kalshi events matching a query, then return top markets."""
     cache_key = f"kalshi:{query.lower().strip()}:{limit}"
-    cached = _market_cache.get(cache_key)
-    if cached is not None:
-        return cached
+    return await _market_cache.get_or_load(cache_key, lambda: _search_events(query, limit))
+
 
+async def _search_events(query: str, limit: int) -> list[dict[str, Any]]:
     results = []
     query_lower = query.lower()
     query_words = [w for w in query_lower.split() if len(w) >= 3]
@@ -101,7 +98,7 @@ def search_markets(query: str, limit: int = 10) -> list[dict[str, Any]]:
         if cursor:
             params["cursor"] = cursor
 
-        data = _request("events", params)
+        data = await _request("events", params)
 
         if not data or "events" not in data:
             break
@@ -120,7 +117,6 @@ def search_markets(query: str, limit: int = 10) -> list[dict[str, Any]]:
             if any(w in searchable for w in query_words):
                 results.append(_parse_event(e))
                 if len(results) >= limit:
-                    _market_cache.set(cache_key, results[:limit])
                     return results[:limit]
 
         cursor = data.get("cursor")
@@ -129,14 +125,12 @@ def search_markets(query: str, limit: int = 10) -> list[dict[str, Any]]:
         pages_fetched += 1
 
     # If still no matches, return empty — don't return unrelated results
-    final = results[:limit]
-    _market_cache.set(cache_key, final)
-    return final
+    return results[:limit]
 
 
-def get_market(ticker: str) -> dict[str, Any] | None:
+async def get_market(ticker: str) -> dict[str, Any] | None:
     """Fetch a single Kalshi market by its ticker."""
-    data = _request(f"markets/{ticker}")
+    data = await _request(f"markets/{ticker}")
 
     if not data or "market" not in data:
         return None
@@ -1,18 +1,41 @@
 """RSS news aggregator for financial news feeds.
 
-Fetches and normalizes news from multiple RSS sources with in-memory caching.
+Fetches and normalizes news from multiple RSS sources.
+
+A background task (``start_refresher``, run by the app) polls every feed
+each ``POLL_INTERVAL`` seconds over the shared HTTP client with conditional
+GETs (ETag / Last-Modified), so unchanged feeds cost a 304 and no parsing.
+Each feed's latest items are kept per feed; after a poll they are merged
+into one snapshot, deduplicated by title and sorted newest first by
+publish time. ``fetch_all_news`` only filters that snapshot.
+
+Feed state (validators + items) goes through the ``feeds`` cache, so with
+the shared cache backend a worker skips feeds another worker polled within
+the interval.
+
+Every polled article is also written to the local full-text index
+(``data.news_index``); ``search_news`` answers from it and only asks Google
+News when the index has too few matches.
 """
 from __future__ import annotations
 
+import asyncio
+import calendar
+import logging
+import os
 import re
-import time
 import hashlib
-import concurrent.futures
-from typing import Optional, List, Dict
-from datetime import datetime, timezone
+import time
+from typing import Any, Optional, List, Dict
 
 import feedparser
 
+from data import http_client
+from data.cache import make_cache
+from data.news_index import get_news_index
+
+logger = logging.getLogger("afindr.news")
+
 # ─── RSS Feed Sources ───
 
 RSS_FEEDS: Dict[str, Dict] = {
@@ -99,18 +122,24 @@ SOURCE_COLORS = {
 
 # ─── Cache ───
 
-_feed_cache: Dict[str, Dict] = {}
-CACHE_TTL = 300  # 5 minutes
+POLL_INTERVAL = float(os.getenv("AFINDR_NEWS_POLL_S", "120"))
+# A feed that fails to refresh keeps serving its last items for up to a day
+STALE_TTL = 86_400
 
+# feed id -> {"etag", "modified", "polled_at", "items": [[published, item], ...]}
+_feed_cache = make_cache("feeds", default_ttl=STALE_TTL, max_size=100)
 
-def _cache_key(feed_id: str) -> str:
-    return f"feed:{feed_id}"
+
+# Google News answers per query, for searches the index could not serve
+_search_cache = make_cache("news_search", default_ttl=POLL_INTERVAL, max_size=200)
+
+# A search answered by fewer local matches than this (or than ``limit``) is a
+# cold miss and goes to Google News
+MIN_INDEX_HITS = int(os.getenv("AFINDR_NEWS_MIN_INDEX_HITS", "3"))
 
 
-def _is_cache_fresh(key: str) -> bool:
-    if key not in _feed_cache:
-        return False
-    return time.time() - _feed_cache[key]["timestamp"] < CACHE_TTL
+def _cache_key(feed_id: str) -> str:
+    return f"feed:{feed_id}"
 
 
 # ─── Parsing ───
@@ -144,24 +173,34 @@ def _detect_category(title: str, summary: str, default: str) -> str:
     return default
 
 
-def _parse_published(entry) -> str:
-    """Parse published date from feed entry."""
+def _published_ts(entry) -> Optional[float]:
+    """Publish time of a feed entry as epoch seconds (UTC), if it has one."""
     published = entry.get("published_parsed") or entry.get("updated_parsed")
     if published:
         try:
-            dt = datetime(*published[:6], tzinfo=timezone.utc)
-            delta = datetime.now(timezone.utc) - dt
-            hours = int(delta.total_seconds() / 3600)
-            if hours < 1:
-                mins = int(delta.total_seconds() / 60)
-                return f"{mins}m ago" if mins > 0 else "Just now"
-            if hours < 24:
-                return f"{hours}h ago"
-            days = hours // 24
-            return f"{days}d ago"
+            return float(calendar.timegm(published[:6] + (0, 0, 0)))
         except Exception:
             pass
-    return "Recent"
+    return None
+
+
+def _relative_time(published: Optional[float], now: float) -> str:
+    if published is None:
+        return "Recent"
+    seconds = now - published
+    hours = int(seconds / 3600)
+    if hours < 1:
+        mins = int(seconds / 60)
+        return f"{mins}m ago" if mins > 0 else "Just now"
+    if hours < 24:
+        return f"{hours}h ago"
+    days = hours // 24
+    return f"{days}d ago"
+
+
+def _parse_published(entry) -> str:
+    """Parse published date from feed entry."""
+    return _relative_time(_published_ts(entry), time.time())
 
 
 def _entry_to_news_item(entry, source: str, default_category: str) -> Dict:
@@ -201,104 +240,243 @@ def _entry_to_news_item(entry, source: str, default_category: str) -> Dict:
     return item
 
 
-# ─── Public API ───
+# ─── Feed polling ───
 
-def fetch_feed(feed_id: str) -> List[Dict]:
-    """Fetch and parse a single RSS feed."""
-    cache_key = _cache_key(feed_id)
-    if _is_cache_fresh(cache_key):
-        return _feed_cache[cache_key]["data"]
+# Merged, deduplicated, newest-first items from the last poll
+_snapshot: List[Dict] = []
+_snapshot_at: float = 0.0
+_refresh_task: Optional[asyncio.Task] = None
+_poll_task: Optional[asyncio.Task] = None
 
-    feed_config = RSS_FEEDS.get(feed_id)
-    if not feed_config:
-        return []
 
+def _parse_feed(body: bytes, feed_config: Dict) -> List[List[Any]]:
+    parsed = feedparser.parse(body)
+    items = []
+    for entry in parsed.entries[:20]:
+        item = _entry_to_news_item(entry, feed_config["source"], feed_config["category"])
+        if item["title"]:  # Skip empty titles
+            items.append([_published_ts(entry), item])
+    return items
+
+
+def _index_items(items: List[List[Any]]) -> None:
+    """Add ``[published, item]`` pairs to the full-text index."""
+    try:
+        get_news_index().add(
+            (published, item, _extract_tickers(item["title"] + " " + item["summary"]))
+            for published, item in items
+        )
+    except Exception as e:
+        logger.warning("News indexing failed: %s", e)
+
+
+def _parse_and_index(body: bytes, feed_config: Dict) -> List[List[Any]]:
+    """Parse a feed body and index its items (blocking; run in a worker thread)."""
+    items = _parse_feed(body, feed_config)
+    _index_items(items)
+    return items
+
+
+async def _poll_feed(feed_id: str) -> Optional[Dict]:
+    """Current state of one feed, re-downloaded only if it changed upstream."""
+    feed_config = RSS_FEEDS[feed_id]
+    key = _cache_key(feed_id)
+    state = _feed_cache.get(key)
+    if state is not None and time.time() - state["polled_at"] < POLL_INTERVAL:
+        return state
+
+    headers = {}
+    if state is not None:
+        if state.get("etag"):
+            headers["If-None-Match"] = state["etag"]
+        if state.get("modified"):
+            headers["If-Modified-Since"] = state["modified"]
     try:
-        parsed = feedparser.parse(feed_config["url"])
-        items = []
-        for entry in parsed.entries[:20]:
-            item = _entry_to_news_item(entry, feed_config["source"], feed_config["category"])
-            if item["title"]:  # Skip empty titles
-                items.append(item)
-
-        _feed_cache[cache_key] = {"data": items, "timestamp": time.time()}
-        return items
-    except Exception:
-        # Return cached data if available, even if stale
-        if cache_key in _feed_cache:
-            return _feed_cache[cache_key]["data"]
+        resp = await http_client.request(
+            "GET", feed_config["url"], provider=f"rss:{feed_id}", headers=headers,
+            follow_redirects=True, retries=1)
+        if resp.status_code == 304 and state is not None:
+            state = {**state, "polled_at": time.time()}
+        else:
+            resp.raise_for_status()
+            state = {
+                "etag": resp.headers.get("ETag"),
+                "modified": resp.headers.get("Last-Modified"),
+                "polled_at": time.time(),
+                "items": await asyncio.to_thread(_parse_and_index, resp.content, feed_config),
+            }
+    except Exception as e:
+        # Keep serving the last items; retried on the next poll
+        logger.warning("News feed %s failed: %s", feed_id, e)
+        return state
+    _feed_cache.set(key, state)
+    return state
+
+
+def _build_snapshot(states: List[Optional[Dict]], now: float) -> List[Dict]:
+    """Merge feeds in RSS_FEEDS order, dedupe by title, sort newest first (undated last)."""
+    merged = []
+    seen_titles = set()
+    for state in states:
+        for published, item in (state or {}).get("items", []):
+            title_key = item["title"].lower()[:60]
+            if title_key in seen_titles:
+                continue
+            seen_titles.add(title_key)
+            merged.append((published, item))
+    merged.sort(key=lambda pair: -pair[0] if pair[0] is not None else float("inf"))
+    return [{**item, "time": _relative_time(published, now)} for published, item in merged]
+
+
+async def refresh_feeds() -> List[Dict]:
+    """Poll every feed once and rebuild the snapshot (concurrent callers share one poll)."""
+    global _refresh_task
+    loop = asyncio.get_running_loop()
+    if _refresh_task is None or _refresh_task.done() or _refresh_task.get_loop() is not loop:
+        _refresh_task = loop.create_task(_refresh())
+    return await asyncio.shield(_refresh_task)
+
+
+async def _refresh() -> List[Dict]:
+    global _snapshot, _snapshot_at
+    states = await asyncio.gather(*(_poll_feed(feed_id) for feed_id in RSS_FEEDS))
+    _snapshot_at = time.time()
+    _snapshot = _build_snapshot(states, _snapshot_at)
+    return _snapshot
+
+
+async def _poll_forever() -> None:
+    while True:
+        try:
+            await refresh_feeds()
+        except Exception as e:
+            logger.warning("News refresh failed: %s", e)
+        await asyncio.sleep(POLL_INTERVAL)
+
+
+async def start_refresher() -> None:
+    """Start the background poller on the running loop (app startup)."""
+    global _poll_task
+    if _poll_task is None or _poll_task.done():
+        _poll_task = asyncio.get_running_loop().create_task(_poll_forever())
+
+
+async def stop_refresher() -> None:
+    global _poll_task
+    if _poll_task is not None:
+        _poll_task.cancel()
+        try:
+            await _poll_task
+        except asyncio.CancelledError:
+            pass
+        _poll_task = None
+
+
+# ─── Public API ───
+
+async def fetch_feed(feed_id: str) -> List[Dict]:
+    """Items of a single RSS feed."""
+    if feed_id not in RSS_FEEDS:
         return []
+    state = await _poll_feed(feed_id)
+    now = time.time()
+    return [{**item, "time": _relative_time(published, now)}
+            for published, item in (state or {}).get("items", [])]
 
 
-def fetch_all_news(
+async def fetch_all_news(
     category: Optional[str] = None,
     ticker: Optional[str] = None,
     source: Optional[str] = None,
     limit: int = 50,
 ) -> List[Dict]:
-    """Fetch news from all RSS feeds, with optional filtering."""
-    all_items = []
-    seen_titles = set()
-
-    feed_ids = list(RSS_FEEDS.keys())
-    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-        results = list(executor.map(fetch_feed, feed_ids))
+    """News from all RSS feeds, newest first, with optional filtering.
 
-    for items in results:
-        for item in items:
-            title_key = item["title"].lower()[:60]
-            if title_key in seen_titles:
-                continue
-            seen_titles.add(title_key)
-            all_items.append(item)
+    Reads the refresher's snapshot; polls inline only when there is no
+    snapshot yet or it is older than the poll interval (refresher not running).
+    """
+    items = _snapshot
+    if not _snapshot_at or time.time() - _snapshot_at > POLL_INTERVAL * 2:
+        items = await refresh_feeds()
 
-    # Apply filters
     if category and category != "All":
-        all_items = [i for i in all_items if i["category"] == category]
+        items = [i for i in items if i["category"] == category]
 
     if ticker:
         ticker_upper = ticker.upper()
-        all_items = [i for i in all_items if i.get("ticker", "").upper() == ticker_upper]
+        items = [i for i in items if i.get("ticker", "").upper() == ticker_upper]
 
     if source:
-        all_items = [i for i in all_items if i["source"].lower() == source.lower()]
-
-    # Sort by time (most recent first — "Just now" and "Xm ago" come first)
-    def sort_key(item):
-        t = item.get("time", "")
-        if t == "Just now":
-            return 0
-        if t.endswith("m ago"):
-            return int(t.replace("m ago", ""))
-        if t.endswith("h ago"):
-            return int(t.replace("h ago", "")) * 60
-        if t.endswith("d ago"):
-            return int(t.replace("d ago", "")) * 1440
-        return 99999
-
-    all_items.sort(key=sort_key)
-    return all_items[:limit]
-
-
-def fetch_google_news_rss(query: str, limit: int = 15) -> List[Dict]:
-    """Fetch news from Google News RSS for any search query.
+        source_lower = source.lower()
+        items = [i for i in items if i["source"].lower() == source_lower]
 
-    Works for topics ("tariffs", "OPEC"), tickers ("AAPL stock"), or general queries.
-    """
+    return items[:limit]
+
+
+def _google_news_url(query: str) -> str:
     from urllib.parse import quote_plus
+    return f"https://news.google.com/rss/search?q={quote_plus(query)}&hl=en-US&gl=US&ceid=US:en"
 
-    url = f"https://news.google.com/rss/search?q={quote_plus(query)}&hl=en-US&gl=US&ceid=US:en"
 
+_GOOGLE_NEWS_FEED = {"source": "Google News", "category": "Markets"}
+
+
+async def _load_google_news(query: str) -> List[List[Any]]:
+    resp = await http_client.request(
+        "GET", _google_news_url(query), provider="google_news", follow_redirects=True, retries=1)
+    resp.raise_for_status()
+    return await asyncio.to_thread(_parse_and_index, resp.content, _GOOGLE_NEWS_FEED)
+
+
+async def search_news(
+    query: str,
+    limit: int = 10,
+    days: Optional[float] = None,
+    ticker: Optional[str] = None,
+    category: Optional[str] = None,
+) -> List[Dict]:
+    """Articles matching ``query``, best match first, from the local index.
+
+    Falls back to Google News (whose results are indexed too) when the index
+    has fewer than ``min(limit, MIN_INDEX_HITS)`` matches in the window.
+    """
+    since = time.time() - days * 86_400 if days else None
+    # SQLite may wait on another worker's write lock; keep that off the event loop
+    hits = await asyncio.to_thread(
+        lambda: get_news_index().search(query, ticker=ticker, category=category, since=since, limit=limit))
+    if len(hits) < min(limit, MIN_INDEX_HITS):
+        try:
+            remote = await _search_cache.get_or_load(query.lower().strip(), lambda: _load_google_news(query))
+        except Exception as e:
+            logger.warning("Google News search for %r failed: %s", query, e)
+            remote = []
+        seen = {item["id"] for _, item in hits}
+        for published, item in remote:
+            if since is not None and published is not None and published < since:
+                continue
+            if category and category != "All" and item["category"] != category:
+                continue
+            if ticker and ticker.upper() not in _extract_tickers(item["title"] + " " + item["summary"]):
+                continue
+            if item["id"] not in seen:
+                seen.add(item["id"])
+                hits.append((published, item))
+    now = time.time()
+    return [{**item, "time": _relative_time(published, now)} for published, item in hits[:limit]]
+
+
+async def fetch_google_news_rss(query: str, limit: int = 15) -> List[Dict]:
+    """Fetch news from Google News RSS for any search query.
+
+    Works for topics ("tariffs", "OPEC"), tickers ("AAPL stock"), or general queries.
+    Shares search_news' cache, and the results are indexed too.
+    """
     try:
-        parsed = feedparser.parse(url)
-        items = []
-        for entry in parsed.entries[:limit]:
-            item = _entry_to_news_item(entry, "Google News", "Markets")
-            if item["title"]:
-                items.append(item)
-        return items
-    except Exception:
+        items = await _search_cache.get_or_load(query.lower().strip(), lambda: _load_google_news(query))
+    except Exception as e:
+        logger.warning("Google News search for %r failed: %s", query, e)
         return []
+    return [item for _, item in items[:limit]]
 
 
 def get_available_sources() -> List[Dict]:
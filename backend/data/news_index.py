@@ -0,0 +1,242 @@
+"""Local full-text index of every news article the fetchers have seen.
+
+``search_news`` used to send each query to Google News. Articles from the
+RSS poller (and from Google News answers) are now written to a SQLite
+database with an FTS5 index, so most searches are answered locally in a
+few milliseconds:
+
+    articles(rowid, id, published, source, category, item)   -- item = JSON
+    articles_fts(title, summary, tickers)                    -- FTS5, rowid = articles.rowid
+    article_tickers(ticker, published, article)              -- ticker -> articles
+
+Queries are ranked by BM25 (title weighted over summary) with a small
+penalty per day of age, and can be filtered by ticker, category, source
+and publish-time range. Undated articles are filed under the time they
+were first seen.
+
+The index is bounded by a retention window (``AFINDR_NEWS_RETENTION_DAYS``,
+default 30) and a row cap (``AFINDR_NEWS_INDEX_MAX``); older articles are
+purged every few inserts. It lives next to the shared fetcher cache
+(``AFINDR_NEWS_INDEX_PATH``) and is WAL-mode, so every worker on the host
+reads and feeds the same index.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+NEWS_INDEX_PATH = os.getenv(
+    "AFINDR_NEWS_INDEX_PATH", os.path.join(os.path.dirname(__file__), ".cache", "news_index.sqlite"))
+RETENTION_DAYS = float(os.getenv("AFINDR_NEWS_RETENTION_DAYS", "30"))
+MAX_ARTICLES = int(os.getenv("AFINDR_NEWS_INDEX_MAX", "50000"))
+
+# Purge articles past retention once per this many inserts
+_PURGE_EVERY = 256
+
+# bm25 column weights (title, summary, tickers) and rank penalty per day of age
+_BM25_WEIGHTS = (10.0, 3.0, 5.0)
+_AGE_PENALTY_PER_DAY = 0.1
+
+# Query words that never narrow a news search
+_STOPWORDS = {
+    "a", "an", "and", "about", "for", "in", "is", "latest", "news", "of", "on",
+    "or", "recent", "the", "to", "today", "what", "with",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    published REAL NOT NULL,
+    source TEXT NOT NULL,
+    category TEXT NOT NULL,
+    item TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_published ON articles (published);
+CREATE TABLE IF NOT EXISTS article_tickers (
+    ticker TEXT NOT NULL,
+    published REAL NOT NULL,
+    article INTEGER NOT NULL,
+    PRIMARY KEY (ticker, published, article)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, summary, tickers, tokenize = 'porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS articles_delete AFTER DELETE ON articles BEGIN
+    DELETE FROM articles_fts WHERE rowid = old.rowid;
+    DELETE FROM article_tickers WHERE ticker IN (
+        SELECT value FROM json_each(json_extract(old.item, '$.tickers'))
+    ) AND published = old.published AND article = old.rowid;
+END;
+"""
+
+
+def match_expression(query: str) -> Optional[str]:
+    """FTS5 MATCH expression requiring every meaningful word of ``query``."""
+    words = [w for w in re.findall(r"\w+", query.lower()) if w not in _STOPWORDS]
+    if not words:
+        return None
+    return " ".join(f'"{w}"' for w in dict.fromkeys(words))
+
+
+class NewsIndex:
+    """Full-text article index in a SQLite database shared by the workers."""
+
+    def __init__(
+        self,
+        path: str = NEWS_INDEX_PATH,
+        retention_days: float = RETENTION_DAYS,
+        max_articles: int = MAX_ARTICLES,
+    ):
+        self._path = path
+        self._retention = retention_days * 86_400
+        self._max_articles = max_articles
+        self._local = threading.local()
+        self._inserts = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    def add(self, articles: Iterable[Tuple[Optional[float], Dict, Sequence[str]]]) -> int:
+        """Index ``(published, item, tickers)`` triples; returns how many were new.
+
+        Articles are keyed by ``item["id"]``, so re-polled or duplicate
+        headlines are skipped. Articles already past retention are ignored.
+        """
+        now = time.time()
+        cutoff = now - self._retention
+        added = 0
+        conn = self._conn()
+        with conn:
+            for published, item, tickers in articles:
+                published = now if published is None else published
+                if published < cutoff:
+                    continue
+                tickers = list(dict.fromkeys(t.upper() for t in tickers))
+                row = conn.execute(
+                    "INSERT INTO articles (id, published, source, category, item) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (id) DO NOTHING RETURNING rowid",
+                    (item["id"], published, item["source"], item["category"],
+                     json.dumps({**item, "tickers": tickers}, separators=(",", ":"))),
+                ).fetchone()
+                if row is None:
+                    continue
+                rowid = row[0]
+                conn.execute(
+                    "INSERT INTO articles_fts (rowid, title, summary, tickers) VALUES (?, ?, ?, ?)",
+                    (rowid, item["title"], item.get("summary", ""), " ".join(tickers)),
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO article_tickers VALUES (?, ?, ?)",
+                    [(t, published, rowid) for t in tickers],
+                )
+                added += 1
+        self._inserts += added
+        if added and self._inserts >= _PURGE_EVERY:
+            self._inserts = 0
+            self.purge()
+        return added
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        *,
+        ticker: Optional[str] = None,
+        category: Optional[str] = None,
+        source: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 20,
+    ) -> List[Tuple[float, Dict]]:
+        """``(published, item)`` pairs matching every filter, best match first.
+
+        Without a text query (or one made only of stopwords) the newest
+        matching articles come first.
+        """
+        match = match_expression(query) if query else None
+        where: List[str] = []
+        params: List[Any] = []
+        if match is not None:
+            sql = ("SELECT a.published, a.item FROM articles_fts f JOIN articles a ON a.rowid = f.rowid")
+            where.append("articles_fts MATCH ?")
+            params.append(match)
+        else:
+            sql = "SELECT a.published, a.item FROM articles a"
+        if ticker:
+            where.append("a.rowid IN (SELECT article FROM article_tickers WHERE ticker = ?)")
+            params.append(ticker.upper())
+        if category and category != "All":
+            where.append("a.category = ?")
+            params.append(category)
+        if source:
+            where.append("a.source = ? COLLATE NOCASE")
+            params.append(source)
+        if since is not None:
+            where.append("a.published >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("a.published <= ?")
+            params.append(until)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if match is not None:
+            weights = ", ".join(str(w) for w in _BM25_WEIGHTS)
+            sql += f" ORDER BY bm25(articles_fts, {weights}) + (? - a.published) * ? LIMIT ?"
+            params += [time.time(), _AGE_PENALTY_PER_DAY / 86_400, limit]
+        else:
+            sql += " ORDER BY a.published DESC LIMIT ?"
+            params.append(limit)
+        try:
+            rows = self._conn().execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            # e.g. a query word FTS5 cannot parse; treat as no local match
+            return []
+        return [(published, json.loads(item)) for published, item in rows]
+
+    def purge(self) -> int:
+        """Drop articles past retention, then the oldest over ``max_articles``."""
+        conn = self._conn()
+        with conn:
+            removed = conn.execute(
+                "DELETE FROM articles WHERE published < ?", (time.time() - self._retention,)).rowcount
+            removed += conn.execute(
+                "DELETE FROM articles WHERE rowid IN ("
+                "SELECT rowid FROM articles ORDER BY published DESC LIMIT -1 OFFSET ?)",
+                (self._max_articles,),
+            ).rowcount
+        return max(removed, 0)
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._conn() as conn:
+            conn.execute("DELETE FROM articles")
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread, reopened in forked workers
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self._path, timeout=30.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+
+_index: Optional[NewsIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_news_index() -> NewsIndex:
+    """The process-wide index at ``NEWS_INDEX_PATH`` (opened on first use)."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = NewsIndex()
+    return _index
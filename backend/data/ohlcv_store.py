@@ -0,0 +1,383 @@
+"""Columnar on-disk store for Databento 1-min OHLCV bars.
+
+Parsing the CSVs with date handling costs every process that touches a
+symbol. This module converts them once into raw ``.npy`` column files
+(timestamps as int64 plus one file per OHLCV column) that are opened
+with ``mmap_mode="r"``: loading is a handful of ``mmap`` calls and the
+pages are shared by every worker through the OS page cache.
+
+Layout under ``STORE_DIR``::
+
+    nq.json                  manifest: current generation + source files
+    nq-<generation>/ts.npy   int64 timestamps (unit in manifest)
+    nq-<generation>/open.npy ... volume.npy
+    nq-<generation>/rollup_5min/ts.npy ...   materialized resample, same layout
+
+A rebuild writes a new generation directory and then swaps the manifest
+with ``os.replace``, so concurrent readers never see a half-written
+store. Rebuilds of one symbol are serialized by an ``fcntl.flock`` on
+``.<prefix>.lock``; a worker that waited on the lock re-reads the
+manifest and reuses what the winner published. When only new CSV files appear, just those are parsed and merged
+into the existing columns.
+
+Rollups for ``ROLLUP_RULES`` are built lazily on first request and live
+in the generation directory. When bars are appended, every rollup that
+already exists is carried into the new generation with only its tail
+buckets recomputed.
+
+Usage (from backend/):
+    python -m data.ohlcv_store [nq es gc cl]
+"""
+from __future__ import annotations
+
+import contextlib
+import glob
+import json
+import os
+import shutil
+import sys
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "databento")
+STORE_DIR = os.path.join(DATA_DIR, ".store")
+
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+COLUMNS = PRICE_COLUMNS + ["volume"]
+
+# Bump when the on-disk layout changes; older stores are rebuilt.
+STORE_VERSION = 1
+
+# Resample rules materialized as rollups (fetcher.RESAMPLE_MAP minus 1min)
+ROLLUP_RULES = ["3min", "5min", "15min", "30min", "1h", "4h", "1D", "1W"]
+
+# Left-closed, left-labelled buckets of fixed length; the rest (1W) are
+# located through pandas' own resample binning
+_FIXED_SPANS = {rule: pd.Timedelta(rule) for rule in ROLLUP_RULES if rule != "1W"}
+
+# Longer than any rollup bucket; bounds the 1-min window recomputed around a cut
+_MAX_BUCKET = pd.Timedelta(days=8)
+
+_OHLCV_AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+
+def source_files(prefix: str, data_dir: str = DATA_DIR) -> List[str]:
+    return sorted(glob.glob(os.path.join(data_dir, f"{prefix}_*_1min.csv")))
+
+
+def fingerprint(path: str) -> Dict:
+    """Name/size/mtime of a source file, used to detect changed inputs."""
+    st = os.stat(path)
+    return {"name": os.path.basename(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def read_csv_files(files: List[str]) -> pd.DataFrame:
+    """Parse and clean Databento 1-min CSVs into an OHLCV frame indexed by ts_event."""
+    frames = []
+    for f in files:
+        df = pd.read_csv(
+            f,
+            parse_dates=["ts_event"],
+            usecols=["ts_event", "open", "high", "low", "close", "volume"],
+        )
+        frames.append(df)
+
+    combined = pd.concat(frames, ignore_index=True)
+    combined = combined.sort_values("ts_event", kind="stable").drop_duplicates(subset=["ts_event"])
+    combined = combined.set_index("ts_event")
+
+    for col in PRICE_COLUMNS:
+        combined[col] = pd.to_numeric(combined[col], errors="coerce")
+    combined["volume"] = pd.to_numeric(combined["volume"], errors="coerce").fillna(0).astype(int)
+    combined = combined.dropna(subset=PRICE_COLUMNS)
+    return combined
+
+
+def _read_manifest(prefix: str, store_dir: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(store_dir, f"{prefix}.json")) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != STORE_VERSION:
+        return None
+    return manifest
+
+
+def _save_frame(path: str, df: pd.DataFrame) -> Dict:
+    """Write ``df`` as .npy columns under ``path``; returns its index unit/tz."""
+    os.mkdir(path)
+    tz = df.index.tz
+    naive = df.index.tz_convert("UTC").tz_localize(None) if tz is not None else df.index
+    np.save(os.path.join(path, "ts.npy"), naive.asi8)
+    for col in COLUMNS:
+        np.save(os.path.join(path, f"{col}.npy"), np.ascontiguousarray(df[col].to_numpy()))
+    return {"unit": np.datetime_data(naive.dtype)[0], "tz": str(tz) if tz is not None else None}
+
+
+def _load_frame(path: str, unit: str, tz: Optional[str], name: Optional[str]) -> pd.DataFrame:
+    # Timestamps are stored as UTC epoch ticks in the manifest's unit
+    ts = np.asarray(np.load(os.path.join(path, "ts.npy"), mmap_mode="r"))
+    index = pd.DatetimeIndex(ts.view(f"M8[{unit}]"), name=name)
+    if tz:
+        index = index.tz_localize("UTC").tz_convert(tz)
+    # Plain ndarray views over the maps; copy=False keeps each column backed
+    # by its read-only memory map
+    columns = {
+        col: np.asarray(np.load(os.path.join(path, f"{col}.npy"), mmap_mode="r"))
+        for col in COLUMNS
+    }
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def _generation_path(prefix: str, manifest: Dict, store_dir: str) -> str:
+    return os.path.join(store_dir, f"{prefix}-{manifest['generation']}")
+
+
+def _open_columns(prefix: str, manifest: Dict, store_dir: str) -> pd.DataFrame:
+    return _load_frame(_generation_path(prefix, manifest, store_dir),
+                       manifest["unit"], manifest["tz"], "ts_event")
+
+
+def _open_rollup(prefix: str, manifest: Dict, rule: str, store_dir: str) -> Optional[pd.DataFrame]:
+    path = os.path.join(_generation_path(prefix, manifest, store_dir), f"rollup_{rule}")
+    if not os.path.isdir(path):
+        return None
+    return _load_frame(path, manifest["unit"], manifest["tz"], "ts_event")
+
+
+def _save_rollup(gen_path: str, rule: str, rollup: pd.DataFrame) -> None:
+    # Build beside the final name and rename into place; if another worker
+    # got there first its copy is identical, so ours is dropped. A generation
+    # that was already removed is not recreated (``_save_frame`` uses mkdir).
+    tmp = os.path.join(gen_path, f".rollup_{rule}.{uuid.uuid4().hex[:12]}")
+    try:
+        _save_frame(tmp, rollup)
+        os.rename(tmp, os.path.join(gen_path, f"rollup_{rule}"))
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _write_generation(
+    prefix: str,
+    df: pd.DataFrame,
+    files: List[str],
+    store_dir: str,
+    rollups: Optional[Dict[str, pd.DataFrame]] = None,
+) -> Dict:
+    generation = uuid.uuid4().hex[:12]
+    path = os.path.join(store_dir, f"{prefix}-{generation}")
+    index_info = _save_frame(path, df)
+    for rule, rollup in (rollups or {}).items():
+        _save_rollup(path, rule, rollup)
+
+    manifest = {
+        "version": STORE_VERSION,
+        "generation": generation,
+        **index_info,
+        "rows": len(df),
+        "files": [fingerprint(f) for f in files],
+    }
+    tmp = os.path.join(store_dir, f".{prefix}.json.{generation}")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, os.path.join(store_dir, f"{prefix}.json"))
+    return manifest
+
+
+def _remove_stale(prefix: str, keep: str, store_dir: str) -> None:
+    # Readers that already mapped an old generation keep their pages (POSIX
+    # unlink semantics); new readers follow the manifest. Another process may
+    # have published after us, so its generation is kept too.
+    current = _read_manifest(prefix, store_dir)
+    keep_dirs = {f"{prefix}-{keep}"}
+    if current is not None:
+        keep_dirs.add(f"{prefix}-{current['generation']}")
+    for path in glob.glob(os.path.join(store_dir, f"{prefix}-*")):
+        if os.path.basename(path) not in keep_dirs:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def build_lock(prefix: str, store_dir: str):
+    """Hold the exclusive rebuild lock for ``prefix`` under ``store_dir``.
+
+    ``flock`` locks belong to the open file, so this serializes threads of
+    one process as well as separate worker processes.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    handle = open(os.path.join(store_dir, f".{prefix}.lock"), "a")
+    try:
+        if HAS_FCNTL:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        yield
+    finally:
+        handle.close()
+
+
+def sync_store(prefix: str, data_dir: str = DATA_DIR, store_dir: str = STORE_DIR) -> Dict:
+    """Bring the store for ``prefix`` up to date with its CSV files.
+
+    Unchanged sources are a no-op. If existing files are untouched and new
+    ones were added, only the new files are parsed and merged in; any other
+    change (a file edited or removed) rebuilds from scratch.
+
+    Returns the current manifest.
+    """
+    files = source_files(prefix, data_dir)
+    if not files:
+        raise ValueError(f"No Databento data found for prefix '{prefix}' in {data_dir}")
+
+    current = {os.path.basename(f): fingerprint(f) for f in files}
+    manifest = _read_manifest(prefix, store_dir)
+    if manifest is not None and {entry["name"]: entry for entry in manifest["files"]} == current:
+        return manifest
+    with build_lock(prefix, store_dir):
+        return _rebuild(prefix, files, current, store_dir)
+
+
+def _rebuild(prefix: str, files: List[str], current: Dict[str, Dict], store_dir: str) -> Dict:
+    # Caller holds build_lock; the manifest may have been published while it waited
+    manifest = _read_manifest(prefix, store_dir)
+    if manifest is not None:
+        stored = {entry["name"]: entry for entry in manifest["files"]}
+        if stored == current:
+            return manifest
+        if all(current.get(name) == entry for name, entry in stored.items()):
+            new_files = [f for f in files if os.path.basename(f) not in stored]
+            existing = _open_columns(prefix, manifest, store_dir)
+            merged = pd.concat([existing, read_csv_files(new_files)])
+            # Stable sort keeps already-stored bars ahead of duplicates from new files
+            merged = merged.sort_index(kind="stable")
+            merged = merged[~merged.index.duplicated(keep="first")]
+
+            added = merged.index.difference(existing.index)
+            rollups = {}
+            for rule in ROLLUP_RULES:
+                rollup = _open_rollup(prefix, manifest, rule, store_dir)
+                if rollup is not None:
+                    rollups[rule] = rollup if added.empty else update_rollup(rollup, merged, added[0], rule)
+            return _publish(prefix, merged, files, store_dir, rollups)
+
+    return _publish(prefix, read_csv_files(files), files, store_dir)
+
+
+def _publish(
+    prefix: str,
+    df: pd.DataFrame,
+    files: List[str],
+    store_dir: str,
+    rollups: Optional[Dict[str, pd.DataFrame]] = None,
+) -> Dict:
+    os.makedirs(store_dir, exist_ok=True)
+    manifest = _write_generation(prefix, df, files, store_dir, rollups)
+    _remove_stale(prefix, manifest["generation"], store_dir)
+    return manifest
+
+
+def load_store(prefix: str, data_dir: str = DATA_DIR, store_dir: str = STORE_DIR) -> pd.DataFrame:
+    """Return the memory-mapped 1-min OHLCV frame for ``prefix``, syncing first."""
+    manifest = sync_store(prefix, data_dir, store_dir)
+    try:
+        return _open_columns(prefix, manifest, store_dir)
+    except FileNotFoundError:
+        # Superseded by a concurrent rebuild between sync and open
+        return _open_columns(prefix, sync_store(prefix, data_dir, store_dir), store_dir)
+
+
+def load_rollup(prefix: str, rule: str, data_dir: str = DATA_DIR, store_dir: str = STORE_DIR) -> pd.DataFrame:
+    """Return the memory-mapped ``rule`` rollup of ``prefix``, building it on first use."""
+    if rule not in ROLLUP_RULES:
+        raise ValueError(f"No rollup for rule '{rule}'")
+    manifest = sync_store(prefix, data_dir, store_dir)
+    rollup = _open_rollup(prefix, manifest, rule, store_dir)
+    if rollup is None:
+        built = resample_ohlcv(_open_columns(prefix, manifest, store_dir), rule)
+        # Under the lock so _remove_stale cannot drop the generation mid-write
+        with build_lock(prefix, store_dir):
+            _save_rollup(_generation_path(prefix, manifest, store_dir), rule, built)
+        rollup = _open_rollup(prefix, manifest, rule, store_dir)
+        if rollup is None:  # generation superseded while building
+            rollup = built
+    return rollup
+
+
+def resample_ohlcv(df: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """Resample 1-min OHLCV bars to ``rule``, dropping empty buckets."""
+    if rule == "1min":
+        return df
+    return df.resample(rule).agg(_OHLCV_AGG).dropna(subset=["open"])
+
+
+def _bucket_label(ts: pd.Timestamp, rule: str) -> pd.Timestamp:
+    if rule in _FIXED_SPANS:
+        # Spans divide a day, so flooring matches resample's start_day origin
+        return ts.floor(rule)
+    return pd.Series([0], index=pd.DatetimeIndex([ts])).resample(rule).first().index[0]
+
+
+def update_rollup(rollup: pd.DataFrame, bars: pd.DataFrame, first_new: pd.Timestamp, rule: str) -> pd.DataFrame:
+    """Recompute the buckets of ``rollup`` from the one holding ``first_new`` onward.
+
+    ``bars`` is the full 1-min series after the append. The result equals
+    ``resample_ohlcv(bars, rule)``.
+    """
+    label = _bucket_label(first_new, rule)
+    i = bars.index.searchsorted(first_new - _MAX_BUCKET)
+    tail = resample_ohlcv(bars.iloc[i:], rule)
+    return pd.concat([rollup[rollup.index < label], tail[tail.index >= label]])
+
+
+def slice_rollup(bars: pd.DataFrame, rollup: pd.DataFrame, start: pd.Timestamp, rule: str) -> pd.DataFrame:
+    """Equivalent of ``resample_ohlcv(bars[bars.index >= start], rule)`` served from ``rollup``.
+
+    Whole buckets after ``start`` are located by binary search in the
+    rollup index; only the bucket ``start`` cuts through is recomputed.
+    """
+    label = _bucket_label(start, rule)
+    rest = rollup.iloc[rollup.index.searchsorted(label, side="right"):]
+    i0 = bars.index.searchsorted(start)
+    if rule in _FIXED_SPANS:
+        # Aggregate the cut bucket directly rather than through resample
+        seg = bars.iloc[i0:bars.index.searchsorted(label + _FIXED_SPANS[rule])]
+        if seg.empty:
+            return rest
+        head = pd.DataFrame({
+            "open": [seg["open"].iat[0]],
+            "high": [seg["high"].max()],
+            "low": [seg["low"].min()],
+            "close": [seg["close"].iat[-1]],
+            "volume": [seg["volume"].sum()],
+        }, index=pd.DatetimeIndex([label], name=rollup.index.name).as_unit(rollup.index.unit))
+    else:
+        head = resample_ohlcv(bars.iloc[i0:bars.index.searchsorted(start + _MAX_BUCKET)], rule)
+        head = head[head.index <= label]
+        if head.empty:
+            return rest
+    return pd.concat([head, rest])
+
+
+def main(argv: List[str]) -> None:
+    prefixes = argv or sorted({
+        os.path.basename(f).split("_", 1)[0]
+        for f in glob.glob(os.path.join(DATA_DIR, "*_*_1min.csv"))
+    })
+    for prefix in prefixes:
+        manifest = sync_store(prefix)
+        for rule in ROLLUP_RULES:
+            load_rollup(prefix, rule)
+        print(f"{prefix}: {manifest['rows']:,} bars from {len(manifest['files'])} file(s), "
+              f"{len(ROLLUP_RULES)} rollups")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
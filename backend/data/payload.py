@@ -0,0 +1,73 @@
+"""Column-wise JSON payloads for OHLCV candles and ticks.
+
+The data endpoints used to walk ``df.iterrows()`` and build one dict per
+candle/tick, then let FastAPI re-encode that list. Here every field is
+converted once as a NumPy column (``tolist`` yields plain Python
+scalars), and the body is encoded directly — with orjson when installed,
+else the stdlib C encoder.
+
+Two layouts:
+  rows    — ``[{time, open, ...}, ...]`` (the original format)
+  columns — ``{time: [...], open: [...], ...}``; smaller and cheaper to
+            build and parse, for clients that index by column
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import Response
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+FORMATS = ("rows", "columns")
+
+
+def epoch_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    """Little-endian int64 epoch nanoseconds of ``index`` (empty for an empty index)."""
+    if len(index) == 0:
+        return np.empty(0, dtype="<i8")
+    return index.as_unit("ns").asi8.astype("<i8", copy=False)
+
+
+def ohlcv_columns(df: pd.DataFrame) -> Dict[str, list]:
+    """Candle fields as lists: epoch-second times, prices rounded to 2dp, int volume."""
+    columns = {"time": (epoch_ns(df.index) // 1_000_000_000).tolist()}
+    for col in ("open", "high", "low", "close"):
+        columns[col] = np.round(df[col].to_numpy(dtype=np.float64), 2).tolist()
+    columns["volume"] = df["volume"].to_numpy().astype(np.int64).tolist()
+    return columns
+
+
+def tick_columns(df: pd.DataFrame) -> Dict[str, list]:
+    """Tick fields as lists: float epoch-second times (µs precision), price to 2dp."""
+    if df.empty:
+        # The no-tick-files placeholder has no DatetimeIndex
+        return {"time": [], "price": [], "size": [], "side": []}
+    return {
+        "time": np.round(epoch_ns(df.index) / 1e9, 6).tolist(),
+        "price": np.round(df["price"].to_numpy(dtype=np.float64), 2).tolist(),
+        "size": df["size"].to_numpy().astype(np.int64).tolist(),
+        "side": df["side"].astype(str).tolist(),
+    }
+
+
+def to_rows(columns: Dict[str, list]) -> List[Dict[str, Any]]:
+    """Transpose a column payload into the row-dict layout."""
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+def json_response(payload: Dict[str, Any]) -> Response:
+    """Encode ``payload`` (plain Python types only) without FastAPI's jsonable_encoder pass."""
+    if HAS_ORJSON:
+        body = orjson.dumps(payload)
+    else:
+        body = json.dumps(payload, separators=(",", ":")).encode()
+    return Response(content=body, media_type="application/json")
@@ -10,23 +10,20 @@ import json
 import logging
 from typing import Any
 
-import httpx
-
-from data.cache import TTLCache
+from data.cache import make_cache
+from data.http_client import get_json
 
 logger = logging.getLogger("afindr.polymarket")
 
 # 5-minute TTL cache for market searches
-_market_cache = TTLCache(default_ttl=300.0, max_size=100)
+_market_cache = make_cache("polymarket", default_ttl=300.0, max_size=100, stale_ttl=300.0)
 
 _BASE = "https://gamma-api.polymarket.com"
 
 
-def _request(endpoint: str, params: dict | None = None) -> list | dict | None:
+async def _request(endpoint: str, params: dict | None = None) -> list | dict | None:
     try:
-        resp = httpx.get(f"{_BASE}/{endpoint}", params=params or {}, timeout=10)
-        resp.raise_for_status()
-        return resp.json()
+        return await get_json(f"{_BASE}/{endpoint}", provider="polymarket", params=params or {})
     except Exception as e:
         logger.warning(f"Polymarket API error: {e}")
         return None
@@ -108,22 +105,25 @@ def _parse_event_markets(event: dict) -> list[dict[str, Any]]:
     return parsed
 
 
-def search_markets(query: str, limit: int = 10) -> list[dict[str, Any]]:
+async def search_markets(query: str, limit: int = 10) -> list[dict[str, Any]]:
     """Search Polymarket for markets matching a query string.
 
     Uses the /events endpoint (which returns grouped markets) and filters
     by text match. The /markets endpoint does NOT support text search.
     """
     cache_key = f"poly:{query.lower().strip()}:{limit}"
-    cached = _market_cache.get(cache_key)
-    if cached is not None:
-        return cached
+    found = await _market_cache.get_or_load(
+        cache_key, lambda: _search_events(query, limit), cache_if=lambda r: r is not None)
+    return found if found is not None else []
+
 
+async def _search_events(query: str, limit: int) -> list[dict[str, Any]] | None:
+    """Matching markets, or None when the events request fails (not cached)."""
     query_lower = query.lower()
     query_words = [w for w in query_lower.split() if len(w) >= 2]
 
     # Fetch events sorted by volume (Iran events are high-volume, top 20)
-    data = _request("events", {
+    data = await _request("events", {
         "_limit": 100,
         "closed": "false",
         "active": "true",
@@ -132,7 +132,7 @@ def search_markets(query: str, limit: int = 10) -> list[dict[str, Any]]:
     })
 
     if not data or not isinstance(data, list):
-        return []
+        return None
 
     # Filter events by query text — check title, slug, tags
     matching_events = []
@@ -153,19 +153,15 @@ def search_markets(query: str, limit: int = 10) -> list[dict[str, Any]]:
         for m in event_markets[:5]:
             results.append(m)
             if len(results) >= limit:
-                final_early = results[:limit]
-                _market_cache.set(cache_key, final_early)
-                return final_early
+                return results[:limit]
 
     # If still no results, return empty — don't return unrelated markets
-    final = results[:limit]
-    _market_cache.set(cache_key, final)
-    return final
+    return results[:limit]
 
 
-def get_trending_markets(limit: int = 10) -> list[dict[str, Any]]:
+async def get_trending_markets(limit: int = 10) -> list[dict[str, Any]]:
     """Fetch currently active markets sorted by volume (most popular)."""
-    data = _request("events", {
+    data = await _request("events", {
         "_limit": limit,
         "closed": "false",
         "active": "true",
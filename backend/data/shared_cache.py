@@ -0,0 +1,259 @@
+"""SQLite-backed fetcher cache shared by every worker process on a host.
+
+With ``AFINDR_CACHE_BACKEND=sqlite`` the fetcher caches (quotes, news
+feeds, yfinance, BLS, prediction markets) live in one WAL-mode database
+instead of per-process dicts, so N uvicorn workers make one upstream call
+per key instead of N. No external service: the database is a local file
+(``AFINDR_CACHE_PATH``, default ``data/.cache/fetchers.sqlite``).
+
+    cache(ns, key, expires_at, stale_until, value)   -- one table, namespaced
+
+Values are stored as a tagged blob: ``J`` + JSON for plain API payloads,
+``P`` + pickle protocol 5 for DataFrames/arrays (raw column buffers, no
+text round-trip) and anything JSON would not give back unchanged (tuples,
+non-string dict keys), so both backends return what was stored.
+
+Loads are single-flight across processes as well as within one: the
+loading thread/task takes an ``fcntl.flock`` on a per-key lock file, then
+re-reads the row before calling upstream, so a worker that waited on the
+lock picks up the value another worker just stored. Expired rows and rows
+over ``max_size`` (soonest-expiring first) are purged every few writes.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data.cache import CacheBase
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+SHARED_CACHE_PATH = os.getenv(
+    "AFINDR_CACHE_PATH", os.path.join(os.path.dirname(__file__), ".cache", "fetchers.sqlite"))
+
+# Purge expired / excess rows once per this many writes
+_PURGE_EVERY = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    ns TEXT NOT NULL,
+    key TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    stale_until REAL NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (ns, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_stale_until ON cache (ns, stale_until);
+"""
+
+
+def encode(value: Any) -> bytes:
+    """Tagged binary form of ``value`` (see module docstring)."""
+    if not isinstance(value, (pd.DataFrame, pd.Series, pd.Index, np.ndarray)):
+        try:
+            dumped = json.dumps(value, separators=(",", ":"))
+            if json.loads(dumped) == value:
+                return b"J" + dumped.encode()
+        except (TypeError, ValueError):
+            pass
+    return b"P" + pickle.dumps(value, protocol=5)
+
+
+def decode(blob: bytes) -> Any:
+    tag, body = blob[:1], blob[1:]
+    if tag == b"J":
+        return json.loads(body)
+    return pickle.loads(body)
+
+
+class SqliteCache(CacheBase):
+    """TTL cache in a shared SQLite database, one namespace per fetcher."""
+
+    def __init__(
+        self,
+        namespace: str,
+        default_ttl: float = 60.0,
+        max_size: int = 500,
+        stale_ttl: float = 0.0,
+        max_bytes: Optional[int] = None,
+        path: str = SHARED_CACHE_PATH,
+    ):
+        super().__init__()
+        self._ns = namespace
+        self._default_ttl = default_ttl
+        self._max_size = max_size
+        self._stale_ttl = stale_ttl
+        self._max_bytes = max_bytes
+        self._path = path
+        self._lock_dir = f"{path}.locks"
+        os.makedirs(self._lock_dir, exist_ok=True)
+        self._local = threading.local()
+        self._writes = 0
+        self._conn().executescript(_SCHEMA)
+
+    # -- basic operations -------------------------------------------------
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        state, value = self._peek(key)
+        if state != "fresh":
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        blob = encode(value)
+        if self._max_bytes is not None and len(blob) > self._max_bytes:
+            return
+        ttl = ttl or self._default_ttl
+        expires_at = time.time() + ttl
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+            (self._ns, repr(key), expires_at, expires_at + self._stale_ttl, blob),
+        )
+        self._writes += 1
+        if self._writes % _PURGE_EVERY == 0:
+            self.purge()
+
+    def __contains__(self, key: Hashable) -> bool:
+        row = self._row(key)
+        return row is not None and row[0] >= time.time()
+
+    def __len__(self) -> int:
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM cache WHERE ns = ? AND stale_until >= ?", (self._ns, time.time()),
+        ).fetchone()[0]
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM cache WHERE ns = ?", (self._ns,))
+
+    def purge(self) -> None:
+        """Drop rows past their stale window, then the soonest-expiring rows over max_size."""
+        conn = self._conn()
+        conn.execute("DELETE FROM cache WHERE ns = ? AND stale_until < ?", (self._ns, time.time()))
+        evicted = conn.execute(
+            "DELETE FROM cache WHERE ns = ? AND key IN ("
+            "SELECT key FROM cache WHERE ns = ? ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self._ns, self._ns, self._max_size),
+        ).rowcount
+        self.evictions += max(evicted, 0)
+
+    def stats(self) -> Dict[str, int]:
+        entries, nbytes = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache WHERE ns = ?", (self._ns,),
+        ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": nbytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "loads": self.loads,
+        }
+
+    def _probe(self, key: Hashable) -> Tuple[str, Any]:
+        state, value = self._peek(key)
+        if state == "fresh":
+            self.hits += 1
+        elif state == "stale":
+            self.stale_hits += 1
+        else:
+            self.misses += 1
+        return state, value
+
+    # -- cross-process single flight ----------------------------------------
+
+    async def _fill(self, key, loader, ttl, cache_if) -> Any:
+        lock = await self._acquire_async(key)
+        try:
+            state, value = self._peek(key)
+            if state == "fresh":
+                return value
+            return await super()._fill(key, loader, ttl, cache_if)
+        finally:
+            self._release(lock)
+
+    def _fill_sync(self, key, loader, ttl, cache_if) -> Any:
+        with self._file_lock(key):
+            state, value = self._peek(key)
+            if state == "fresh":
+                return value
+            return super()._fill_sync(key, loader, ttl, cache_if)
+
+    def _lock_path(self, key: Hashable) -> str:
+        digest = hashlib.sha1(f"{self._ns}\0{key!r}".encode()).hexdigest()[:20]
+        return os.path.join(self._lock_dir, f"{digest}.lock")
+
+    @contextlib.contextmanager
+    def _file_lock(self, key: Hashable):
+        handle = open(self._lock_path(key), "a")
+        try:
+            if HAS_FCNTL:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            yield
+        finally:
+            self._release(handle)
+
+    async def _acquire_async(self, key: Hashable):
+        # Poll a non-blocking flock so a cancelled task never leaves a thread
+        # holding the lock
+        handle = open(self._lock_path(key), "a")
+        if not HAS_FCNTL:
+            return handle
+        try:
+            while True:
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    return handle
+                except BlockingIOError:
+                    await asyncio.sleep(0.02)
+        except BaseException:
+            handle.close()
+            raise
+
+    @staticmethod
+    def _release(handle) -> None:
+        if HAS_FCNTL:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+
+    # -- storage ------------------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread, reopened in forked workers
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self._path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _row(self, key: Hashable) -> Optional[Tuple[float, float, bytes]]:
+        return self._conn().execute(
+            "SELECT expires_at, stale_until, value FROM cache WHERE ns = ? AND key = ?",
+            (self._ns, repr(key)),
+        ).fetchone()
+
+    def _peek(self, key: Hashable) -> Tuple[str, Any]:
+        row = self._row(key)
+        now = time.time()
+        if row is None or row[1] < now:
+            return "miss", None
+        return ("fresh" if row[0] >= now else "stale"), decode(row[2])
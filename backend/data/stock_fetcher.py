@@ -2,11 +2,12 @@
 from __future__ import annotations
 
 import math
-import time
 from typing import Optional, Dict, Any
 
 import yfinance as yf
 
+from data.cache import make_cache
+
 
 def _safe_float(v) -> Optional[float]:
     """Convert a value to float, returning None for NaN/Inf/missing."""
@@ -22,25 +23,25 @@ def _safe_float(v) -> Optional[float]:
 
 # ─── Cache ───
 
-_quote_cache: Dict[str, Dict] = {}
 QUOTE_CACHE_TTL = 60  # 1 minute for quotes
 INFO_CACHE_TTL = 300  # 5 minutes for fundamentals
 
+# Failed lookups (None) are not cached
+_quote_cache = make_cache("quotes", default_ttl=QUOTE_CACHE_TTL, max_size=500)
+
 
-def _is_fresh(cache_entry: Dict, ttl: int) -> bool:
-    if not cache_entry:
-        return False
-    return time.time() - cache_entry.get("timestamp", 0) < ttl
+def _cached(cache_key: str, ttl: int, loader) -> Optional[Dict[str, Any]]:
+    return _quote_cache.get_or_load_sync(cache_key, loader, ttl=ttl, cache_if=lambda r: r is not None)
 
 
 # ─── Public API ───
 
 def fetch_stock_quote(ticker: str) -> Optional[Dict[str, Any]]:
     """Fetch real-time quote data for a stock ticker."""
-    cache_key = f"quote:{ticker}"
-    if cache_key in _quote_cache and _is_fresh(_quote_cache[cache_key], QUOTE_CACHE_TTL):
-        return _quote_cache[cache_key]["data"]
+    return _cached(f"quote:{ticker}", QUOTE_CACHE_TTL, lambda: _load_stock_quote(ticker))
 
+
+def _load_stock_quote(ticker: str) -> Optional[Dict[str, Any]]:
     try:
         stock = yf.Ticker(ticker)
         info = stock.info
@@ -90,7 +91,6 @@ def fetch_stock_quote(ticker: str) -> Optional[Dict[str, Any]]:
             "intraday": intraday,
         }
 
-        _quote_cache[cache_key] = {"data": data, "timestamp": time.time()}
         return data
     except Exception:
         return None
@@ -176,10 +176,10 @@ def _format_large_count(n) -> str:
 
 def fetch_stock_detail_full(ticker: str) -> Optional[Dict[str, Any]]:
     """Fetch comprehensive stock detail: quote, fundamentals, earnings, analyst data, ownership."""
-    cache_key = f"detail_full:{ticker}"
-    if cache_key in _quote_cache and _is_fresh(_quote_cache[cache_key], INFO_CACHE_TTL):
-        return _quote_cache[cache_key]["data"]
+    return _cached(f"detail_full:{ticker}", INFO_CACHE_TTL, lambda: _load_stock_detail_full(ticker))
+
 
+def _load_stock_detail_full(ticker: str) -> Optional[Dict[str, Any]]:
     try:
         stock = yf.Ticker(ticker)
         info = stock.info or {}
@@ -461,7 +461,6 @@ def fetch_stock_detail_full(ticker: str) -> Optional[Dict[str, Any]]:
             "sector": info.get("sector", "-") or "-",
         }
 
-        _quote_cache[cache_key] = {"data": data, "timestamp": time.time()}
         return data
     except Exception:
         return None
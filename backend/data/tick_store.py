@@ -0,0 +1,259 @@
+"""Day-partitioned on-disk store for Databento tick files.
+
+Tick CSVs can cover months, so instead of one sorted in-memory frame the
+ticks are split into one segment per UTC day, each a directory of ``.npy``
+columns opened with ``mmap_mode="r"``. A manifest maps days to segments:
+
+    ticks/nq.json                   files + {day: {segment, rows}}
+    ticks/nq/2026-01-05-<id>/       ts.npy (int64 ns UTC), price.npy,
+                                    size.npy, side.npy
+
+A date query opens that day's segment (plus the next day's first tick if
+it falls exactly on midnight, matching the inclusive ``.loc`` slice the
+fetcher used); the most-recent query walks segments backwards until it
+has ``limit`` ticks. Resident memory is bounded by the segments touched.
+
+Building parses one CSV at a time. When only new files appear, only the
+days they contain are rewritten; segments for other days are reused.
+Builds take the same per-prefix ``build_lock`` as the OHLCV store, so
+concurrent cold starts publish one set of segments.
+"""
+from __future__ import annotations
+
+import glob
+import json
+import os
+import shutil
+import uuid
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data.ohlcv_store import DATA_DIR, STORE_DIR, build_lock, fingerprint
+
+TICK_STORE_DIR = os.path.join(STORE_DIR, "ticks")
+
+# Bump when the on-disk layout changes; older stores are rebuilt.
+TICK_STORE_VERSION = 1
+
+_DAY_NS = 86_400 * 10**9
+
+
+def tick_files(prefix: str, data_dir: str = DATA_DIR) -> List[str]:
+    return sorted(glob.glob(os.path.join(data_dir, f"{prefix}_tick_*.csv")))
+
+
+def empty_ticks() -> pd.DataFrame:
+    """Placeholder returned when a symbol has no tick files."""
+    empty = pd.DataFrame(columns=["price", "size", "side"])
+    empty.index.name = "ts_event"
+    return empty
+
+
+def read_tick_csv(path: str) -> pd.DataFrame:
+    """Parse and clean one Databento trades CSV, sorted by ts_event."""
+    df = pd.read_csv(path, usecols=["ts_event", "price", "size", "side"])
+    df["ts_event"] = pd.to_datetime(df["ts_event"], format="ISO8601", utc=True)
+    df = df.sort_values("ts_event", kind="stable").set_index("ts_event")
+
+    df["price"] = pd.to_numeric(df["price"], errors="coerce")
+    df["size"] = pd.to_numeric(df["size"], errors="coerce").fillna(0).astype(int)
+    return df.dropna(subset=["price"])
+
+
+def _manifest_path(prefix: str, store_dir: str) -> str:
+    return os.path.join(store_dir, f"{prefix}.json")
+
+
+def _read_manifest(prefix: str, store_dir: str) -> Optional[Dict]:
+    try:
+        with open(_manifest_path(prefix, store_dir)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != TICK_STORE_VERSION:
+        return None
+    return manifest
+
+
+def _segment_path(prefix: str, segment: str, store_dir: str) -> str:
+    return os.path.join(store_dir, prefix, segment)
+
+
+def _write_segment(prefix: str, day: str, ts: np.ndarray, price: np.ndarray,
+                   size: np.ndarray, side: np.ndarray, store_dir: str) -> str:
+    segment = f"{day}-{uuid.uuid4().hex[:12]}"
+    path = _segment_path(prefix, segment, store_dir)
+    os.makedirs(path)
+    np.save(os.path.join(path, "ts.npy"), ts.astype(np.int64, copy=False))
+    np.save(os.path.join(path, "price.npy"), price.astype(np.float64, copy=False))
+    np.save(os.path.join(path, "size.npy"), size.astype(np.int64, copy=False))
+    np.save(os.path.join(path, "side.npy"), side)
+    return segment
+
+
+def _load_segment_arrays(prefix: str, segment: str, store_dir: str) -> Dict[str, np.ndarray]:
+    path = _segment_path(prefix, segment, store_dir)
+    return {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        for name in ("ts", "price", "size", "side")
+    }
+
+
+def _frame(arrays: Dict[str, np.ndarray], lo: int = 0, hi: Optional[int] = None) -> pd.DataFrame:
+    ts = np.asarray(arrays["ts"][lo:hi])
+    index = pd.DatetimeIndex(ts.view("M8[ns]"), name="ts_event").tz_localize("UTC")
+    return pd.DataFrame({
+        "price": np.asarray(arrays["price"][lo:hi]),
+        "size": np.asarray(arrays["size"][lo:hi]),
+        "side": np.asarray(arrays["side"][lo:hi]).astype(str),
+    }, index=index, copy=False)
+
+
+def _add_file(prefix: str, path: str, days: Dict[str, Dict], store_dir: str) -> None:
+    """Split one CSV into day segments, merging with any segment already in ``days``."""
+    df = read_tick_csv(path)
+    if df.empty:
+        return
+    ts = df.index.as_unit("ns").asi8
+    price = df["price"].to_numpy(dtype=np.float64)
+    size = df["size"].to_numpy(dtype=np.int64)
+    side = df["side"].astype(str).to_numpy(dtype="S")
+    day_idx = ts // _DAY_NS
+    bounds = np.flatnonzero(np.diff(day_idx)) + 1
+    for lo, hi in zip(np.r_[0, bounds], np.r_[bounds, len(ts)]):
+        day = str(pd.Timestamp(int(day_idx[lo]) * _DAY_NS).date())
+        parts = [(ts[lo:hi], price[lo:hi], size[lo:hi], side[lo:hi])]
+        if day in days:
+            old = _load_segment_arrays(prefix, days[day]["segment"], store_dir)
+            parts.insert(0, (old["ts"], old["price"], old["size"], old["side"]))
+        d_ts, d_price, d_size, d_side = (np.concatenate(cols) for cols in zip(*parts))
+        if len(parts) > 1:
+            order = np.argsort(d_ts, kind="stable")
+            d_ts, d_price, d_size, d_side = d_ts[order], d_price[order], d_size[order], d_side[order]
+        segment = _write_segment(prefix, day, d_ts, d_price, d_size, d_side, store_dir)
+        days[day] = {"segment": segment, "rows": len(d_ts)}
+
+
+def _remove_unreferenced(prefix: str, days: Dict[str, Dict], store_dir: str) -> None:
+    keep = {entry["segment"] for entry in days.values()}
+    current = _read_manifest(prefix, store_dir)
+    if current is not None:
+        keep.update(entry["segment"] for entry in current["days"].values())
+    for path in glob.glob(os.path.join(store_dir, prefix, "*")):
+        if os.path.basename(path) not in keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def sync_ticks(prefix: str, data_dir: str = DATA_DIR, store_dir: str = TICK_STORE_DIR) -> Optional[Dict]:
+    """Bring the tick store for ``prefix`` up to date; None if there are no tick files.
+
+    Unchanged files are a no-op; new files only rewrite the days they
+    touch; an edited or removed file rebuilds the store.
+    """
+    files = tick_files(prefix, data_dir)
+    if not files:
+        return None
+
+    current = {os.path.basename(f): fingerprint(f) for f in files}
+    manifest = _read_manifest(prefix, store_dir)
+    if manifest is not None and {entry["name"]: entry for entry in manifest["files"]} == current:
+        return manifest
+    with build_lock(prefix, store_dir):
+        return _rebuild(prefix, files, current, store_dir)
+
+
+def _rebuild(prefix: str, files: List[str], current: Dict[str, Dict], store_dir: str) -> Dict:
+    # Caller holds build_lock; the manifest may have been published while it waited
+    manifest = _read_manifest(prefix, store_dir)
+    days: Dict[str, Dict] = {}
+    pending = files
+    if manifest is not None:
+        stored = {entry["name"]: entry for entry in manifest["files"]}
+        if stored == current:
+            return manifest
+        if all(current.get(name) == entry for name, entry in stored.items()):
+            days = dict(manifest["days"])
+            pending = [f for f in files if os.path.basename(f) not in stored]
+
+    os.makedirs(os.path.join(store_dir, prefix), exist_ok=True)
+    for path in pending:
+        _add_file(prefix, path, days, store_dir)
+
+    manifest = {
+        "version": TICK_STORE_VERSION,
+        "files": [current[os.path.basename(f)] for f in files],
+        "days": dict(sorted(days.items())),
+    }
+    tmp = os.path.join(store_dir, f".{prefix}.json.{uuid.uuid4().hex[:12]}")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp, _manifest_path(prefix, store_dir))
+    _remove_unreferenced(prefix, days, store_dir)
+    return manifest
+
+
+def iter_segments(prefix: str, data_dir: str = DATA_DIR, store_dir: str = TICK_STORE_DIR) -> Iterator[Dict[str, np.ndarray]]:
+    """Yield each day's memory-mapped ts/price/size/side arrays in time order."""
+    manifest = sync_ticks(prefix, data_dir, store_dir)
+    if manifest is None:
+        return
+    for entry in manifest["days"].values():
+        yield _load_segment_arrays(prefix, entry["segment"], store_dir)
+
+
+def _with_fresh_manifest(read: Callable[[Dict], pd.DataFrame], prefix: str,
+                         data_dir: str, store_dir: str) -> pd.DataFrame:
+    manifest = sync_ticks(prefix, data_dir, store_dir)
+    if manifest is None:
+        return empty_ticks()
+    try:
+        return read(manifest)
+    except FileNotFoundError:
+        # A segment was replaced by a concurrent sync between manifest and open
+        manifest = sync_ticks(prefix, data_dir, store_dir)
+        return empty_ticks() if manifest is None else read(manifest)
+
+
+def read_day(prefix: str, date: str, data_dir: str = DATA_DIR, store_dir: str = TICK_STORE_DIR) -> pd.DataFrame:
+    """Ticks from ``date`` 00:00 UTC through the following midnight, inclusive."""
+    return _with_fresh_manifest(lambda manifest: _read_day(prefix, date, manifest, store_dir),
+                                prefix, data_dir, store_dir)
+
+
+def _read_day(prefix: str, date: str, manifest: Dict, store_dir: str) -> pd.DataFrame:
+    start = pd.Timestamp(date).tz_localize("UTC")
+    day = str(start.date())
+    next_day = str((start + pd.Timedelta(days=1)).date())
+    frames = []
+    if day in manifest["days"]:
+        arrays = _load_segment_arrays(prefix, manifest["days"][day]["segment"], store_dir)
+        frames.append(_frame(arrays, int(np.searchsorted(arrays["ts"], start.value))))
+    if next_day in manifest["days"]:
+        arrays = _load_segment_arrays(prefix, manifest["days"][next_day]["segment"], store_dir)
+        boundary = start.value + _DAY_NS
+        frames.append(_frame(arrays, 0, int(np.searchsorted(arrays["ts"], boundary, side="right"))))
+    if not frames:
+        return empty_ticks()
+    return pd.concat(frames) if len(frames) > 1 else frames[0]
+
+
+def read_tail(prefix: str, limit: int, data_dir: str = DATA_DIR, store_dir: str = TICK_STORE_DIR) -> pd.DataFrame:
+    """The most recent ``limit`` ticks, reading only the segments needed."""
+    return _with_fresh_manifest(lambda manifest: _read_tail(prefix, limit, manifest, store_dir),
+                                prefix, data_dir, store_dir)
+
+
+def _read_tail(prefix: str, limit: int, manifest: Dict, store_dir: str) -> pd.DataFrame:
+    frames, remaining = [], limit
+    for day in reversed(list(manifest["days"])):
+        if remaining <= 0:
+            break
+        arrays = _load_segment_arrays(prefix, manifest["days"][day]["segment"], store_dir)
+        n = len(arrays["ts"])
+        frames.append(_frame(arrays, max(0, n - remaining)))
+        remaining -= n
+    if not frames:
+        return empty_ticks()
+    return pd.concat(frames[::-1]) if len(frames) > 1 else frames[0]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional, List, Dict
+import numpy as np
 import pandas as pd
 from engine.strategy import BaseStrategy, Signal
 from engine.metrics import calculate_metrics
@@ -25,18 +26,125 @@ class Position:
     take_profit: Optional[float] = None
 
 
-@dataclass
+def ohlcv_columns(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Extract contiguous float64 OHLCV columns and int64 epoch-second times."""
+    cols = {
+        col: np.ascontiguousarray(data[col].to_numpy(dtype=np.float64))
+        for col in ("open", "high", "low", "close", "volume")
+    }
+    index = data.index
+    if isinstance(index, pd.DatetimeIndex):
+        cols["time"] = index.as_unit("ns").asi8 // 1_000_000_000
+    else:
+        cols["time"] = np.asarray(index, dtype=np.int64)
+    return cols
+
+
 class BacktestResult:
-    trades: list[dict]
-    equity_curve: list[dict]
-    metrics: dict
+    """Trades, equity curve and metrics of a backtest run.
+
+    The equity curve is either given as a list of {"time", "value"} dicts
+    or as parallel ``equity_times`` (int64) / ``equity_values`` (float64)
+    arrays. In the array form the dict list is only built the first time
+    ``equity_curve`` is read, i.e. when the result is serialized.
+    """
+
+    def __init__(
+        self,
+        trades: list[dict],
+        equity_curve: Optional[list[dict]] = None,
+        metrics: Optional[dict] = None,
+        equity_times: Optional[np.ndarray] = None,
+        equity_values: Optional[np.ndarray] = None,
+        checkpoint_metrics: Optional[Dict[int, dict]] = None,
+    ):
+        self.trades = trades
+        self.metrics = metrics if metrics is not None else {}
+        self.equity_times = equity_times
+        self.equity_values = equity_values
+        self._equity_curve = equity_curve
+        # Metrics "as if the run had ended" at selected bars, see Backtester.run
+        self.checkpoint_metrics = checkpoint_metrics if checkpoint_metrics is not None else {}
+
+    @property
+    def equity_curve(self) -> list[dict]:
+        if self._equity_curve is None:
+            if self.equity_times is None:
+                self._equity_curve = []
+            else:
+                self._equity_curve = [
+                    {"time": t, "value": v}
+                    for t, v in zip(self.equity_times.tolist(), self.equity_values.tolist())
+                ]
+        return self._equity_curve
+
+    @equity_curve.setter
+    def equity_curve(self, value: list[dict]) -> None:
+        self._equity_curve = value
+        self.equity_times = self.equity_values = None
+
+    def __repr__(self) -> str:
+        n_points = len(self.equity_times) if self.equity_times is not None else len(self.equity_curve)
+        return f"BacktestResult(trades={len(self.trades)}, equity_points={n_points}, metrics={self.metrics!r})"
+
+
+class _HistoryView:
+    """Lazy stand-in for ``data.iloc[:n]``.
+
+    ``len(history)`` is answered without touching pandas; any other access
+    materializes the real DataFrame slice once and delegates to it, so
+    strategies that still compute over ``history`` keep working unchanged.
+    """
+
+    __slots__ = ("_data", "_n", "_frame")
+
+    def __init__(self, data: pd.DataFrame, n: int):
+        self._data = data
+        self._n = n
+        self._frame = None
+
+    def _df(self) -> pd.DataFrame:
+        if self._frame is None:
+            self._frame = self._data.iloc[:self._n]
+        return self._frame
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, key):
+        return self._df()[key]
+
+    def __getattr__(self, name):
+        return getattr(self._df(), name)
+
+    def __iter__(self):
+        return iter(self._df())
+
+    def __contains__(self, key) -> bool:
+        return key in self._df()
+
+    def __repr__(self) -> str:
+        return repr(self._df())
 
 
 class Backtester:
-    def __init__(self, strategy: BaseStrategy, data: pd.DataFrame, config: BacktestConfig):
+    """Bar-by-bar backtest engine.
+
+    ``columnar=True`` (default) extracts the OHLCV columns into contiguous
+    NumPy arrays once, feeds the strategy a plain bar dict built from
+    Python lists (a fresh snapshot per bar, so strategies may keep it) and
+    a lazy history view, and records the equity curve into preallocated
+    arrays.
+    ``columnar=False`` runs the original per-row pandas loop; both produce
+    identical trades, equity and metrics.
+    """
+
+    def __init__(self, strategy: BaseStrategy, data: pd.DataFrame, config: BacktestConfig,
+                 columnar: bool = True):
         self.strategy = strategy
         self.data = data
         self.config = config
+        self.columnar = columnar
         self.balance = config.initial_balance
         self.position: Optional[Position] = None
         self.trades: list[dict] = []
@@ -44,9 +152,96 @@ class Backtester:
         self.trade_id = 0
         self._current_mae = 0.0  # Max Adverse Excursion (worst unrealized loss)
         self._current_mfe = 0.0  # Max Favorable Excursion (best unrealized gain)
+        self._checkpoints: set = set()
+        self._checkpoint_metrics: Dict[int, dict] = {}
+
+    def run(self, checkpoints: Optional[List[int]] = None) -> BacktestResult:
+        """Run the backtest.
+
+        ``checkpoints`` is an optional list of bar indices. For each one the
+        result's ``checkpoint_metrics[i]`` holds the metrics the run would
+        report if the data ended at bar i (open position closed at that
+        bar's close), i.e. the same as running on ``data.iloc[:i + 1]``.
+        Strategies only see past bars, so one run over the longest prefix
+        stands in for one run per prefix.
+        """
+        self._checkpoints = set(checkpoints or ())
+        self._checkpoint_metrics = {}
+        if self.columnar:
+            result = self._run_columnar()
+        else:
+            result = self._run_rows()
+        result.checkpoint_metrics = self._checkpoint_metrics
+        return result
+
+    def _checkpoint(self, i: int, time: int, close: float) -> None:
+        """Record metrics as if the run ended at bar i, without changing state."""
+        position, balance, trade_id = self.position, self.balance, self.trade_id
+        if position:
+            self._close_position({"time": time, "close": close})
+        self._checkpoint_metrics[i] = calculate_metrics(self.trades, self.config.initial_balance)
+        if position:
+            self.trades.pop()
+        self.position, self.balance, self.trade_id = position, balance, trade_id
+
+    def _run_columnar(self) -> BacktestResult:
+        cols = ohlcv_columns(self.data)
+        n = len(self.data)
+        closes, times = cols["close"], cols["time"]
+        equity_times = np.empty(n, dtype=np.int64)
+        equity_values = np.empty(n, dtype=np.float64)
+        rows = zip(*(cols[k].tolist() for k in ("time", "open", "high", "low", "close", "volume")))
+        point_value = self.config.point_value
+        strategy = self.strategy
+
+        strategy.reset_indicators()
+        for i, (t, o, h, lo, close, v) in enumerate(rows):
+            bar = {"time": t, "open": o, "high": h, "low": lo, "close": close, "volume": v}
+            history = _HistoryView(self.data, i + 1)
+            strategy.update_indicators(bar)
+
+            if self.position:
+                self._check_sl_tp(bar)
+
+            # Track MAE/MFE while position is open
+            if self.position:
+                if self.position.side == "long":
+                    excursion = (close - self.position.entry_price) * point_value * self.position.size
+                else:
+                    excursion = (self.position.entry_price - close) * point_value * self.position.size
+                self._current_mfe = max(self._current_mfe, excursion)
+                self._current_mae = min(self._current_mae, excursion)
+
+            signal = strategy.on_bar(bar, history)
+            if not self.position:
+                if signal and signal.action in ("buy", "sell"):
+                    self._open_position(bar, signal)
+            elif signal and signal.action == "close":
+                self._close_position(bar)
+            elif signal and signal.action in ("buy", "sell"):
+                side = "long" if signal.action == "buy" else "short"
+                if side != self.position.side:
+                    self._close_position(bar)
+                    self._open_position(bar, signal)
+
+            equity_times[i] = times[i]
+            equity_values[i] = round(self._current_equity(close), 2)
+            if i in self._checkpoints:
+                self._checkpoint(i, int(times[i]), close)
+
+        if self.position:
+            last_bar = {"time": int(equity_times[-1]), "close": float(closes[-1])}
+            self._close_position(last_bar)
+
+        metrics = calculate_metrics(self.trades, self.config.initial_balance)
+        return BacktestResult(
+            trades=self.trades, metrics=metrics,
+            equity_times=equity_times, equity_values=equity_values,
+        )
 
-    def run(self) -> BacktestResult:
+    def _run_rows(self) -> BacktestResult:
         rows = self.data.reset_index()
+        self.strategy.reset_indicators()
         for i in range(len(rows)):
             row = rows.iloc[i]
             bar = {
@@ -58,6 +253,7 @@ class Backtester:
                 "volume": float(row["volume"]),
             }
             history = self.data.iloc[:i + 1]
+            self.strategy.update_indicators(bar)
 
             if self.position:
                 self._check_sl_tp(bar)
@@ -89,6 +285,8 @@ class Backtester:
                 "time": bar["time"],
                 "value": round(self._current_equity(bar["close"]), 2),
             })
+            if i in self._checkpoints:
+                self._checkpoint(i, bar["time"], bar["close"])
 
         if self.position:
             last_bar = {"time": self.equity_curve[-1]["time"], "close": float(rows.iloc[-1]["close"])}
@@ -22,7 +22,18 @@ from .divergences_volume import (
     detect_volume_profile,
     detect_volume_spikes,
 )
-from ._types import ChartPatternResult, ChartElement, SwingPoint
+from .streaming import (
+    StreamingDetector,
+    StreamingFVG,
+    StreamingOrderBlocks,
+    StreamingLiquiditySweeps,
+    StreamingBOSChoCH,
+    StreamingSwingPoints,
+    STREAMING_DETECTORS,
+    create_streaming_detector,
+)
+from ._features import frame_context
+from ._types import ChartPatternResult, ChartElement, ChartDelta, SwingPoint
 
 __all__ = [
     # ICT/SMC
@@ -42,8 +53,20 @@ __all__ = [
     "detect_macd_divergence",
     "detect_volume_profile",
     "detect_volume_spikes",
+    # Streaming (live bars)
+    "StreamingDetector",
+    "StreamingFVG",
+    "StreamingOrderBlocks",
+    "StreamingLiquiditySweeps",
+    "StreamingBOSChoCH",
+    "StreamingSwingPoints",
+    "STREAMING_DETECTORS",
+    "create_streaming_detector",
+    # Feature cache
+    "frame_context",
     # Types
     "ChartPatternResult",
     "ChartElement",
+    "ChartDelta",
     "SwingPoint",
 ]
@@ -0,0 +1,150 @@
+"""Per-frame feature cache shared by the pattern detectors.
+
+The detectors all start from the same derived arrays -- ATR, swing points,
+RSI, MACD, VWAP, session (calendar day) ids. When the agent runs
+``detect_chart_patterns``, ``detect_key_levels`` and ``detect_divergences``
+back to back on one symbol, each of those used to be recomputed per call.
+They now go through this module:
+
+    key = (symbol, interval, first bar, last bar, bar count, last-bar OHLCV),
+          feature, params
+
+The symbol/interval come from ``frame_context`` (set by the tool handler
+around detection), so a frame without one -- e.g. a detector called
+directly -- is computed as before and not cached. First bar and bar count
+are part of the key so that slices (``df.iloc[-200:]``) and different
+lookback periods of the same series never share ATR/RSI seeds. The last
+bar's OHLCV values are part of it too: a still-forming intraday bar keeps
+its timestamp while its high/low/close move.
+
+Entries live in one byte-bounded ``LRUCache`` (``AFINDR_FEATURE_CACHE_MB``).
+When a frame with a newer last bar -- or the same last bar with new
+values -- arrives for a symbol/interval, every entry cached for its older
+frames is dropped. Cached arrays are read-only
+and swing lists are copies, so a detector cannot corrupt another's input.
+"""
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data.cache import LRUCache
+
+from ._types import SwingPoint
+from ._utils import compute_atr, compute_macd, compute_rsi, compute_vwap, detect_swing_points
+
+FEATURE_CACHE_MB = float(os.getenv("AFINDR_FEATURE_CACHE_MB", "128"))
+
+_cache = LRUCache(max_bytes=int(FEATURE_CACHE_MB * 1024 * 1024))
+
+# (symbol, interval) of the frame the running detectors are looking at
+_frame: ContextVar[Optional[Tuple[str, str]]] = ContextVar("chart_pattern_frame", default=None)
+
+# (symbol, interval) -> (newest last-bar ns, its OHLCV fingerprint, cache keys
+# computed on frames ending there)
+_latest: Dict[Tuple[str, str], Tuple[int, bytes, Set[Hashable]]] = {}
+_latest_lock = threading.Lock()
+
+_NS_PER_DAY = 86_400 * 10**9
+
+_FINGERPRINT_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+@contextlib.contextmanager
+def frame_context(symbol: str, interval: str) -> Iterator[None]:
+    """Cache features of frames detected inside this block under ``symbol``/``interval``."""
+    token = _frame.set((symbol.upper(), interval))
+    try:
+        yield
+    finally:
+        _frame.reset(token)
+
+
+def _frame_key(df: pd.DataFrame) -> Optional[Tuple]:
+    series = _frame.get()
+    if series is None or len(df) == 0 or not isinstance(df.index, pd.DatetimeIndex):
+        return None
+    # Raw bytes rather than floats so a NaN volume still compares equal
+    fingerprint = np.array([df[c].iat[-1] if c in df else np.nan for c in _FINGERPRINT_COLUMNS],
+                           dtype=np.float64).tobytes()
+    return (*series, df.index[0].value, df.index[-1].value, len(df), fingerprint)
+
+
+def _track(frame_key: Tuple, key: Hashable) -> None:
+    """Remember ``key`` under its series; drop the series' older frames on a new or updated bar."""
+    series, last, fingerprint = frame_key[:2], frame_key[3], frame_key[5]
+    with _latest_lock:
+        latest = _latest.get(series)
+        if latest is None or last > latest[0] or (last == latest[0] and fingerprint != latest[1]):
+            if latest is not None:
+                for stale in latest[2]:
+                    _cache.delete(stale)
+            latest = _latest[series] = (last, fingerprint, set())
+        if last == latest[0]:
+            latest[2].add(key)
+
+
+def _cached(df: pd.DataFrame, feature: str, params: Tuple, compute: Callable[[], Any]) -> Any:
+    frame_key = _frame_key(df)
+    if frame_key is None:
+        return compute()
+    key = (frame_key, feature, params)
+    _track(frame_key, key)
+    return _cache.get_or_load_sync(key, compute)
+
+
+def _readonly(*arrays: np.ndarray):
+    for a in arrays:
+        a.flags.writeable = False
+    return arrays if len(arrays) > 1 else arrays[0]
+
+
+# ─── Features ───
+
+def atr(df: pd.DataFrame, period: int = 14) -> np.ndarray:
+    return _cached(df, "atr", (period,), lambda: _readonly(compute_atr(df, period)))
+
+
+def rsi(df: pd.DataFrame, period: int = 14) -> np.ndarray:
+    return _cached(df, "rsi", (period,), lambda: _readonly(compute_rsi(df["close"].values, period)))
+
+
+def macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, ...]:
+    return _cached(df, "macd", (fast, slow, signal),
+                   lambda: _readonly(*compute_macd(df["close"].values, fast, slow, signal)))
+
+
+def vwap(df: pd.DataFrame) -> np.ndarray:
+    return _cached(df, "vwap", (), lambda: _readonly(compute_vwap(df)))
+
+
+def swings(df: pd.DataFrame, lookback: int = 5, lookforward: int = 5) -> List[SwingPoint]:
+    points = _cached(df, "swings", (lookback, lookforward),
+                     lambda: tuple(detect_swing_points(df, lookback, lookforward)))
+    return list(points)
+
+
+def session_ids(df: pd.DataFrame) -> np.ndarray:
+    """Calendar day of each bar in the index's own timezone, as days since 1970-01-01."""
+    def compute():
+        index = pd.DatetimeIndex(df.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)  # wall-clock time
+        return _readonly(index.as_unit("ns").asi8 // _NS_PER_DAY)
+    return _cached(df, "session_ids", (), compute)
+
+
+def stats() -> Dict[str, int]:
+    return _cache.stats()
+
+
+def clear() -> None:
+    with _latest_lock:
+        _latest.clear()
+    _cache.clear()
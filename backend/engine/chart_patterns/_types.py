@@ -22,6 +22,12 @@ class ChartElement:
     id: str
     props: dict = field(default_factory=dict)  # All visual properties
 
+    def to_dict(self) -> dict:
+        """Flatten to the raw element format the frontend expects."""
+        entry = {"type": self.type, "id": self.id}
+        entry.update(self.props)
+        return entry
+
 
 @dataclass
 class ChartPatternResult:
@@ -32,16 +38,30 @@ class ChartPatternResult:
 
     def to_chart_script(self, name: str, script_id: str) -> dict:
         """Convert to the chart_script format the frontend expects."""
-        raw_elements = []
-        for el in self.elements:
-            entry = {"type": el.type, "id": el.id}
-            entry.update(el.props)
-            raw_elements.append(entry)
-
         return {
             "id": script_id,
             "name": name,
             "visible": True,
-            "elements": raw_elements,
+            "elements": [el.to_dict() for el in self.elements],
             "generators": [],
         }
+
+
+@dataclass
+class ChartDelta:
+    """What a streaming detector changed on one bar."""
+    pattern_type: str
+    time: int                                   # Unix seconds of the bar
+    elements: List[ChartElement] = field(default_factory=list)  # new or changed
+    removed: List[str] = field(default_factory=list)            # element ids to drop
+
+    def __bool__(self) -> bool:
+        return bool(self.elements or self.removed)
+
+    def to_dict(self) -> dict:
+        return {
+            "pattern_type": self.pattern_type,
+            "time": self.time,
+            "elements": [el.to_dict() for el in self.elements],
+            "removed": list(self.removed),
+        }
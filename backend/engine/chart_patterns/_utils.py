@@ -2,16 +2,30 @@
 
 Reusable across ICT patterns, key levels, and divergence/volume detectors.
 All functions operate on pandas DataFrames with columns: open, high, low, close, volume.
+
+Every detector goes through these, so they are array code: swing points
+compare each bar with sliding-window maxima/minima of its neighbours
+(``sliding_window_view``), true range is elementwise, and the Wilder
+smoothing recursion behind ATR/RSI runs as a numba kernel when numba is
+installed (``scipy.signal.lfilter`` otherwise).
 """
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
 
 from ._types import SwingPoint
 
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 
 # ─── Timestamp Conversion ───
 
@@ -24,8 +38,37 @@ def ts_to_unix(ts) -> int:
     return int(pd.Timestamp(ts).timestamp())
 
 
+def unix_times(index, positions: Optional[np.ndarray] = None) -> List[int]:
+    """``ts_to_unix`` of ``index[positions]`` (all of ``index`` by default), without boxing each Timestamp."""
+    if positions is None:
+        positions = np.arange(len(index))
+    if isinstance(index, pd.DatetimeIndex):
+        ns = index[positions].as_unit("ns").asi8
+        # Truncate toward zero like int(ts.timestamp())
+        return (np.sign(ns) * (np.abs(ns) // 1_000_000_000)).tolist()
+    return [ts_to_unix(index[i]) for i in positions]
+
+
 # ─── Swing Point Detection ───
 
+def _neighbour_extreme(values: np.ndarray, lookback: int, lookforward: int, fn) -> np.ndarray:
+    """``fn`` (np.max / np.min) of the bars around each centre i in [lookback, n - lookforward).
+
+    Covers values[i - lookback : i] and values[i + 1 : i + lookforward + 1];
+    the centre itself is excluded.
+    """
+    n = len(values)
+    m = n - lookback - lookforward
+    fill = -np.inf if fn is np.max else np.inf
+    left = np.full(m, fill)
+    right = np.full(m, fill)
+    if lookback:
+        left = fn(sliding_window_view(values[:n - lookforward - 1], lookback), axis=1)
+    if lookforward:
+        right = fn(sliding_window_view(values[lookback + 1:], lookforward), axis=1)
+    return fn(np.stack([left, right]), axis=0)
+
+
 def detect_swing_points(
     df: pd.DataFrame,
     lookback: int = 5,
@@ -38,33 +81,31 @@ def detect_swing_points(
 
     Returns SwingPoints sorted by index, with HH/HL/LH/LL classification.
     """
-    highs = df["high"].values
-    lows = df["low"].values
+    highs = df["high"].to_numpy(dtype=float)
+    lows = df["low"].to_numpy(dtype=float)
     n = len(df)
     timestamps = df.index
 
-    swings: List[SwingPoint] = []
-
-    for i in range(lookback, n - lookforward):
-        # Swing high check
-        window_highs = highs[i - lookback : i + lookforward + 1]
-        if highs[i] == window_highs.max() and np.sum(window_highs == highs[i]) == 1:
-            swings.append(SwingPoint(
-                index=i,
-                price=float(highs[i]),
-                timestamp=ts_to_unix(timestamps[i]),
-                type="high",
-            ))
-
-        # Swing low check
-        window_lows = lows[i - lookback : i + lookforward + 1]
-        if lows[i] == window_lows.min() and np.sum(window_lows == lows[i]) == 1:
-            swings.append(SwingPoint(
-                index=i,
-                price=float(lows[i]),
-                timestamp=ts_to_unix(timestamps[i]),
-                type="low",
-            ))
+    if n - lookback - lookforward <= 0:
+        return []
+
+    # Strictly above (below) every other bar in the window: a tie is no swing
+    centre = slice(lookback, n - lookforward)
+    is_high = highs[centre] > _neighbour_extreme(highs, lookback, lookforward, np.max)
+    is_low = lows[centre] < _neighbour_extreme(lows, lookback, lookforward, np.min)
+
+    # By bar, the high before the low on the same bar
+    keys = np.concatenate([np.flatnonzero(is_high) * 2, np.flatnonzero(is_low) * 2 + 1])
+    keys.sort()
+    idx = keys // 2 + lookback
+    is_low_point = (keys & 1).astype(bool)
+    prices = np.where(is_low_point, lows[idx], highs[idx])
+
+    swings: List[SwingPoint] = [
+        SwingPoint(index=i, price=price, timestamp=ts, type="low" if low else "high")
+        for i, price, ts, low in zip(idx.tolist(), prices.tolist(),
+                                     unix_times(timestamps, idx), is_low_point.tolist())
+    ]
 
     # Classify HH/HL/LH/LL
     _classify_swings(swings)
@@ -91,63 +132,134 @@ def _classify_swings(swings: List[SwingPoint]) -> None:
             prev_low = sp.price
 
 
+# ─── First-Crossing Queries ───
+
+class CrossingIndex:
+    """First bar at or after ``start`` whose value reaches a price level.
+
+    With ``below=True`` a bar reaches ``level`` when ``values[j] <= level``
+    (e.g. a low filling a gap), otherwise when ``values[j] >= level``. A
+    sparse table of block minima over power-of-two spans lets a query skip
+    every block that cannot hold a crossing, largest first: O(log n) per
+    query instead of a forward scan, after O(n log n) setup. Queries return
+    ``len(values)`` when the level is never reached; NaN bars never reach it.
+    """
+
+    def __init__(self, values: np.ndarray, below: bool = True):
+        self._sign = 1.0 if below else -1.0
+        # Both directions become "first value <= level" on sign * values
+        v = self._sign * np.asarray(values, dtype=float)
+        v[np.isnan(v)] = np.inf
+        self.n = len(v)
+        self._tables = [v]
+        span = 1
+        while 2 * span <= self.n:
+            prev = self._tables[-1]
+            self._tables.append(np.minimum(prev[:-span], prev[span:]))
+            span *= 2
+
+    def first(self, start: int, level: float) -> int:
+        level = self._sign * level
+        if level != level:  # NaN level: never reached
+            return self.n
+        p = start
+        for k in range(len(self._tables) - 1, -1, -1):
+            span = 1 << k
+            if p + span <= self.n and self._tables[k][p] > level:
+                p += span
+        return p
+
+    def first_many(self, starts: np.ndarray, levels: np.ndarray) -> np.ndarray:
+        """Vectorized ``first`` over paired arrays of starts and levels."""
+        p = np.array(starts, dtype=np.int64)
+        levels = self._sign * np.asarray(levels, dtype=float)
+        for k in range(len(self._tables) - 1, -1, -1):
+            span = 1 << k
+            table = self._tables[k]
+            inside = p + span <= self.n
+            skip = inside & (table[np.where(inside, p, 0)] > levels)
+            p += span * skip
+        p[np.isnan(levels)] = self.n
+        return p
+
+
 # ─── Technical Indicators (vectorized) ───
 
-def compute_atr(df: pd.DataFrame, period: int = 14) -> np.ndarray:
+def _wilder(values, period, start, seed, out):
+    # out[start] = seed, then out[i] = (out[i - 1] * (period - 1) + values[i]) / period
+    prev = seed
+    out[start] = prev
+    for i in range(start + 1, len(values)):
+        prev = (prev * (period - 1) + values[i]) / period
+        out[i] = prev
+
+
+if HAS_NUMBA:
+    _wilder_jit = njit(cache=True, nogil=True)(_wilder)
+
+
+def _wilder_lfilter(values, period, start, seed, out):
+    # Same recursion as a first-order IIR filter: y[i] = x[i] / p + y[i - 1] * (p - 1) / p
+    out[start] = seed
+    if start + 1 < len(values):
+        zi = np.array([seed * (period - 1) / period])
+        out[start + 1:] = lfilter([1.0 / period], [1.0, -(period - 1) / period],
+                                  values[start + 1:], zi=zi)[0]
+
+
+def wilder_smooth(values: np.ndarray, period: int, use_numba: Optional[bool] = None) -> np.ndarray:
+    """Wilder's smoothing (RMA) seeded with the mean of the first ``period`` values.
+
+    Returns an array the length of ``values``; the first ``period - 1`` are NaN.
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    if len(values) < period:
+        return out
+    if use_numba is None:
+        use_numba = HAS_NUMBA
+    if use_numba and not HAS_NUMBA:
+        raise ImportError("numba is not installed")
+    kernel = _wilder_jit if use_numba else _wilder_lfilter
+    kernel(values, period, period - 1, float(np.mean(values[:period])), out)
+    return out
+
+
+def compute_atr(df: pd.DataFrame, period: int = 14, use_numba: Optional[bool] = None) -> np.ndarray:
     """Compute Average True Range (Wilder's smoothing).
 
-    Returns numpy array of length len(df).  First `period` values are NaN.
+    Returns numpy array of length len(df).  First `period - 1` values are NaN.
     """
-    high = df["high"].values.astype(float)
-    low = df["low"].values.astype(float)
-    close = df["close"].values.astype(float)
-
-    tr = np.empty(len(df))
-    tr[0] = high[0] - low[0]
-    for i in range(1, len(df)):
-        tr[i] = max(
-            high[i] - low[i],
-            abs(high[i] - close[i - 1]),
-            abs(low[i] - close[i - 1]),
-        )
-
-    atr = np.full(len(df), np.nan)
-    atr[period - 1] = np.mean(tr[:period])
-    for i in range(period, len(df)):
-        atr[i] = (atr[i - 1] * (period - 1) + tr[i]) / period
-    return atr
-
-
-def compute_rsi(closes: np.ndarray, period: int = 14) -> np.ndarray:
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+    close = df["close"].to_numpy(dtype=float)
+
+    tr = high - low
+    if len(tr) > 1:
+        prev_close = close[:-1]
+        tr[1:] = np.maximum.reduce([tr[1:], np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)])
+    return wilder_smooth(tr, period, use_numba)
+
+
+def compute_rsi(closes: np.ndarray, period: int = 14, use_numba: Optional[bool] = None) -> np.ndarray:
     """Compute RSI using Wilder's smoothing.
 
     Returns numpy array same length as closes.  First `period` values are NaN.
     """
-    closes = closes.astype(float)
+    closes = np.asarray(closes, dtype=float)
     deltas = np.diff(closes)
     gains = np.where(deltas > 0, deltas, 0.0)
     losses = np.where(deltas < 0, -deltas, 0.0)
 
     rsi = np.full(len(closes), np.nan)
+    if len(deltas) < period:
+        return rsi
 
-    avg_gain = np.mean(gains[:period])
-    avg_loss = np.mean(losses[:period])
-
-    if avg_loss == 0:
-        rsi[period] = 100.0
-    else:
+    avg_gain = wilder_smooth(gains, period, use_numba)[period - 1:]
+    avg_loss = wilder_smooth(losses, period, use_numba)[period - 1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
         rs = avg_gain / avg_loss
-        rsi[period] = 100.0 - 100.0 / (1.0 + rs)
-
-    for i in range(period, len(deltas)):
-        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-        if avg_loss == 0:
-            rsi[i + 1] = 100.0
-        else:
-            rs = avg_gain / avg_loss
-            rsi[i + 1] = 100.0 - 100.0 / (1.0 + rs)
-
+        rsi[period:] = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + rs))
     return rsi
 
 
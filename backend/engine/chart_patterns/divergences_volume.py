@@ -10,7 +10,8 @@ import numpy as np
 import pandas as pd
 
 from ._types import ChartElement, ChartPatternResult
-from ._utils import compute_rsi, compute_macd, detect_swing_points, ts_to_unix
+from . import _features as features
+from ._utils import ts_to_unix
 from .chart_palette import DIVERGENCE, VOLUME_PROFILE, VOLUME_SPIKE
 
 MAX_ELEMENTS = 50
@@ -31,10 +32,9 @@ def detect_rsi_divergence(
     Hidden bearish: price makes Lower High but RSI makes Higher High (trend continuation down).
     Hidden bullish: price makes Higher Low but RSI makes Lower Low (trend continuation up).
     """
-    closes = df["close"].values
-    rsi = compute_rsi(closes, rsi_period)
+    rsi = features.rsi(df, rsi_period)
 
-    swings = detect_swing_points(df, lookback=swing_lookback, lookforward=swing_lookback)
+    swings = features.swings(df, lookback=swing_lookback, lookforward=swing_lookback)
 
     elements: List[ChartElement] = []
     div_count = 0
@@ -171,10 +171,9 @@ def detect_macd_divergence(
     slow moving averages — divergence means the trend's acceleration is
     changing even though price keeps moving in the same direction.
     """
-    closes = df["close"].values
-    _, _, histogram = compute_macd(closes, macd_fast, macd_slow, macd_signal)
+    _, _, histogram = features.macd(df, macd_fast, macd_slow, macd_signal)
 
-    swings = detect_swing_points(df, lookback=swing_lookback, lookforward=swing_lookback)
+    swings = features.swings(df, lookback=swing_lookback, lookforward=swing_lookback)
     timestamps = df.index
 
     elements: List[ChartElement] = []
@@ -2,6 +2,10 @@
 
 Detects: Fair Value Gaps, Order Blocks, Breaker Blocks, Liquidity Sweeps,
 Break of Structure / Change of Character, Swing Points, and Killzone Ranges.
+
+When a gap is filled or a block mitigated is answered by ``CrossingIndex``
+(first bar after i whose low/high reaches the level) rather than a forward
+scan per candidate, so full-history detection stays O(n log n).
 """
 from __future__ import annotations
 
@@ -11,7 +15,8 @@ import numpy as np
 import pandas as pd
 
 from ._types import ChartElement, ChartPatternResult, SwingPoint
-from ._utils import compute_atr, detect_swing_points, ts_to_unix
+from . import _features as features
+from ._utils import CrossingIndex, ts_to_unix, unix_times
 from .chart_palette import FVG, OB, BB, STRUCTURE, SWEEP, SWING, KILLZONE
 
 MAX_ELEMENTS = 50
@@ -31,15 +36,24 @@ def detect_fvg(
     Bullish FVG: candle[i-2].high < candle[i].low  (gap up)
     Bearish FVG: candle[i-2].low  > candle[i].high (gap down)
     """
-    atr = compute_atr(df, 14)
+    atr = features.atr(df, 14)
     highs = df["high"].values
     lows = df["low"].values
-    timestamps = df.index
+    times = unix_times(df.index)
     n = len(df)
 
     # Limit scan range — use at least 500 bars to cover recent visible candles
     start = max(2, n - max_age_bars)
 
+    # Fill bar of a gap formed at bar i (n if never filled): first later low
+    # at/below high[i-2] (bullish) or high at/above low[i-2] (bearish)
+    if show_filled and start < n:
+        after = np.arange(start + 1, n + 1)
+        bull_fill = CrossingIndex(lows, below=True).first_many(after, highs[start - 2 : n - 2])
+        bear_fill = CrossingIndex(highs, below=False).first_many(after, lows[start - 2 : n - 2])
+    else:
+        bull_fill = bear_fill = np.full(max(n - start, 0), n)
+
     elements: List[ChartElement] = []
     fvg_count = 0
 
@@ -52,17 +66,13 @@ def detect_fvg(
         if gap > min_gap_atr_ratio * atr[i]:
             top = float(lows[i])
             bottom = float(highs[i - 2])
-            t_start = ts_to_unix(timestamps[i - 2])
+            t_start = times[i - 2]
 
             # Check fill status
-            filled = False
-            t_end = ts_to_unix(timestamps[-1])  # extend to last bar by default
-            if show_filled:
-                for j in range(i + 1, n):
-                    if lows[j] <= bottom:
-                        filled = True
-                        t_end = ts_to_unix(timestamps[j])
-                        break
+            fill_bar = bull_fill[i - start]
+            filled = fill_bar < n
+            # extend to last bar by default
+            t_end = times[fill_bar if filled else -1]
 
             opacity = FVG["bull"]["opacity_filled"] if filled else FVG["bull"]["opacity_active"]
             label = f"{FVG['bull']['label']} (filled)" if filled else FVG["bull"]["label"]
@@ -87,16 +97,12 @@ def detect_fvg(
         if gap > min_gap_atr_ratio * atr[i]:
             top = float(lows[i - 2])
             bottom = float(highs[i])
-            t_start = ts_to_unix(timestamps[i - 2])
-
-            filled = False
-            t_end = ts_to_unix(timestamps[-1])  # extend to last bar by default
-            if show_filled:
-                for j in range(i + 1, n):
-                    if highs[j] >= top:
-                        filled = True
-                        t_end = ts_to_unix(timestamps[j])
-                        break
+            t_start = times[i - 2]
+
+            fill_bar = bear_fill[i - start]
+            filled = fill_bar < n
+            # extend to last bar by default
+            t_end = times[fill_bar if filled else -1]
 
             opacity = FVG["bear"]["opacity_filled"] if filled else FVG["bear"]["opacity_active"]
             label = f"{FVG['bear']['label']} (filled)" if filled else FVG["bear"]["label"]
@@ -150,13 +156,16 @@ def detect_order_blocks(
     Bearish OB: Last green candle before a strong down-move.
     Mitigated OBs become Breaker Blocks with flipped colors.
     """
-    atr = compute_atr(df, 14)
+    atr = features.atr(df, 14)
     opens = df["open"].values
     closes = df["close"].values
     highs = df["high"].values
     lows = df["low"].values
-    timestamps = df.index
+    times = unix_times(df.index)
     n = len(df)
+    # Mitigation: first later low at/below a bull OB's low, high at/above a bear OB's high
+    low_reach = CrossingIndex(lows, below=True)
+    high_reach = CrossingIndex(highs, below=False)
 
     elements: List[ChartElement] = []
     ob_count = 0
@@ -177,20 +186,15 @@ def detect_order_blocks(
                     ob_high = float(highs[k])
                     ob_low = float(lows[k])
                     ob_mid = (ob_high + ob_low) / 2.0
-                    t_start = ts_to_unix(timestamps[k])
+                    t_start = times[k]
 
                     # Check mitigation
-                    mitigated = False
-                    mitigation_bar = None
-                    for j in range(i + 1, n):
-                        if lows[j] <= ob_low:
-                            mitigated = True
-                            mitigation_bar = j
-                            break
+                    mitigation_bar = low_reach.first(i + 1, ob_low)
+                    mitigated = mitigation_bar < n
 
                     if mitigated:
                         # OB box ends at mitigation
-                        t_end = ts_to_unix(timestamps[mitigation_bar])
+                        t_end = times[mitigation_bar]
                         elements.append(ChartElement(
                             type="box",
                             id=f"ob_bull_{i}",
@@ -205,7 +209,7 @@ def detect_order_blocks(
                             },
                         ))
                         # Breaker Block: former bull OB mitigated -> bear BB
-                        bb_end = ts_to_unix(timestamps[-1])
+                        bb_end = times[-1]
                         elements.append(ChartElement(
                             type="box",
                             id=f"bb_bear_{i}",
@@ -220,7 +224,7 @@ def detect_order_blocks(
                             },
                         ))
                     else:
-                        t_end = ts_to_unix(timestamps[-1])
+                        t_end = times[-1]
                         elements.append(ChartElement(
                             type="box",
                             id=f"ob_bull_{i}",
@@ -256,18 +260,13 @@ def detect_order_blocks(
                     ob_high = float(highs[k])
                     ob_low = float(lows[k])
                     ob_mid = (ob_high + ob_low) / 2.0
-                    t_start = ts_to_unix(timestamps[k])
-
-                    mitigated = False
-                    mitigation_bar = None
-                    for j in range(i + 1, n):
-                        if highs[j] >= ob_high:
-                            mitigated = True
-                            mitigation_bar = j
-                            break
+                    t_start = times[k]
+
+                    mitigation_bar = high_reach.first(i + 1, ob_high)
+                    mitigated = mitigation_bar < n
 
                     if mitigated:
-                        t_end = ts_to_unix(timestamps[mitigation_bar])
+                        t_end = times[mitigation_bar]
                         elements.append(ChartElement(
                             type="box",
                             id=f"ob_bear_{i}",
@@ -282,7 +281,7 @@ def detect_order_blocks(
                             },
                         ))
                         # Breaker Block: former bear OB mitigated -> bull BB
-                        bb_end = ts_to_unix(timestamps[-1])
+                        bb_end = times[-1]
                         elements.append(ChartElement(
                             type="box",
                             id=f"bb_bull_{i}",
@@ -297,7 +296,7 @@ def detect_order_blocks(
                             },
                         ))
                     else:
-                        t_end = ts_to_unix(timestamps[-1])
+                        t_end = times[-1]
                         elements.append(ChartElement(
                             type="box",
                             id=f"ob_bear_{i}",
@@ -357,7 +356,7 @@ def detect_liquidity_sweeps(
     A sweep occurs when price takes out a swing high/low by a small amount
     then reverses within N candles.
     """
-    swings = detect_swing_points(df, lookback=swing_lookback, lookforward=swing_lookback)
+    swings = features.swings(df, lookback=swing_lookback, lookforward=swing_lookback)
     highs = df["high"].values
     lows = df["low"].values
     closes = df["close"].values
@@ -478,7 +477,7 @@ def detect_bos_choch(
 
     Trend is established by tracking the last `trend_swings` swing points.
     """
-    swings = detect_swing_points(df, lookback=swing_lookback, lookforward=swing_lookback)
+    swings = features.swings(df, lookback=swing_lookback, lookforward=swing_lookback)
     highs = df["high"].values
     lows = df["low"].values
     timestamps = df.index
@@ -623,7 +622,7 @@ def detect_swing_points_with_labels(
 
     Returns markers at each swing point colored by classification.
     """
-    swings = detect_swing_points(df, lookback=lookback, lookforward=lookforward)
+    swings = features.swings(df, lookback=lookback, lookforward=lookforward)
     timestamps = df.index
 
     elements: List[ChartElement] = []
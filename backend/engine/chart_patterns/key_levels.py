@@ -11,7 +11,8 @@ import numpy as np
 import pandas as pd
 
 from ._types import ChartElement, ChartPatternResult
-from ._utils import compute_atr, compute_vwap, detect_swing_points, ts_to_unix
+from . import _features as features
+from ._utils import ts_to_unix
 from .chart_palette import SESSION_LEVELS, SR
 
 MAX_ELEMENTS = 50
@@ -33,10 +34,10 @@ def detect_support_resistance(
     """
     # Use only last lookback_bars
     df_slice = df.iloc[-lookback_bars:] if len(df) > lookback_bars else df
-    atr = compute_atr(df_slice, 14)
+    atr = features.atr(df_slice, 14)
     avg_atr = float(np.nanmean(atr[~np.isnan(atr)])) if np.any(~np.isnan(atr)) else 1.0
 
-    swings = detect_swing_points(df_slice, lookback=swing_lookback, lookforward=swing_lookback)
+    swings = features.swings(df_slice, lookback=swing_lookback, lookforward=swing_lookback)
     if not swings:
         return ChartPatternResult(pattern_type="support_resistance", metadata={"total_detected": 0})
 
@@ -123,14 +124,11 @@ def detect_session_levels(
 
     if "previous_day" in sessions or "previous_week" in sessions:
         # Group by date
-        df_copy = df.copy()
-        df_copy["date"] = pd.Series(timestamps, index=df_copy.index).dt.date
-
-        dates = sorted(df_copy["date"].unique())
+        days = features.session_ids(df)
+        dates = np.unique(days)
 
         if "previous_day" in sessions and len(dates) >= 2:
-            prev_date = dates[-2]
-            prev_day = df_copy[df_copy["date"] == prev_date]
+            prev_day = df[days == dates[-2]]
 
             if len(prev_day) > 0:
                 pdh = float(prev_day["high"].max())
@@ -158,11 +156,11 @@ def detect_session_levels(
 
         if "previous_week" in sessions and len(dates) >= 7:
             # Find previous week's data
-            df_copy["week"] = pd.Series(timestamps, index=df_copy.index).dt.isocalendar().week.values
-            weeks = sorted(df_copy["week"].unique())
+            week = pd.Series(timestamps, index=df.index).dt.isocalendar().week.values
+            weeks = sorted(np.unique(week))
             if len(weeks) >= 2:
                 prev_week = weeks[-2]
-                pw_data = df_copy[df_copy["week"] == prev_week]
+                pw_data = df[week == prev_week]
 
                 if len(pw_data) > 0:
                     pwh = float(pw_data["high"].max())
@@ -344,19 +342,15 @@ def detect_vwap_bands(
     if std_dev_bands is None:
         std_dev_bands = [1.0, 2.0]
 
-    timestamps = df.index
     elements: List[ChartElement] = []
 
     if anchor == "session":
         # Group by date and compute VWAP per day, use only last day
-        df_copy = df.copy()
-        df_copy["date"] = pd.Series(timestamps, index=df_copy.index).dt.date
-        dates = sorted(df_copy["date"].unique())
+        days = features.session_ids(df)
 
-        if dates:
+        if len(days):
             # Use last trading day for VWAP
-            last_date = dates[-1]
-            day_data = df_copy[df_copy["date"] == last_date]
+            day_data = df[days == days.max()]
 
             if len(day_data) > 0:
                 vwap_vals, vwap_std = _compute_vwap_with_std(day_data)
@@ -425,7 +419,7 @@ def detect_vwap_bands(
                             ))
     else:
         # Full dataset VWAP
-        vwap_vals = compute_vwap(df)
+        vwap_vals = features.vwap(df)
         last_vwap = float(vwap_vals[-1]) if not np.isnan(vwap_vals[-1]) else None
 
         if last_vwap is not None:
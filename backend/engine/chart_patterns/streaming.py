@@ -0,0 +1,705 @@
+"""Incremental (streaming) ICT pattern detectors for live bars.
+
+The ``detect_*`` functions rescan the whole frame on every call. The
+detectors here keep running state instead and advance by one closed bar
+per ``update(bar)``, returning a ``ChartDelta`` with only the elements
+that bar created or changed (a new FVG, an FVG filled, an order block
+mitigated into a breaker, a BOS/CHoCH break, a sweep) and the ids that
+dropped off the chart.
+
+Per-bar cost does not grow with history: open gaps and blocks wait in
+heaps keyed by the price that fills/mitigates them, so a bar pops exactly
+the ones it reaches (O(log n)); swing-based detectors only look at the
+bars inside their confirmation windows.
+
+``snapshot()`` after streaming bars 0..n-1 returns the same elements as
+the batch detector run on those n bars, including the ``MAX_ELEMENTS``
+cap; deltas keep a client's copy in step with it. Open boxes (active
+gaps/blocks, breakers) are sent once with ``timeEnd`` at the bar that
+created them and are meant to run to the latest bar; ``snapshot()``
+stretches them. The only departure from batch output is the sweep
+threshold, whose tick size comes from the running mean close rather
+than the mean over the whole frame.
+
+Usage:
+    det = StreamingFVG()
+    script = det.feed(history_df).to_chart_script("FVG", "live_fvg")
+    for bar in live_bars:            # {"time", "open", "high", "low", "close"}
+        delta = det.update(bar)
+        if delta:
+            push(delta.to_dict())
+"""
+from __future__ import annotations
+
+import bisect
+import heapq
+import inspect
+import math
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from engine.indicators import ATR
+
+from ._types import ChartDelta, ChartElement, ChartPatternResult, SwingPoint
+from ._utils import ts_to_unix, unix_times
+from .chart_palette import BB, FVG, OB, STRUCTURE, SWEEP, SWING
+from .ict_patterns import MAX_ELEMENTS, _get_trend_at
+
+# (time, open, high, low, close)
+Bar = Tuple[int, float, float, float, float]
+
+
+class StreamingDetector:
+    """Base class for streaming pattern detectors.
+
+    Subclasses implement ``_step(i)`` for the bar just appended at index
+    ``i`` and ``_reset()``, and publish elements with ``_put`` /
+    ``_discard`` under an order key that sorts them the way the batch
+    detector lists them. Only the last ``max_elements`` by key are kept,
+    like the batch detector's cap.
+    """
+
+    pattern_type = ""
+
+    def __init__(self, history: int = 1, max_elements: int = MAX_ELEMENTS):
+        self.history = history
+        self.max_elements = max_elements
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.total_detected = 0
+        self._bars: Deque[Bar] = deque(maxlen=self.history)
+        self._keys: List[tuple] = []                    # sorted keys of displayed elements
+        self._shown: Dict[tuple, ChartElement] = {}
+        self._open: set = set()                         # keys whose timeEnd follows the last bar
+        self._changed: Dict[str, tuple] = {}            # id -> key, pending for this bar
+        self._added: set = set()                        # ids first shown on this bar
+        self._removed: List[str] = []
+        self._reset()
+
+    # -- feeding ----------------------------------------------------------
+
+    def update(self, bar: dict) -> ChartDelta:
+        """Advance by one closed bar (``time`` in Unix seconds or a Timestamp)."""
+        self._advance(ts_to_unix(bar["time"]), float(bar["open"]), float(bar["high"]),
+                      float(bar["low"]), float(bar["close"]))
+        return self._flush()
+
+    def feed(self, df: pd.DataFrame) -> ChartPatternResult:
+        """Stream every bar of ``df`` (e.g. history before going live); returns ``snapshot()``."""
+        cols = [df[c].to_numpy(dtype=float).tolist() for c in ("open", "high", "low", "close")]
+        for bar in zip(unix_times(df.index), *cols):
+            self._advance(*bar)
+            self._clear_pending()
+        return self.snapshot()
+
+    def snapshot(self) -> ChartPatternResult:
+        """Every element currently displayed, in batch order."""
+        self._stretch(self._open)
+        return ChartPatternResult(
+            pattern_type=self.pattern_type,
+            elements=[_copy(self._shown[k]) for k in self._keys],
+            metadata={
+                "total_detected": self.total_detected,
+                "displayed": len(self._keys),
+                "bars": self.count,
+                "streaming": True,
+            },
+        )
+
+    @property
+    def last_time(self) -> Optional[int]:
+        return self._bars[-1][0] if self._bars else None
+
+    def _advance(self, t: int, o: float, h: float, l: float, c: float) -> None:
+        self._bars.append((t, o, h, l, c))
+        self.count += 1
+        self._step(self.count - 1)
+
+    def _bar(self, i: int) -> Bar:
+        """Bar ``i`` (absolute index); must be within the last ``history`` bars."""
+        return self._bars[i - self.count]
+
+    # -- publishing -------------------------------------------------------
+
+    def _put(self, key: tuple, element: ChartElement, open_: bool = False) -> None:
+        """Show (or replace) ``element`` at ``key``; ``open_`` boxes run to the last bar."""
+        if key not in self._shown:
+            if len(self._keys) >= self.max_elements and key < self._keys[0]:
+                return  # older than everything displayed: the cap hides it
+            bisect.insort(self._keys, key)
+            self._added.add(element.id)
+            if len(self._keys) > self.max_elements:
+                self._discard(self._keys[0])
+        self._shown[key] = element
+        if open_:
+            self._open.add(key)
+        else:
+            self._open.discard(key)
+        self._changed[element.id] = key
+
+    def _discard(self, key: tuple) -> None:
+        element = self._shown.pop(key, None)
+        if element is None:
+            return
+        self._keys.pop(bisect.bisect_left(self._keys, key))
+        self._open.discard(key)
+        self._changed.pop(element.id, None)
+        if element.id in self._added:
+            self._added.discard(element.id)  # never sent
+        else:
+            self._removed.append(element.id)
+
+    def _stretch(self, keys) -> None:
+        last = self.last_time
+        for key in keys:
+            if key in self._open:
+                self._shown[key].props["timeEnd"] = last
+
+    def _flush(self) -> ChartDelta:
+        keys = list(self._changed.values())
+        self._stretch(keys)
+        delta = ChartDelta(
+            pattern_type=self.pattern_type,
+            time=self.last_time,
+            elements=[_copy(self._shown[k]) for k in keys],
+            removed=self._removed,
+        )
+        self._clear_pending()
+        return delta
+
+    def _clear_pending(self) -> None:
+        self._changed = {}
+        self._added = set()
+        self._removed = []
+
+    def _step(self, i: int) -> None:
+        raise NotImplementedError
+
+    def _reset(self) -> None:
+        raise NotImplementedError
+
+
+def _copy(element: ChartElement) -> ChartElement:
+    return ChartElement(type=element.type, id=element.id, props=dict(element.props))
+
+
+class _SwingTracker:
+    """Swing points as they are confirmed, ``lookforward`` bars after the swing bar.
+
+    Same rule and HH/HL/LH/LL classification as ``detect_swing_points``:
+    strictly above (below) every other high (low) within ``lookback`` /
+    ``lookforward`` bars, the high first when one bar is both.
+    """
+
+    def __init__(self, lookback: int = 5, lookforward: int = 5):
+        self.lookback = lookback
+        self.lookforward = lookforward
+        self._window: Deque[Bar] = deque(maxlen=lookback + lookforward + 1)
+        self._prev_high: Optional[float] = None
+        self._prev_low: Optional[float] = None
+
+    def update(self, i: int, bar: Bar) -> List[SwingPoint]:
+        self._window.append(bar)
+        if len(self._window) < self._window.maxlen:
+            return []
+        window = list(self._window)
+        centre = window[self.lookback]
+        others = window[:self.lookback] + window[self.lookback + 1:]
+        s = i - self.lookforward
+        swings = []
+        if all(centre[2] > b[2] for b in others):
+            label = "HH" if self._prev_high is None or centre[2] > self._prev_high else "LH"
+            self._prev_high = centre[2]
+            swings.append(SwingPoint(index=s, price=centre[2], timestamp=centre[0], type="high",
+                                     classification=label))
+        if all(centre[3] < b[3] for b in others):
+            label = "HL" if self._prev_low is None or centre[3] > self._prev_low else "LL"
+            self._prev_low = centre[3]
+            swings.append(SwingPoint(index=s, price=centre[3], timestamp=centre[0], type="low",
+                                     classification=label))
+        return swings
+
+
+def _side(sp: SwingPoint) -> int:
+    return 0 if sp.type == "high" else 1
+
+
+# ─── Fair Value Gaps ───
+
+class StreamingFVG(StreamingDetector):
+    """``detect_fvg`` one bar at a time.
+
+    A gap formed at bar i is filled by the first later low at/below
+    high[i-2] (bullish) or high at/above low[i-2] (bearish); gaps older
+    than ``max_age_bars`` are removed.
+    """
+
+    pattern_type = "fvg"
+
+    def __init__(self, min_gap_atr_ratio: float = 0.3, show_filled: bool = True,
+                 max_age_bars: int = 500, max_elements: int = MAX_ELEMENTS):
+        self.min_gap_atr_ratio = min_gap_atr_ratio
+        self.show_filled = show_filled
+        self.max_age_bars = max_age_bars
+        super().__init__(history=3, max_elements=max_elements)
+
+    def _reset(self) -> None:
+        self._atr = ATR(14)
+        self._bull: List[Tuple[float, int]] = []   # max-heap on gap bottom: (-bottom, i)
+        self._bear: List[Tuple[float, int]] = []   # min-heap on gap top: (top, i)
+        self._live: Dict[tuple, ChartElement] = {}  # unfilled gaps by key
+        self._formed: Deque[tuple] = deque()       # keys by formation bar, for expiry
+
+    def _step(self, i: int) -> None:
+        t, o, h, l, c = self._bar(i)
+        atr = self._atr.update({"high": h, "low": l, "close": c})
+
+        # Fills: the gaps this bar's low/high reaches
+        while self._bull and -self._bull[0][0] >= l:
+            self._fill((heapq.heappop(self._bull)[1], 0), "bull", t)
+        while self._bear and self._bear[0][0] <= h:
+            self._fill((heapq.heappop(self._bear)[1], 1), "bear", t)
+
+        # Expiry: the batch detector only scans the last max_age_bars bars
+        while self._formed and self._formed[0][0] < self.count - self.max_age_bars:
+            key = self._formed.popleft()
+            self._live.pop(key, None)
+            self._discard(key)
+        if len(self._bull) + len(self._bear) > 2 * len(self._live) + 64:
+            # Expired gaps price never reached: rebuild the heaps from the live ones
+            self._bull = [e for e in self._bull if (e[1], 0) in self._live]
+            self._bear = [e for e in self._bear if (e[1], 1) in self._live]
+            heapq.heapify(self._bull)
+            heapq.heapify(self._bear)
+
+        if i < 2 or self._atr.count < 14 or math.isnan(atr):
+            return
+        t2, _, h2, l2, _ = self._bar(i - 2)
+        threshold = self.min_gap_atr_ratio * atr
+        if l - h2 > threshold:
+            self._open_gap((i, 0), "bull", t2, top=l, bottom=h2)
+            if self.show_filled:
+                heapq.heappush(self._bull, (-h2, i))
+        if l2 - h > threshold:
+            self._open_gap((i, 1), "bear", t2, top=l2, bottom=h)
+            if self.show_filled:
+                heapq.heappush(self._bear, (l2, i))
+
+    def _open_gap(self, key: tuple, side: str, t_start: int, top: float, bottom: float) -> None:
+        element = ChartElement(
+            type="box",
+            id=f"fvg_{side}_{key[0]}",
+            props={
+                "timeStart": t_start,
+                "timeEnd": self.last_time,
+                "priceHigh": top,
+                "priceLow": bottom,
+                "color": FVG[side]["color"],
+                "opacity": FVG[side]["opacity_active"],
+                "label": FVG[side]["label"],
+            },
+        )
+        self._live[key] = element
+        self._formed.append(key)
+        self.total_detected += 1
+        self._put(key, element, open_=True)
+
+    def _fill(self, key: tuple, side: str, t: int) -> None:
+        element = self._live.pop(key, None)
+        if element is None:  # already expired
+            return
+        element.props.update({
+            "timeEnd": t,
+            "opacity": FVG[side]["opacity_filled"],
+            "label": f"{FVG[side]['label']} (filled)",
+        })
+        if key in self._shown:
+            self._put(key, element)
+
+
+# ─── Order Blocks ───
+
+class StreamingOrderBlocks(StreamingDetector):
+    """``detect_order_blocks`` one bar at a time.
+
+    The impulse ending at bar i is judged when bar i + 1 closes (the batch
+    detector never looks at the last bar). A block is mitigated by the
+    first later low at/below its low (bullish) or high at/above its high
+    (bearish), which opens the opposite breaker block.
+    """
+
+    pattern_type = "order_blocks"
+
+    def __init__(self, impulse_atr_multiplier: float = 1.5, impulse_candle_count: int = 3,
+                 max_elements: int = MAX_ELEMENTS):
+        self.impulse_atr_multiplier = impulse_atr_multiplier
+        self.impulse_candle_count = impulse_candle_count
+        super().__init__(history=impulse_candle_count + 3, max_elements=max_elements)
+
+    def _reset(self) -> None:
+        self._atr = ATR(14)
+        self._prev_atr = math.nan
+        self._bull: List[Tuple[float, int]] = []   # max-heap on block low: (-low, i)
+        self._bear: List[Tuple[float, int]] = []   # min-heap on block high: (high, i)
+        self._blocks: Dict[tuple, ChartElement] = {}  # unmitigated block boxes by key
+
+    def _step(self, i: int) -> None:
+        t, o, h, l, c = self._bar(i)
+        atr = self._atr.update({"high": h, "low": l, "close": c})
+        prev_atr, self._prev_atr = self._prev_atr, (atr if self._atr.count >= 14 else math.nan)
+
+        n = self.impulse_candle_count
+        j = i - 1  # impulse end bar
+        if j >= n and not math.isnan(prev_atr):
+            move_up = self._bar(j)[2] - self._bar(j - n)[3]
+            move_down = self._bar(j - n)[3] - self._bar(j)[2]
+            threshold = self.impulse_atr_multiplier * prev_atr
+            candles = range(j, max(j - n - 1, 0) - 1, -1)
+            if move_up >= threshold:
+                for k in candles:
+                    _, ko, kh, kl, kc = self._bar(k)
+                    if kc < ko:  # Red candle
+                        self._open_block(j, "bull", self._bar(k))
+                        heapq.heappush(self._bull, (-kl, j))
+                        break
+            if move_down >= threshold:
+                for k in candles:
+                    _, ko, kh, kl, kc = self._bar(k)
+                    if kc > ko:  # Green candle
+                        self._open_block(j, "bear", self._bar(k))
+                        heapq.heappush(self._bear, (kh, j))
+                        break
+
+        # Mitigation (from the bar after the impulse, so including this one)
+        while self._bull and -self._bull[0][0] >= l:
+            self._mitigate((heapq.heappop(self._bull)[1], 0), "bull", "bear", t)
+        while self._bear and self._bear[0][0] <= h:
+            self._mitigate((heapq.heappop(self._bear)[1], 1), "bear", "bull", t)
+
+    def _open_block(self, j: int, side: str, candle: Bar) -> None:
+        t_start, _, ob_high, ob_low, _ = candle
+        rank = 0 if side == "bull" else 1
+        box = ChartElement(
+            type="box",
+            id=f"ob_{side}_{j}",
+            props={
+                "timeStart": t_start,
+                "timeEnd": self.last_time,
+                "priceHigh": ob_high,
+                "priceLow": ob_low,
+                "color": OB[side]["color"],
+                "opacity": OB[side]["opacity"],
+                "label": OB[side]["label"],
+            },
+        )
+        self._blocks[(j, rank, 0)] = box
+        self._put((j, rank, 0), box, open_=True)
+        self._put((j, rank, 2), ChartElement(
+            type="hline",
+            id=f"ob_mid_{side}_{j}",
+            props={
+                "price": round((ob_high + ob_low) / 2.0, 2),
+                "color": OB["midline"]["color"],
+                "width": OB["midline"]["width"],
+                "style": OB["midline"]["style"],
+            },
+        ))
+        self.total_detected += 1
+
+    def _mitigate(self, key: tuple, side: str, breaker: str, t: int) -> None:
+        j, rank = key
+        box = self._blocks.pop((j, rank, 0))
+        box.props.update({"timeEnd": t, "opacity": 0.06})
+        if (j, rank, 0) in self._shown:
+            self._put((j, rank, 0), box)
+        # Breaker Block: the mitigated block flips to the opposite side
+        self._put((j, rank, 1), ChartElement(
+            type="box",
+            id=f"bb_{breaker}_{j}",
+            props={
+                "timeStart": t,
+                "timeEnd": t,
+                "priceHigh": box.props["priceHigh"],
+                "priceLow": box.props["priceLow"],
+                "color": BB[breaker]["color"],
+                "opacity": BB[breaker]["opacity"],
+                "label": BB[breaker]["label"],
+            },
+        ), open_=True)
+
+
+# ─── Swing-based detectors ───
+
+class _SwingStreamingDetector(StreamingDetector):
+    """Runs a ``_SwingTracker`` and hands each confirmed swing to ``_on_swings``.
+
+    Swings are confirmed ``lookforward`` bars late, so the bars after the
+    swing are kept (``history``) for detectors that need to replay them.
+    """
+
+    def __init__(self, lookback: int, lookforward: int, max_elements: int):
+        self.lookback = lookback
+        self.lookforward = lookforward
+        super().__init__(history=lookforward + 1, max_elements=max_elements)
+
+    def _reset(self) -> None:
+        self._tracker = _SwingTracker(self.lookback, self.lookforward)
+        self._reset_state()
+
+    def _step(self, i: int) -> None:
+        swings = self._tracker.update(i, self._bar(i))
+        self._on_bar(i)
+        if swings:
+            self._on_swings(i, swings)
+
+    def _on_bar(self, i: int) -> None:
+        pass
+
+    def _on_swings(self, i: int, swings: List[SwingPoint]) -> None:
+        raise NotImplementedError
+
+    def _reset_state(self) -> None:
+        pass
+
+
+class StreamingSwingPoints(_SwingStreamingDetector):
+    """``detect_swing_points_with_labels`` one bar at a time."""
+
+    pattern_type = "swing_points"
+
+    def __init__(self, lookback: int = 5, lookforward: int = 5, max_elements: int = MAX_ELEMENTS):
+        super().__init__(lookback, lookforward, max_elements)
+
+    def _on_swings(self, i: int, swings: List[SwingPoint]) -> None:
+        for sp in swings:
+            high = sp.type == "high"
+            self._put((sp.index, _side(sp)), ChartElement(
+                type="marker",
+                id=f"swing_{sp.type}_{sp.index}",
+                props={
+                    "time": sp.timestamp,
+                    "position": "aboveBar" if high else "belowBar",
+                    "shape": "arrowDown" if high else "arrowUp",
+                    "color": SWING.get(sp.classification, SWING["unknown"])["color"],
+                    "text": f"{sp.classification} {sp.price:.2f}",
+                },
+            ))
+            self.total_detected += 1
+
+
+class _PendingSweep:
+    __slots__ = ("sp", "candidates", "found")
+
+    def __init__(self, sp: SwingPoint):
+        self.sp = sp
+        self.candidates: Deque[Tuple[int, int]] = deque()  # (bar, time) through the level
+        self.found: Optional[Tuple[int, int]] = None
+
+
+class StreamingLiquiditySweeps(_SwingStreamingDetector):
+    """``detect_liquidity_sweeps`` one bar at a time.
+
+    Each confirmed swing waits up to 19 bars for a bar through its level
+    (by at most 10x the tick threshold) followed within
+    ``reversal_candles`` by a close back across it.
+    """
+
+    pattern_type = "liquidity_sweeps"
+
+    def __init__(self, sweep_threshold_ticks: float = 2.0, reversal_candles: int = 3,
+                 swing_lookback: int = 5, max_elements: int = MAX_ELEMENTS):
+        self.sweep_threshold_ticks = sweep_threshold_ticks
+        self.reversal_candles = reversal_candles
+        super().__init__(swing_lookback, swing_lookback, max_elements)
+
+    def _reset_state(self) -> None:
+        self._pending: List[_PendingSweep] = []
+        self._close_sum = 0.0
+        self._close_count = 0
+
+    def _on_bar(self, i: int) -> None:
+        close = self._bar(i)[4]
+        if not math.isnan(close):
+            self._close_sum += close
+            self._close_count += 1
+        if self._pending:
+            self._scan(i)
+
+    def _on_swings(self, i: int, swings: List[SwingPoint]) -> None:
+        # Replay the bars between the swing and its confirmation
+        new = [_PendingSweep(sp) for sp in swings]
+        for j in range(swings[0].index + 1, i + 1):
+            self._scan(j, new)
+        self._pending.extend(p for p in new if p.found is None or not self._emit(p, i))
+
+    def _scan(self, j: int, pending: Optional[List[_PendingSweep]] = None) -> None:
+        t, _, h, l, c = self._bar(j)
+        avg_price = self._close_sum / self._close_count if self._close_count else math.nan
+        limit = self.sweep_threshold_ticks * (0.25 if avg_price > 1000 else 0.01) * 10
+        rc = self.reversal_candles
+        keep = []
+        for p in self._pending if pending is None else pending:
+            s, price = p.sp.index, p.sp.price
+            if p.found is None:
+                high = p.sp.type == "high"
+                if j < s + 20 and (h > price and h - price <= limit if high
+                                   else l < price and price - l <= limit):
+                    p.candidates.append((j, t))
+                while p.candidates and j > p.candidates[0][0] + rc:
+                    p.candidates.popleft()
+                if p.candidates and (c < price if high else c > price):
+                    p.found = p.candidates[0]
+            if p.found is not None:
+                if pending is None and self._emit(p, j):
+                    continue
+            elif j >= s + 19 + rc:
+                continue  # no candidate can still reverse
+            keep.append(p)
+        if pending is None:
+            self._pending = keep
+
+    def _emit(self, p: _PendingSweep, j: int) -> bool:
+        """Publish a found sweep once the batch detector would show it (bar j is the last)."""
+        sp = p.sp
+        if sp.index >= j - self.reversal_candles:
+            return False
+        bar, t = p.found
+        rank = _side(sp)
+        high = sp.type == "high"
+        self._put((sp.index, rank, 0), ChartElement(
+            type="marker",
+            id=f"sweep_{sp.type}_{sp.index}_{bar}",
+            props={
+                "time": t,
+                "position": "aboveBar" if high else "belowBar",
+                "shape": "arrowDown" if high else "arrowUp",
+                "color": SWEEP["marker_color"],
+                "text": SWEEP["marker_text"],
+            },
+        ))
+        self._put((sp.index, rank, 1), ChartElement(
+            type="hline",
+            id=f"sweep_level_{sp.type}_{sp.index}",
+            props={
+                "price": sp.price,
+                "color": SWEEP["line_color"],
+                "width": SWEEP["line_width"],
+                "style": SWEEP["line_style"],
+                "label": f"Swept {sp.price:.2f}",
+            },
+        ))
+        self.total_detected += 1
+        return True
+
+
+class StreamingBOSChoCH(_SwingStreamingDetector):
+    """``detect_bos_choch`` one bar at a time.
+
+    Each confirmed swing waits up to 29 bars for a bar beyond its level.
+    The break is a BOS or CHoCH by the trend of the ``2 * trend_swings``
+    swings before it, fixed when the swing is confirmed.
+    """
+
+    pattern_type = "bos_choch"
+
+    def __init__(self, trend_swings: int = 3, swing_lookback: int = 5,
+                 max_elements: int = MAX_ELEMENTS):
+        self.trend_swings = trend_swings
+        super().__init__(swing_lookback, swing_lookback, max_elements)
+
+    def _reset_state(self) -> None:
+        self._recent: Deque[SwingPoint] = deque(maxlen=2 * self.trend_swings)
+        self._pending: List[Tuple[SwingPoint, str]] = []
+
+    def _on_bar(self, i: int) -> None:
+        if self._pending:
+            self._pending = [p for p in self._pending if not self._check(p, i)]
+
+    def _on_swings(self, i: int, swings: List[SwingPoint]) -> None:
+        trend = _get_trend_at(list(self._recent), swings[0].index, self.trend_swings)
+        self._recent.extend(swings)
+        for sp in swings:
+            pending = (sp, trend)
+            if not any(self._check(pending, j) for j in range(sp.index + 1, i + 1)):
+                self._pending.append(pending)
+
+    def _check(self, pending: Tuple[SwingPoint, str], j: int) -> bool:
+        """Whether the swing is resolved at bar j (broken, or out of range)."""
+        sp, trend = pending
+        if j >= sp.index + 30:
+            return True
+        _, _, h, l, _ = self._bar(j)
+        if sp.type == "high":
+            if not h > sp.price:
+                return False
+            style = STRUCTURE["bull"]
+            label = STRUCTURE["choch_label"] if trend == "down" else STRUCTURE["bos_label"]
+        else:
+            if not l < sp.price:
+                return False
+            style = STRUCTURE["bear"]
+            label = STRUCTURE["choch_label"] if trend == "up" else STRUCTURE["bos_label"]
+        self._put((sp.index, _side(sp)), ChartElement(
+            type="hline",
+            id=f"bos_{sp.index}_{j}",
+            props={
+                "price": sp.price,
+                "color": style["color"],
+                "width": style["width"],
+                "style": style["style"],
+                "label": f"{label} {sp.price:.2f}",
+            },
+        ))
+        self.total_detected += 1
+        return True
+
+
+STREAMING_DETECTORS = {
+    "fvg": StreamingFVG,
+    "order_blocks": StreamingOrderBlocks,
+    "liquidity_sweeps": StreamingLiquiditySweeps,
+    "bos_choch": StreamingBOSChoCH,
+    "swing_points": StreamingSwingPoints,
+}
+
+
+def _coerce_param(key: str, value, default):
+    """``value`` as the type of ``default``; ValueError if it isn't one."""
+    if isinstance(default, bool):
+        if isinstance(value, str) and value.lower() in ("true", "false"):
+            return value.lower() == "true"
+        if not isinstance(value, bool):
+            raise ValueError(f"{key} must be true or false, got {value!r}")
+        return value
+    if isinstance(default, (int, float)):
+        try:
+            number = math.nan if isinstance(value, bool) else float(value)
+        except (TypeError, ValueError):
+            number = math.nan
+        if isinstance(default, int):
+            if not number.is_integer() or number < 1:
+                raise ValueError(f"{key} must be a positive integer, got {value!r}")
+            return int(number)
+        if not math.isfinite(number) or number < 0:
+            raise ValueError(f"{key} must be a non-negative number, got {value!r}")
+        return number
+    return value
+
+
+def create_streaming_detector(name: str, params: Optional[dict] = None) -> StreamingDetector:
+    """Streaming detector ``name`` built from the ``params`` its constructor accepts.
+
+    Values are coerced to the type of the parameter's default (so JSON
+    strings like ``"5"`` work); anything that doesn't fit raises ValueError.
+    """
+    cls = STREAMING_DETECTORS[name]
+    accepted = inspect.signature(cls.__init__).parameters
+    kwargs = {}
+    for key, value in (params or {}).items():
+        if key in accepted and key != "self":
+            kwargs[key] = _coerce_param(key, value, accepted[key].default)
+    return cls(**kwargs)
@@ -0,0 +1,614 @@
+"""Streaming (incremental) technical indicators.
+
+Every indicator here keeps a small amount of running state and advances by
+exactly one bar per ``update(bar)`` call, so a strategy that registers its
+indicators in ``__init__`` no longer rebuilds ``ta`` series over the whole
+``history`` slice on every bar (O(n) per bar -> O(1) per bar).
+
+Values mirror the ``ta`` library conventions used by the preset strategies:
+EMA/RSI/MACD follow ``pandas.ewm(adjust=False)``, ATR/ADX use ta's Wilder
+smoothing and seeding, rolling windows require a full window before they
+produce a value, and "not ready yet" is reported as ``NaN`` so comparisons
+behave exactly as they did against pandas Series.
+
+Usage:
+    class MyStrategy(BaseStrategy):
+        def __init__(self, params):
+            super().__init__(params)
+            self.ema = self.add_indicator(EMA(params.get("period", 20)))
+
+        def on_bar(self, bar, history):
+            if self.ema[-1] > self.ema[-2]:
+                ...
+"""
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Deque, NamedTuple, Optional
+
+import numpy as np
+
+NAN = float("nan")
+
+
+# ═══════════════════════════════════════════════════════════════
+# Running-state helpers
+# ═══════════════════════════════════════════════════════════════
+
+class _EWM:
+    """Exponentially weighted mean with ``adjust=False`` semantics.
+
+    Matches ``Series.ewm(alpha=..., adjust=False, min_periods=...).mean()``:
+    leading NaNs are skipped, the first observation seeds the average and
+    ``min_periods`` counts observations (not bars).
+    """
+
+    __slots__ = ("alpha", "min_periods", "mean", "nobs")
+
+    def __init__(self, alpha: float, min_periods: int):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.mean = NAN
+        self.nobs = 0
+
+    def reset(self) -> None:
+        self.mean = NAN
+        self.nobs = 0
+
+    def update(self, x: float) -> float:
+        if x == x:
+            self.nobs += 1
+            if self.mean != self.mean:
+                self.mean = x
+            elif self.mean != x:
+                old_wt = 1.0 - self.alpha
+                self.mean = (old_wt * self.mean + self.alpha * x) / (old_wt + self.alpha)
+        return self.mean if self.nobs >= self.min_periods else NAN
+
+
+class _RollingWindow:
+    """Fixed-size rolling window with O(1) sum / mean / variance.
+
+    Uses compensated summation for the sum and Welford's add/remove update
+    for the variance (the same scheme pandas' rolling aggregations use), so
+    long runs over futures prices do not drift. NaN inputs occupy a slot but
+    are excluded from the statistics, like ``rolling(min_periods=window)``.
+    """
+
+    __slots__ = ("window", "buf", "nobs", "_sum", "_comp", "_mean", "_ssqdm", "_wcomp")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.buf: Deque[float] = deque()
+        self.reset()
+
+    def reset(self) -> None:
+        self.buf.clear()
+        self.nobs = 0
+        self._sum = 0.0
+        self._comp = 0.0
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._wcomp = 0.0
+
+    def _add_sum(self, val: float) -> None:
+        y = val - self._comp
+        t = self._sum + y
+        self._comp = t - self._sum - y
+        self._sum = t
+
+    def _add(self, val: float) -> None:
+        if val != val:
+            return
+        self.nobs += 1
+        self._add_sum(val)
+        prev_mean = self._mean - self._wcomp
+        y = val - self._wcomp
+        t = y - self._mean
+        self._wcomp = t + self._mean - y
+        self._mean = self._mean + t / self.nobs
+        self._ssqdm += (val - prev_mean) * (val - self._mean)
+
+    def _remove(self, val: float) -> None:
+        if val != val:
+            return
+        self.nobs -= 1
+        self._add_sum(-val)
+        if self.nobs:
+            prev_mean = self._mean - self._wcomp
+            y = val - self._wcomp
+            t = y - self._mean
+            self._wcomp = t + self._mean - y
+            self._mean = self._mean - t / self.nobs
+            self._ssqdm -= (val - prev_mean) * (val - self._mean)
+        else:
+            self._sum = self._comp = 0.0
+            self._mean = self._ssqdm = self._wcomp = 0.0
+
+    def push(self, val: float) -> None:
+        if len(self.buf) == self.window:
+            self._remove(self.buf.popleft())
+        self.buf.append(val)
+        self._add(val)
+
+    @property
+    def full(self) -> bool:
+        return self.nobs >= self.window
+
+    def sum(self) -> float:
+        return self._sum if self.full else NAN
+
+    def mean(self) -> float:
+        return self._sum / self.nobs if self.full else NAN
+
+    def std(self, ddof: int = 1) -> float:
+        if not self.full or self.nobs <= ddof:
+            return NAN
+        return math.sqrt(max(self._ssqdm, 0.0) / (self.nobs - ddof))
+
+
+class _RollingExtreme:
+    """Rolling max (or min) over the last ``window`` values via a monotonic deque."""
+
+    __slots__ = ("window", "is_max", "_dq", "_i")
+
+    def __init__(self, window: int, is_max: bool):
+        self.window = window
+        self.is_max = is_max
+        self._dq: Deque[tuple] = deque()
+        self._i = 0
+
+    def reset(self) -> None:
+        self._dq.clear()
+        self._i = 0
+
+    def push(self, val: float) -> float:
+        dq = self._dq
+        if self.is_max:
+            while dq and dq[-1][1] <= val:
+                dq.pop()
+        else:
+            while dq and dq[-1][1] >= val:
+                dq.pop()
+        dq.append((self._i, val))
+        if dq[0][0] <= self._i - self.window:
+            dq.popleft()
+        self._i += 1
+        return dq[0][1] if self._i >= self.window else NAN
+
+
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    if prev_close != prev_close:
+        return high - low
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+def _safe_div(num: float, den: float) -> float:
+    """Float division with pandas semantics (x/0 -> ±inf, 0/0 -> NaN)."""
+    if den == 0:
+        if num == 0 or num != num:
+            return NAN
+        return math.copysign(math.inf, num)
+    return num / den
+
+
+# ═══════════════════════════════════════════════════════════════
+# Indicator base
+# ═══════════════════════════════════════════════════════════════
+
+class Indicator:
+    """Base class for streaming indicators.
+
+    Subclasses implement ``_step(bar)`` returning the value for the new bar
+    and ``_reset()`` to clear running state. The last ``keep`` outputs are
+    retained and addressable with negative indices (``ind[-1]`` is the
+    current bar, ``ind[-2]`` the previous one).
+    """
+
+    def __init__(self, keep: int = 2):
+        self.keep = keep
+        self._values: Deque = deque(maxlen=keep)
+        self.count = 0
+
+    def update(self, bar: dict):
+        value = self._step(bar)
+        self._values.append(value)
+        self.count += 1
+        return value
+
+    def reset(self) -> None:
+        self._values.clear()
+        self.count = 0
+        self._reset()
+
+    @property
+    def value(self):
+        return self._values[-1] if self._values else None
+
+    def __getitem__(self, idx: int):
+        if idx >= 0:
+            raise IndexError("Streaming indicators only support negative indices")
+        return self._values[idx]
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _step(self, bar: dict):
+        raise NotImplementedError
+
+    def _reset(self) -> None:
+        raise NotImplementedError
+
+
+# ═══════════════════════════════════════════════════════════════
+# Single-output indicators
+# ═══════════════════════════════════════════════════════════════
+
+class EMA(Indicator):
+    """Exponential moving average (``ta.trend.EMAIndicator``)."""
+
+    def __init__(self, window: int, source: str = "close", keep: int = 2):
+        super().__init__(keep)
+        self.window = window
+        self.source = source
+        self._ewm = _EWM(2.0 / (window + 1), window)
+
+    def _step(self, bar):
+        return self._ewm.update(float(bar[self.source]))
+
+    def _reset(self):
+        self._ewm.reset()
+
+
+class SMA(Indicator):
+    """Simple moving average over a fixed window of ``source``."""
+
+    def __init__(self, window: int, source: str = "close", keep: int = 2):
+        super().__init__(keep)
+        self.window = window
+        self.source = source
+        self._win = _RollingWindow(window)
+
+    def _step(self, bar):
+        self._win.push(float(bar[self.source]))
+        return self._win.mean()
+
+    def _reset(self):
+        self._win.reset()
+
+
+class RSI(Indicator):
+    """Relative Strength Index with Wilder smoothing (``ta.momentum.RSIIndicator``)."""
+
+    def __init__(self, window: int = 14, source: str = "close", keep: int = 2):
+        super().__init__(keep)
+        self.window = window
+        self.source = source
+        self._up = _EWM(1.0 / window, window)
+        self._down = _EWM(1.0 / window, window)
+        self._prev = NAN
+
+    def _step(self, bar):
+        price = float(bar[self.source])
+        diff = price - self._prev
+        self._prev = price
+        up = diff if diff > 0 else 0.0
+        down = -diff if diff < 0 else 0.0
+        ema_up = self._up.update(up)
+        ema_down = self._down.update(down)
+        if ema_down != ema_down:
+            return NAN
+        if ema_down == 0:
+            return 100.0
+        return 100 - (100 / (1 + ema_up / ema_down))
+
+    def _reset(self):
+        self._up.reset()
+        self._down.reset()
+        self._prev = NAN
+
+
+class ATR(Indicator):
+    """Average True Range (``ta.volatility.AverageTrueRange``).
+
+    Seeded with the mean true range of the first ``window`` bars, then
+    Wilder-smoothed. Like ta, bars before the seed report 0.0.
+    """
+
+    def __init__(self, window: int = 14, keep: int = 2):
+        super().__init__(keep)
+        self.window = window
+        self._reset()
+
+    def _step(self, bar):
+        tr = _true_range(float(bar["high"]), float(bar["low"]), self._prev_close)
+        self._prev_close = float(bar["close"])
+        self._n += 1
+        if self._n < self.window:
+            self._seed.append(tr)
+            return 0.0
+        if self._n == self.window:
+            self._seed.append(tr)
+            self._atr = float(np.mean(self._seed))
+            self._seed = []
+        else:
+            self._atr = (self._atr * (self.window - 1) + tr) / float(self.window)
+        return self._atr
+
+    def _reset(self):
+        self._prev_close = NAN
+        self._n = 0
+        self._seed: list = []
+        self._atr = 0.0
+
+
+# ═══════════════════════════════════════════════════════════════
+# Multi-output indicators
+# ═══════════════════════════════════════════════════════════════
+
+class BollingerValue(NamedTuple):
+    upper: float
+    middle: float
+    lower: float
+
+
+class BollingerBands(Indicator):
+    """Bollinger Bands with population std (``ta.volatility.BollingerBands``)."""
+
+    def __init__(self, window: int = 20, window_dev: float = 2.0, keep: int = 2):
+        super().__init__(keep)
+        self.window = window
+        self.window_dev = window_dev
+        self._win = _RollingWindow(window)
+
+    def _step(self, bar):
+        self._win.push(float(bar["close"]))
+        mavg = self._win.mean()
+        mstd = self._win.std(ddof=0)
+        return BollingerValue(
+            upper=mavg + self.window_dev * mstd,
+            middle=mavg,
+            lower=mavg - self.window_dev * mstd,
+        )
+
+    def _reset(self):
+        self._win.reset()
+
+
+class MACDValue(NamedTuple):
+    macd: float
+    signal: float
+    hist: float
+
+
+class MACD(Indicator):
+    """MACD line, signal line and histogram (``ta.trend.MACD``)."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9, keep: int = 2):
+        super().__init__(keep)
+        self.fast_ema = _EWM(2.0 / (fast + 1), fast)
+        self.slow_ema = _EWM(2.0 / (slow + 1), slow)
+        self.signal_ema = _EWM(2.0 / (signal + 1), signal)
+
+    def _step(self, bar):
+        price = float(bar["close"])
+        macd = self.fast_ema.update(price) - self.slow_ema.update(price)
+        signal = self.signal_ema.update(macd)
+        return MACDValue(macd=macd, signal=signal, hist=macd - signal)
+
+    def _reset(self):
+        self.fast_ema.reset()
+        self.slow_ema.reset()
+        self.signal_ema.reset()
+
+
+class StochasticValue(NamedTuple):
+    k: float
+    d: float
+
+
+class Stochastic(Indicator):
+    """Stochastic oscillator %K / %D (``ta.momentum.StochasticOscillator``)."""
+
+    def __init__(self, window: int = 14, smooth_window: int = 3, keep: int = 2):
+        super().__init__(keep)
+        self.window = window
+        self.smooth_window = smooth_window
+        self._hh = _RollingExtreme(window, is_max=True)
+        self._ll = _RollingExtreme(window, is_max=False)
+        self._d = _RollingWindow(smooth_window)
+
+    def _step(self, bar):
+        smax = self._hh.push(float(bar["high"]))
+        smin = self._ll.push(float(bar["low"]))
+        k = 100 * _safe_div(float(bar["close"]) - smin, smax - smin)
+        # inf/-inf from a flat range are excluded from the %D window, as in pandas
+        self._d.push(k if math.isfinite(k) else NAN)
+        return StochasticValue(k=k, d=self._d.mean())
+
+    def _reset(self):
+        self._hh.reset()
+        self._ll.reset()
+        self._d.reset()
+
+
+class ADXValue(NamedTuple):
+    adx: float
+    plus_di: float
+    minus_di: float
+
+
+class ADX(Indicator):
+    """Average Directional Index with +DI / -DI (``ta.trend.ADXIndicator``).
+
+    Reproduces ta's seeding: the smoothed TR/DM sums start at bar ``window``,
+    +DI/-DI report from bar ``window + 1`` and ADX from bar ``2 * window - 1``;
+    earlier bars report 0.0.
+    """
+
+    def __init__(self, window: int = 14, keep: int = 2):
+        super().__init__(keep)
+        self.window = window
+        self._reset()
+
+    def _step(self, bar):
+        w = self.window
+        high, low, close = float(bar["high"]), float(bar["low"]), float(bar["close"])
+        i = self._n
+        self._n += 1
+        if i == 0:
+            self._prev_high, self._prev_low, self._prev_close = high, low, close
+            return ADXValue(0.0, 0.0, 0.0)
+
+        tr = max(high, self._prev_close) - min(low, self._prev_close)
+        diff_up = high - self._prev_high
+        diff_down = self._prev_low - low
+        pos = diff_up if (diff_up > diff_down and diff_up > 0) else 0.0
+        neg = diff_down if (diff_down > diff_up and diff_down > 0) else 0.0
+        self._prev_high, self._prev_low, self._prev_close = high, low, close
+
+        if i <= w:
+            self._trs += tr
+            self._dip += pos
+            self._din += neg
+        else:
+            self._trs = self._trs - (self._trs / float(w)) + tr
+            self._dip = self._dip - (self._dip / float(w)) + pos
+            self._din = self._din - (self._din / float(w)) + neg
+        if i < w:
+            return ADXValue(0.0, 0.0, 0.0)
+
+        if self._trs != 0:
+            plus_di = 100 * (self._dip / self._trs)
+            minus_di = 100 * (self._din / self._trs)
+        else:
+            plus_di = minus_di = 0.0
+        denom = plus_di + minus_di
+        dx = 100 * abs((plus_di - minus_di) / denom) if denom != 0 else 0.0
+
+        adx = 0.0
+        if i < 2 * w - 1:
+            self._dx_seed.append(dx)
+        elif i == 2 * w - 1:
+            self._dx_seed.append(dx)
+            self._adx = float(np.mean(self._dx_seed))
+            self._dx_seed = []
+            adx = self._adx
+        else:
+            self._adx = ((self._adx * (w - 1)) + dx) / float(w)
+            adx = self._adx
+
+        if i == w:
+            return ADXValue(adx, 0.0, 0.0)
+        return ADXValue(adx, plus_di, minus_di)
+
+    def _reset(self):
+        self._n = 0
+        self._prev_high = self._prev_low = self._prev_close = NAN
+        self._trs = self._dip = self._din = 0.0
+        self._dx_seed: list = []
+        self._adx = 0.0
+
+
+class SuperTrendValue(NamedTuple):
+    upper: float
+    lower: float
+    direction: int  # 1 = up, -1 = down
+
+
+class SuperTrend(Indicator):
+    """SuperTrend bands and direction built on a streaming ATR."""
+
+    def __init__(self, atr_period: int = 10, factor: float = 3.0, keep: int = 2):
+        super().__init__(keep)
+        self.atr_period = atr_period
+        self.factor = factor
+        self._atr = ATR(atr_period, keep=1)
+        self._reset()
+
+    def _step(self, bar):
+        atr = self._atr.update(bar)
+        hl2 = (float(bar["high"]) + float(bar["low"])) / 2
+        upper = hl2 + self.factor * atr
+        lower = hl2 - self.factor * atr
+        close = float(bar["close"])
+        i = self._n
+        self._n += 1
+
+        direction = self._direction
+        if i >= self.atr_period + 1:
+            if upper < self._upper and self._prev_close > self._upper:
+                upper = self._upper
+            if lower > self._lower and self._prev_close < self._lower:
+                lower = self._lower
+            if self._direction == 1:
+                direction = -1 if close < lower else 1
+            else:
+                direction = 1 if close > upper else -1
+
+        self._upper, self._lower = upper, lower
+        self._prev_close = close
+        self._direction = direction
+        return SuperTrendValue(upper=upper, lower=lower, direction=direction)
+
+    def _reset(self):
+        self._atr.reset()
+        self._n = 0
+        self._upper = self._lower = NAN
+        self._prev_close = NAN
+        self._direction = 1
+
+
+class VWAPValue(NamedTuple):
+    vwap: float
+    std: float  # std of (close - vwap); NaN when not ready
+
+
+class VWAP(Indicator):
+    """Volume-weighted average price.
+
+    With ``window`` set, VWAP is rolled over the last ``window`` bars and
+    ``std`` is the rolling sample std of ``close - vwap`` over the same
+    window (the band used by the VWAP deviation preset). With
+    ``window=None`` VWAP is cumulative and ``std`` is the running std of
+    ``close - vwap`` since the anchor.
+    """
+
+    def __init__(self, window: Optional[int] = None, keep: int = 2):
+        super().__init__(keep)
+        self.window = window
+        self._reset()
+
+    def _step(self, bar):
+        tp = (float(bar["high"]) + float(bar["low"]) + float(bar["close"])) / 3
+        vol = float(bar["volume"])
+        if self.window is None:
+            self._pv += tp * vol
+            self._vol += vol
+            vwap = _safe_div(self._pv, self._vol)
+            dev = float(bar["close"]) - vwap
+            self._n += 1
+            delta = dev - self._dev_mean
+            self._dev_mean += delta / self._n
+            self._dev_m2 += delta * (dev - self._dev_mean)
+            std = math.sqrt(self._dev_m2 / (self._n - 1)) if self._n > 1 else NAN
+            return VWAPValue(vwap=vwap, std=std)
+
+        self._pv_win.push(tp * vol)
+        self._vol_win.push(vol)
+        vwap = _safe_div(self._pv_win.sum(), self._vol_win.sum())
+        self._dev_win.push(float(bar["close"]) - vwap)
+        return VWAPValue(vwap=vwap, std=self._dev_win.std(ddof=1))
+
+    def _reset(self):
+        if self.window is None:
+            self._pv = 0.0
+            self._vol = 0.0
+            self._n = 0
+            self._dev_mean = 0.0
+            self._dev_m2 = 0.0
+        else:
+            self._pv_win = _RollingWindow(self.window)
+            self._vol_win = _RollingWindow(self.window)
+            self._dev_win = _RollingWindow(self.window)
@@ -111,6 +111,122 @@ def calculate_metrics(trades: List[Dict], initial_balance: float) -> dict:
     }
 
 
+def calculate_metrics_columns(
+    pnls: np.ndarray,
+    cols: np.ndarray,
+    n_cols: int,
+    initial_balance: float,
+) -> List[dict]:
+    """calculate_metrics for many trade lists at once (one per column).
+
+    Used by parameter sweeps, where each column is one parameter combo.
+    Trades of all columns are passed flat; within a column they must be
+    in chronological order. The per-trade arithmetic is done on a padded
+    (n_cols, max_trades) matrix so the cost does not grow with a Python
+    loop over trades.
+
+    Args:
+        pnls: Per-trade PnL (already rounded like trade["pnl"]).
+        cols: Column index of each trade.
+        n_cols: Number of columns (columns without trades get empty metrics).
+        initial_balance: Starting balance, shared by every column.
+
+    Returns:
+        One metrics dict per column, same keys and values as calculate_metrics.
+    """
+    pnls = np.asarray(pnls, dtype=np.float64)
+    cols = np.asarray(cols, dtype=np.int64)
+    order = np.argsort(cols, kind="stable")
+    pnls, cols = pnls[order], cols[order]
+
+    n = np.bincount(cols, minlength=n_cols)
+    width = max(int(n.max()) if n_cols else 0, 1)
+    starts = np.concatenate(([0], np.cumsum(n)[:-1]))
+    pos = np.arange(len(pnls)) - starts[cols]
+    P = np.zeros((n_cols, width))
+    P[cols, pos] = pnls
+    mask = np.zeros((n_cols, width), dtype=bool)
+    mask[cols, pos] = True
+
+    win = mask & (P > 0)
+    loss = mask & (P <= 0)
+    down = mask & (P < 0)
+    n_win, n_loss, n_down = win.sum(axis=1), loss.sum(axis=1), down.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+
+    def _streak(flags):
+        run = np.cumsum(flags, axis=1)
+        return (run - np.maximum.accumulate(np.where(flags, 0, run), axis=1)).max(axis=1)
+
+    max_consec_wins = _streak(win)
+    max_consec_losses = _streak(loss)
+
+    # Drawdown on the trade-by-trade equity curve (padding keeps it flat)
+    equity = np.cumsum(np.hstack([np.full((n_cols, 1), float(initial_balance)), P]), axis=1)
+    peak = np.maximum.accumulate(equity, axis=1)
+    drawdown = equity - peak
+    max_dd = drawdown.min(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        max_dd_pct = np.where(peak.max(axis=1) > 0, (drawdown / peak).min(axis=1), 0.0)
+
+    total_return = P.sum(axis=1)
+    gross_profit = np.where(win, P, 0.0).sum(axis=1)
+    gross_loss = np.abs(np.where(loss, P, 0.0).sum(axis=1))
+
+    returns = P / initial_balance
+    mean_ret = returns.sum(axis=1) / safe_n
+    std_ret = np.sqrt((np.where(mask, returns - mean_ret[:, None], 0.0) ** 2).sum(axis=1) / safe_n)
+    down_ret = np.where(down, returns, 0.0)
+    down_mean = down_ret.sum(axis=1) / np.maximum(n_down, 1)
+    std_down = np.sqrt((np.where(down, down_ret - down_mean[:, None], 0.0) ** 2).sum(axis=1)
+                       / np.maximum(n_down, 1))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where((n > 1) & (std_ret > 0), mean_ret / std_ret * np.sqrt(252), 0.0)
+        sortino = np.where((n_down > 1) & (std_down > 0), mean_ret / std_down * np.sqrt(252), 0.0)
+        avg_win = np.where(n_win > 0, gross_profit / np.maximum(n_win, 1), 0.0)
+        avg_loss = np.where(n_loss > 0, -gross_loss / np.maximum(n_loss, 1), 0.0)
+
+    empty = calculate_metrics([], initial_balance)
+    out: List[dict] = []
+    for c in range(n_cols):
+        count = int(n[c])
+        if count == 0:
+            out.append(dict(empty))
+            continue
+        tr, dd, dd_pct = float(total_return[c]), float(max_dd[c]), float(max_dd_pct[c])
+        annualized_return_pct = (tr / initial_balance) * (252 / count) * 100
+        expectancy = round(tr / count, 2)
+        avg_loss_abs = abs(float(avg_loss[c])) if n_loss[c] else 1.0
+        dsr, dsr_pvalue = deflated_sharpe_ratio(float(sharpe[c]), count)
+        out.append({
+            "total_trades": count,
+            "win_rate": int(n_win[c]) / count,
+            "loss_rate": int(n_loss[c]) / count,
+            "total_return": round(tr, 2),
+            "total_return_pct": round(tr / initial_balance * 100, 2),
+            "max_drawdown": round(dd, 2),
+            "max_drawdown_pct": round(dd_pct * 100, 2),
+            "max_consecutive_losses": int(max_consec_losses[c]),
+            "max_consecutive_wins": int(max_consec_wins[c]),
+            "profit_factor": round(float(gross_profit[c]) / float(gross_loss[c]), 2)
+            if gross_loss[c] > 0 else 9999.99,
+            "sharpe_ratio": round(float(sharpe[c]), 2),
+            "avg_win": round(float(avg_win[c]), 2) if n_win[c] else 0.0,
+            "avg_loss": round(float(avg_loss[c]), 2) if n_loss[c] else 0.0,
+            "sortino_ratio": round(float(sortino[c]), 2),
+            "calmar_ratio": round(abs(annualized_return_pct / (dd_pct * 100)), 2) if dd_pct < 0 else 0.0,
+            "recovery_factor": round(abs(tr / dd), 2) if dd < 0 else 0.0,
+            "expectancy": expectancy,
+            "expectancy_ratio": round(expectancy / avg_loss_abs, 2) if avg_loss_abs > 0 else 0.0,
+            "payoff_ratio": round(abs(float(avg_win[c]) / float(avg_loss[c])), 2)
+            if n_win[c] and n_loss[c] else 0.0,
+            "deflated_sharpe_ratio": dsr,
+            "dsr_pvalue": dsr_pvalue,
+        })
+    return out
+
+
 def deflated_sharpe_ratio(
     observed_sharpe: float,
     num_trades: int,
@@ -8,6 +8,8 @@ Three methods + composite robustness scoring:
 """
 from __future__ import annotations
 
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass, asdict, field
 from typing import List, Dict, Optional
 
@@ -48,88 +50,206 @@ class MonteCarloResult:
         return asdict(self)
 
 
-def _simulate(
-    pnls: np.ndarray,
-    initial_balance: float,
-    num_simulations: int,
-    ruin_threshold_pct: float,
-    rng: np.random.Generator,
-    sampler: str = "reshuffle",
-    skip_pct: float = 10.0,
-) -> MonteCarloResult:
-    """Core simulation loop supporting different sampling strategies."""
-    n_trades = len(pnls)
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
-    if n_trades == 0:
-        return MonteCarloResult(
-            num_simulations=0, num_trades=0, method=sampler,
-            mean_return=0, median_return=0, std_return=0,
-            percentile_5=0, percentile_25=0, percentile_75=0, percentile_95=0,
-            mean_max_drawdown=0, median_max_drawdown=0,
-            worst_max_drawdown=0, percentile_95_drawdown=0,
-            probability_of_ruin=0, probability_of_profit=0,
-            equity_percentiles={"p5": [], "p25": [], "p50": [], "p75": [], "p95": []},
-        )
-
-    ruin_level = initial_balance * (1 - ruin_threshold_pct / 100.0)
+# Memory budget for one batch of simulated equity paths. Each batch holds
+# about three (batch, n_trades) float64 arrays.
+_CHUNK_BYTES = 64 * 1024 * 1024
 
-    final_returns = np.zeros(num_simulations)
-    max_drawdowns = np.zeros(num_simulations)
-    ruin_count = 0
-
-    # For fan chart we use a fixed-length equity array
-    # Skip method produces shorter sequences, so pad
-    max_len = n_trades + 1
-    all_equity = np.zeros((num_simulations, max_len))
-
-    for i in range(num_simulations):
-        if sampler == "reshuffle":
-            sim_pnls = rng.permutation(pnls)
-        elif sampler == "resample":
-            # Bootstrap: sample with replacement
-            indices = rng.integers(0, n_trades, size=n_trades)
-            sim_pnls = pnls[indices]
-        elif sampler == "skip":
-            # Randomly skip skip_pct% of trades
-            n_skip = max(1, int(n_trades * skip_pct / 100.0))
-            keep_mask = np.ones(n_trades, dtype=bool)
-            skip_indices = rng.choice(n_trades, size=n_skip, replace=False)
-            keep_mask[skip_indices] = False
-            sim_pnls_raw = pnls[keep_mask]
-            # Pad to same length for fan chart
-            sim_pnls = np.zeros(n_trades)
-            sim_pnls[:len(sim_pnls_raw)] = sim_pnls_raw
-        else:
-            sim_pnls = rng.permutation(pnls)
+_SAMPLERS = {"reshuffle": 0, "resample": 1, "skip": 2}
 
-        equity = np.empty(max_len)
-        equity[0] = initial_balance
-        np.cumsum(sim_pnls, out=equity[1:])
-        equity[1:] += initial_balance
 
-        all_equity[i] = equity
-        final_returns[i] = equity[-1] - initial_balance
+def _draw(n_trades: int, rows: int, rng: np.random.Generator, mode: int, n_skip: int) -> np.ndarray:
+    """Random numbers for one batch.
 
-        peak = np.maximum.accumulate(equity)
-        dd = equity - peak
-        max_drawdowns[i] = float(dd.min())
+    Reshuffle: uniforms driving a Fisher-Yates shuffle per row. Resample:
+    bootstrap indices. Skip: uniforms for a partial Fisher-Yates that picks
+    the skipped trades. Both kernels consume the same draws, so they
+    produce identical simulations.
+    """
+    if mode == 1:
+        return rng.integers(0, n_trades, size=(rows, n_trades))
+    if mode == 2:
+        return rng.random((rows, n_skip))
+    return rng.random((rows, n_trades))
+
+
+def _mc_kernel(pnls, draws, mode, n_skip, trade_cols, initial_balance, ruin_level,
+               final_returns, max_drawdowns, ruined, sampled):
+    """Per-row simulation, fused into one pass (compiled with numba)."""
+    rows = draws.shape[0]
+    n = pnls.shape[0]
+    seq = np.empty(n)
+    order = np.empty(n, np.int64)
+    keep = np.empty(n, np.bool_)
+    for r in range(rows):
+        if mode == 0:
+            seq[:] = pnls
+            for i in range(n - 1, 0, -1):
+                j = int(draws[r, i] * (i + 1))
+                tmp = seq[i]
+                seq[i] = seq[j]
+                seq[j] = tmp
+        elif mode == 1:
+            for k in range(n):
+                seq[k] = pnls[int(draws[r, k])]
+        else:
+            for k in range(n):
+                order[k] = k
+                keep[k] = True
+            for s in range(n_skip):
+                i = n - 1 - s
+                j = int(draws[r, s] * (i + 1))
+                tmp = order[i]
+                order[i] = order[j]
+                order[j] = tmp
+                keep[order[i]] = False
+            m = 0
+            for k in range(n):
+                if keep[k]:
+                    seq[m] = pnls[k]
+                    m += 1
+            for k in range(m, n):
+                seq[k] = 0.0
+
+        cum = 0.0
+        peak = 0.0
+        dd = 0.0
+        low = 0.0
+        c = 0
+        for k in range(n):
+            cum += seq[k]
+            if cum > peak:
+                peak = cum
+            if cum - peak < dd:
+                dd = cum - peak
+            if cum < low:
+                low = cum
+            if c < trade_cols.shape[0] and trade_cols[c] == k:
+                sampled[r, c] = cum + initial_balance
+                c += 1
+        final_returns[r] = cum
+        max_drawdowns[r] = dd
+        ruined[r] = low + initial_balance <= ruin_level
+
+
+if HAS_NUMBA:
+    _mc_kernel_jit = njit(cache=True, nogil=True)(_mc_kernel)
+
+
+def _mc_numpy(pnls, draws, mode, n_skip, trade_cols, initial_balance, ruin_level,
+              final_returns, max_drawdowns, ruined, sampled):
+    """Same as _mc_kernel, vectorized along the batch (row) axis."""
+    rows, n = draws.shape[0], len(pnls)
+    ar = np.arange(rows)
+    if mode == 0:
+        cum_pnl = np.tile(pnls, (rows, 1))
+        for i in range(n - 1, 0, -1):
+            j = (draws[:, i] * (i + 1)).astype(np.int64)
+            tmp = cum_pnl[:, i].copy()
+            cum_pnl[:, i] = cum_pnl[ar, j]
+            cum_pnl[ar, j] = tmp
+    elif mode == 1:
+        cum_pnl = pnls[draws]
+    else:
+        order = np.tile(np.arange(n), (rows, 1))
+        for s in range(n_skip):
+            i = n - 1 - s
+            j = (draws[:, s] * (i + 1)).astype(np.int64)
+            tmp = order[:, i].copy()
+            order[:, i] = order[ar, j]
+            order[ar, j] = tmp
+        keep = np.ones((rows, n), dtype=bool)
+        keep[ar[:, None], order[:, n - n_skip:]] = False
+        # Kept trades in original order, zero-padded at the end
+        packed = np.argsort(~keep, axis=1, kind="stable")
+        cum_pnl = np.where(np.take_along_axis(keep, packed, axis=1), pnls[packed], 0.0)
+
+    # Work on cumulative P&L; equity is initial_balance + cum_pnl
+    np.cumsum(cum_pnl, axis=1, out=cum_pnl)
+    final_returns[:] = cum_pnl[:, -1]
+    sampled[:] = cum_pnl[:, trade_cols] + initial_balance
+    lowest = np.minimum(cum_pnl.min(axis=1), 0.0)
+    ruined[:] = lowest + initial_balance <= ruin_level
+    # The peak starts at the initial balance, so the drawdown at each
+    # trade is min(cum_pnl, cum_pnl - running max of cum_pnl)
+    peak = np.maximum.accumulate(cum_pnl, axis=1)
+    np.subtract(cum_pnl, peak, out=peak)
+    max_drawdowns[:] = np.minimum(peak.min(axis=1), lowest)
+
+
+def _empty_result(sampler: str) -> MonteCarloResult:
+    return MonteCarloResult(
+        num_simulations=0, num_trades=0, method=sampler,
+        mean_return=0, median_return=0, std_return=0,
+        percentile_5=0, percentile_25=0, percentile_75=0, percentile_95=0,
+        mean_max_drawdown=0, median_max_drawdown=0,
+        worst_max_drawdown=0, percentile_95_drawdown=0,
+        probability_of_ruin=0, probability_of_profit=0,
+        equity_percentiles={"p5": [], "p25": [], "p50": [], "p75": [], "p95": []},
+    )
 
-        if equity.min() <= ruin_level:
-            ruin_count += 1
 
-    # Compute equity percentiles (subsample for large trade counts)
+def _fan_indices(n_trades: int) -> List[int]:
+    """Equity indices sampled for the fan chart (index 0 = initial balance)."""
     step = max(1, n_trades // 200)
-    indices = list(range(0, max_len, step))
+    indices = list(range(0, n_trades + 1, step))
     if indices[-1] != n_trades:
         indices.append(n_trades)
-    sampled = all_equity[:, indices]
+    return indices
+
 
+def _simulate_chunk(
+    pnls: np.ndarray,
+    rows: int,
+    seed_seq: np.random.SeedSequence,
+    mode: int,
+    n_skip: int,
+    initial_balance: float,
+    ruin_level: float,
+    use_numba: bool,
+) -> tuple:
+    """Simulate one batch of ``rows`` paths with its own RNG stream.
+
+    Returns (final_returns, max_drawdowns, ruined, sampled equity).
+    """
+    trade_cols = np.array(_fan_indices(len(pnls))[1:], dtype=np.int64) - 1
+    final_returns = np.empty(rows)
+    max_drawdowns = np.empty(rows)
+    ruined = np.empty(rows, dtype=bool)
+    sampled = np.empty((rows, len(trade_cols)))
+    draws = _draw(len(pnls), rows, np.random.default_rng(seed_seq), mode, n_skip)
+    kernel = _mc_kernel_jit if use_numba else _mc_numpy
+    kernel(pnls, draws, mode, n_skip, trade_cols, initial_balance, ruin_level,
+           final_returns, max_drawdowns, ruined, sampled)
+    return final_returns, max_drawdowns, ruined, sampled
+
+
+def _summarize(
+    sampler: str,
+    n_trades: int,
+    initial_balance: float,
+    chunks: List[tuple],
+) -> MonteCarloResult:
+    final_returns = np.concatenate([c[0] for c in chunks])
+    max_drawdowns = np.concatenate([c[1] for c in chunks])
+    ruined = np.concatenate([c[2] for c in chunks])
+    num_simulations = len(final_returns)
+    sampled = np.empty((num_simulations, len(_fan_indices(n_trades))))
+    sampled[:, 0] = initial_balance
+    sampled[:, 1:] = np.concatenate([c[3] for c in chunks])
+
+    pct = np.percentile(sampled, [5, 25, 50, 75, 95], axis=0).round(2)
     equity_percentiles = {
-        "p5": np.percentile(sampled, 5, axis=0).round(2).tolist(),
-        "p25": np.percentile(sampled, 25, axis=0).round(2).tolist(),
-        "p50": np.percentile(sampled, 50, axis=0).round(2).tolist(),
-        "p75": np.percentile(sampled, 75, axis=0).round(2).tolist(),
-        "p95": np.percentile(sampled, 95, axis=0).round(2).tolist(),
+        "p5": pct[0].tolist(),
+        "p25": pct[1].tolist(),
+        "p50": pct[2].tolist(),
+        "p75": pct[3].tolist(),
+        "p95": pct[4].tolist(),
     }
 
     return MonteCarloResult(
@@ -147,12 +267,112 @@ def _simulate(
         median_max_drawdown=round(float(np.median(max_drawdowns)), 2),
         worst_max_drawdown=round(float(np.min(max_drawdowns)), 2),
         percentile_95_drawdown=round(float(np.percentile(max_drawdowns, 5)), 2),
-        probability_of_ruin=round(ruin_count / num_simulations * 100, 2),
+        probability_of_ruin=round(float(np.sum(ruined)) / num_simulations * 100, 2),
         probability_of_profit=round(float(np.sum(final_returns > 0)) / num_simulations * 100, 2),
         equity_percentiles=equity_percentiles,
     )
 
 
+def _simulate_methods(
+    pnls: np.ndarray,
+    initial_balance: float,
+    num_simulations: int,
+    ruin_threshold_pct: float,
+    seed: int,
+    samplers: List[str],
+    skip_pct: float = 10.0,
+    chunk_bytes: int = _CHUNK_BYTES,
+    use_numba: Optional[bool] = None,
+    workers: int = 1,
+) -> Dict[str, MonteCarloResult]:
+    """Batched simulation of one or more sampling methods.
+
+    Random draws for a batch of simulations are made as one 2-D array and
+    equity, drawdown and ruin are reduced along each row, in batches sized
+    to ``chunk_bytes``. Only the equity points used by the fan chart are
+    kept per batch. The per-row work runs in a numba kernel when numba is
+    installed, else vectorized in NumPy; both give the same result.
+
+    Every (method, batch) pair gets its own RNG stream spawned from
+    ``seed``, so batches are independent tasks: with ``workers > 1`` they
+    run concurrently on a process pool and the result does not depend on
+    the worker count.
+    """
+    n_trades = len(pnls)
+    if n_trades == 0:
+        return {sampler: _empty_result(sampler) for sampler in samplers}
+
+    ruin_level = initial_balance * (1 - ruin_threshold_pct / 100.0)
+    n_skip = min(n_trades, max(1, int(n_trades * skip_pct / 100.0)))
+    if use_numba is None:
+        use_numba = HAS_NUMBA
+
+    batch = max(1, chunk_bytes // (3 * 8 * n_trades))
+    bounds = [(lo, min(lo + batch, num_simulations)) for lo in range(0, num_simulations, batch)]
+    method_seeds = np.random.SeedSequence(seed).spawn(len(_SAMPLERS))
+
+    tasks = []  # (sampler, args for _simulate_chunk)
+    for sampler in samplers:
+        mode = _SAMPLERS.get(sampler, 0)
+        for (lo, hi), chunk_seed in zip(bounds, method_seeds[mode].spawn(len(bounds))):
+            tasks.append((sampler, (pnls, hi - lo, chunk_seed, mode, n_skip,
+                                    float(initial_balance), ruin_level, use_numba)))
+
+    if workers > 1 and len(tasks) > 1:
+        outputs = [f.result() for f in _submit(workers, [args for _, args in tasks])]
+    else:
+        outputs = [_simulate_chunk(*args) for _, args in tasks]
+
+    return {
+        sampler: _summarize(sampler, n_trades, initial_balance,
+                            [out for (s, _), out in zip(tasks, outputs) if s == sampler])
+        for sampler in samplers
+    }
+
+
+def _simulate(
+    pnls: np.ndarray,
+    initial_balance: float,
+    num_simulations: int,
+    ruin_threshold_pct: float,
+    seed: int,
+    sampler: str = "reshuffle",
+    skip_pct: float = 10.0,
+    chunk_bytes: int = _CHUNK_BYTES,
+    use_numba: Optional[bool] = None,
+    workers: int = 1,
+) -> MonteCarloResult:
+    """Single-method wrapper around _simulate_methods."""
+    return _simulate_methods(
+        pnls, initial_balance, num_simulations, ruin_threshold_pct, seed, [sampler],
+        skip_pct, chunk_bytes, use_numba, workers,
+    )[sampler]
+
+
+# Process pool shared by Monte Carlo calls; the iterative runner calls full
+# mode every iteration, so the pool outlives a single run.
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _submit(workers: int, task_args: List[tuple]) -> List[Future]:
+    """Submit _simulate_chunk tasks to the shared pool, (re)creating it for ``workers``.
+
+    Creation and submission happen under one lock, so concurrent callers
+    never build two pools. A pool replaced for a different ``workers``
+    still runs what was submitted to it (shutdown does not cancel futures).
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_workers = workers
+        return [_pool.submit(_simulate_chunk, *args) for args in task_args]
+
+
 def _compute_robustness(
     reshuffle: MonteCarloResult,
     resample: MonteCarloResult,
@@ -242,6 +462,7 @@ def run_monte_carlo(
     seed: int = 42,
     method: str = "reshuffle",
     skip_pct: float = 10.0,
+    workers: int = 1,
 ) -> MonteCarloResult:
     """Run Monte Carlo simulation on trade P&Ls.
 
@@ -254,32 +475,37 @@ def run_monte_carlo(
         method: "reshuffle" | "resample" | "skip" | "full".
                 "full" runs all three methods and computes robustness score.
         skip_pct: Percentage of trades to skip (for "skip" method).
+        workers: Processes to run simulation batches on (1 = in-process).
+                 Results for a given seed are the same for any value.
 
     Returns:
         MonteCarloResult with distribution statistics.
         In "full" mode, includes robustness_score, robustness_grade, and sub_results.
     """
-    rng = np.random.default_rng(seed)
     pnls = np.array(trade_pnls, dtype=np.float64)
 
     if method == "full":
-        # Run all three methods
-        reshuffle = _simulate(pnls, initial_balance, num_simulations, ruin_threshold_pct, rng, "reshuffle")
-        resample = _simulate(pnls, initial_balance, num_simulations, ruin_threshold_pct, rng, "resample")
-        skip = _simulate(pnls, initial_balance, num_simulations, ruin_threshold_pct, rng, "skip", skip_pct)
+        # Run all three methods (concurrently when workers > 1)
+        results = _simulate_methods(
+            pnls, initial_balance, num_simulations, ruin_threshold_pct, seed,
+            ["reshuffle", "resample", "skip"], skip_pct, workers=workers,
+        )
+        reshuffle, resample, skip = results["reshuffle"], results["resample"], results["skip"]
 
         score, grade = _compute_robustness(reshuffle, resample, skip)
 
         # Use reshuffle as primary result (most standard) but attach sub-results
-        result = reshuffle
-        result.method = "full"
-        result.robustness_score = score
-        result.robustness_grade = grade
-        result.sub_results = {
+        sub_results = {
             "reshuffle": reshuffle.to_dict(),
             "resample": resample.to_dict(),
             "skip": skip.to_dict(),
         }
+        result = reshuffle
+        result.method = "full"
+        result.robustness_score = score
+        result.robustness_grade = grade
+        result.sub_results = sub_results
         return result
     else:
-        return _simulate(pnls, initial_balance, num_simulations, ruin_threshold_pct, rng, method, skip_pct)
+        return _simulate(pnls, initial_balance, num_simulations, ruin_threshold_pct, seed,
+                         method, skip_pct, workers=workers)
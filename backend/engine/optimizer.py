@@ -2,12 +2,23 @@
 
 Supports grid search and random search over strategy parameter space.
 Returns ranked parameter combinations with full metrics.
+
+Both searches can fan combos out over a process pool (``workers=N``).
+The OHLCV frame is copied once into a shared-memory block that every
+worker maps at start-up, so each task only pickles its params dict.
+Strategies compiled from user code don't pickle, so pass their source as
+``strategy_code`` and each worker compiles its own copy.
 """
 from __future__ import annotations
 
+import logging
+import pickle
+from bisect import insort
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass, asdict
 from itertools import product
-from typing import List, Dict
+from multiprocessing import shared_memory
+from typing import Callable, List, Dict, Optional
 
 import numpy as np
 import pandas as pd
@@ -15,6 +26,8 @@ import pandas as pd
 from engine.backtester import Backtester, BacktestConfig
 from engine.metrics import calculate_metrics
 
+logger = logging.getLogger("afindr.optimizer")
+
 
 @dataclass
 class OptimizationResult:
@@ -31,6 +44,154 @@ class OptimizationResult:
         return asdict(self)
 
 
+_OHLCV = ["open", "high", "low", "close", "volume"]
+
+# Per-worker state, set once by init_worker
+_worker_state: dict = {}
+
+
+def _evaluate(strategy_class: type, data: pd.DataFrame, config: BacktestConfig,
+              params: dict, optimization_metric: str) -> Optional[Dict]:
+    """Backtest one param combo; None if the strategy fails."""
+    try:
+        strategy = strategy_class(params)
+        bt = Backtester(strategy, data, config)
+        result = bt.run()
+    except Exception:
+        return None
+    metric_val = result.metrics.get(optimization_metric, 0)
+    if metric_val == float("inf"):
+        metric_val = 999.0
+    return {
+        "params": params,
+        "metrics": result.metrics,
+        "metric_value": round(metric_val, 4),
+    }
+
+
+def share_frame(data: pd.DataFrame):
+    """Copy OHLCV values + index into one shared-memory block.
+
+    Returns (shm, spec) where spec is the small picklable description
+    workers need to rebuild the frame without copying it.
+    """
+    n = len(data)
+    index = data.index
+    tz = None
+    if isinstance(index, pd.DatetimeIndex):
+        tz = str(index.tz) if index.tz is not None else None
+        index_values = index.as_unit("ns").asi8
+        index_kind = "datetime"
+    else:
+        index_values = np.asarray(index, dtype=np.int64)
+        index_kind = "int"
+    shm = shared_memory.SharedMemory(create=True, size=max(n * 6 * 8, 1))
+    values = np.ndarray((n, 5), dtype=np.float64, buffer=shm.buf)
+    values[:] = data[_OHLCV].to_numpy(dtype=np.float64)
+    np.ndarray(n, dtype=np.int64, buffer=shm.buf, offset=n * 5 * 8)[:] = index_values
+    spec = {"name": shm.name, "n": n, "index_kind": index_kind, "tz": tz}
+    return shm, spec
+
+
+def init_worker(spec: dict, strategy_class, config: BacktestConfig,
+                optimization_metric: str) -> None:
+    """Pool initializer: map the frame from ``share_frame``.
+
+    strategy_class may be strategy source to compile. The worker's frame,
+    strategy, config and metric are then available from ``worker_state``.
+    """
+    if isinstance(strategy_class, str):
+        # Classes compiled from user code don't pickle; rebuild from source
+        from agent.sandbox import execute_strategy_code
+        strategy_class = execute_strategy_code(strategy_class)
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    n = spec["n"]
+    values = np.ndarray((n, 5), dtype=np.float64, buffer=shm.buf)
+    index_values = np.ndarray(n, dtype=np.int64, buffer=shm.buf, offset=n * 5 * 8)
+    if spec["index_kind"] == "datetime":
+        index = pd.DatetimeIndex(index_values.view("datetime64[ns]"))
+        if spec["tz"]:
+            index = index.tz_localize("UTC").tz_convert(spec["tz"])
+    else:
+        index = pd.Index(index_values)
+    # Columns are views into the shared block, not copies
+    data = pd.DataFrame(values, index=index, columns=_OHLCV, copy=False)
+    _worker_state.update(shm=shm, data=data, strategy_class=strategy_class,
+                         config=config, optimization_metric=optimization_metric)
+
+
+def worker_state() -> dict:
+    """What ``init_worker`` set up in this process: data, strategy_class, config, optimization_metric."""
+    return _worker_state
+
+
+def _evaluate_in_worker(params: dict) -> Optional[Dict]:
+    st = worker_state()
+    return _evaluate(st["strategy_class"], st["data"], st["config"], params,
+                     st["optimization_metric"])
+
+
+def _run_combos(
+    strategy_class: type,
+    data: pd.DataFrame,
+    config: BacktestConfig,
+    combos: List[dict],
+    optimization_metric: str,
+    top_n: int,
+    workers: int,
+    on_update: Optional[Callable[[List[Dict]], None]],
+    strategy_code: Optional[str] = None,
+) -> List[Dict]:
+    """Evaluate combos serially or on a process pool, ranked best-first.
+
+    on_update, if given, is called with the current top_n ranking every
+    time a result comes in. Ties keep submission order, so the final
+    ranking does not depend on which worker finished first.
+    """
+    ranked: List[tuple] = []  # (-metric_value, combo index, result)
+
+    def add(k: int, res: Optional[Dict]) -> None:
+        if res is None:
+            return
+        insort(ranked, (-res["metric_value"], k, res), key=lambda x: x[:2])
+        if on_update is not None:
+            on_update([r for _, _, r in ranked[:top_n]])
+
+    worker_strategy = strategy_class
+    if workers > 1 and len(combos) > 1:
+        try:
+            pickle.dumps(strategy_class)
+        except Exception:
+            if strategy_code is not None:
+                worker_strategy = strategy_code
+            else:
+                logger.warning("%s can't be pickled and no strategy_code was given; "
+                               "evaluating %d combos serially instead of on %d workers",
+                               strategy_class.__name__, len(combos), workers)
+                workers = 1
+
+    if workers <= 1 or len(combos) <= 1:
+        for k, params in enumerate(combos):
+            add(k, _evaluate(strategy_class, data, config, params, optimization_metric))
+    else:
+        shm, spec = share_frame(data)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(combos)),
+                initializer=init_worker,
+                initargs=(spec, worker_strategy, config, optimization_metric),
+            ) as pool:
+                futures = {pool.submit(_evaluate_in_worker, params): k
+                           for k, params in enumerate(combos)}
+                for fut in as_completed(futures):
+                    add(futures[fut], fut.result())
+        finally:
+            shm.close()
+            shm.unlink()
+
+    return [r for _, _, r in ranked]
+
+
 def grid_search(
     strategy_class: type,
     data: pd.DataFrame,
@@ -38,6 +199,9 @@ def grid_search(
     param_grid: Dict[str, List],
     optimization_metric: str = "profit_factor",
     top_n: int = 20,
+    workers: int = 1,
+    on_update: Optional[Callable[[List[Dict]], None]] = None,
+    strategy_code: Optional[str] = None,
 ) -> OptimizationResult:
     """Exhaustive grid search over parameter space.
 
@@ -48,31 +212,18 @@ def grid_search(
         param_grid: {"param_name": [val1, val2, ...], ...}
         optimization_metric: Metric to maximize (key from calculate_metrics output).
         top_n: Number of top results to return.
+        workers: Processes to spread combos over (1 = run in this process).
+        on_update: Called with the current top_n ranking as results arrive.
+        strategy_code: Source strategy_class was compiled from; workers
+            compile it themselves when the class can't be pickled.
     """
     param_names = list(param_grid.keys())
     param_values = list(param_grid.values())
     all_combos = list(product(*param_values))
 
-    results = []
-    for combo in all_combos:
-        params = dict(zip(param_names, combo))
-        try:
-            strategy = strategy_class(params)
-            bt = Backtester(strategy, data, config)
-            result = bt.run()
-            metric_val = result.metrics.get(optimization_metric, 0)
-            if metric_val == float("inf"):
-                metric_val = 999.0
-            results.append({
-                "params": params,
-                "metrics": result.metrics,
-                "metric_value": round(metric_val, 4),
-            })
-        except Exception:
-            continue
-
-    # Sort by optimization metric descending
-    results.sort(key=lambda x: x["metric_value"], reverse=True)
+    combos = [dict(zip(param_names, combo)) for combo in all_combos]
+    results = _run_combos(strategy_class, data, config, combos, optimization_metric,
+                          top_n, workers, on_update, strategy_code)
 
     # Parameter sensitivity: |correlation| of each param with the metric
     sensitivity: Dict[str, float] = {}
@@ -113,6 +264,9 @@ def random_search(
     num_trials: int = 100,
     top_n: int = 20,
     seed: int = 42,
+    workers: int = 1,
+    on_update: Optional[Callable[[List[Dict]], None]] = None,
+    strategy_code: Optional[str] = None,
 ) -> OptimizationResult:
     """Random search over parameter space.
 
@@ -126,10 +280,14 @@ def random_search(
         num_trials: Number of random parameter combos to test.
         top_n: Number of top results to return.
         seed: Random seed for reproducibility.
+        workers: Processes to spread trials over (1 = run in this process).
+        on_update: Called with the current top_n ranking as results arrive.
+        strategy_code: Source strategy_class was compiled from; workers
+            compile it themselves when the class can't be pickled.
     """
     rng = np.random.default_rng(seed)
 
-    results = []
+    combos = []
     for _ in range(num_trials):
         params: dict = {}
         for name, spec in param_ranges.items():
@@ -141,23 +299,10 @@ def random_search(
                 step = spec.get("step", 1)
                 val = int(rng.integers(low // step, high // step + 1) * step)
                 params[name] = val
+        combos.append(params)
 
-        try:
-            strategy = strategy_class(params)
-            bt = Backtester(strategy, data, config)
-            result = bt.run()
-            metric_val = result.metrics.get(optimization_metric, 0)
-            if metric_val == float("inf"):
-                metric_val = 999.0
-            results.append({
-                "params": params,
-                "metrics": result.metrics,
-                "metric_value": round(metric_val, 4),
-            })
-        except Exception:
-            continue
-
-    results.sort(key=lambda x: x["metric_value"], reverse=True)
+    results = _run_combos(strategy_class, data, config, combos, optimization_metric,
+                          top_n, workers, on_update, strategy_code)
     best = results[0] if results else {"params": {}, "metric_value": 0}
 
     for i, r in enumerate(results[:top_n]):
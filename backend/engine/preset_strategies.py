@@ -16,8 +16,10 @@ Usage via code:
 from __future__ import annotations
 import pandas as pd
 import numpy as np
-import ta
 from engine.strategy import BaseStrategy, Signal
+from engine.indicators import (
+    ADX, ATR, EMA, MACD, RSI, SMA, VWAP, BollingerBands, Stochastic, SuperTrend,
+)
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -29,15 +31,17 @@ from engine.strategy import BaseStrategy, Signal
 class EMACrossover(BaseStrategy):
     """Buy when fast EMA crosses above slow EMA, sell on cross below."""
 
+    def __init__(self, params):
+        super().__init__(params)
+        self.ema_fast = self.add_indicator(EMA(self.params.get("fast_period", 9)))
+        self.ema_slow = self.add_indicator(EMA(self.params.get("slow_period", 21)))
+
     def on_bar(self, bar: dict, history: pd.DataFrame):
-        fast = self.params.get("fast_period", 9)
         slow = self.params.get("slow_period", 21)
         if len(history) < slow + 2:
             return None
-        ema_fast = ta.trend.EMAIndicator(history["close"], window=fast).ema_indicator()
-        ema_slow = ta.trend.EMAIndicator(history["close"], window=slow).ema_indicator()
-        prev_fast, curr_fast = ema_fast.iloc[-2], ema_fast.iloc[-1]
-        prev_slow, curr_slow = ema_slow.iloc[-2], ema_slow.iloc[-1]
+        prev_fast, curr_fast = self.ema_fast[-2], self.ema_fast[-1]
+        prev_slow, curr_slow = self.ema_slow[-2], self.ema_slow[-1]
         if prev_fast <= prev_slow and curr_fast > curr_slow:
             return Signal(action="buy", size=1.0)
         if prev_fast >= prev_slow and curr_fast < curr_slow:
@@ -54,6 +58,10 @@ class EMACrossover(BaseStrategy):
 class RSIMeanReversion(BaseStrategy):
     """Buy on RSI oversold bounce, close on overbought. Fixed SL."""
 
+    def __init__(self, params):
+        super().__init__(params)
+        self.rsi = self.add_indicator(RSI(self.params.get("rsi_period", 14)))
+
     def on_bar(self, bar: dict, history: pd.DataFrame):
         period = self.params.get("rsi_period", 14)
         oversold = self.params.get("oversold", 30)
@@ -61,8 +69,7 @@ class RSIMeanReversion(BaseStrategy):
         sl_points = self.params.get("stop_loss_points", 50)
         if len(history) < period + 2:
             return None
-        rsi = ta.momentum.RSIIndicator(history["close"], window=period).rsi()
-        prev_rsi, curr_rsi = rsi.iloc[-2], rsi.iloc[-1]
+        prev_rsi, curr_rsi = self.rsi[-2], self.rsi[-1]
         if prev_rsi <= oversold and curr_rsi > oversold:
             return Signal(action="buy", size=1.0,
                           stop_loss=bar["close"] - sl_points)
@@ -80,16 +87,18 @@ class RSIMeanReversion(BaseStrategy):
 class BollingerBreakout(BaseStrategy):
     """Long on upper band breakout, short on lower band break. SL at middle band."""
 
+    def __init__(self, params):
+        super().__init__(params)
+        self.bb = self.add_indicator(BollingerBands(
+            self.params.get("bb_period", 20), self.params.get("bb_std", 2.0)))
+        self._prev_close = None
+
     def on_bar(self, bar: dict, history: pd.DataFrame):
         period = self.params.get("bb_period", 20)
-        std = self.params.get("bb_std", 2.0)
+        prev_close, self._prev_close = self._prev_close, bar["close"]
         if len(history) < period + 2:
             return None
-        bb = ta.volatility.BollingerBands(history["close"], window=period, window_dev=std)
-        upper = bb.bollinger_hband().iloc[-1]
-        lower = bb.bollinger_lband().iloc[-1]
-        mid = bb.bollinger_mavg().iloc[-1]
-        prev_close = history["close"].iloc[-2]
+        upper, mid, lower = self.bb[-1]
         curr_close = bar["close"]
         if prev_close <= upper and curr_close > upper:
             return Signal(action="buy", size=1.0, stop_loss=mid)
@@ -107,16 +116,18 @@ class BollingerBreakout(BaseStrategy):
 class MACDMomentum(BaseStrategy):
     """Buy when MACD histogram crosses above zero, sell on cross below."""
 
+    def __init__(self, params):
+        super().__init__(params)
+        self.macd = self.add_indicator(MACD(
+            self.params.get("fast", 12), self.params.get("slow", 26),
+            self.params.get("signal", 9)))
+
     def on_bar(self, bar: dict, history: pd.DataFrame):
-        fast = self.params.get("fast", 12)
         slow = self.params.get("slow", 26)
         signal = self.params.get("signal", 9)
         if len(history) < slow + signal + 2:
             return None
-        macd = ta.trend.MACD(history["close"], window_fast=fast,
-                             window_slow=slow, window_sign=signal)
-        hist = macd.macd_diff()
-        prev_h, curr_h = hist.iloc[-2], hist.iloc[-1]
+        prev_h, curr_h = self.macd[-2].hist, self.macd[-1].hist
         if prev_h <= 0 and curr_h > 0:
             return Signal(action="buy", size=1.0)
         if prev_h >= 0 and curr_h < 0:
@@ -137,6 +148,8 @@ class ATRTrailingStop(BaseStrategy):
         super().__init__(params)
         self._trailing_stop = None
         self._side = None
+        self.atr = self.add_indicator(ATR(self.params.get("atr_period", 14)))
+        self.ema = self.add_indicator(EMA(self.params.get("ema_period", 50)))
 
     def on_bar(self, bar: dict, history: pd.DataFrame):
         atr_period = self.params.get("atr_period", 14)
@@ -144,10 +157,8 @@ class ATRTrailingStop(BaseStrategy):
         ema_period = self.params.get("ema_period", 50)
         if len(history) < max(atr_period, ema_period) + 2:
             return None
-        atr_val = ta.volatility.AverageTrueRange(
-            history["high"], history["low"], history["close"],
-            window=atr_period).average_true_range().iloc[-1]
-        ema_val = ta.trend.EMAIndicator(history["close"], window=ema_period).ema_indicator().iloc[-1]
+        atr_val = self.atr[-1]
+        ema_val = self.ema[-1]
         price = bar["close"]
 
         # Update trailing stop for open position
@@ -190,6 +201,11 @@ class ATRTrailingStop(BaseStrategy):
 class StochasticReversal(BaseStrategy):
     """Buy when Stoch K crosses above D in oversold zone. TP at 50 points."""
 
+    def __init__(self, params):
+        super().__init__(params)
+        self.stoch = self.add_indicator(Stochastic(
+            self.params.get("k_period", 14), self.params.get("d_period", 3)))
+
     def on_bar(self, bar: dict, history: pd.DataFrame):
         k_period = self.params.get("k_period", 14)
         d_period = self.params.get("d_period", 3)
@@ -197,13 +213,8 @@ class StochasticReversal(BaseStrategy):
         sl_points = self.params.get("stop_loss_points", 30)
         if len(history) < k_period + d_period + 2:
             return None
-        stoch = ta.momentum.StochasticOscillator(
-            history["high"], history["low"], history["close"],
-            window=k_period, smooth_window=d_period)
-        k = stoch.stoch().iloc[-1]
-        k_prev = stoch.stoch().iloc[-2]
-        d = stoch.stoch_signal().iloc[-1]
-        d_prev = stoch.stoch_signal().iloc[-2]
+        k, d = self.stoch[-1]
+        k_prev, d_prev = self.stoch[-2]
         # K crosses above D in oversold
         if k_prev <= d_prev and k > d and k < 20:
             return Signal(action="buy", size=1.0,
@@ -226,42 +237,17 @@ class StochasticReversal(BaseStrategy):
 class SuperTrendFollower(BaseStrategy):
     """Follow SuperTrend direction. Flip long/short on direction change."""
 
+    def __init__(self, params):
+        super().__init__(params)
+        self.supertrend = self.add_indicator(SuperTrend(
+            self.params.get("atr_period", 10), self.params.get("factor", 3.0)))
+
     def on_bar(self, bar: dict, history: pd.DataFrame):
         atr_period = self.params.get("atr_period", 10)
-        factor = self.params.get("factor", 3.0)
         if len(history) < atr_period + 3:
             return None
-
-        atr = ta.volatility.AverageTrueRange(
-            history["high"], history["low"], history["close"],
-            window=atr_period).average_true_range()
-        hl2 = (history["high"] + history["low"]) / 2
-        upper_basic = hl2 + factor * atr
-        lower_basic = hl2 - factor * atr
-
-        closes = history["close"]
-        n = len(closes)
-
-        # Compute trailing SuperTrend bands (proper algorithm)
-        final_upper = upper_basic.copy()
-        final_lower = lower_basic.copy()
-        direction = pd.Series(1, index=history.index)  # 1=up, -1=down
-
-        for i in range(atr_period + 1, n):
-            # Upper band: keep previous if close was above it
-            if final_upper.iloc[i] < final_upper.iloc[i - 1] and closes.iloc[i - 1] > final_upper.iloc[i - 1]:
-                final_upper.iloc[i] = final_upper.iloc[i - 1]
-            # Lower band: keep previous if close was below it
-            if final_lower.iloc[i] > final_lower.iloc[i - 1] and closes.iloc[i - 1] < final_lower.iloc[i - 1]:
-                final_lower.iloc[i] = final_lower.iloc[i - 1]
-
-            if direction.iloc[i - 1] == 1:
-                direction.iloc[i] = -1 if closes.iloc[i] < final_lower.iloc[i] else 1
-            else:
-                direction.iloc[i] = 1 if closes.iloc[i] > final_upper.iloc[i] else -1
-
-        prev_dir = direction.iloc[-2]
-        curr_dir = direction.iloc[-1]
+        prev_dir = self.supertrend[-2].direction
+        curr_dir = self.supertrend[-1].direction
 
         if curr_dir == 1 and prev_dir == -1:
             return Signal(action="buy", size=1.0)
@@ -279,22 +265,18 @@ class SuperTrendFollower(BaseStrategy):
 class VWAPDeviation(BaseStrategy):
     """Buy when price drops 2 stddev below VWAP, sell 2 above. SL at 3 stddev."""
 
+    def __init__(self, params):
+        super().__init__(params)
+        # Approximate VWAP using rolling window
+        self.vwap = self.add_indicator(VWAP(window=self.params.get("lookback", 20)))
+
     def on_bar(self, bar: dict, history: pd.DataFrame):
         lookback = self.params.get("lookback", 20)
         std_mult = self.params.get("std_mult", 2.0)
         sl_mult = self.params.get("sl_mult", 3.0)
         if len(history) < lookback + 2:
             return None
-        # Approximate VWAP using rolling window
-        tp = (history["high"] + history["low"] + history["close"]) / 3
-        vol = history["volume"]
-        cum_tp_vol = (tp * vol).rolling(lookback).sum()
-        cum_vol = vol.rolling(lookback).sum()
-        vwap = cum_tp_vol / cum_vol
-        std = (history["close"] - vwap).rolling(lookback).std()
-
-        vwap_val = vwap.iloc[-1]
-        std_val = std.iloc[-1]
+        vwap_val, std_val = self.vwap[-1]
         if pd.isna(vwap_val) or pd.isna(std_val) or std_val == 0:
             return None
         price = bar["close"]
@@ -323,20 +305,18 @@ class VWAPDeviation(BaseStrategy):
 class ADXTrendStrength(BaseStrategy):
     """Trade only in strong trends (ADX > threshold). Direction from DI+/DI-."""
 
+    def __init__(self, params):
+        super().__init__(params)
+        self.adx = self.add_indicator(ADX(self.params.get("adx_period", 14)))
+
     def on_bar(self, bar: dict, history: pd.DataFrame):
         adx_period = self.params.get("adx_period", 14)
         adx_threshold = self.params.get("adx_threshold", 25)
         sl_points = self.params.get("stop_loss_points", 40)
         if len(history) < adx_period * 2:
             return None
-        adx_ind = ta.trend.ADXIndicator(
-            history["high"], history["low"], history["close"],
-            window=adx_period)
-        adx = adx_ind.adx().iloc[-1]
-        di_plus = adx_ind.adx_pos().iloc[-1]
-        di_minus = adx_ind.adx_neg().iloc[-1]
-        prev_di_plus = adx_ind.adx_pos().iloc[-2]
-        prev_di_minus = adx_ind.adx_neg().iloc[-2]
+        adx, di_plus, di_minus = self.adx[-1]
+        _, prev_di_plus, prev_di_minus = self.adx[-2]
         if pd.isna(adx):
             return None
         # Only trade in strong trends
@@ -363,6 +343,13 @@ class MultiFactorConfluence(BaseStrategy):
     """Score-based entry: EMA trend + RSI momentum + volume confirmation.
     Requires 2/3 factors aligned. ATR-based SL/TP."""
 
+    def __init__(self, params):
+        super().__init__(params)
+        self.ema = self.add_indicator(EMA(self.params.get("ema_period", 50)))
+        self.rsi = self.add_indicator(RSI(self.params.get("rsi_period", 14)))
+        self.atr = self.add_indicator(ATR(self.params.get("atr_period", 14)))
+        self.avg_vol = self.add_indicator(SMA(self.params.get("vol_lookback", 20), source="volume"))
+
     def on_bar(self, bar: dict, history: pd.DataFrame):
         ema_period = self.params.get("ema_period", 50)
         rsi_period = self.params.get("rsi_period", 14)
@@ -375,12 +362,10 @@ class MultiFactorConfluence(BaseStrategy):
             return None
 
         price = bar["close"]
-        ema = ta.trend.EMAIndicator(history["close"], window=ema_period).ema_indicator().iloc[-1]
-        rsi = ta.momentum.RSIIndicator(history["close"], window=rsi_period).rsi().iloc[-1]
-        atr_val = ta.volatility.AverageTrueRange(
-            history["high"], history["low"], history["close"],
-            window=atr_period).average_true_range().iloc[-1]
-        avg_vol = history["volume"].rolling(vol_lookback).mean().iloc[-1]
+        ema = self.ema[-1]
+        rsi = self.rsi[-1]
+        atr_val = self.atr[-1]
+        avg_vol = self.avg_vol[-1]
         curr_vol = bar["volume"]
 
         if pd.isna(ema) or pd.isna(rsi) or pd.isna(atr_val) or pd.isna(avg_vol):
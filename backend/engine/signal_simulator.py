@@ -0,0 +1,411 @@
+"""Native SL/TP exit simulator for vectorized (VectorBTStrategy) signals.
+
+Turns the boolean arrays of a TradeSignal — plus optional per-bar
+stop-loss / take-profit price levels — into trades and an equity curve
+without vectorbt. Fill rules are the same as engine.backtester.Backtester,
+so a VectorBTStrategy and an equivalent bar-by-bar BaseStrategy produce the
+same trades:
+
+  - market entries/exits fill at the bar close ± slippage
+  - stops are checked against the bar high/low from the bar after entry,
+    stop-loss before take-profit, and fill exactly at the stop level
+  - an opposite entry while in a position flips it (close + open)
+  - commission is charged on open and on close
+  - MAE/MFE are tracked on closes while the position is open
+  - an open position is closed at the last bar's close
+
+Two interchangeable kernels are provided: a per-bar loop compiled with
+numba when it is installed, and a pure-NumPy "trade walk" that jumps from
+one entry/exit event to the next with searchsorted and only scans bars
+inside open trades. Both handle millions of bars per second.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+@dataclass
+class SignalSimulation:
+    """Raw simulator output: one row per trade plus the per-bar equity."""
+    entry_idx: np.ndarray     # int64
+    exit_idx: np.ndarray      # int64
+    side: np.ndarray          # int8, 1 = long, -1 = short
+    entry_price: np.ndarray
+    exit_price: np.ndarray
+    stop_loss: np.ndarray     # NaN = none
+    take_profit: np.ndarray   # NaN = none
+    pnl_points: np.ndarray
+    pnl: np.ndarray
+    mae: np.ndarray
+    mfe: np.ndarray
+    equity: np.ndarray        # float64, marked to market at each close
+
+    @property
+    def num_trades(self) -> int:
+        return len(self.entry_idx)
+
+
+def _signal_loop(high, low, close, long_entry, long_exit, short_entry, short_exit,
+                 sl_arr, tp_arr, slippage, commission, point_value, size, initial_balance):
+    """Per-bar reference kernel (compiled with numba when available)."""
+    n = close.shape[0]
+    t_entry = np.empty(n, np.int64)
+    t_exit = np.empty(n, np.int64)
+    t_side = np.empty(n, np.int8)
+    t_entry_px = np.empty(n, np.float64)
+    t_exit_px = np.empty(n, np.float64)
+    t_sl = np.empty(n, np.float64)
+    t_tp = np.empty(n, np.float64)
+    t_pts = np.empty(n, np.float64)
+    t_pnl = np.empty(n, np.float64)
+    t_mae = np.empty(n, np.float64)
+    t_mfe = np.empty(n, np.float64)
+    equity = np.empty(n, np.float64)
+
+    balance = initial_balance
+    pos = 0
+    entry_idx = 0
+    entry_px = 0.0
+    sl = np.nan
+    tp = np.nan
+    mae = 0.0
+    mfe = 0.0
+    k = 0
+
+    for i in range(n):
+        # 1. Stops, checked on bars after the entry bar
+        if pos != 0:
+            hit = False
+            px = 0.0
+            if pos == 1:
+                if sl == sl and low[i] <= sl:
+                    hit = True
+                    px = sl
+                elif tp == tp and high[i] >= tp:
+                    hit = True
+                    px = tp
+            else:
+                if sl == sl and high[i] >= sl:
+                    hit = True
+                    px = sl
+                elif tp == tp and low[i] <= tp:
+                    hit = True
+                    px = tp
+            if hit:
+                pts = (px - entry_px) if pos == 1 else (entry_px - px)
+                pnl = pts * point_value * size
+                balance += pnl - commission
+                t_entry[k] = entry_idx
+                t_exit[k] = i
+                t_side[k] = pos
+                t_entry_px[k] = entry_px
+                t_exit_px[k] = px
+                t_sl[k] = sl
+                t_tp[k] = tp
+                t_pts[k] = pts
+                t_pnl[k] = pnl
+                t_mae[k] = mae
+                t_mfe[k] = mfe
+                k += 1
+                pos = 0
+
+        # 2. Excursion tracking
+        if pos != 0:
+            if pos == 1:
+                exc = (close[i] - entry_px) * point_value * size
+            else:
+                exc = (entry_px - close[i]) * point_value * size
+            mfe = max(mfe, exc)
+            mae = min(mae, exc)
+
+        # 3. Signals
+        close_now = False
+        open_side = 0
+        if pos == 0:
+            if long_entry[i]:
+                open_side = 1
+            elif short_entry[i]:
+                open_side = -1
+        elif pos == 1:
+            if long_exit[i]:
+                close_now = True
+            elif short_entry[i]:
+                close_now = True
+                open_side = -1
+        else:
+            if short_exit[i]:
+                close_now = True
+            elif long_entry[i]:
+                close_now = True
+                open_side = 1
+
+        if close_now:
+            if pos == 1:
+                px = close[i] - slippage
+                pts = px - entry_px
+            else:
+                px = close[i] + slippage
+                pts = entry_px - px
+            pnl = pts * point_value * size
+            balance += pnl - commission
+            t_entry[k] = entry_idx
+            t_exit[k] = i
+            t_side[k] = pos
+            t_entry_px[k] = entry_px
+            t_exit_px[k] = px
+            t_sl[k] = sl
+            t_tp[k] = tp
+            t_pts[k] = pts
+            t_pnl[k] = pnl
+            t_mae[k] = mae
+            t_mfe[k] = mfe
+            k += 1
+            pos = 0
+
+        if open_side != 0:
+            pos = open_side
+            entry_idx = i
+            entry_px = close[i] + slippage if pos == 1 else close[i] - slippage
+            sl = sl_arr[i]
+            tp = tp_arr[i]
+            balance -= commission
+            mae = 0.0
+            mfe = 0.0
+
+        # 4. Mark to market
+        if pos == 1:
+            equity[i] = balance + (close[i] - entry_px) * point_value * size
+        elif pos == -1:
+            equity[i] = balance + (entry_px - close[i]) * point_value * size
+        else:
+            equity[i] = balance
+
+    if pos != 0:
+        last = n - 1
+        if pos == 1:
+            px = close[last] - slippage
+            pts = px - entry_px
+        else:
+            px = close[last] + slippage
+            pts = entry_px - px
+        pnl = pts * point_value * size
+        t_entry[k] = entry_idx
+        t_exit[k] = last
+        t_side[k] = pos
+        t_entry_px[k] = entry_px
+        t_exit_px[k] = px
+        t_sl[k] = sl
+        t_tp[k] = tp
+        t_pts[k] = pts
+        t_pnl[k] = pnl
+        t_mae[k] = mae
+        t_mfe[k] = mfe
+        k += 1
+
+    return (t_entry[:k], t_exit[:k], t_side[:k], t_entry_px[:k], t_exit_px[:k],
+            t_sl[:k], t_tp[:k], t_pts[:k], t_pnl[:k], t_mae[:k], t_mfe[:k], equity)
+
+
+if HAS_NUMBA:
+    _signal_loop_jit = njit(cache=True, nogil=True)(_signal_loop)
+
+
+def _next(indices: np.ndarray, start: int, n: int) -> int:
+    """First value in sorted ``indices`` that is >= start, or n if none."""
+    pos = np.searchsorted(indices, start)
+    return int(indices[pos]) if pos < len(indices) else n
+
+
+def _signal_trade_walk(high, low, close, long_entry, long_exit, short_entry, short_exit,
+                       sl_arr, tp_arr, slippage, commission, point_value, size, initial_balance):
+    """NumPy kernel: same semantics as _signal_loop, one Python step per trade."""
+    n = close.shape[0]
+    entry_events = np.flatnonzero(long_entry | short_entry)
+    long_exit_events = np.flatnonzero(long_exit | short_entry)
+    short_exit_events = np.flatnonzero(short_exit | long_entry)
+
+    trades = []
+    unrealized = np.zeros(n, dtype=np.float64)
+    balance_marks = []  # (bar index, balance after that bar)
+    balance = initial_balance
+
+    i = _next(entry_events, 0, n)
+    side = 1 if i < n and long_entry[i] else -1
+    while i < n:
+        entry_px = close[i] + slippage if side == 1 else close[i] - slippage
+        sl, tp = sl_arr[i], tp_arr[i]
+        balance -= commission
+
+        # First opposing signal after the entry bar
+        signal_exit = _next(long_exit_events if side == 1 else short_exit_events, i + 1, n)
+
+        # First stop hit in (entry, signal_exit] — stops are checked before signals
+        stop_exit, stop_px = n, 0.0
+        has_sl, has_tp = sl == sl, tp == tp
+        if (has_sl or has_tp) and i + 1 < n:
+            hi = min(signal_exit, n - 1) + 1
+            h, lo = high[i + 1:hi], low[i + 1:hi]
+            if side == 1:
+                sl_hit = lo <= sl if has_sl else np.zeros(len(h), dtype=bool)
+                tp_hit = h >= tp if has_tp else np.zeros(len(h), dtype=bool)
+            else:
+                sl_hit = h >= sl if has_sl else np.zeros(len(h), dtype=bool)
+                tp_hit = lo <= tp if has_tp else np.zeros(len(h), dtype=bool)
+            hits = sl_hit | tp_hit
+            if hits.any():
+                j = int(np.argmax(hits))
+                stop_exit = i + 1 + j
+                stop_px = sl if sl_hit[j] else tp
+
+        if stop_exit < n:
+            exit_bar, exit_px, last_open = stop_exit, stop_px, stop_exit - 1
+        elif signal_exit < n:
+            exit_bar, last_open = signal_exit, signal_exit
+            exit_px = close[exit_bar] - slippage if side == 1 else close[exit_bar] + slippage
+        else:
+            exit_bar, last_open = n - 1, n - 1
+            exit_px = close[exit_bar] - slippage if side == 1 else close[exit_bar] + slippage
+
+        path = close[i + 1:last_open + 1]
+        if side == 1:
+            exc = (path - entry_px) * point_value * size
+            unrealized[i:exit_bar] = (close[i:exit_bar] - entry_px) * point_value * size
+            pts = exit_px - entry_px
+        else:
+            exc = (entry_px - path) * point_value * size
+            unrealized[i:exit_bar] = (entry_px - close[i:exit_bar]) * point_value * size
+            pts = entry_px - exit_px
+        mae = min(0.0, float(exc.min())) if len(exc) else 0.0
+        mfe = max(0.0, float(exc.max())) if len(exc) else 0.0
+        pnl = pts * point_value * size
+        trades.append((i, exit_bar, side, entry_px, exit_px, sl, tp, pts, pnl, mae, mfe))
+
+        if stop_exit >= n and signal_exit >= n:
+            # Force-closed after the loop: the last bar is still marked open
+            unrealized[n - 1] = (close[n - 1] - entry_px if side == 1 else entry_px - close[n - 1]) \
+                * point_value * size
+            balance_marks.append((i, balance))
+            break
+
+        if stop_exit < n:
+            balance_marks.append((i, balance))
+            balance += pnl - commission
+            balance_marks.append((exit_bar, balance))
+            i = _next(entry_events, exit_bar, n)
+            if i < n:
+                side = 1 if long_entry[i] else -1
+            continue
+
+        balance_marks.append((i, balance))
+        balance += pnl - commission
+        flip = not (long_exit[exit_bar] if side == 1 else short_exit[exit_bar])
+        if flip:
+            i, side = exit_bar, -side
+        else:
+            balance_marks.append((exit_bar, balance))
+            i = _next(entry_events, exit_bar + 1, n)
+            if i < n:
+                side = 1 if long_entry[i] else -1
+
+    # Step function of the balance after each bar (later marks on a bar win)
+    balance_curve = np.full(n, initial_balance, dtype=np.float64)
+    if balance_marks:
+        mark_bars = np.array([b for b, _ in balance_marks], dtype=np.int64)
+        mark_vals = np.array([v for _, v in balance_marks], dtype=np.float64)
+        pos = np.searchsorted(mark_bars, np.arange(n), side="right") - 1
+        valid = pos >= 0
+        balance_curve[valid] = mark_vals[pos[valid]]
+    equity = balance_curve + unrealized
+
+    if trades:
+        cols = list(zip(*trades))
+        out = (
+            np.array(cols[0], np.int64), np.array(cols[1], np.int64), np.array(cols[2], np.int8),
+            *(np.array(c, np.float64) for c in cols[3:]),
+        )
+    else:
+        out = (np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.int8),
+               *(np.empty(0, np.float64) for _ in range(8)))
+    return (*out, equity)
+
+
+def _as_bool(arr: Optional[np.ndarray], n: int) -> np.ndarray:
+    if arr is None:
+        return np.zeros(n, dtype=np.bool_)
+    arr = np.asarray(arr)
+    if arr.shape != (n,):
+        raise ValueError(f"Signal array has shape {arr.shape}, expected ({n},)")
+    if arr.dtype != np.bool_:
+        # pandas/vbt signals can arrive as object or float arrays with NaN
+        arr = np.nan_to_num(arr.astype(np.float64)) != 0
+    return np.ascontiguousarray(arr)
+
+
+def _as_levels(arr: Optional[np.ndarray], n: int) -> np.ndarray:
+    if arr is None:
+        return np.full(n, np.nan, dtype=np.float64)
+    arr = np.ascontiguousarray(np.asarray(arr, dtype=np.float64))
+    if arr.shape != (n,):
+        raise ValueError(f"Stop array has shape {arr.shape}, expected ({n},)")
+    return arr
+
+
+def simulate_signals(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    entries: np.ndarray,
+    exits: np.ndarray,
+    short_entries: Optional[np.ndarray] = None,
+    short_exits: Optional[np.ndarray] = None,
+    stop_loss: Optional[np.ndarray] = None,
+    take_profit: Optional[np.ndarray] = None,
+    slippage: float = 0.0,
+    commission: float = 0.0,
+    point_value: float = 1.0,
+    size: float = 1.0,
+    initial_balance: float = 0.0,
+    use_numba: Optional[bool] = None,
+) -> SignalSimulation:
+    """Simulate long/short trades from signal arrays with optional stops.
+
+    Args:
+        high, low, close: Price arrays (same length n).
+        entries / exits: Long entry / exit booleans.
+        short_entries / short_exits: Short entry / exit booleans (optional).
+        stop_loss / take_profit: Absolute price levels per bar, read on the
+            entry bar and held for the life of the trade; NaN = no stop.
+        slippage: Price slippage applied to market fills (points).
+        commission: Flat commission per side.
+        point_value: Dollar value of one point.
+        size: Contracts per trade.
+        initial_balance: Starting account balance for the equity curve.
+        use_numba: Force the compiled (True) or NumPy (False) kernel;
+            default picks numba when installed.
+    """
+    close = np.ascontiguousarray(np.asarray(close, dtype=np.float64))
+    n = close.shape[0]
+    args = (
+        np.ascontiguousarray(np.asarray(high, dtype=np.float64)),
+        np.ascontiguousarray(np.asarray(low, dtype=np.float64)),
+        close,
+        _as_bool(entries, n), _as_bool(exits, n),
+        _as_bool(short_entries, n), _as_bool(short_exits, n),
+        _as_levels(stop_loss, n), _as_levels(take_profit, n),
+        float(slippage), float(commission), float(point_value), float(size), float(initial_balance),
+    )
+    if use_numba is None:
+        use_numba = HAS_NUMBA
+    if use_numba and not HAS_NUMBA:
+        raise ImportError("numba is not installed. Install with: pip install numba")
+    kernel = _signal_loop_jit if use_numba else _signal_trade_walk
+    return SignalSimulation(*kernel(*args))
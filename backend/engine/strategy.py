@@ -17,6 +17,29 @@ class BaseStrategy:
 
     def __init__(self, params: dict):
         self.params = params
+        self._indicators: list = []
+
+    def add_indicator(self, indicator):
+        """Register a streaming indicator (see engine.indicators).
+
+        Registered indicators are advanced by the backtester once per bar,
+        before on_bar() is called, so on_bar() can read ``ind[-1]`` /
+        ``ind[-2]`` without recomputing anything over ``history``.
+        """
+        if not hasattr(self, "_indicators"):
+            self._indicators = []
+        self._indicators.append(indicator)
+        return indicator
+
+    def update_indicators(self, bar: dict) -> None:
+        """Advance every registered indicator by one bar."""
+        for indicator in getattr(self, "_indicators", ()):
+            indicator.update(bar)
+
+    def reset_indicators(self) -> None:
+        """Clear indicator state so the strategy can be replayed from bar 0."""
+        for indicator in getattr(self, "_indicators", ()):
+            indicator.reset()
 
     def on_bar(self, bar: dict, history: pd.DataFrame) -> Optional[Signal]:
         """Called for each bar. Return a Signal or None."""
@@ -21,8 +21,9 @@ try:
 except ImportError:
     HAS_VBT = False
 
-from engine.backtester import BacktestConfig, BacktestResult
-from engine.metrics import calculate_metrics
+from engine.backtester import BacktestConfig, BacktestResult, ohlcv_columns
+from engine.metrics import calculate_metrics, calculate_metrics_columns
+from engine.signal_simulator import simulate_signals
 from engine.vbt_strategy import VectorBTStrategy, TradeSignal
 
 
@@ -43,61 +44,73 @@ def run_signals_backtest(
     strategy: VectorBTStrategy,
     data: pd.DataFrame,
     config: BacktestConfig,
+    use_numba: Optional[bool] = None,
 ) -> BacktestResult:
     """Fallback: run a VectorBTStrategy without VectorBT installed.
 
-    Uses the strategy's generate_signals() to get boolean arrays, then
-    simulates trades bar-by-bar. Produces the same BacktestResult format.
+    Uses the strategy's generate_signals() to get signal arrays (long,
+    short and optional SL/TP levels), then simulates them with
+    engine.signal_simulator using the same fill rules as the bar-by-bar
+    Backtester. Produces the same BacktestResult format.
     """
-    signals = strategy.generate_signals(data)
-    close = data["close"].values
-    rows = data.reset_index()
-
-    balance = config.initial_balance
-    trades: list[dict] = []
-    equity_curve: list[dict] = []
-    trade_id = 0
-    in_position = False
-    entry_price = 0.0
-    entry_time = 0
-    entry_idx = 0
-
-    for i in range(len(rows)):
-        row = rows.iloc[i]
-        ts = int(row.iloc[0].timestamp()) if hasattr(row.iloc[0], "timestamp") else int(row.iloc[0])
-        price = float(close[i])
-
-        if not in_position and bool(signals.entries[i]):
-            in_position = True
-            entry_price = price
-            entry_time = ts
-            entry_idx = i
-        elif in_position and bool(signals.exits[i]):
-            pnl_points = price - entry_price
-            pnl = pnl_points * config.point_value - config.commission * 2
-            balance += pnl
-            trade_id += 1
-            trades.append({
-                "id": trade_id,
-                "instrument": "N/A",
-                "side": "long",
-                "size": 1,
-                "entry_price": entry_price,
-                "exit_price": price,
-                "entry_time": entry_time,
-                "exit_time": ts,
-                "stop_loss": None,
-                "take_profit": None,
-                "pnl": round(pnl, 2),
-                "pnl_points": round(pnl_points, 2),
-                "commission": config.commission * 2,
-            })
-            in_position = False
+    return _simulate_signals_result(strategy.generate_signals(data), data, config, use_numba)
 
-        equity_curve.append({"time": ts, "value": round(balance, 2)})
+
+def _has_stops(signals: TradeSignal) -> bool:
+    return signals.stop_loss is not None or signals.take_profit is not None
+
+
+def _simulate_signals_result(
+    signals: TradeSignal,
+    data: pd.DataFrame,
+    config: BacktestConfig,
+    use_numba: Optional[bool] = None,
+) -> BacktestResult:
+    cols = ohlcv_columns(data)
+    sim = simulate_signals(
+        cols["high"], cols["low"], cols["close"],
+        signals.entries, signals.exits,
+        short_entries=signals.short_entries, short_exits=signals.short_exits,
+        stop_loss=signals.stop_loss, take_profit=signals.take_profit,
+        slippage=config.slippage_ticks * config.tick_size,
+        commission=config.commission,
+        point_value=config.point_value,
+        initial_balance=config.initial_balance,
+        use_numba=use_numba,
+    )
+
+    times = cols["time"].tolist()
+    trades = [
+        {
+            "id": k + 1,
+            "instrument": "N/A",
+            "side": "long" if side == 1 else "short",
+            "size": 1,
+            "entry_price": round(entry_px, 2),
+            "exit_price": round(exit_px, 2),
+            "entry_time": times[entry_i],
+            "exit_time": times[exit_i],
+            "stop_loss": None if sl != sl else sl,
+            "take_profit": None if tp != tp else tp,
+            "pnl": round(pnl, 2),
+            "pnl_points": round(pts, 2),
+            "commission": config.commission * 2,
+            "mae": round(mae, 2),
+            "mfe": round(mfe, 2),
+        }
+        for k, (entry_i, exit_i, side, entry_px, exit_px, sl, tp, pts, pnl, mae, mfe) in enumerate(zip(
+            sim.entry_idx.tolist(), sim.exit_idx.tolist(), sim.side.tolist(),
+            sim.entry_price.tolist(), sim.exit_price.tolist(),
+            sim.stop_loss.tolist(), sim.take_profit.tolist(),
+            sim.pnl_points.tolist(), sim.pnl.tolist(), sim.mae.tolist(), sim.mfe.tolist(),
+        ))
+    ]
 
     metrics = calculate_metrics(trades, config.initial_balance)
-    return BacktestResult(trades=trades, equity_curve=equity_curve, metrics=metrics)
+    return BacktestResult(
+        trades=trades, metrics=metrics,
+        equity_times=cols["time"], equity_values=np.round(sim.equity, 2),
+    )
 
 
 def run_vbt_backtest(
@@ -112,6 +125,12 @@ def run_vbt_backtest(
         data: OHLCV DataFrame.
         config: Backtest configuration (initial_balance, commission, etc.).
 
+    Signals that carry SL/TP levels are simulated with
+    engine.signal_simulator instead: Portfolio.from_signals only takes
+    stops as fractions of its own (percent-slippage) entry price, so the
+    absolute levels would not fill where the bar-by-bar Backtester fills
+    them.
+
     Returns:
         BacktestResult compatible with the bar-by-bar backtester output.
     """
@@ -121,6 +140,8 @@ def run_vbt_backtest(
         )
 
     signals = strategy.generate_signals(data)
+    if _has_stops(signals):
+        return _simulate_signals_result(signals, data, config)
 
     # Build VectorBT portfolio
     close = data["close"]
@@ -152,17 +173,27 @@ def run_vbt_backtest(
     return _portfolio_to_result(pf, data, config)
 
 
+# Rough bytes per (bar, combo) cell of a sweep chunk: four bool signal
+# columns plus the float64 cash/position/value buffers of the simulation.
+_SWEEP_BYTES_PER_CELL = 40
+
+
 def run_vbt_sweep(
     strategy_class: type,
     data: pd.DataFrame,
     config: BacktestConfig,
     param_grid: Dict[str, List],
     optimization_metric: str = "sharpe_ratio",
+    max_chunk_bytes: int = 256 * 1024 * 1024,
 ) -> SweepResult:
     """Run a vectorized parameter sweep.
 
-    Tests all combinations of parameters in param_grid simultaneously
-    using VectorBT's broadcasting. Much faster than sequential grid search.
+    Every combination's signals are stacked into a 2-D (bars x combos)
+    matrix and simulated in one Portfolio.from_signals call per column
+    chunk (chunks are sized to stay under ``max_chunk_bytes``). Metrics for
+    all combos are then derived from the flat trade records at once.
+    Without VectorBT installed the columns are simulated with
+    engine.signal_simulator instead.
 
     Args:
         strategy_class: A VectorBTStrategy subclass.
@@ -170,31 +201,42 @@ def run_vbt_sweep(
         config: Backtest configuration.
         param_grid: {"param_name": [val1, val2, ...]} for each parameter.
         optimization_metric: Metric to rank results by.
+        max_chunk_bytes: Memory budget for one simulated column chunk.
 
     Returns:
         SweepResult with metrics for every combination and best params.
     """
-    if not HAS_VBT:
-        raise ImportError("vectorbt is not installed")
-
     from itertools import product
 
     param_names = list(param_grid.keys())
     param_values = list(param_grid.values())
     all_combos = list(product(*param_values))
+    n_bars = len(data)
 
-    results: List[Dict] = []
-
-    for combo in all_combos:
+    # Signal generation stays per combo; everything after it is columnar
+    results: List[Dict] = [{} for _ in all_combos]
+    ok: List[int] = []
+    signals: List[TradeSignal] = []
+    for k, combo in enumerate(all_combos):
         params = dict(zip(param_names, combo))
         try:
-            strategy = strategy_class(params)
-            result = run_vbt_backtest(strategy, data, config)
-            result.metrics["params"] = params
-            results.append(result.metrics)
+            signals.append(strategy_class(params).generate_signals(data))
+            ok.append(k)
         except Exception:
             # Skip failed parameter combos
-            results.append({"params": params, "error": True})
+            results[k] = {"params": params, "error": True}
+
+    chunk = max(1, max_chunk_bytes // max(n_bars * _SWEEP_BYTES_PER_CELL, 1))
+    simulate = _simulate_chunk_vbt if HAS_VBT else _simulate_chunk_native
+    for lo in range(0, len(ok), chunk):
+        block = signals[lo:lo + chunk]
+        try:
+            pnls, cols = simulate(block, data, config)
+            chunk_metrics = calculate_metrics_columns(pnls, cols, len(block), config.initial_balance)
+        except Exception:
+            chunk_metrics = [{"error": True}] * len(block)
+        for k, metrics in zip(ok[lo:lo + chunk], chunk_metrics):
+            results[k] = {**metrics, "params": dict(zip(param_names, all_combos[k]))}
 
     # Filter valid results and find best
     valid_results = [r for r in results if not r.get("error")]
@@ -237,6 +279,80 @@ def run_vbt_sweep(
     )
 
 
+def _stack_signals(block: List[TradeSignal], n_bars: int) -> Dict[str, np.ndarray]:
+    """Stack per-combo signal arrays into (n_bars, n_combos) bool matrices."""
+    def column(arr):
+        return np.zeros(n_bars, dtype=bool) if arr is None else np.asarray(arr, dtype=bool)
+
+    stacked = {
+        "entries": np.column_stack([column(s.entries) for s in block]),
+        "exits": np.column_stack([column(s.exits) for s in block]),
+    }
+    if any(s.short_entries is not None for s in block):
+        stacked["short_entries"] = np.column_stack([column(s.short_entries) for s in block])
+        stacked["short_exits"] = np.column_stack([column(s.short_exits) for s in block])
+    return stacked
+
+
+def _simulate_chunk_vbt(block: List[TradeSignal], data: pd.DataFrame, config: BacktestConfig):
+    """One Portfolio.from_signals over a column chunk -> flat (pnls, cols).
+
+    Columns that carry SL/TP levels are simulated natively, for the same
+    reason run_vbt_backtest does, so rankings do not depend on the backend.
+    """
+    stopped = np.array([_has_stops(s) for s in block], dtype=bool)
+    if stopped.any():
+        parts = [
+            (idx, simulate([block[c] for c in idx], data, config))
+            for idx, simulate in ((np.flatnonzero(stopped), _simulate_chunk_native),
+                                  (np.flatnonzero(~stopped), _simulate_chunk_vbt))
+            if len(idx)
+        ]
+        return (np.concatenate([pnls for _, (pnls, _) in parts]),
+                np.concatenate([idx[cols] for idx, (_, cols) in parts]))
+
+    close = data["close"]
+    avg_price = float(close.mean())
+    stacked = _stack_signals(block, len(data))
+    pf = vbt.Portfolio.from_signals(
+        close=close,
+        **{k: pd.DataFrame(v, index=data.index) for k, v in stacked.items()},
+        init_cash=config.initial_balance,
+        fees=config.commission / (avg_price * config.point_value) if avg_price > 0 else 0.0,
+        slippage=config.slippage_ticks * config.tick_size / avg_price if avg_price > 0 else 0.0,
+        size=1.0,
+        size_type="amount",
+        accumulate=False,
+        freq="1D",
+    )
+    # Same per-trade PnL as _portfolio_to_result, from the raw record array
+    records = pf.trades.values
+    points = records["exit_price"] - records["entry_price"]
+    points = np.where(records["direction"] == 0, points, -points)
+    pnls = np.round(points * config.point_value * records["size"], 2)
+    return pnls, records["col"]
+
+
+def _simulate_chunk_native(block: List[TradeSignal], data: pd.DataFrame, config: BacktestConfig):
+    """Simulate a column chunk with engine.signal_simulator -> flat (pnls, cols)."""
+    cols = ohlcv_columns(data)
+    pnls, owners = [], []
+    for c, sig in enumerate(block):
+        sim = simulate_signals(
+            cols["high"], cols["low"], cols["close"], sig.entries, sig.exits,
+            short_entries=sig.short_entries, short_exits=sig.short_exits,
+            stop_loss=sig.stop_loss, take_profit=sig.take_profit,
+            slippage=config.slippage_ticks * config.tick_size,
+            commission=config.commission,
+            point_value=config.point_value,
+        )
+        pnls.append(np.round(sim.pnl, 2))
+        owners.append(np.full(sim.num_trades, c, dtype=np.int64))
+    if not pnls:
+        return np.empty(0), np.empty(0, dtype=np.int64)
+    return np.concatenate(pnls), np.concatenate(owners)
+
+
 def _portfolio_to_result(
     pf, data: pd.DataFrame, config: BacktestConfig
 ) -> BacktestResult:
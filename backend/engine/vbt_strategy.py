@@ -30,6 +30,9 @@ class TradeSignal:
     exits: np.ndarray         # True where we exit long
     short_entries: Optional[np.ndarray] = None  # True where we enter short
     short_exits: Optional[np.ndarray] = None    # True where we exit short
+    # Absolute SL/TP price per bar, read on the entry bar (NaN = no stop)
+    stop_loss: Optional[np.ndarray] = None
+    take_profit: Optional[np.ndarray] = None
 
 
 class VectorBTStrategy:
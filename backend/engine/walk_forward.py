@@ -5,18 +5,32 @@ optimizes strategy parameters on in-sample, validates on out-of-sample.
 Reports per-window and aggregate OOS performance + robustness ratio.
 
 Enhanced with parameter stability metrics and recommendation engine.
+
+The in-sample grids of all windows can be spread over a process pool
+(``workers=N``, sharing the OHLCV frame like engine.optimizer does). In
+anchored mode every in-sample range starts at bar 0, so each combo is
+backtested once over the longest range and the shorter windows read their
+metrics off Backtester checkpoints. Strategies compiled from user code
+don't pickle, so pass their source as ``strategy_code`` and each worker
+compiles its own copy.
 """
 from __future__ import annotations
 
+import logging
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass, asdict
 from itertools import product
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 
 import numpy as np
 import pandas as pd
 
 from engine.backtester import Backtester, BacktestConfig
 from engine.metrics import calculate_metrics
+from engine.optimizer import init_worker, share_frame, worker_state
+
+logger = logging.getLogger("afindr.walk_forward")
 
 
 @dataclass
@@ -135,6 +149,33 @@ def _compute_param_stability(windows: List[WalkForwardWindow]) -> ParamStability
     )
 
 
+def _is_task(strategy_class: type, data: pd.DataFrame, config: BacktestConfig,
+             params: dict, start: int, stop: int, checkpoints: List[int]) -> Optional[List[dict]]:
+    """In-sample backtest of one combo over data[start:stop].
+
+    Returns the metrics at each checkpoint (bar offsets into the slice),
+    or None if the strategy fails.
+    """
+    try:
+        result = Backtester(strategy_class(params), data.iloc[start:stop], config).run(checkpoints)
+    except Exception:
+        return None
+    return [result.checkpoint_metrics[c] for c in checkpoints]
+
+
+def _is_task_in_worker(params: dict, start: int, stop: int,
+                       checkpoints: List[int]) -> Optional[List[dict]]:
+    st = worker_state()
+    return _is_task(st["strategy_class"], st["data"], st["config"], params, start, stop, checkpoints)
+
+
+def _metric_value(metrics: dict, optimization_metric: str) -> float:
+    metric_val = metrics.get(optimization_metric, 0)
+    if metric_val == float("inf"):
+        metric_val = 999.0
+    return metric_val
+
+
 def run_walk_forward(
     strategy_class: type,
     data: pd.DataFrame,
@@ -143,8 +184,12 @@ def run_walk_forward(
     num_windows: int = 5,
     is_ratio: float = 0.7,
     optimization_metric: str = "profit_factor",
+    anchored: bool = False,
+    workers: int = 1,
+    on_progress: Optional[Callable[[int, int, dict], None]] = None,
+    strategy_code: Optional[str] = None,
 ) -> WalkForwardResult:
-    """Run walk-forward analysis with rolling windows.
+    """Run walk-forward analysis with rolling or anchored windows.
 
     Args:
         strategy_class: A BaseStrategy subclass.
@@ -154,6 +199,13 @@ def run_walk_forward(
         num_windows: Number of IS/OOS windows.
         is_ratio: Fraction of each window used for in-sample (0.5-0.9).
         optimization_metric: Metric to maximize during IS optimization.
+        anchored: Expanding windows — every in-sample range starts at the
+            first bar; OOS ranges are the same as in rolling mode.
+        workers: Processes to spread the in-sample grids over (1 = serial).
+        on_progress: Called as on_progress(done, total, window_dict) after
+            each window's out-of-sample run.
+        strategy_code: Source strategy_class was compiled from; workers
+            compile it themselves when the class can't be pickled.
 
     Returns:
         WalkForwardResult with per-window and aggregate OOS performance,
@@ -170,76 +222,136 @@ def run_walk_forward(
 
     param_names = list(param_grid.keys())
     param_values = list(param_grid.values())
-    all_combos = list(product(*param_values))
+    all_combos = [dict(zip(param_names, combo)) for combo in product(*param_values)]
 
+    # (window index, IS start, IS end, OOS end) for windows with enough data
+    plan = []
     for w in range(num_windows):
         start_idx = w * window_size
         is_end_idx = start_idx + is_size
         oos_end_idx = min(start_idx + window_size, total_bars)
-
-        is_data = data.iloc[start_idx:is_end_idx]
-        oos_data = data.iloc[is_end_idx:oos_end_idx]
-
-        if len(is_data) < 20 or len(oos_data) < 5:
+        is_start_idx = 0 if anchored else start_idx
+        if is_end_idx - is_start_idx < 20 or oos_end_idx - is_end_idx < 5:
             continue
-
-        # Grid search on in-sample
-        best_params: dict = {}
-        best_metric_value = -float("inf")
-
-        for combo in all_combos:
-            params = dict(zip(param_names, combo))
-            try:
-                strategy = strategy_class(params)
-                bt = Backtester(strategy, is_data, config)
-                result = bt.run()
-                metric_val = result.metrics.get(optimization_metric, 0)
-                if metric_val == float("inf"):
-                    metric_val = 999.0
+        plan.append((w, is_start_idx, is_end_idx, oos_end_idx))
+
+    # In-sample tasks: (combo, start, stop, checkpoints) -> metrics per window.
+    # Rolling: one task per (window, combo). Anchored: one task per combo
+    # over the longest range, checkpointed at each window's IS end.
+    tasks = []
+    if anchored and plan:
+        stop = plan[-1][2]
+        checkpoints = [is_end - 1 for _, _, is_end, _ in plan]
+        for c, params in enumerate(all_combos):
+            tasks.append((c, list(range(len(plan))), (params, 0, stop, checkpoints)))
+    else:
+        for p, (_, is_start, is_end, _) in enumerate(plan):
+            for c, params in enumerate(all_combos):
+                tasks.append((c, [p], (params, is_start, is_end, [is_end - is_start - 1])))
+
+    # is_results[p][c] = IS metrics of combo c in planned window p (None = failed)
+    is_results: List[List[Optional[dict]]] = [[None] * len(all_combos) for _ in plan]
+    pending = [len(all_combos) for _ in plan]
+    next_window = 0
+
+    def finish_windows() -> None:
+        """Pick winners and run OOS for every window whose grid is complete, in order."""
+        nonlocal next_window, running_balance
+        while next_window < len(plan) and pending[next_window] == 0:
+            w, is_start, is_end, oos_end = plan[next_window]
+            is_data = data.iloc[is_start:is_end]
+            oos_data = data.iloc[is_end:oos_end]
+
+            # Grid search winner (first combo wins ties, as a serial scan would)
+            best_params: dict = {}
+            is_metrics: Optional[dict] = None
+            best_metric_value = -float("inf")
+            for params, metrics in zip(all_combos, is_results[next_window]):
+                if metrics is None:
+                    continue
+                metric_val = _metric_value(metrics, optimization_metric)
                 if metric_val > best_metric_value:
                     best_metric_value = metric_val
-                    best_params = params
-            except Exception:
-                continue
-
-        if not best_params:
-            best_params = {k: v[len(v) // 2] for k, v in param_grid.items()}
-
-        # Run in-sample with best params for reporting
-        is_strategy = strategy_class(best_params)
-        is_bt = Backtester(is_strategy, is_data, config)
-        is_result = is_bt.run()
-
-        # Run out-of-sample with best params
-        oos_config = BacktestConfig(
-            initial_balance=running_balance,
-            commission=config.commission,
-            slippage_ticks=config.slippage_ticks,
-            point_value=config.point_value,
-            tick_size=config.tick_size,
-        )
-        oos_strategy = strategy_class(best_params)
-        oos_bt = Backtester(oos_strategy, oos_data, oos_config)
-        oos_result = oos_bt.run()
-
-        if oos_result.equity_curve:
-            running_balance = oos_result.equity_curve[-1]["value"]
-
-        all_oos_trades.extend(oos_result.trades)
-        all_oos_equity.extend(oos_result.equity_curve)
-
-        windows.append(WalkForwardWindow(
-            window_index=w,
-            is_start=str(is_data.index[0]),
-            is_end=str(is_data.index[-1]),
-            oos_start=str(oos_data.index[0]),
-            oos_end=str(oos_data.index[-1]),
-            is_bars=len(is_data),
-            oos_bars=len(oos_data),
-            is_metrics=is_result.metrics,
-            oos_metrics=oos_result.metrics,
-            best_params=best_params,
-        ))
+                    best_params, is_metrics = params, metrics
+
+            if not best_params:
+                best_params = {k: v[len(v) // 2] for k, v in param_grid.items()}
+            if is_metrics is None:
+                is_metrics = Backtester(strategy_class(best_params), is_data, config).run().metrics
+
+            # Run out-of-sample with best params
+            oos_config = BacktestConfig(
+                initial_balance=running_balance,
+                commission=config.commission,
+                slippage_ticks=config.slippage_ticks,
+                point_value=config.point_value,
+                tick_size=config.tick_size,
+            )
+            oos_strategy = strategy_class(best_params)
+            oos_bt = Backtester(oos_strategy, oos_data, oos_config)
+            oos_result = oos_bt.run()
+
+            if oos_result.equity_curve:
+                running_balance = oos_result.equity_curve[-1]["value"]
+
+            all_oos_trades.extend(oos_result.trades)
+            all_oos_equity.extend(oos_result.equity_curve)
+
+            window = WalkForwardWindow(
+                window_index=w,
+                is_start=str(is_data.index[0]),
+                is_end=str(is_data.index[-1]),
+                oos_start=str(oos_data.index[0]),
+                oos_end=str(oos_data.index[-1]),
+                is_bars=len(is_data),
+                oos_bars=len(oos_data),
+                is_metrics=is_metrics,
+                oos_metrics=oos_result.metrics,
+                best_params=best_params,
+            )
+            windows.append(window)
+            next_window += 1
+            if on_progress is not None:
+                on_progress(next_window, len(plan), asdict(window))
+
+    def record(c: int, planned: List[int], metrics: Optional[List[dict]]) -> None:
+        for k, p in enumerate(planned):
+            is_results[p][c] = metrics[k] if metrics is not None else None
+            pending[p] -= 1
+        finish_windows()
+
+    worker_strategy = strategy_class
+    if workers > 1 and len(tasks) > 1:
+        try:
+            pickle.dumps(strategy_class)
+        except Exception:
+            if strategy_code is not None:
+                worker_strategy = strategy_code
+            else:
+                logger.warning("%s can't be pickled and no strategy_code was given; "
+                               "running %d in-sample tasks serially instead of on %d workers",
+                               strategy_class.__name__, len(tasks), workers)
+                workers = 1
+
+    finish_windows()  # windows with an empty grid
+    if workers <= 1 or len(tasks) <= 1:
+        for c, planned, args in tasks:
+            record(c, planned, _is_task(strategy_class, data, config, *args))
+    else:
+        shm, spec = share_frame(data)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(tasks)),
+                initializer=init_worker,
+                initargs=(spec, worker_strategy, config, optimization_metric),
+            ) as pool:
+                futures = {pool.submit(_is_task_in_worker, *args): (c, planned)
+                           for c, planned, args in tasks}
+                for fut in as_completed(futures):
+                    record(*futures[fut], fut.result())
+        finally:
+            shm.close()
+            shm.unlink()
 
     # Aggregate OOS metrics
     aggregate_oos = calculate_metrics(all_oos_trades, config.initial_balance)
@@ -219,6 +219,14 @@ app.include_router(iterations_router)
 app.include_router(optimize_router)
 app.include_router(admin_router)
 
+# Background RSS poller; close the pooled HTTP client the data fetchers share
+from data.http_client import aclose as close_http_client
+from data.news_fetcher import start_refresher as start_news_refresher, stop_refresher as stop_news_refresher
+
+app.router.on_startup.append(start_news_refresher)
+app.router.on_shutdown.append(stop_news_refresher)
+app.router.on_shutdown.append(close_http_client)
+
 
 @app.get("/health")
 async def health():
@@ -180,7 +180,7 @@ async def chat(request: Request, req: ChatRequest):
                     result_data = json.loads(result_str)
                     if "error" not in result_data and result_data.get("chart_script"):
                         chart_script_results.append(result_data["chart_script"])
-                elif tool_name in ("detect_chart_patterns", "detect_key_levels", "detect_divergences"):
+                elif tool_name in ("detect_chart_patterns", "detect_key_levels", "detect_divergences", "detect_patterns_batch"):
                     result_str = await TOOL_HANDLERS[tool_name](tool_input)
                     result_data = json.loads(result_str)
                     if "error" not in result_data and result_data.get("chart_script"):
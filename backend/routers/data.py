@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from data.fetcher import fetch_ohlcv, fetch_ticks
+from data.binary_stream import HAS_PYARROW, MEDIA_TYPES, stream_candles, stream_ticks
+from data.fetcher import fetch_ohlcv, fetch_tick_columns, fetch_tick_frame
+from data.payload import FORMATS, json_response, ohlcv_columns, to_rows
 from data.contracts import CONTRACTS, get_contract_config
 
 from rate_limit import limiter
@@ -32,7 +35,14 @@ async def list_contracts(request: Request):
 
 @router.post("/ohlcv")
 @limiter.limit("60/minute")
-async def get_ohlcv(request: Request, req: DataRequest):
+async def get_ohlcv(
+    request: Request,
+    req: DataRequest,
+    format: str = Query("rows", description="rows (list of candle dicts) or columns ({time: [...], ...})"),
+):
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {FORMATS}")
+
     try:
         get_contract_config(req.symbol)
     except ValueError as e:
@@ -43,30 +53,89 @@ async def get_ohlcv(request: Request, req: DataRequest):
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
-    candles = []
-    for ts, row in df.iterrows():
-        candles.append({
-            "time": int(ts.timestamp()),
-            "open": round(row["open"], 2),
-            "high": round(row["high"], 2),
-            "low": round(row["low"], 2),
-            "close": round(row["close"], 2),
-            "volume": int(row["volume"]),
-        })
-    return {"symbol": req.symbol, "candles": candles, "count": len(candles)}
+    columns = ohlcv_columns(df)
+    candles = columns if format == "columns" else to_rows(columns)
+    return json_response({"symbol": req.symbol, "candles": candles, "count": len(df)})
 
 
 @router.post("/ticks")
 @limiter.limit("60/minute")
-async def get_ticks(request: Request, req: TickRequest):
+async def get_ticks(
+    request: Request,
+    req: TickRequest,
+    format: str = Query("rows", description="rows (list of tick dicts) or columns ({time: [...], ...})"),
+):
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {FORMATS}")
+
+    try:
+        get_contract_config(req.symbol)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        columns = await fetch_tick_columns(req.symbol, req.date, req.limit)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    ticks = columns if format == "columns" else to_rows(columns)
+    return json_response({"symbol": req.symbol, "ticks": ticks, "count": len(columns["time"])})
+
+
+def _check_stream_format(format: str) -> None:
+    if format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"format must be one of {tuple(MEDIA_TYPES)}")
+    if format == "arrow" and not HAS_PYARROW:
+        raise HTTPException(status_code=400, detail="Arrow streams need pyarrow installed on the server")
+
+
+@router.post("/ohlcv/stream")
+@limiter.limit("60/minute")
+async def stream_ohlcv(
+    request: Request,
+    req: DataRequest,
+    format: str = Query("binary", description="binary (little-endian column framing) or arrow (Arrow IPC)"),
+):
+    """Candles as a chunked binary stream; see data.binary_stream for the layout."""
+    _check_stream_format(format)
+    try:
+        get_contract_config(req.symbol)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        df = await fetch_ohlcv(req.symbol, req.period, req.interval)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return StreamingResponse(
+        stream_candles(df, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"X-Row-Count": str(len(df))},
+    )
+
+
+@router.post("/ticks/stream")
+@limiter.limit("60/minute")
+async def stream_tick_data(
+    request: Request,
+    req: TickRequest,
+    format: str = Query("binary", description="binary (little-endian column framing) or arrow (Arrow IPC)"),
+):
+    """Ticks as a chunked binary stream; see data.binary_stream for the layout."""
+    _check_stream_format(format)
     try:
         get_contract_config(req.symbol)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
     try:
-        ticks = await fetch_ticks(req.symbol, req.date, req.limit)
+        df = await fetch_tick_frame(req.symbol, req.date, req.limit)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
-    return {"symbol": req.symbol, "ticks": ticks, "count": len(ticks)}
+    return StreamingResponse(
+        stream_ticks(df, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"X-Row-Count": str(len(df))},
+    )
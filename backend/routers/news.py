@@ -6,7 +6,7 @@ from typing import Optional
 from fastapi import APIRouter, Query, Request
 
 from rate_limit import limiter
-from data.news_fetcher import fetch_all_news, get_available_sources
+from data.news_fetcher import fetch_all_news, get_available_sources, search_news
 from data.stock_fetcher import fetch_stock_quote, fetch_analyst_ratings, fetch_related_stocks, fetch_stock_detail_full
 
 router = APIRouter(prefix="/api/news", tags=["news"])
@@ -22,7 +22,22 @@ async def get_news_feed(
     limit: int = Query(50, ge=1, le=200, description="Max articles"),
 ):
     """Get aggregated news feed from all RSS sources."""
-    items = fetch_all_news(category=category, ticker=ticker, source=source, limit=limit)
+    items = await fetch_all_news(category=category, ticker=ticker, source=source, limit=limit)
+    return {"articles": items, "count": len(items)}
+
+
+@router.get("/search")
+@limiter.limit("60/minute")
+async def search_news_articles(
+    request: Request,
+    q: str = Query(..., min_length=1, description="Search query"),
+    ticker: Optional[str] = Query(None, description="Filter by ticker"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    days: Optional[float] = Query(None, gt=0, description="Only articles from the last N days"),
+    limit: int = Query(20, ge=1, le=100, description="Max articles"),
+):
+    """Full-text search over indexed news articles."""
+    items = await search_news(q, limit=limit, days=days, ticker=ticker, category=category)
     return {"articles": items, "count": len(items)}
 
 
@@ -16,7 +16,7 @@ from rate_limit import limiter
 from data.fetcher import fetch_ohlcv
 from data.contracts import get_contract_config, CONTRACTS
 from engine.backtester import BacktestConfig
-from engine.vbt_backtester import run_vbt_sweep, HAS_VBT
+from engine.vbt_backtester import run_vbt_sweep
 from agent.sandbox import validate_strategy_code, execute_strategy_code
 from agent.strategy_agent import generate_vbt_strategy
 
@@ -36,10 +36,7 @@ class SweepRequest(BaseModel):
 @router.post("/sweep")
 @limiter.limit("10/minute")
 async def run_sweep(request: Request, req: SweepRequest):
-    """Run a vectorized parameter sweep using VectorBT."""
-    if not HAS_VBT:
-        return {"error": "VectorBT is not installed. Cannot run parameter sweep."}
-
+    """Run a vectorized parameter sweep (VectorBT when installed, native simulator otherwise)."""
     # Generate strategy
     strategy_result = generate_vbt_strategy(req.strategy_description, [])
     if "error" in strategy_result:
@@ -1,19 +1,30 @@
-"""WebSocket router for real-time backtest progress streaming.
+"""WebSocket router for real-time backtest progress and live chart patterns.
 
 Provides a WebSocket endpoint at /ws/backtest/{run_id} that streams
-progress updates during long-running backtests and parameter sweeps.
+progress updates during long-running backtests and parameter sweeps, and
+/ws/patterns, which streams incremental chart-pattern overlays as bars close.
 """
 from __future__ import annotations
 
 import asyncio
 import json
+import os
 import uuid
-from typing import Dict
+from typing import Dict, List, Optional
 
+import numpy as np
+import pandas as pd
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from data.fetcher import fetch_ohlcv
+from engine.chart_patterns import STREAMING_DETECTORS, create_streaming_detector
+from engine.chart_patterns._utils import ts_to_unix, unix_times
+
 router = APIRouter(tags=["websocket"])
 
+# Seconds between fetch_ohlcv polls for newly closed bars on /ws/patterns
+PATTERN_POLL_SECONDS = float(os.getenv("AFINDR_PATTERN_POLL_SECONDS", "15"))
+
 # Active connections: run_id -> WebSocket
 _connections: Dict[str, WebSocket] = {}
 
@@ -123,3 +134,151 @@ async def send_error(run_id: str, error: str):
 def generate_run_id() -> str:
     """Generate a unique run ID."""
     return f"run_{uuid.uuid4().hex[:12]}"
+
+
+# ─── Live chart patterns ───
+
+def _closed_bars(df: pd.DataFrame, after: Optional[int]) -> List[dict]:
+    """Bars of ``df`` newer than ``after``, without the last one (still forming)."""
+    closed = df.iloc[:-1]
+    times = unix_times(closed.index)
+    cols = [closed[c].to_numpy(dtype=float).tolist() for c in ("open", "high", "low", "close")]
+    return [
+        {"time": t, "open": o, "high": h, "low": l, "close": c}
+        for t, o, h, l, c in zip(times, *cols)
+        if after is None or t > after
+    ]
+
+
+def _bar_step(df: pd.DataFrame) -> Optional[int]:
+    """Typical spacing in seconds between the bars of ``df`` (None under two bars)."""
+    times = unix_times(df.index[-50:])
+    if len(times) < 2:
+        return None
+    return int(np.median(np.diff(times)))
+
+
+@router.websocket("/ws/patterns")
+async def pattern_stream(websocket: WebSocket):
+    """WebSocket endpoint for live chart-pattern overlays.
+
+    The client opens with a subscription:
+        {"symbol": "NQ=F", "interval": "1m", "period": "5d",
+         "detectors": ["fvg", "order_blocks", ...], ...detector params}
+    and gets a "snapshot" chart script of the patterns over the closed
+    history. After that, each closed bar that adds, changes or drops
+    elements produces one "patterns" message with just those elements and
+    removed ids. Closed bars come from the client ({"type": "bar", "bar":
+    {"time", "open", "high", "low", "close"}}) and from polling fetch_ohlcv
+    every PATTERN_POLL_SECONDS, whatever the client sends in between. A
+    client bar that skips ahead of the last closed bar is only taken
+    together with the bars before it, from fetch_ohlcv.
+    """
+    await websocket.accept()
+    try:
+        try:
+            sub = json.loads(await websocket.receive_text())
+        except ValueError:
+            sub = None
+        if not isinstance(sub, dict):
+            await websocket.send_json({"type": "error", "error": "Expected a JSON subscription"})
+            return
+        names = sub.get("detectors") or list(STREAMING_DETECTORS)
+        if not isinstance(names, list) or not all(isinstance(n, str) for n in names):
+            unknown = names
+        else:
+            unknown = [n for n in names if n not in STREAMING_DETECTORS]
+        if unknown:
+            await websocket.send_json({
+                "type": "error",
+                "error": f"Unknown detectors: {unknown}. Valid: {list(STREAMING_DETECTORS)}",
+            })
+            return
+        symbol = sub.get("symbol", "NQ=F")
+        interval = sub.get("interval", "1m")
+        period = sub.get("period", "5d")
+        try:
+            detectors = [create_streaming_detector(name, sub) for name in names]
+        except (TypeError, ValueError) as e:
+            await websocket.send_json({"type": "error", "error": f"Invalid detector params: {e}"})
+            return
+
+        try:
+            df = await fetch_ohlcv(symbol, period, interval)
+        except Exception as e:
+            await websocket.send_json({"type": "error", "error": f"Failed to fetch data for {symbol}: {e}"})
+            return
+        history = df.iloc[:-1]
+        snapshots = await asyncio.to_thread(lambda: [det.feed(history) for det in detectors])
+        last = detectors[0].last_time
+        step = _bar_step(history)
+        script_id = f"live_{uuid.uuid4().hex[:8]}"
+        await websocket.send_json({
+            "type": "snapshot",
+            "script_id": script_id,
+            "symbol": symbol,
+            "interval": interval,
+            "time": last,
+            "chart_script": {
+                "id": script_id,
+                "name": f"Live Patterns — {symbol} {interval}",
+                "visible": True,
+                "elements": [el.to_dict() for snap in snapshots for el in snap.elements],
+                "generators": [],
+            },
+        })
+
+        # Poll on a fixed schedule; client messages don't push it back
+        loop = asyncio.get_running_loop()
+        next_poll = loop.time() + PATTERN_POLL_SECONDS
+        while True:
+            try:
+                message = await asyncio.wait_for(websocket.receive_text(),
+                                                 timeout=max(next_poll - loop.time(), 0))
+            except asyncio.TimeoutError:
+                next_poll = loop.time() + PATTERN_POLL_SECONDS
+                try:
+                    bars = _closed_bars(await fetch_ohlcv(symbol, period, interval), last)
+                except Exception:
+                    continue
+            else:
+                if message == "ping":
+                    await websocket.send_text("pong")
+                    continue
+                try:
+                    data = json.loads(message)
+                    if data.get("type") != "bar":
+                        continue
+                    bar = {k: float(data["bar"][k]) for k in ("open", "high", "low", "close")}
+                    bar["time"] = ts_to_unix(data["bar"]["time"])
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue
+                # Skip bars already seen (e.g. also picked up by a poll)
+                if last is not None and bar["time"] <= last:
+                    continue
+                if last is None or step is None or bar["time"] != last + step:
+                    # The client skipped ahead: take the bars in between (and
+                    # this one) from fetch_ohlcv, or leave them to the next poll
+                    try:
+                        fetched = await fetch_ohlcv(symbol, period, interval)
+                    except Exception:
+                        continue
+                    bars = [b for b in _closed_bars(fetched, last) if b["time"] <= bar["time"]]
+                    if not bars or bars[-1]["time"] != bar["time"]:
+                        continue
+                else:
+                    bars = [bar]
+
+            for bar in bars:
+                deltas = [det.update(bar) for det in detectors]
+                last = detectors[0].last_time
+                if any(deltas):
+                    await websocket.send_json({
+                        "type": "patterns",
+                        "script_id": script_id,
+                        "time": last,
+                        "elements": [el.to_dict() for d in deltas for el in d.elements],
+                        "removed": [rid for d in deltas for rid in d.removed],
+                    })
+    except WebSocketDisconnect:
+        pass
@@ -88,6 +88,8 @@ def main():
                     "volume": float(df.iloc[i]["volume"]),
                 }
                 history = df.iloc[:i + 1]
+                if hasattr(strategy, "update_indicators"):
+                    strategy.update_indicators(bar)
                 signal = strategy.on_bar(bar, history)
                 if signal:
                     trades.append({
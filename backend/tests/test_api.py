@@ -90,3 +90,42 @@ async def test_backtest_runs_list(client):
     data = resp.json()
     assert "runs" in data
     assert isinstance(data["runs"], list)
+
+
+# ── Market Data ──────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_ohlcv_columns_match_rows(client):
+    body = {"symbol": "NQ=F", "period": "5d", "interval": "15m"}
+    rows = (await client.post("/api/data/ohlcv", json=body)).json()
+    cols = (await client.post("/api/data/ohlcv?format=columns", json=body)).json()
+    assert rows["count"] == cols["count"] == len(rows["candles"]) > 0
+    assert list(cols["candles"]) == ["time", "open", "high", "low", "close", "volume"]
+    assert [dict(zip(cols["candles"], v)) for v in zip(*cols["candles"].values())] == rows["candles"]
+
+
+@pytest.mark.asyncio
+async def test_ohlcv_rejects_unknown_format(client):
+    resp = await client.post("/api/data/ohlcv?format=csv", json={"symbol": "NQ=F"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_ticks_columns_without_tick_files(client):
+    resp = await client.post("/api/data/ticks?format=columns", json={"symbol": "NQ=F"})
+    assert resp.status_code == 200
+    assert resp.json()["ticks"] == {"time": [], "price": [], "size": [], "side": []}
+
+
+@pytest.mark.asyncio
+async def test_ohlcv_binary_stream(client):
+    body = {"symbol": "NQ=F", "period": "5d", "interval": "15m"}
+    rows = (await client.post("/api/data/ohlcv", json=body)).json()
+    resp = await client.post("/api/data/ohlcv/stream", json=body)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/octet-stream"
+    assert int(resp.headers["x-row-count"]) == rows["count"]
+    assert resp.content[:4] == b"AFDB"
+    # header + u32 count + 4x f32 + 2x i64 per row + u32 terminator
+    assert len(resp.content) == 16 + 4 + rows["count"] * 32 + 4
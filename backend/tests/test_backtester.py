@@ -249,3 +249,16 @@ class TestBacktester:
 
         assert isinstance(result, BacktestResult)
         assert len(result.trades) == 0
+
+    def test_checkpoint_metrics_match_prefix_runs(self, sample_ohlcv_data, backtest_config):
+        """checkpoint_metrics[i] equals the metrics of a run on data[:i + 1]."""
+        from engine.preset_strategies import PRESET_STRATEGIES
+        preset = PRESET_STRATEGIES[0]
+        checkpoints = [99, 250, 333, len(sample_ohlcv_data) - 1]
+        full = Backtester(preset["class"](dict(preset["default_params"])),
+                          sample_ohlcv_data, backtest_config).run(checkpoints)
+        for i in checkpoints:
+            prefix = Backtester(preset["class"](dict(preset["default_params"])),
+                                sample_ohlcv_data.iloc[:i + 1], backtest_config).run()
+            assert full.checkpoint_metrics[i] == prefix.metrics
+        assert full.checkpoint_metrics[checkpoints[-1]] == full.metrics
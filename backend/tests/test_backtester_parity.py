@@ -0,0 +1,133 @@
+"""Parity tests: columnar Backtester fast path vs. the original row loop.
+
+Every preset strategy (plus the inline SL/TP helpers) is run through both
+engines on the same data; trades, equity curve and metrics must be
+identical, not just close.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine.backtester import Backtester, BacktestResult
+from engine.preset_strategies import PRESET_STRATEGIES
+from engine.strategy import BaseStrategy, Signal
+
+
+@pytest.fixture
+def volatile_ohlcv_data():
+    """1000 volatile 5-min bars with alternating trends (same recipe as the preset tests)."""
+    rng = np.random.RandomState(7)
+    n = 1000
+    trend = np.repeat([0.003, -0.003, 0.003, -0.003, 0.003], n // 5)
+    close = 15000.0 * np.cumprod(1 + trend + rng.normal(0, 0.03, size=n))
+    high = close * (1 + rng.uniform(0.005, 0.03, size=n))
+    low = close * (1 - rng.uniform(0.005, 0.03, size=n))
+    open_ = low + rng.uniform(0.3, 0.7, size=n) * (high - low)
+    volume = rng.randint(1000, 50000, size=n).astype(float)
+    dates = pd.date_range(start="2025-01-02 09:30", periods=n, freq="5min", tz="UTC")
+    return pd.DataFrame(
+        {"open": open_, "high": high, "low": low, "close": close, "volume": volume},
+        index=dates,
+    )
+
+
+class HistoryHeavyStrategy(BaseStrategy):
+    """Computes off the full history DataFrame the old way."""
+
+    def __init__(self):
+        super().__init__({})
+
+    def on_bar(self, bar, history):
+        if len(history) < 22:
+            return None
+        sma = history["close"].rolling(20).mean()
+        if history["close"].iloc[-2] <= sma.iloc[-2] and bar["close"] > sma.iloc[-1]:
+            return Signal(action="buy", stop_loss=bar["close"] - 100, take_profit=bar["close"] + 150)
+        if history["close"].iloc[-2] >= sma.iloc[-2] and bar["close"] < sma.iloc[-1]:
+            return Signal(action="sell", stop_loss=bar["close"] + 100, take_profit=bar["close"] - 150)
+        return None
+
+
+class PrevBarStrategy(BaseStrategy):
+    """Keeps the previous bar object around, as generated strategies often do."""
+
+    def __init__(self):
+        super().__init__({})
+        self.prev_bar = None
+
+    def on_bar(self, bar, history):
+        prev, self.prev_bar = self.prev_bar, bar
+        if prev is None:
+            return None
+        if bar["close"] > prev["high"]:
+            return Signal(action="buy", stop_loss=prev["low"])
+        if bar["close"] < prev["low"]:
+            return Signal(action="sell", stop_loss=prev["high"])
+        return None
+
+
+def _run_both(strategy_factory, data, config):
+    legacy = Backtester(strategy_factory(), data, config, columnar=False).run()
+    columnar = Backtester(strategy_factory(), data, config, columnar=True).run()
+    return legacy, columnar
+
+
+def _assert_identical(legacy: BacktestResult, columnar: BacktestResult):
+    assert columnar.trades == legacy.trades
+    assert columnar.metrics == legacy.metrics
+    assert columnar.equity_curve == legacy.equity_curve
+    for a, b in zip(columnar.trades, legacy.trades):
+        assert type(a["entry_time"]) is type(b["entry_time"])
+        assert type(a["exit_time"]) is type(b["exit_time"])
+
+
+@pytest.mark.parametrize("preset", PRESET_STRATEGIES, ids=[p["name"] for p in PRESET_STRATEGIES])
+@pytest.mark.parametrize("dataset", ["sample_ohlcv_data", "volatile_ohlcv_data"])
+def test_presets_identical(preset, dataset, request, backtest_config):
+    data = request.getfixturevalue(dataset)
+    legacy, columnar = _run_both(
+        lambda: preset["class"](dict(preset["default_params"])), data, backtest_config)
+    _assert_identical(legacy, columnar)
+
+
+def test_history_strategy_identical(volatile_ohlcv_data, backtest_config):
+    legacy, columnar = _run_both(HistoryHeavyStrategy, volatile_ohlcv_data, backtest_config)
+    assert legacy.trades
+    _assert_identical(legacy, columnar)
+
+
+def test_kept_bar_is_a_snapshot(volatile_ohlcv_data, backtest_config):
+    legacy, columnar = _run_both(PrevBarStrategy, volatile_ohlcv_data, backtest_config)
+    assert legacy.trades
+    _assert_identical(legacy, columnar)
+
+
+def test_integer_index_identical(sample_ohlcv_data, backtest_config):
+    data = sample_ohlcv_data.reset_index(drop=True)
+    preset = PRESET_STRATEGIES[0]
+    legacy, columnar = _run_both(
+        lambda: preset["class"](dict(preset["default_params"])), data, backtest_config)
+    _assert_identical(legacy, columnar)
+
+
+def test_empty_data_identical(backtest_config):
+    empty_df = pd.DataFrame(columns=["open", "high", "low", "close", "volume"])
+    empty_df.index = pd.DatetimeIndex([])
+    preset = PRESET_STRATEGIES[0]
+    legacy, columnar = _run_both(
+        lambda: preset["class"](dict(preset["default_params"])), empty_df, backtest_config)
+    _assert_identical(legacy, columnar)
+
+
+def test_equity_curve_kept_as_arrays(sample_ohlcv_data, backtest_config):
+    preset = PRESET_STRATEGIES[0]
+    result = Backtester(preset["class"](dict(preset["default_params"])),
+                        sample_ohlcv_data, backtest_config).run()
+    assert result.equity_times.dtype == np.int64
+    assert result.equity_values.dtype == np.float64
+    assert len(result.equity_values) == len(sample_ohlcv_data)
+    assert result._equity_curve is None  # not materialized until read
+    curve = result.equity_curve
+    assert curve[0] == {"time": int(result.equity_times[0]), "value": float(result.equity_values[0])}
+    assert result.equity_curve is curve
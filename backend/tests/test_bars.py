@@ -0,0 +1,106 @@
+"""Tests for tick-to-bar aggregation (data.bars)."""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data import bars, fetcher
+from data.bars import HAS_NUMBA, aggregate_ticks, parse_bar_interval
+
+SPECS = [("tick", 50), ("tick", 2.5), ("volume", 400), ("dollar", 2e8), ("range", 6), ("renko", 2)]
+
+
+def _ticks(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    ts = pd.Timestamp("2026-01-05", tz="UTC").value + np.cumsum(rng.integers(1, 10**9, n))
+    price = 21000 + np.round(np.cumsum(rng.normal(0, 0.6, n)) * 4) / 4
+    return ts.astype(np.int64), price, rng.integers(1, 20, n).astype(np.float64)
+
+
+def _segments(ts, price, size, k):
+    bounds = np.linspace(0, len(ts), k + 1).astype(int)
+    return [{"ts": ts[a:b], "price": price[a:b], "size": size[a:b]} for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def _kernels():
+    return [False, True] if HAS_NUMBA else [False]
+
+
+@pytest.mark.parametrize("use_numba", _kernels())
+@pytest.mark.parametrize("bar_type,threshold", SPECS)
+def test_segmentation_and_kernels_agree(bar_type, threshold, use_numba):
+    ts, price, size = _ticks()
+    whole = aggregate_ticks(_segments(ts, price, size, 1), bar_type, threshold, 20, use_numba=False)
+    split = aggregate_ticks(_segments(ts, price, size, 9), bar_type, threshold, 20, use_numba=use_numba)
+    assert len(whole) > 10
+    pd.testing.assert_frame_equal(split, whole)
+    if bar_type != "renko":
+        # Every tick lands in exactly one bar
+        assert whole["volume"].sum() == size.sum()
+        assert whole.index[0].value == ts[0]
+
+
+@pytest.mark.parametrize("use_numba", _kernels())
+def test_wide_renko_does_not_carry_ticks(monkeypatch, use_numba):
+    ts, price, size = _ticks()
+    whole = aggregate_ticks(_segments(ts, price, size, 1), "renko", 15, use_numba=False)
+    assert 0 < len(whole) < 50  # most of the 200 segments close no brick
+
+    seen = []
+    name = "_bar_loop_jit" if use_numba else "_bar_walk"
+    kernel = getattr(bars, name)
+
+    def recording(ts, price, *args):
+        seen.append(len(price))
+        return kernel(ts, price, *args)
+
+    monkeypatch.setattr(bars, name, recording)
+    split = aggregate_ticks(_segments(ts, price, size, 200), "renko", 15, use_numba=use_numba)
+    pd.testing.assert_frame_equal(split, whole)
+    assert max(seen) <= len(ts) // 200 + 1
+
+
+def test_bar_rules():
+    ts = np.arange(8, dtype=np.int64) * 10**9
+    price = np.array([100, 101, 99, 103, 104, 100, 96, 97], dtype=float)
+    size = np.array([1, 2, 3, 4, 1, 1, 1, 1], dtype=float)
+    seg = [{"ts": ts, "price": price, "size": size}]
+
+    vol = aggregate_ticks(seg, "volume", 5, use_numba=False)
+    assert vol["volume"].tolist() == [6, 5, 3]  # closes at 6 (>= 5), then 5, then trailing partial
+    assert vol["close"].tolist() == [99, 104, 97]
+
+    rng = aggregate_ticks(seg, "range", 4, use_numba=False)
+    assert rng[["open", "high", "low", "close"]].values.tolist() == [
+        [100, 103, 99, 103], [104, 104, 100, 100], [96, 97, 96, 97]]
+
+    renko = aggregate_ticks(seg, "renko", 2, use_numba=False)
+    assert renko["close"].tolist() == [102, 104, 102, 100, 98, 96]
+    assert renko["volume"].sum() == size[:7].sum()
+
+
+def test_parse_bar_interval():
+    assert parse_bar_interval("volume:5000") == ("volume", 5000.0)
+    assert parse_bar_interval("renko:2.5") == ("renko", 2.5)
+    assert parse_bar_interval("5m") is None
+    with pytest.raises(ValueError):
+        parse_bar_interval("tick:0")
+
+
+def test_fetch_ohlcv_serves_tick_bars(tmp_path, monkeypatch):
+    ts, price, size = _ticks(5000)
+    pd.DataFrame({
+        "ts_event": pd.DatetimeIndex(ts.view("M8[ns]")).tz_localize("UTC"),
+        "price": price, "size": size.astype(int), "side": "A",
+    }).to_csv(tmp_path / "nq_tick_2026.csv", index=False)
+    monkeypatch.setattr(fetcher, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(fetcher, "TICK_STORE_DIR", str(tmp_path / "ticks"))
+
+    df = asyncio.run(fetcher.fetch_ohlcv("NQ=F", "max", "tick:100"))
+    assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+    assert df.index.name == "timestamp"
+    assert len(df) == 50
+    with pytest.raises(ValueError):
+        asyncio.run(fetcher.fetch_ohlcv("ES=F", "max", "tick:100"))
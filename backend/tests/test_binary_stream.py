@@ -0,0 +1,73 @@
+"""Tests for data.binary_stream framing."""
+
+import struct
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.binary_stream import KIND_CANDLES, KIND_TICKS, stream_candles, stream_ticks
+
+CANDLE_COLUMNS = [("time", "<i8"), ("open", "<f4"), ("high", "<f4"), ("low", "<f4"),
+                  ("close", "<f4"), ("volume", "<i8")]
+TICK_COLUMNS = [("time", "<i8"), ("price", "<f4"), ("size", "<i8"), ("side", "u1")]
+
+
+def decode(body: bytes, columns):
+    """Reference decoder for the AFDB framing."""
+    magic, version, kind, total = struct.unpack_from("<4sBBxxQ", body, 0)
+    assert (magic, version) == (b"AFDB", 1)
+    pos, batches = 16, []
+    while True:
+        (n,) = struct.unpack_from("<I", body, pos)
+        pos += 4
+        if n == 0:
+            break
+        batch = {}
+        for name, dtype in columns:
+            batch[name] = np.frombuffer(body, dtype=dtype, count=n, offset=pos)
+            pos += n * np.dtype(dtype).itemsize
+        batches.append(batch)
+    assert pos == len(body)
+    merged = {name: np.concatenate([b[name] for b in batches]) if batches else np.empty(0, dtype)
+              for name, dtype in columns}
+    return kind, total, len(batches), merged
+
+
+def test_candles_roundtrip_in_batches(sample_ohlcv_data):
+    chunks = list(stream_candles(sample_ohlcv_data, batch_rows=120))
+    kind, total, n_batches, cols = decode(b"".join(chunks), CANDLE_COLUMNS)
+    assert (kind, total, n_batches) == (KIND_CANDLES, 500, 5)
+    assert len(chunks) == 7  # header + 5 batches + end marker
+    np.testing.assert_array_equal(cols["time"], sample_ohlcv_data.index.as_unit("s").asi8)
+    for col in ("open", "high", "low", "close"):
+        np.testing.assert_allclose(cols[col], sample_ohlcv_data[col], rtol=1e-6)
+    np.testing.assert_array_equal(cols["volume"], sample_ohlcv_data["volume"])
+
+
+def test_ticks_roundtrip():
+    rng = np.random.default_rng(2)
+    ts = pd.Timestamp("2026-01-05", tz="UTC").value + np.sort(rng.integers(0, 10**12, 300))
+    df = pd.DataFrame({
+        "price": 21000 + np.round(rng.normal(0, 10, 300) * 4) / 4,
+        "size": rng.integers(1, 20, 300),
+        "side": rng.choice(["A", "B", "N"], 300),
+    }, index=pd.DatetimeIndex(ts.view("M8[ns]")).tz_localize("UTC"))
+
+    kind, total, _, cols = decode(b"".join(stream_ticks(df, batch_rows=64)), TICK_COLUMNS)
+    assert (kind, total) == (KIND_TICKS, 300)
+    np.testing.assert_array_equal(cols["time"], ts)
+    np.testing.assert_array_equal(cols["price"], df["price"])  # quarter ticks are exact in f32
+    np.testing.assert_array_equal(cols["size"], df["size"])
+    assert cols["side"].tobytes().decode() == "".join(df["side"])
+
+
+def test_empty_frame():
+    empty = pd.DataFrame(columns=["price", "size", "side"])
+    kind, total, n_batches, cols = decode(b"".join(stream_ticks(empty)), TICK_COLUMNS)
+    assert (total, n_batches, len(cols["time"])) == (0, 0, 0)
+
+
+def test_unknown_format(sample_ohlcv_data):
+    with pytest.raises(ValueError):
+        stream_candles(sample_ohlcv_data, "csv")
@@ -0,0 +1,168 @@
+"""Tests for data.cache size-bounded LRU / TTL caches."""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from data.cache import LRUCache, TTLCache, sizeof
+
+
+def test_sizeof_counts_array_and_frame_bytes(sample_ohlcv_data):
+    assert sizeof(np.zeros(1000)) == 8000
+    assert sizeof(sample_ohlcv_data) == sample_ohlcv_data.memory_usage(deep=True).sum()
+    assert sizeof([{"a": "x" * 1000}]) > 1000
+
+
+def test_evicts_least_recently_used_within_budget():
+    cache = LRUCache(max_bytes=3 * 8000)
+    for key in "abc":
+        cache.set(key, np.zeros(1000))
+    assert cache.get("a") is not None  # "b" is now the oldest
+    cache.set("d", np.zeros(1000))
+
+    assert "b" not in cache
+    assert all(k in cache for k in "acd")
+    assert cache.nbytes == 3 * 8000
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 0, 1)
+
+
+def test_oversized_value_not_kept():
+    cache = LRUCache(max_bytes=1000)
+    cache.set("small", np.zeros(10))
+    cache.set("big", np.zeros(1000))
+    assert cache.get("big") is None
+    assert cache.get("small") is not None
+    assert cache.stats()["misses"] == 1
+
+
+def test_replacing_key_updates_bytes():
+    cache = LRUCache(max_bytes=10**6)
+    cache.set("k", np.zeros(100))
+    cache.set("k", np.zeros(10))
+    assert len(cache) == 1
+    assert cache.nbytes == 80
+
+
+def test_delete_releases_bytes():
+    cache = LRUCache(max_bytes=10**6)
+    cache.set("k", np.zeros(100))
+    assert cache.delete("k") is True
+    assert cache.delete("k") is False
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_ttl_expiry_and_max_size():
+    cache = TTLCache(default_ttl=60.0, max_size=2)
+    cache.set("old", 1, ttl=0.01)
+    cache.set("a", 2)
+    time.sleep(0.02)
+    assert cache.get("old") is None
+    cache.set("b", 3)
+    cache.set("c", 4)
+    assert len(cache) == 2
+    assert cache.get("a") is None and cache.get("c") == 4
+
+
+def test_frame_keys_are_tuples():
+    cache = LRUCache(max_bytes=10**7)
+    df = pd.DataFrame({"close": np.arange(10.0)})
+    cache.set(("rollup", "nq", "5min"), df)
+    assert cache.get(("rollup", "nq", "5min")) is df
+
+
+def test_expired_entries_leave_through_heap():
+    cache = LRUCache(max_bytes=10**6, default_ttl=0.01)
+    for i in range(100):
+        cache.set(i, i)
+    time.sleep(0.02)
+    cache.set("fresh", 1, ttl=60)
+    assert len(cache) == 1
+    assert cache.stats()["evictions"] == 0  # expiry is not eviction
+
+
+def test_heap_compacts_on_rewrites():
+    cache = LRUCache(max_bytes=10**6, default_ttl=60)
+    for _ in range(1000):
+        cache.set("k", 1)
+    assert len(cache._expiry) <= 2 * len(cache) + 65
+
+
+def test_get_or_load_coalesces_concurrent_misses():
+    cache = TTLCache(default_ttl=60)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(10)))
+
+    assert asyncio.run(main()) == ["value"] * 10
+    assert len(calls) == 1
+    assert cache.get("k") == "value"
+
+
+def test_get_or_load_errors_reach_all_waiters_and_are_not_cached():
+    cache = TTLCache(default_ttl=60)
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(3)),
+                                    return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in asyncio.run(main()))
+    assert "k" not in cache
+
+
+def test_stale_while_revalidate():
+    cache = TTLCache(default_ttl=0.01, stale_ttl=60)
+    cache.set("k", "old")
+    time.sleep(0.02)
+    assert cache.get("k") is None  # plain get does not serve stale
+
+    async def loader():
+        return "new"
+
+    async def main():
+        first = await cache.get_or_load("k", loader)
+        await asyncio.sleep(0)  # let the background refresh finish
+        await asyncio.sleep(0)
+        return first, await cache.get_or_load("k", loader)
+
+    assert asyncio.run(main()) == ("old", "new")
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_get_or_load_sync_single_flight_and_cache_if():
+    cache = TTLCache(default_ttl=60)
+    calls = []
+    gate = threading.Event()
+
+    def loader():
+        calls.append(1)
+        gate.wait(1)
+        return {"ok": True}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load_sync("k", loader)))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert results == [{"ok": True}] * 5
+    assert len(calls) == 1
+
+    assert cache.get_or_load_sync("e", lambda: {"error": "x"}, cache_if=lambda r: "error" not in r) == {"error": "x"}
+    assert "e" not in cache
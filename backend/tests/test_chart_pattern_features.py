@@ -0,0 +1,114 @@
+"""Tests for the per-frame feature cache shared by the chart pattern detectors."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine.chart_patterns import (
+    _features as features,
+    detect_fvg,
+    detect_order_blocks,
+    detect_rsi_divergence,
+    detect_support_resistance,
+    frame_context,
+)
+from engine.chart_patterns._utils import compute_atr, detect_swing_points
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    features.clear()
+    yield
+    features.clear()
+
+
+def _count_calls(monkeypatch, name):
+    calls = []
+    original = getattr(features, name)
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(features, name, counting)
+    return calls
+
+
+def test_without_context_nothing_is_cached(sample_ohlcv_data):
+    features.atr(sample_ohlcv_data, 14)
+    assert features.stats()["entries"] == 0
+
+
+def test_detectors_share_features(sample_ohlcv_data, monkeypatch):
+    calls = _count_calls(monkeypatch, "compute_atr")
+    with frame_context("NQ=F", "5m"):
+        detect_fvg(sample_ohlcv_data)
+        detect_order_blocks(sample_ohlcv_data)
+        detect_rsi_divergence(sample_ohlcv_data)
+    assert len(calls) == 1
+    stats = features.stats()
+    assert stats["hits"] >= 1 and stats["entries"] == 3  # atr, rsi, swings
+
+
+def test_cached_results_match_direct(sample_ohlcv_data):
+    with frame_context("NQ=F", "5m"):
+        first = detect_support_resistance(sample_ohlcv_data)
+        second = detect_support_resistance(sample_ohlcv_data)
+        atr = features.atr(sample_ohlcv_data, 14)
+        swings = features.swings(sample_ohlcv_data, 5, 5)
+    assert first == second == detect_support_resistance(sample_ohlcv_data)
+    np.testing.assert_array_equal(atr, compute_atr(sample_ohlcv_data, 14))
+    assert swings == detect_swing_points(sample_ohlcv_data, 5, 5)
+
+
+def test_cached_arrays_are_read_only(sample_ohlcv_data):
+    with frame_context("NQ=F", "5m"):
+        atr = features.atr(sample_ohlcv_data, 14)
+        swings = features.swings(sample_ohlcv_data)
+        swings.clear()
+        assert features.swings(sample_ohlcv_data)  # callers get their own list
+    with pytest.raises(ValueError):
+        atr[0] = 1.0
+
+
+def test_key_separates_params_slices_and_symbols(sample_ohlcv_data):
+    with frame_context("NQ=F", "5m"):
+        full = features.atr(sample_ohlcv_data, 14)
+        tail = features.atr(sample_ohlcv_data.iloc[-200:], 14)
+        other_period = features.atr(sample_ohlcv_data, 7)
+    with frame_context("ES=F", "5m"):
+        features.atr(sample_ohlcv_data, 14)
+    assert len(tail) == 200 and not np.array_equal(full[-200:], tail)
+    assert not np.array_equal(full, other_period)
+    assert features.stats()["entries"] == 4
+
+
+def test_new_bar_invalidates_older_frames(sample_ohlcv_data):
+    older = sample_ohlcv_data.iloc[:-1]
+    with frame_context("NQ=F", "5m"):
+        features.atr(older, 14)
+        features.rsi(older, 14)
+        features.atr(older.iloc[-100:], 14)
+        assert features.stats()["entries"] == 3
+        features.atr(sample_ohlcv_data, 14)
+    assert features.stats()["entries"] == 1
+
+
+def test_updated_last_bar_invalidates_its_frame(sample_ohlcv_data):
+    forming = sample_ohlcv_data.copy()
+    with frame_context("NQ=F", "5m"):
+        before = features.atr(forming, 14)
+        features.rsi(forming, 14)
+        forming.iloc[-1, forming.columns.get_loc("high")] += 500.0
+        after = features.atr(forming, 14)
+    assert after[-1] != before[-1]
+    np.testing.assert_array_equal(after, compute_atr(forming, 14))
+    assert features.stats()["entries"] == 1
+
+
+def test_session_ids_are_local_calendar_days():
+    index = pd.date_range("2025-01-02 03:00", periods=6, freq="6h", tz="UTC").tz_convert("America/New_York")
+    df = pd.DataFrame({"close": np.arange(6.0)}, index=index)
+    expected = np.array([(d - pd.Timestamp("1970-01-01").date()).days
+                         for d in pd.Series(index).dt.date])
+    np.testing.assert_array_equal(features.session_ids(df), expected)
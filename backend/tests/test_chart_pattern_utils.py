@@ -0,0 +1,163 @@
+"""Parity tests: vectorized chart-pattern utilities vs. the original per-bar loops."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine.chart_patterns import _utils
+from engine.chart_patterns._utils import (
+    HAS_NUMBA,
+    compute_atr,
+    compute_rsi,
+    detect_swing_points,
+    wilder_smooth,
+)
+
+
+# ─── Reference implementations (the original loops) ───
+
+def _reference_swings(df, lookback, lookforward):
+    highs, lows = df["high"].values, df["low"].values
+    out = []
+    for i in range(lookback, len(df) - lookforward):
+        window = highs[i - lookback : i + lookforward + 1]
+        if highs[i] == window.max() and np.sum(window == highs[i]) == 1:
+            out.append((i, "high", float(highs[i])))
+        window = lows[i - lookback : i + lookforward + 1]
+        if lows[i] == window.min() and np.sum(window == lows[i]) == 1:
+            out.append((i, "low", float(lows[i])))
+    return out
+
+
+def _reference_atr(df, period):
+    high, low, close = (df[c].values.astype(float) for c in ("high", "low", "close"))
+    tr = np.empty(len(df))
+    tr[0] = high[0] - low[0]
+    for i in range(1, len(df)):
+        tr[i] = max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+    atr = np.full(len(df), np.nan)
+    atr[period - 1] = np.mean(tr[:period])
+    for i in range(period, len(df)):
+        atr[i] = (atr[i - 1] * (period - 1) + tr[i]) / period
+    return atr
+
+
+def _reference_rsi(closes, period):
+    deltas = np.diff(closes.astype(float))
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    rsi = np.full(len(closes), np.nan)
+    avg_gain, avg_loss = np.mean(gains[:period]), np.mean(losses[:period])
+    rsi[period] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    for i in range(period, len(deltas)):
+        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+        rsi[i + 1] = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return rsi
+
+
+# ─── Fixtures ───
+
+@pytest.fixture
+def tick_rounded_data():
+    """2000 bars on a 0.25 tick grid, so equal highs/lows (ties) are common."""
+    rng = np.random.RandomState(3)
+    n = 2000
+    close = np.round((15000 + np.cumsum(rng.randn(n) * 4)) * 4) / 4
+    high = close + np.round(rng.uniform(0, 3, n) * 4) / 4
+    low = close - np.round(rng.uniform(0, 3, n) * 4) / 4
+    dates = pd.date_range("2025-01-02 09:30", periods=n, freq="1min", tz="UTC")
+    return pd.DataFrame({"open": close, "high": high, "low": low, "close": close,
+                         "volume": rng.randint(1, 500, n).astype(float)}, index=dates)
+
+
+KERNELS = [False] + ([True] if HAS_NUMBA else [])
+
+
+# ─── Tests ───
+
+@pytest.mark.parametrize("lookback,lookforward", [(5, 5), (3, 7), (1, 1), (0, 4), (4, 0), (10, 2)])
+def test_swing_points_match_reference(tick_rounded_data, lookback, lookforward):
+    swings = detect_swing_points(tick_rounded_data, lookback, lookforward)
+    assert [(s.index, s.type, s.price) for s in swings] == \
+        _reference_swings(tick_rounded_data, lookback, lookforward)
+    assert swings[0].timestamp == int(tick_rounded_data.index[swings[0].index].timestamp())
+    assert {s.classification for s in swings} <= {"HH", "HL", "LH", "LL"}
+
+
+def test_swing_points_on_sample_data(sample_ohlcv_data):
+    swings = detect_swing_points(sample_ohlcv_data)
+    assert [(s.index, s.type, s.price) for s in swings] == _reference_swings(sample_ohlcv_data, 5, 5)
+    assert [s.timestamp for s in swings] == \
+        [_utils.ts_to_unix(sample_ohlcv_data.index[s.index]) for s in swings]
+
+
+def test_swing_points_on_integer_index(sample_ohlcv_data):
+    swings = detect_swing_points(sample_ohlcv_data.reset_index(drop=True))
+    assert [s.timestamp for s in swings] == [s.index for s in swings]
+
+
+def test_swing_points_short_frame(sample_ohlcv_data):
+    assert detect_swing_points(sample_ohlcv_data.iloc[:10], 5, 5) == []
+
+
+@pytest.mark.parametrize("use_numba", KERNELS)
+@pytest.mark.parametrize("period", [2, 14, 50])
+def test_atr_matches_reference(tick_rounded_data, use_numba, period):
+    np.testing.assert_allclose(compute_atr(tick_rounded_data, period, use_numba=use_numba),
+                               _reference_atr(tick_rounded_data, period), rtol=1e-12, equal_nan=True)
+
+
+@pytest.mark.parametrize("use_numba", KERNELS)
+@pytest.mark.parametrize("period", [2, 14, 50])
+def test_rsi_matches_reference(sample_ohlcv_data, use_numba, period):
+    closes = sample_ohlcv_data["close"].values
+    np.testing.assert_allclose(compute_rsi(closes, period, use_numba=use_numba),
+                               _reference_rsi(closes, period), rtol=1e-10, equal_nan=True)
+
+
+@pytest.mark.skipif(not HAS_NUMBA, reason="numba not installed")
+def test_numba_kernel_is_exact(tick_rounded_data):
+    expected = _reference_atr(tick_rounded_data, 14)
+    np.testing.assert_array_equal(compute_atr(tick_rounded_data, 14, use_numba=True), expected)
+
+
+def test_rsi_flat_series_is_100():
+    rsi = compute_rsi(np.full(30, 5.0), 14)
+    assert np.isnan(rsi[:14]).all()
+    assert (rsi[14:] == 100.0).all()
+
+
+def test_short_inputs_are_all_nan(sample_ohlcv_data):
+    assert np.isnan(compute_atr(sample_ohlcv_data.iloc[:5], 14)).all()
+    assert np.isnan(compute_rsi(sample_ohlcv_data["close"].values[:10], 14)).all()
+    assert np.isnan(wilder_smooth(np.arange(3.0), 14)).all()
+
+
+def test_numba_requested_without_numba(monkeypatch):
+    monkeypatch.setattr(_utils, "HAS_NUMBA", False)
+    with pytest.raises(ImportError):
+        wilder_smooth(np.arange(30.0), 14, use_numba=True)
+
+
+# ─── CrossingIndex ───
+
+def _scan(values, start, level, below):
+    for j in range(start, len(values)):
+        if (values[j] <= level) if below else (values[j] >= level):
+            return j
+    return len(values)
+
+
+@pytest.mark.parametrize("below", [True, False])
+@pytest.mark.parametrize("n", [1, 2, 7, 64, 1000])
+def test_crossing_index_matches_scan(n, below):
+    rng = np.random.RandomState(n)
+    values = np.round(np.cumsum(rng.randn(n)), 1)
+    values[rng.rand(n) < 0.05] = np.nan
+    index = _utils.CrossingIndex(values, below=below)
+    starts = rng.randint(0, n + 1, size=300)
+    levels = values[rng.randint(0, n, size=300)] + rng.choice([-0.5, 0.0, 0.5], size=300)
+    expected = [_scan(values, s, lv, below) for s, lv in zip(starts, levels)]
+    assert [index.first(int(s), float(lv)) for s, lv in zip(starts, levels)] == expected
+    assert index.first_many(starts, levels).tolist() == expected
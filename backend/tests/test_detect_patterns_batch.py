@@ -0,0 +1,99 @@
+"""Tests for the detect_patterns_batch tool: one fetch, shared features, merged overlay."""
+
+import asyncio
+import json
+
+import pytest
+
+from agent import tools
+from engine.chart_patterns import _features as features, frame_context
+
+
+@pytest.fixture
+def fetches(monkeypatch, sample_ohlcv_data):
+    calls = []
+
+    async def fake_fetch(symbol, period, interval):
+        calls.append((symbol, period, interval))
+        return sample_ohlcv_data
+
+    monkeypatch.setattr(tools, "fetch_ohlcv", fake_fetch)
+    features.clear()
+    yield calls
+    features.clear()
+
+
+def _run(handler, args):
+    return json.loads(asyncio.run(handler(args)))
+
+
+def test_batch_fetches_once_and_merges_single_detector_output(fetches):
+    names = ["fvg", "order_blocks", "support_resistance", "rsi_divergence"]
+    batch = _run(tools.handle_detect_patterns_batch, {"detectors": names, "symbol": "NQ=F", "interval": "1d"})
+
+    assert len(fetches) == 1
+    assert batch["pattern_types"] == names
+    singles = [
+        _run(tools.handle_detect_chart_patterns, {"pattern_type": "fvg", "symbol": "NQ=F", "interval": "1d"}),
+        _run(tools.handle_detect_chart_patterns, {"pattern_type": "order_blocks", "symbol": "NQ=F", "interval": "1d"}),
+        _run(tools.handle_detect_key_levels, {"level_type": "support_resistance", "symbol": "NQ=F", "interval": "1d"}),
+        _run(tools.handle_detect_divergences, {"pattern_type": "rsi_divergence", "symbol": "NQ=F", "interval": "1d"}),
+    ]
+    expected = [{**e, "id": f"{name}:{e['id']}"}
+                for name, single in zip(names, singles) for e in single["chart_script"]["elements"]]
+    assert batch["chart_script"]["elements"] == expected
+    for name, single in zip(names, singles):
+        meta = batch["detectors"][name]
+        assert meta["elements"] == len(single["chart_script"]["elements"])
+        assert meta["ms"] >= 0
+        assert {k: meta[k] for k in single["metadata"]} == single["metadata"]
+    assert batch["timing"]["bars"] == 500
+
+
+def test_batch_computes_shared_features_once(fetches, sample_ohlcv_data):
+    names = ["bos_choch", "swing_points", "liquidity_sweeps", "support_resistance", "rsi_divergence"]
+    before = features.stats()["loads"]
+    with frame_context("NQ=F", "15m"):
+        for name in names:
+            tools._ALL_DETECTORS[name](sample_ohlcv_data, {})
+    sequential = features.stats()["loads"] - before
+    features.clear()
+
+    _run(tools.handle_detect_patterns_batch, {"detectors": names, "symbol": "NQ=F"})
+    # Concurrent detectors wait on each other's feature loads instead of repeating them
+    assert features.stats()["loads"] - before - sequential == sequential
+
+
+def test_all_runs_every_detector(fetches):
+    batch = _run(tools.handle_detect_patterns_batch, {"detectors": ["all"], "symbol": "NQ=F"})
+    assert set(batch["detectors"]) == set(tools._ALL_DETECTORS)
+    assert len(fetches) == 1
+
+
+def test_merged_element_ids_are_unique(fetches):
+    batch = _run(tools.handle_detect_patterns_batch,
+                 {"detectors": ["rsi_divergence", "macd_divergence", "fvg"], "symbol": "NQ=F"})
+    ids = [e["id"] for e in batch["chart_script"]["elements"]]
+    assert any(i.startswith("rsi_divergence:div_") for i in ids)
+    assert any(i.startswith("macd_divergence:div_") for i in ids)
+    assert len(ids) == len(set(ids))
+
+    batch = _run(tools.handle_detect_patterns_batch, {"detectors": ["all"], "symbol": "NQ=F"})
+    ids = [e["id"] for e in batch["chart_script"]["elements"]]
+    assert len(ids) == len(set(ids))
+
+
+def test_failing_detector_does_not_fail_batch(fetches, monkeypatch):
+    def boom(df, args):
+        raise ValueError("bad input")
+
+    monkeypatch.setitem(tools._ALL_DETECTORS, "fvg", boom)
+    batch = _run(tools.handle_detect_patterns_batch, {"detectors": ["fvg", "round_numbers"], "symbol": "NQ=F"})
+    assert "bad input" in batch["detectors"]["fvg"]["error"]
+    assert batch["detectors"]["round_numbers"]["elements"] == len(batch["chart_script"]["elements"])
+
+
+def test_unknown_detector_is_rejected(fetches):
+    result = _run(tools.handle_detect_patterns_batch, {"detectors": ["fvg", "head_and_shoulders"]})
+    assert "head_and_shoulders" in result["error"]
+    assert fetches == []
@@ -0,0 +1,156 @@
+"""Tests for data.http_client and the fetchers ported to it, against a local stub server."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from agent.resilience import CircuitOpenError
+from data import fred_fetcher, http_client, polymarket_fetcher
+
+
+class _Stub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server = self.server
+        path = self.path.split("?")[0]
+        with server.lock:
+            server.hits.append(path)
+            server.ports.add(self.client_address[1])
+        if path == "/json":
+            self._reply(200, {"ok": True})
+        elif path == "/flaky":
+            with server.lock:
+                server.flaky_left -= 1
+                failing = server.flaky_left >= 0
+            self._reply(503, {}) if failing else self._reply(200, {"ok": "eventually"})
+        elif path == "/missing":
+            self._reply(404, {"error": "not found"})
+        elif path == "/slow":
+            with server.lock:
+                server.active += 1
+                server.peak = max(server.peak, server.active)
+            time.sleep(0.05)
+            with server.lock:
+                server.active -= 1
+            self._reply(200, {})
+        elif path == "/fred/series/observations":
+            series = self.path.split("series_id=")[1].split("&")[0]
+            value = {"DGS2": "4.5", "DGS10": "4.0"}.get(series, "3.0")
+            self._reply(200, {"observations": [{"value": value, "date": "2026-01-02"}]})
+        elif path == "/poly/events":
+            self._reply(200, [{
+                "title": "Fed cuts rates in March?", "slug": "fed-march", "volume": 10,
+                "markets": [{"question": "Fed cuts in March?", "outcomes": '["Yes","No"]',
+                             "outcomePrices": '["0.3","0.7"]', "volume": 5, "slug": "fed-march"}],
+            }])
+        else:
+            self._reply(404, {})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self._reply(200, {"echo": json.loads(self.rfile.read(length))})
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.hits, server.ports = [], set()
+    server.flaky_left = 0
+    server.active = server.peak = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_and_post_reuse_one_connection(stub):
+    async def main():
+        first = await http_client.get_json(f"{stub.url}/json", provider="stub")
+        second = await http_client.get_json(f"{stub.url}/json", provider="stub")
+        echo = await http_client.request_json("POST", f"{stub.url}/echo", provider="stub", json={"a": 1})
+        await http_client.aclose()
+        return first, second, echo
+
+    assert asyncio.run(main()) == ({"ok": True}, {"ok": True}, {"echo": {"a": 1}})
+    assert len(stub.ports) == 1  # keep-alive: one TCP connection for all three
+
+
+def test_retries_retryable_status(stub):
+    stub.flaky_left = 2
+    result = asyncio.run(http_client.get_json(f"{stub.url}/flaky", provider="stub-retry", base_delay=0.01))
+    assert result == {"ok": "eventually"}
+    assert stub.hits.count("/flaky") == 3
+
+
+def test_client_errors_not_retried_and_do_not_trip_breaker(stub):
+    async def main():
+        for _ in range(10):
+            with pytest.raises(httpx.HTTPStatusError):
+                await http_client.get_json(f"{stub.url}/missing", provider="stub-404", base_delay=0.01)
+
+    asyncio.run(main())
+    assert stub.hits.count("/missing") == 10
+    assert http_client.breaker_for("stub-404").state.value == "closed"
+
+
+def test_breaker_opens_after_exhausted_retries(stub):
+    stub.flaky_left = 1000
+
+    async def main():
+        for _ in range(5):
+            with pytest.raises(httpx.HTTPStatusError):
+                await http_client.get_json(f"{stub.url}/flaky", provider="stub-down", retries=1, base_delay=0.001)
+        with pytest.raises(CircuitOpenError):
+            await http_client.get_json(f"{stub.url}/flaky", provider="stub-down")
+
+    asyncio.run(main())
+    assert stub.hits.count("/flaky") == 10
+
+
+def test_per_host_concurrency_limit(stub, monkeypatch):
+    host = stub.url.split("//")[1]
+    monkeypatch.setitem(http_client.HOST_CONCURRENCY, host, 2)
+
+    async def main():
+        await asyncio.gather(*(http_client.get_json(f"{stub.url}/slow", provider="stub") for _ in range(6)))
+
+    asyncio.run(main())
+    assert stub.peak == 2
+
+
+def test_fred_treasury_yields_fan_out(stub, monkeypatch):
+    monkeypatch.setenv("FRED_API_KEY", "test")
+    monkeypatch.setattr(fred_fetcher, "_BASE", f"{stub.url}/fred")
+    result = asyncio.run(fred_fetcher.fetch_treasury_yields())
+    assert stub.hits.count("/fred/series/observations") == len(fred_fetcher.TREASURY_SERIES)
+    assert result["yields"]["2y"] == 4.5 and result["yields"]["10y"] == 4.0
+    assert result["inverted"] is True
+
+
+def test_polymarket_search(stub, monkeypatch):
+    monkeypatch.setattr(polymarket_fetcher, "_BASE", f"{stub.url}/poly")
+    polymarket_fetcher._market_cache.clear()
+    markets = asyncio.run(polymarket_fetcher.search_markets("fed march", limit=3))
+    assert markets[0]["title"] == "Fed cuts in March?"
+    assert markets[0]["outcomes"] == [{"name": "Yes", "price": 0.3}, {"name": "No", "price": 0.7}]
@@ -0,0 +1,86 @@
+"""Tests for the ICT detectors' fill / mitigation search.
+
+``CrossingIndex`` is swapped for a linear forward scan (the original
+algorithm); the detectors must produce identical elements either way.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine.chart_patterns import detect_fvg, detect_order_blocks, ict_patterns
+
+
+class ScanCrossing:
+    """Reference: the per-candidate forward scan the detectors used to run."""
+
+    def __init__(self, values, below=True):
+        self.values, self.below, self.n = np.asarray(values, dtype=float), below, len(values)
+
+    def first(self, start, level):
+        for j in range(start, self.n):
+            if (self.values[j] <= level) if self.below else (self.values[j] >= level):
+                return j
+        return self.n
+
+    def first_many(self, starts, levels):
+        return np.array([self.first(int(s), float(lv)) for s, lv in zip(starts, levels)], dtype=np.int64)
+
+
+@pytest.fixture
+def trending_data():
+    """3000 5-min bars that trend, reverse and gap, so some gaps/OBs never fill."""
+    rng = np.random.RandomState(11)
+    n = 3000
+    drift = np.repeat([0.6, -0.4, 0.8, -0.9, 0.3, 0.5], n // 6)
+    close = 15000 + np.cumsum(drift + rng.randn(n) * 3)
+    jumps = rng.rand(n) < 0.02
+    close += np.cumsum(np.where(jumps, rng.randn(n) * 25, 0.0))
+    high = close + rng.uniform(0.25, 4, n)
+    low = close - rng.uniform(0.25, 4, n)
+    open_ = low + rng.uniform(0, 1, n) * (high - low)
+    index = pd.date_range("2025-01-02 09:30", periods=n, freq="5min", tz="UTC")
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close,
+                         "volume": rng.randint(100, 5000, n).astype(float)}, index=index)
+
+
+def _both(monkeypatch, detector, df, **kwargs):
+    fast = detector(df, **kwargs)
+    with monkeypatch.context() as m:
+        m.setattr(ict_patterns, "CrossingIndex", ScanCrossing)
+        slow = detector(df, **kwargs)
+    return fast, slow
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"max_age_bars": 10_000}, {"show_filled": False},
+                                    {"min_gap_atr_ratio": 0.05, "max_age_bars": 10_000}])
+def test_fvg_matches_scan(monkeypatch, trending_data, kwargs):
+    fast, slow = _both(monkeypatch, detect_fvg, trending_data, **kwargs)
+    assert fast == slow
+    assert fast.metadata["total_detected"] > 0
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"impulse_atr_multiplier": 1.0, "impulse_candle_count": 2}])
+def test_order_blocks_match_scan(monkeypatch, trending_data, kwargs):
+    fast, slow = _both(monkeypatch, detect_order_blocks, trending_data, **kwargs)
+    assert fast == slow
+    labels = {e.props.get("label") for e in fast.elements}
+    assert fast.metadata["total_detected"] > 0 and len(labels) > 1
+
+
+def test_unfilled_fvgs_extend_to_last_bar(trending_data):
+    result = detect_fvg(trending_data, max_age_bars=10_000, min_gap_atr_ratio=0.05)
+    last = int(trending_data.index[-1].timestamp())
+    states = {"(filled)" in e.props["label"] for e in result.elements}
+    assert states == {True, False}
+    for element in result.elements:
+        if "(filled)" not in element.props["label"]:
+            assert element.props["timeEnd"] == last
+
+
+def test_tiny_frames():
+    df = pd.DataFrame({"open": [1.0, 2.0], "high": [1.5, 2.5], "low": [0.5, 1.5],
+                       "close": [1.2, 2.2], "volume": [1.0, 1.0]},
+                      index=pd.date_range("2025-01-01", periods=2, freq="5min"))
+    assert detect_fvg(df).elements == []
+    assert detect_order_blocks(df).elements == []
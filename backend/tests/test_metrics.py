@@ -1,8 +1,9 @@
 """Tests for the calculate_metrics function."""
 
+import numpy as np
 import pytest
 
-from engine.metrics import calculate_metrics
+from engine.metrics import calculate_metrics, calculate_metrics_columns
 
 
 INITIAL_BALANCE = 50_000
@@ -110,3 +111,28 @@ class TestCalculateMetrics:
 
         assert metrics["max_consecutive_wins"] == 3
         assert metrics["max_consecutive_losses"] == 2
+
+
+class TestCalculateMetricsColumns:
+
+    def test_matches_calculate_metrics(self):
+        """Each column's metrics equal calculate_metrics on that column's trades."""
+        rng = np.random.default_rng(0)
+        per_col = [
+            [],
+            [125.0],
+            [-40.0, -40.0],
+            list(np.round(rng.normal(20, 300, 57), 2)),
+            list(np.round(rng.normal(-10, 150, 200), 2)),
+        ]
+        pnls = np.concatenate([np.asarray(p, dtype=float) for p in per_col])
+        cols = np.concatenate([np.full(len(p), c) for c, p in enumerate(per_col)])
+        # Interleave columns; only the within-column order matters
+        order = np.argsort(rng.random(len(pnls)))
+        pnls, cols = pnls[order], cols[order]
+        batched = calculate_metrics_columns(pnls, cols, len(per_col), INITIAL_BALANCE)
+
+        for c, metrics in enumerate(batched):
+            expected = calculate_metrics(_make_trades(list(pnls[cols == c])), INITIAL_BALANCE)
+            assert metrics.keys() == expected.keys()
+            assert metrics == pytest.approx(expected)
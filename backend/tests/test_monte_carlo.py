@@ -2,11 +2,17 @@
 
 import sys
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from engine.monte_carlo import run_monte_carlo
+from engine import monte_carlo
+from engine.monte_carlo import HAS_NUMBA, _simulate, run_monte_carlo
 
 
 SAMPLE_PNLS = [100, -50, 200, -30, 150, -80, 120, -40, 60, -20]
@@ -88,3 +94,97 @@ class TestRunMonteCarlo:
         final_p75 = curves["p75"][-1]
         final_p95 = curves["p95"][-1]
         assert final_p5 <= final_p25 <= final_p50 <= final_p75 <= final_p95
+
+
+def _reference(sequences, initial_balance, ruin_level):
+    """Per-simulation loop the batched engine replaced."""
+    finals, drawdowns, ruined = [], [], 0
+    for seq in sequences:
+        equity = np.concatenate(([initial_balance], initial_balance + np.cumsum(seq)))
+        finals.append(equity[-1] - initial_balance)
+        drawdowns.append((equity - np.maximum.accumulate(equity)).min())
+        ruined += equity.min() <= ruin_level
+    return np.array(finals), np.array(drawdowns), ruined
+
+
+class TestBatchedSimulation:
+    """Tests for the batched _simulate engine."""
+
+    PNLS = np.random.default_rng(3).normal(-5, 400, 300)
+
+    @pytest.mark.parametrize("sampler", ["reshuffle", "resample", "skip"])
+    def test_matches_reference_loop(self, sampler):
+        """Stats equal a plain per-simulation loop over the same sequences."""
+        result = _simulate(self.PNLS, 20000, 400, 30, 9, sampler, use_numba=False)
+        if sampler == "resample":
+            # One batch: its stream is the first child of the resample child
+            stream = np.random.SeedSequence(9).spawn(3)[1].spawn(1)[0]
+            idx = np.random.default_rng(stream).integers(0, len(self.PNLS), (400, len(self.PNLS)))
+            finals, drawdowns, ruined = _reference(self.PNLS[idx], 20000, 14000)
+            assert result.mean_return == round(float(finals.mean()), 2)
+            assert result.mean_max_drawdown == round(float(drawdowns.mean()), 2)
+            assert result.worst_max_drawdown == round(float(drawdowns.min()), 2)
+            assert result.probability_of_ruin == round(ruined / 400 * 100, 2)
+        elif sampler == "reshuffle":
+            # Every permutation ends at the same total
+            assert result.std_return == 0
+            assert result.mean_return == round(float(self.PNLS.sum()), 2)
+        else:
+            assert result.num_trades == len(self.PNLS)
+        assert len(result.equity_percentiles["p50"]) == len(self.PNLS) + 1
+
+    @pytest.mark.parametrize("sampler", ["reshuffle", "resample", "skip"])
+    def test_workers_do_not_change_results(self, sampler):
+        serial = _simulate(self.PNLS, 20000, 300, 30, 1, sampler, use_numba=False, chunk_bytes=1)
+        pooled = _simulate(self.PNLS, 20000, 300, 30, 1, sampler, use_numba=False, chunk_bytes=1,
+                           workers=2)
+        assert pooled.to_dict() == serial.to_dict()
+
+    def test_full_mode_reproducible_across_workers(self):
+        serial = run_monte_carlo(list(self.PNLS), 20000, 200, method="full", seed=5)
+        pooled = run_monte_carlo(list(self.PNLS), 20000, 200, method="full", seed=5, workers=3)
+        assert pooled.to_dict() == serial.to_dict()
+        # Each method draws from its own stream, same as a single-method run
+        skip = run_monte_carlo(list(self.PNLS), 20000, 200, method="skip", seed=5)
+        assert serial.sub_results["skip"] == skip.to_dict()
+
+    def test_concurrent_callers_share_the_pool(self, monkeypatch):
+        created = []
+        real_pool = monte_carlo.ProcessPoolExecutor
+
+        def slow_pool(**kw):
+            created.append(kw)
+            time.sleep(0.05)  # keep the other callers inside the creation window
+            return real_pool(**kw)
+
+        monkeypatch.setattr(monte_carlo, "ProcessPoolExecutor", slow_pool)
+        monkeypatch.setattr(monte_carlo, "_pool", None)
+        monkeypatch.setattr(monte_carlo, "_pool_workers", 0)
+        serial = run_monte_carlo(list(self.PNLS), 20000, 200, method="full", seed=5)
+
+        def run_all(worker_counts):
+            barrier = threading.Barrier(len(worker_counts))
+
+            def run(workers):
+                barrier.wait()
+                return run_monte_carlo(list(self.PNLS), 20000, 200, method="full", seed=5, workers=workers)
+
+            with ThreadPoolExecutor(len(worker_counts)) as threads:
+                return list(threads.map(run, worker_counts))
+
+        try:
+            assert all(r.to_dict() == serial.to_dict() for r in run_all([2, 2, 2, 2]))
+            assert len(created) == 1
+            # A different worker count replaces the pool under callers still using it
+            assert all(r.to_dict() == serial.to_dict() for r in run_all([2, 3, 2, 3]))
+        finally:
+            monte_carlo._pool.shutdown()
+
+    @pytest.mark.skipif(not HAS_NUMBA, reason="numba not installed")
+    @pytest.mark.parametrize("n_trades", [1, 2, 300])
+    @pytest.mark.parametrize("sampler", ["reshuffle", "resample", "skip"])
+    def test_numba_matches_numpy(self, sampler, n_trades):
+        pnls = self.PNLS[:n_trades]
+        a = _simulate(pnls, 20000, 300, 30, 1, sampler, use_numba=False)
+        b = _simulate(pnls, 20000, 300, 30, 1, sampler, use_numba=True)
+        assert a.to_dict() == b.to_dict()
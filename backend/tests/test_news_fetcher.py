@@ -0,0 +1,179 @@
+"""Tests for data.news_fetcher polling, conditional GETs and the merged snapshot."""
+
+import asyncio
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from data import news_fetcher, news_index
+
+
+def _rss(items):
+    entries = "".join(
+        f"<item><title>{title}</title><link>http://x/{i}</link><description>{desc}</description>"
+        f"<pubDate>{date}</pubDate></item>"
+        for i, (title, desc, date) in enumerate(items)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{entries}</channel></rss>'.encode()
+
+
+def _ago(hours):
+    return formatdate(time.time() - hours * 3600, usegmt=True)
+
+
+FEEDS = {
+    "/a": _rss([
+        ("Fed holds rates steady", "FOMC statement", _ago(5)),
+        ("NVDA beats earnings", "Strong quarter for NVDA", _ago(2)),
+    ]),
+    "/b": _rss([
+        ("Fed holds rates steady", "duplicate headline", _ago(4.9)),
+        ("Gold rallies on weak dollar", "Commodity move", _ago(4)),
+        ("Undated oil note", "crude", ""),
+    ]),
+}
+
+
+class _FeedServer(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        etag = f'"{self.path}-v1"'
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path.startswith("/google"):
+            body = _rss([("Tariff talks stall again", "Trade war fears", _ago(1))])
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = FEEDS[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def feeds(monkeypatch, tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedServer)
+    server.daemon_threads = True
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr(news_fetcher, "RSS_FEEDS", {
+        "a": {"url": f"{url}/a", "source": "Reuters", "category": "Markets"},
+        "b": {"url": f"{url}/b", "source": "CNBC", "category": "Markets"},
+    })
+    monkeypatch.setattr(news_fetcher, "_snapshot", [])
+    monkeypatch.setattr(news_fetcher, "_snapshot_at", 0.0)
+    monkeypatch.setattr(news_fetcher, "_google_news_url", lambda q: f"{url}/google?q={q}")
+    monkeypatch.setattr(news_index, "_index", news_index.NewsIndex(str(tmp_path / "news.sqlite")))
+    news_fetcher._feed_cache.clear()
+    news_fetcher._search_cache.clear()
+    yield server
+    news_fetcher._feed_cache.clear()
+    server.shutdown()
+    server.server_close()
+
+
+def test_snapshot_is_deduplicated_and_newest_first(feeds):
+    items = asyncio.run(news_fetcher.fetch_all_news(limit=50))
+    titles = [i["title"] for i in items]
+    assert titles == ["NVDA beats earnings", "Gold rallies on weak dollar",
+                      "Fed holds rates steady", "Undated oil note"]
+    # The duplicate headline is kept from the first feed
+    assert items[2]["source"] == "Reuters"
+    assert items[-1]["time"] == "Recent"
+    assert items[0]["time"] == "2h ago"
+
+
+def test_filters_read_the_snapshot(feeds):
+    async def main():
+        await news_fetcher.fetch_all_news()
+        return (await news_fetcher.fetch_all_news(ticker="nvda"),
+                await news_fetcher.fetch_all_news(source="cnbc"),
+                await news_fetcher.fetch_all_news(category="Commodities"))
+
+    nvda, cnbc, commodities = asyncio.run(main())
+    assert [i["title"] for i in nvda] == ["NVDA beats earnings"]
+    assert {i["source"] for i in cnbc} == {"CNBC"}
+    assert "Gold rallies on weak dollar" in [i["title"] for i in commodities]
+    assert len(feeds.requests) == 2  # later reads did not poll
+
+
+def test_repoll_uses_conditional_get(feeds, monkeypatch):
+    asyncio.run(news_fetcher.refresh_feeds())
+    monkeypatch.setattr(news_fetcher, "POLL_INTERVAL", 0.0)
+    items = asyncio.run(news_fetcher.refresh_feeds())
+
+    revalidations = [etag for _, etag in feeds.requests[2:]]
+    assert sorted(revalidations) == ['"/a-v1"', '"/b-v1"']
+    assert len(items) == 4  # 304 keeps the parsed items
+
+
+def test_concurrent_refreshes_share_one_poll(feeds):
+    async def main():
+        return await asyncio.gather(*(news_fetcher.refresh_feeds() for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert all(r is results[0] for r in results)
+    assert len(feeds.requests) == 2
+
+
+def test_failed_feed_keeps_last_items(feeds, monkeypatch):
+    asyncio.run(news_fetcher.refresh_feeds())
+    monkeypatch.setattr(news_fetcher, "POLL_INTERVAL", 0.0)
+    feeds.shutdown()
+    feeds.server_close()
+    items = asyncio.run(news_fetcher.refresh_feeds())
+    assert len(items) == 4
+
+
+def test_polled_articles_are_searchable(feeds):
+    async def main():
+        await news_fetcher.refresh_feeds()
+        return await news_fetcher.search_news("fed rates", limit=1)
+
+    items = asyncio.run(main())
+    assert items[0]["title"] == "Fed holds rates steady"
+    assert not any(path.startswith("/google") for path, _ in feeds.requests)
+
+
+def test_search_cold_miss_goes_to_network_once(feeds):
+    async def main():
+        first = await news_fetcher.search_news("tariff talks", limit=5)
+        second = await news_fetcher.search_news("tariff talks", limit=1)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert [i["title"] for i in first] == ["Tariff talks stall again"]
+    assert [i["title"] for i in second] == ["Tariff talks stall again"]
+    # The second query is answered by the index the first one filled
+    assert sum(path.startswith("/google") for path, _ in feeds.requests) == 1
+
+
+def test_google_news_rss_is_fetched_async_and_indexed(feeds):
+    async def main():
+        articles = await news_fetcher.fetch_google_news_rss("tariff stock")
+        hits = await news_fetcher.search_news("tariff talks", limit=1)
+        return articles, hits
+
+    articles, hits = asyncio.run(main())
+    assert [a["title"] for a in articles] == ["Tariff talks stall again"]
+    assert [h["title"] for h in hits] == ["Tariff talks stall again"]
+    assert sum(path.startswith("/google") for path, _ in feeds.requests) == 1
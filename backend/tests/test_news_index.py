@@ -0,0 +1,75 @@
+"""Tests for data.news_index: full-text search, filters, ranking and retention."""
+
+import time
+
+import pytest
+
+from data.news_index import NewsIndex, match_expression
+
+
+def _item(n, title, summary="", category="Markets", source="Reuters"):
+    return {"id": f"id{n}", "title": title, "summary": summary, "category": category,
+            "source": source, "sentiment": "neutral", "url": f"http://x/{n}", "time": "Recent"}
+
+
+@pytest.fixture
+def index(tmp_path):
+    now = time.time()
+    idx = NewsIndex(str(tmp_path / "news.sqlite"), retention_days=30, max_articles=100)
+    idx.add([
+        (now - 3600, _item(1, "Fed holds rates steady", "FOMC keeps policy unchanged", "Macro"), []),
+        (now - 7200, _item(2, "NVDA beats earnings estimates", "Data center revenue jumps", "Earnings"), ["NVDA"]),
+        (now - 5 * 86400, _item(3, "Rates outlook: Fed seen cutting", "Markets price cuts", "Macro", "CNBC"), []),
+        (now - 600, _item(4, "Oil rallies as OPEC trims output", "Crude higher", "Commodities"), ["CL=F"]),
+        (None, _item(5, "NVDA and AAPL lead tech rally", "Mega caps gain", "Markets"), ["NVDA", "AAPL"]),
+    ])
+    return idx
+
+
+def test_match_expression_drops_stopwords():
+    assert match_expression("latest news on the Fed") == '"fed"'
+    assert match_expression("news") is None
+    assert match_expression('tariffs "trade war"') == '"tariffs" "trade" "war"'
+
+
+def test_search_ranks_title_matches_first(index):
+    titles = [item["title"] for _, item in index.search("fed rates")]
+    assert titles == ["Fed holds rates steady", "Rates outlook: Fed seen cutting"]
+
+
+def test_search_stems_words(index):
+    assert [item["id"] for _, item in index.search("earning")] == ["id2"]
+
+
+def test_filters(index):
+    assert {item["id"] for _, item in index.search(ticker="nvda")} == {"id2", "id5"}
+    assert [item["id"] for _, item in index.search("fed", source="cnbc")] == ["id3"]
+    assert [item["id"] for _, item in index.search(category="Commodities")] == ["id4"]
+    assert [item["id"] for _, item in index.search("fed", since=time.time() - 86400)] == ["id1"]
+
+
+def test_no_query_returns_newest_first(index):
+    ids = [item["id"] for _, item in index.search(limit=3)]
+    assert ids == ["id5", "id4", "id1"]  # undated article filed at first-seen time
+
+
+def test_duplicates_and_expired_articles_are_skipped(index):
+    now = time.time()
+    added = index.add([
+        (now, _item(1, "Fed holds rates steady"), []),
+        (now - 60 * 86400, _item(9, "Ancient headline"), []),
+    ])
+    assert added == 0
+    assert len(index) == 5
+
+
+def test_purge_enforces_retention_and_cap(tmp_path):
+    now = time.time()
+    idx = NewsIndex(str(tmp_path / "news.sqlite"), retention_days=1, max_articles=3)
+    idx.add((now - i * 60, _item(i, f"Headline {i}", ticker), [ticker])
+            for i, ticker in enumerate(["AAPL", "MSFT", "NVDA", "META", "TSLA"]))
+    assert idx.purge() == 2
+    assert len(idx) == 3
+    assert idx.search(ticker="TSLA") == []
+    assert idx.search("headline", ticker="AAPL")[0][1]["id"] == "id0"
+    assert idx.search("meta") == []  # full-text rows removed with the article
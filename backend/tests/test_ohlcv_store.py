@@ -0,0 +1,159 @@
+"""Tests for the columnar Databento OHLCV store."""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data import ohlcv_store
+from data.ohlcv_store import (
+    ROLLUP_RULES, load_rollup, load_store, read_csv_files, resample_ohlcv, slice_rollup,
+    source_files, sync_store,
+)
+
+
+def _write_csv(path, start, n, seed):
+    rng = np.random.default_rng(seed)
+    close = 20000 + np.cumsum(rng.normal(0, 5, n))
+    df = pd.DataFrame({
+        "ts_event": pd.date_range(start, periods=n, freq="1min", tz="UTC"),
+        "rtype": 33,
+        "open": close + rng.normal(0, 1, n),
+        "high": close + 5,
+        "low": close - 5,
+        "close": close,
+        "volume": rng.integers(1, 500, n),
+        "symbol": "NQ.c.0",
+    })
+    df.to_csv(path, index=False)
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    data_dir = tmp_path / "databento"
+    data_dir.mkdir()
+    _write_csv(data_dir / "nq_2025_1min.csv", "2025-12-24 20:00", 30000, seed=1)
+    return str(data_dir), str(tmp_path / "store")
+
+
+def test_matches_csv_parse(dirs):
+    data_dir, store_dir = dirs
+    df = load_store("nq", data_dir, store_dir)
+    pd.testing.assert_frame_equal(df, read_csv_files(source_files("nq", data_dir)))
+    assert not df["close"].to_numpy().flags.writeable  # memory-mapped
+
+
+def test_unchanged_sources_are_not_reparsed(dirs, monkeypatch):
+    data_dir, store_dir = dirs
+    first = sync_store("nq", data_dir, store_dir)
+    monkeypatch.setattr(ohlcv_store, "read_csv_files", lambda files: pytest.fail("reparsed"))
+    assert sync_store("nq", data_dir, store_dir) == first
+
+
+def test_new_file_is_appended(dirs, monkeypatch):
+    data_dir, store_dir = dirs
+    sync_store("nq", data_dir, store_dir)
+    # Overlaps the last few hours of the first file
+    _write_csv(os.path.join(data_dir, "nq_2026_1min.csv"), "2026-01-14 11:00", 3000, seed=2)
+
+    parsed = []
+    real = ohlcv_store.read_csv_files
+    monkeypatch.setattr(ohlcv_store, "read_csv_files",
+                        lambda files: parsed.append(files) or real(files))
+    df = load_store("nq", data_dir, store_dir)
+
+    assert [[os.path.basename(f) for f in files] for files in parsed] == [["nq_2026_1min.csv"]]
+    full = real(source_files("nq", data_dir))
+    assert df.index.is_monotonic_increasing and df.index.is_unique
+    pd.testing.assert_frame_equal(df, full)
+    # One generation directory remains
+    assert len([p for p in os.listdir(store_dir) if p.startswith("nq-")]) == 1
+
+
+def test_modified_file_rebuilds(dirs):
+    data_dir, store_dir = dirs
+    sync_store("nq", data_dir, store_dir)
+    _write_csv(os.path.join(data_dir, "nq_2025_1min.csv"), "2025-06-01 00:00", 50, seed=3)
+    df = load_store("nq", data_dir, store_dir)
+    assert len(df) == 50
+    assert df.index[0] == pd.Timestamp("2025-06-01", tz="UTC")
+
+
+def test_missing_prefix_raises(dirs):
+    data_dir, store_dir = dirs
+    with pytest.raises(ValueError):
+        load_store("es", data_dir, store_dir)
+
+
+@pytest.mark.parametrize("rule", ROLLUP_RULES)
+def test_rollup_slices_match_resample(dirs, rule):
+    data_dir, store_dir = dirs
+    bars = load_store("nq", data_dir, store_dir)
+    rollup = load_rollup("nq", rule, data_dir, store_dir)
+    pd.testing.assert_frame_equal(rollup, resample_ohlcv(bars, rule), check_freq=False)
+    for start in [bars.index[0] - pd.Timedelta(days=1), bars.index[4321],
+                  bars.index[17000] + pd.Timedelta(seconds=30), bars.index[-1]]:
+        pd.testing.assert_frame_equal(
+            slice_rollup(bars, rollup, start, rule),
+            resample_ohlcv(bars[bars.index >= start], rule),
+            check_freq=False,
+        )
+
+
+def test_rollups_follow_appended_bars(dirs, monkeypatch):
+    data_dir, store_dir = dirs
+    for rule in ROLLUP_RULES:
+        load_rollup("nq", rule, data_dir, store_dir)
+    _write_csv(os.path.join(data_dir, "nq_2026_1min.csv"), "2026-01-14 10:07", 5000, seed=4)
+
+    resampled = []
+    real = ohlcv_store.resample_ohlcv
+    monkeypatch.setattr(ohlcv_store, "resample_ohlcv",
+                        lambda df, rule: resampled.append(len(df)) or real(df, rule))
+    manifest = sync_store("nq", data_dir, store_dir)
+    monkeypatch.undo()
+
+    bars = load_store("nq", data_dir, store_dir)
+    # Only a tail window is resampled per rollup
+    assert len(resampled) == len(ROLLUP_RULES) and max(resampled) < len(bars) // 2
+    for rule in ROLLUP_RULES:
+        rollup = ohlcv_store._open_rollup("nq", manifest, rule, store_dir)
+        pd.testing.assert_frame_equal(rollup, resample_ohlcv(bars, rule), check_freq=False)
+
+
+def test_concurrent_cold_starts_build_once(dirs, monkeypatch):
+    data_dir, store_dir = dirs
+    parsed = []
+    real = ohlcv_store.read_csv_files
+
+    def slow_parse(files):
+        parsed.append(files)
+        time.sleep(0.2)  # keep the build in progress while the others arrive
+        return real(files)
+
+    monkeypatch.setattr(ohlcv_store, "read_csv_files", slow_parse)
+    barrier = threading.Barrier(4)
+
+    def cold_start():
+        barrier.wait()
+        return load_store("nq", data_dir, store_dir)
+
+    with ThreadPoolExecutor(4) as pool:
+        frames = list(pool.map(lambda _: cold_start(), range(4)))
+
+    assert len(parsed) == 1
+    for df in frames[1:]:
+        pd.testing.assert_frame_equal(df, frames[0])
+    assert len([p for p in os.listdir(store_dir) if p.startswith("nq-")]) == 1
+
+
+def test_rollup_save_does_not_recreate_removed_generation(dirs):
+    data_dir, store_dir = dirs
+    bars = load_store("nq", data_dir, store_dir)
+    gone = os.path.join(store_dir, "nq-superseded")
+    ohlcv_store._save_rollup(gone, "5min", resample_ohlcv(bars, "5min"))
+    assert not os.path.exists(gone)
@@ -0,0 +1,85 @@
+"""Tests for engine.optimizer grid/random search, serial and process-pool."""
+
+import pytest
+
+from engine import optimizer
+from engine.optimizer import grid_search, random_search
+from engine.preset_strategies import PRESET_STRATEGIES
+
+PRESET = PRESET_STRATEGIES[0]
+STRATEGY = PRESET["class"]
+
+
+def _grid():
+    return {k: [v, v * 2] for k, v in list(PRESET["default_params"].items())[:2]
+            if isinstance(v, int)}
+
+
+def test_grid_search_parallel_matches_serial(sample_ohlcv_data, backtest_config):
+    serial = grid_search(STRATEGY, sample_ohlcv_data, backtest_config, _grid(), top_n=3)
+    parallel = grid_search(STRATEGY, sample_ohlcv_data, backtest_config, _grid(), top_n=3,
+                           workers=2)
+    assert serial.evaluated == parallel.evaluated == serial.total_combinations
+    assert parallel.to_dict() == serial.to_dict()
+
+
+def test_random_search_parallel_matches_serial(sample_ohlcv_data, backtest_config):
+    ranges = {k: {"min": max(2, v // 2), "max": v * 2}
+              for k, v in PRESET["default_params"].items() if isinstance(v, int)}
+    serial = random_search(STRATEGY, sample_ohlcv_data, backtest_config, ranges, num_trials=6)
+    parallel = random_search(STRATEGY, sample_ohlcv_data, backtest_config, ranges, num_trials=6,
+                             workers=3)
+    assert parallel.to_dict() == serial.to_dict()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_on_update_streams_ranking(sample_ohlcv_data, backtest_config, workers):
+    updates = []
+    result = grid_search(STRATEGY, sample_ohlcv_data, backtest_config, _grid(), top_n=2,
+                         workers=workers, on_update=updates.append)
+    assert len(updates) == result.evaluated
+    assert [len(u) for u in updates][:2] == [1, 2]
+    for ranking in updates:
+        values = [r["metric_value"] for r in ranking]
+        assert values == sorted(values, reverse=True)
+    assert [r["params"] for r in updates[-1]] == [r["params"] for r in result.results]
+
+
+COMPILED_CODE = """
+from engine.strategy import BaseStrategy, Signal
+
+class CompiledBuyStrategy(BaseStrategy):
+    def on_bar(self, bar, history):
+        period = self.params.get("period", 10)
+        if len(history) < period + 2:
+            return None
+        if bar["close"] > history["close"].iloc[-period]:
+            return Signal(action="buy", size=1.0)
+        return Signal(action="close")
+"""
+
+
+def test_unpicklable_strategy_runs_serially(sample_ohlcv_data, backtest_config, caplog):
+    Local = type("Local", (STRATEGY,), {})  # not importable by worker processes
+    with caplog.at_level("WARNING", logger="afindr.optimizer"):
+        result = grid_search(Local, sample_ohlcv_data, backtest_config, _grid(), workers=2)
+    assert result.evaluated == result.total_combinations
+    assert "serially" in caplog.text
+
+
+def test_compiled_strategy_ships_code_to_workers(sample_ohlcv_data, backtest_config, monkeypatch):
+    from agent.sandbox import execute_strategy_code
+
+    compiled = execute_strategy_code(COMPILED_CODE)
+    pools = []
+    real_pool = optimizer.ProcessPoolExecutor
+    monkeypatch.setattr(optimizer, "ProcessPoolExecutor",
+                        lambda **kw: pools.append(kw) or real_pool(**kw))
+    grid = {"period": [3, 5, 8, 13]}
+    serial = grid_search(compiled, sample_ohlcv_data, backtest_config, grid)
+    parallel = grid_search(compiled, sample_ohlcv_data, backtest_config, grid, workers=2,
+                           strategy_code=COMPILED_CODE)
+    assert len(pools) == 1
+    assert pools[0]["initargs"][1] == COMPILED_CODE
+    assert parallel.evaluated == 4
+    assert parallel.to_dict() == serial.to_dict()
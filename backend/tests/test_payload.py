@@ -0,0 +1,44 @@
+"""Tests for data.payload column-wise serialization."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.payload import json_response, ohlcv_columns, tick_columns, to_rows
+
+
+def test_candle_rows_match_iterrows(sample_ohlcv_data):
+    legacy = [{
+        "time": int(ts.timestamp()),
+        "open": round(row["open"], 2),
+        "high": round(row["high"], 2),
+        "low": round(row["low"], 2),
+        "close": round(row["close"], 2),
+        "volume": int(row["volume"]),
+    } for ts, row in sample_ohlcv_data.iterrows()]
+    assert to_rows(ohlcv_columns(sample_ohlcv_data)) == legacy
+
+
+def test_tick_rows_match_iterrows():
+    rng = np.random.default_rng(1)
+    ts = pd.Timestamp("2026-01-05", tz="UTC").value + np.sort(rng.integers(0, 10**13, 500))
+    df = pd.DataFrame({
+        "price": 21000 + rng.normal(0, 10, 500),
+        "size": rng.integers(1, 20, 500),
+        "side": rng.choice(["A", "B"], 500),
+    }, index=pd.DatetimeIndex(ts.view("M8[ns]")).tz_localize("UTC"))
+
+    rows = to_rows(tick_columns(df))
+    for got, (t, row) in zip(rows, df.iterrows()):
+        assert got["time"] == pytest.approx(t.timestamp(), abs=2e-6)
+        assert (got["price"], got["size"], got["side"]) == (
+            round(float(row["price"]), 2), int(row["size"]), str(row["side"]))
+
+
+def test_json_response_body(sample_ohlcv_data):
+    columns = ohlcv_columns(sample_ohlcv_data.iloc[:3])
+    resp = json_response({"candles": columns})
+    assert resp.media_type == "application/json"
+    assert json.loads(resp.body) == {"candles": columns}
@@ -0,0 +1,129 @@
+"""Tests for data.shared_cache SQLite cache backend."""
+
+import asyncio
+import multiprocessing
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.cache import TTLCache, make_cache
+from data.shared_cache import HAS_FCNTL, SqliteCache, decode, encode
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "fetchers.sqlite")
+
+
+def test_encode_round_trips_frames_and_payloads(sample_ohlcv_data):
+    blob = encode(sample_ohlcv_data)
+    assert blob[:1] == b"P"
+    pd.testing.assert_frame_equal(decode(blob), sample_ohlcv_data)
+
+    payload = {"ticker": "AAPL", "intraday": [1.5, 2.0], "pe": None}
+    assert encode(payload)[:1] == b"J"
+    assert decode(encode(payload)) == payload
+
+
+@pytest.mark.parametrize("value", [
+    (1, 2),
+    {"range": (0.5, 1.5)},
+    {1: "jan", 2: "feb"},
+    [{"ids": {7, 8}}],
+    {"ratio": float("nan")},
+])
+def test_encode_round_trips_values_json_would_change(value, cache_path):
+    blob = encode(value)
+    assert blob[:1] == b"P"
+    decoded = decode(blob)
+    assert type(decoded) is type(value)
+    assert repr(decoded) == repr(value)
+
+    cache = SqliteCache("rt", path=cache_path)
+    cache.set("k", value)
+    assert repr(cache.get("k")) == repr(value)
+
+
+def test_shared_between_instances(cache_path):
+    a = SqliteCache("quotes", default_ttl=60, path=cache_path)
+    b = SqliteCache("quotes", default_ttl=60, path=cache_path)
+    other = SqliteCache("feeds", default_ttl=60, path=cache_path)
+    a.set("quote:AAPL", {"price": 1.0})
+    assert b.get("quote:AAPL") == {"price": 1.0}
+    assert other.get("quote:AAPL") is None
+    assert len(b) == 1
+
+
+def test_ttl_and_stale_window(cache_path):
+    cache = SqliteCache("yf", default_ttl=0.01, stale_ttl=60, path=cache_path)
+    cache.set("k", [1, 2])
+    time.sleep(0.02)
+    assert cache.get("k") is None
+    assert cache.get_or_load_sync("k", lambda: [3]) == [1, 2]  # stale, refreshing
+    # The refreshed row expires within 10ms too, so read it through the stale window
+    deadline = time.time() + 2
+    while cache._peek("k")[1] != [3] and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache._peek("k")[1] == [3]
+
+
+def test_purge_enforces_max_size(cache_path):
+    cache = SqliteCache("bls", default_ttl=60, max_size=5, path=cache_path)
+    for i in range(20):
+        cache.set(i, i)
+    cache.purge()
+    assert len(cache) == 5
+    assert cache.get(19) == 19
+
+
+def test_async_get_or_load(cache_path):
+    cache = SqliteCache("yf", default_ttl=60, path=cache_path)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return pd.DataFrame({"close": np.arange(3.0)})
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_load("AAPL", loader) for _ in range(5)))
+
+    frames = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(f["close"].tolist() == [0.0, 1.0, 2.0] for f in frames)
+    assert cache.get("AAPL")["close"].tolist() == [0.0, 1.0, 2.0]
+
+
+def _worker(path, counter, barrier):
+    cache = SqliteCache("quotes", default_ttl=60, path=path)
+
+    def loader():
+        with open(counter, "a") as f:
+            f.write("x")
+        time.sleep(0.2)
+        return {"price": 42}
+
+    barrier.wait()
+    assert cache.get_or_load_sync("quote:NQ", loader) == {"price": 42}
+
+
+@pytest.mark.skipif(not HAS_FCNTL, reason="needs fcntl file locks")
+def test_single_flight_across_processes(cache_path, tmp_path):
+    counter = str(tmp_path / "calls")
+    ctx = multiprocessing.get_context("fork")
+    barrier = ctx.Barrier(3)
+    procs = [ctx.Process(target=_worker, args=(cache_path, counter, barrier)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(10)
+    assert [p.exitcode for p in procs] == [0, 0, 0]
+    assert open(counter).read() == "x"
+
+
+def test_make_cache_backends():
+    assert isinstance(make_cache("t", backend="memory"), TTLCache)
+    with pytest.raises(ValueError):
+        make_cache("t", backend="redis")
@@ -0,0 +1,195 @@
+"""Tests for engine.signal_simulator and run_signals_backtest.
+
+The simulator must reproduce the bar-by-bar Backtester exactly, so each
+signal set is also replayed through Backtester via a BaseStrategy that
+emits the equivalent Signal objects.
+"""
+
+import numpy as np
+import pytest
+
+from engine.backtester import Backtester
+from engine.signal_simulator import HAS_NUMBA, simulate_signals
+from engine.strategy import BaseStrategy, Signal
+from engine.vbt_backtester import HAS_VBT, run_signals_backtest, run_vbt_backtest
+from engine.vbt_strategy import TradeSignal, VectorBTStrategy
+
+
+def _random_signals(df, seed, shorts=True, stops=True, density=0.05):
+    rng = np.random.default_rng(seed)
+    n = len(df)
+    close = df["close"].to_numpy()
+    sig = TradeSignal(
+        entries=rng.random(n) < density,
+        exits=rng.random(n) < density,
+    )
+    if shorts:
+        sig.short_entries = rng.random(n) < density
+        sig.short_exits = rng.random(n) < density
+    if stops:
+        # Distances are sign-agnostic: SL/TP for both sides are set from the
+        # long-side perspective, then mirrored where a short would enter.
+        dist_sl = rng.uniform(20, 120, n)
+        dist_tp = rng.uniform(20, 160, n)
+        short_bar = sig.short_entries & ~sig.entries if shorts else np.zeros(n, dtype=bool)
+        sig.stop_loss = np.where(short_bar, close + dist_sl, close - dist_sl)
+        sig.take_profit = np.where(short_bar, close - dist_tp, close + dist_tp)
+        sig.take_profit[rng.random(n) < 0.3] = np.nan
+    return sig
+
+
+class _Signals(VectorBTStrategy):
+    def __init__(self, signals):
+        super().__init__({})
+        self.signals = signals
+
+    def generate_signals(self, df):
+        return self.signals
+
+
+class _Replay(BaseStrategy):
+    """Replays TradeSignal arrays as bar-by-bar Signals."""
+
+    def __init__(self, signals, n):
+        super().__init__({})
+        z = np.zeros(n, dtype=bool)
+        self.le = signals.entries
+        self.lx = signals.exits
+        self.se = signals.short_entries if signals.short_entries is not None else z
+        self.sx = signals.short_exits if signals.short_exits is not None else z
+        self.sl = signals.stop_loss if signals.stop_loss is not None else np.full(n, np.nan)
+        self.tp = signals.take_profit if signals.take_profit is not None else np.full(n, np.nan)
+        self.i = -1
+        self.side = None
+
+    def _open(self, action, i):
+        sl, tp = self.sl[i], self.tp[i]
+        return Signal(action=action,
+                      stop_loss=None if np.isnan(sl) else float(sl),
+                      take_profit=None if np.isnan(tp) else float(tp))
+
+    def on_bar(self, bar, history):
+        self.i += 1
+        i = self.i
+        # The Backtester may have stopped us out before on_bar; infer the
+        # position from what we asked for plus stop hits.
+        if self.side == "long" and self._stopped(bar, "long"):
+            self.side = None
+        elif self.side == "short" and self._stopped(bar, "short"):
+            self.side = None
+
+        if self.side is None:
+            if self.le[i]:
+                self.side, self._levels = "long", (self.sl[i], self.tp[i])
+                return self._open("buy", i)
+            if self.se[i]:
+                self.side, self._levels = "short", (self.sl[i], self.tp[i])
+                return self._open("sell", i)
+        elif self.side == "long":
+            if self.lx[i]:
+                self.side = None
+                return Signal(action="close")
+            if self.se[i]:
+                self.side, self._levels = "short", (self.sl[i], self.tp[i])
+                return self._open("sell", i)
+        else:
+            if self.sx[i]:
+                self.side = None
+                return Signal(action="close")
+            if self.le[i]:
+                self.side, self._levels = "long", (self.sl[i], self.tp[i])
+                return self._open("buy", i)
+        return None
+
+    def _stopped(self, bar, side):
+        sl, tp = self._levels
+        if side == "long":
+            return (sl == sl and bar["low"] <= sl) or (tp == tp and bar["high"] >= tp)
+        return (sl == sl and bar["high"] >= sl) or (tp == tp and bar["low"] <= tp)
+
+
+def _kernels():
+    return [False, True] if HAS_NUMBA else [False]
+
+
+@pytest.mark.parametrize("use_numba", _kernels())
+@pytest.mark.parametrize("seed", range(6))
+@pytest.mark.parametrize("shorts,stops", [(False, False), (True, False), (False, True), (True, True)])
+def test_matches_backtester(sample_ohlcv_data, backtest_config, use_numba, seed, shorts, stops):
+    df = sample_ohlcv_data
+    signals = _random_signals(df, seed, shorts=shorts, stops=stops)
+    expected = Backtester(_Replay(signals, len(df)), df, backtest_config).run()
+    result = run_signals_backtest(_Signals(signals), df, backtest_config, use_numba=use_numba)
+
+    assert len(result.trades) == len(expected.trades) > 0
+    for got, want in zip(result.trades, expected.trades):
+        assert got == pytest.approx(want)
+    assert result.metrics == pytest.approx(expected.metrics)
+    np.testing.assert_allclose(result.equity_values, expected.equity_values, atol=0.011)
+    np.testing.assert_array_equal(result.equity_times, expected.equity_times)
+
+
+@pytest.mark.skipif(not HAS_VBT, reason="vectorbt not installed")
+@pytest.mark.parametrize("seed", range(3))
+def test_vbt_path_honors_stops(sample_ohlcv_data, backtest_config, seed):
+    df = sample_ohlcv_data
+    signals = _random_signals(df, seed)
+    native = run_signals_backtest(_Signals(signals), df, backtest_config)
+    result = run_vbt_backtest(_Signals(signals), df, backtest_config)
+
+    assert any(abs(t["exit_price"] - t["stop_loss"]) < 0.01 for t in result.trades)
+    assert result.trades == native.trades
+    assert result.metrics == native.metrics
+
+
+@pytest.mark.skipif(not HAS_NUMBA, reason="numba not installed")
+def test_kernels_identical():
+    rng = np.random.default_rng(3)
+    n = 20_000
+    close = 15000 + np.cumsum(rng.normal(0, 5, n))
+    high = close + rng.uniform(0, 8, n)
+    low = close - rng.uniform(0, 8, n)
+    kwargs = dict(
+        entries=rng.random(n) < 0.02, exits=rng.random(n) < 0.02,
+        short_entries=rng.random(n) < 0.02, short_exits=rng.random(n) < 0.02,
+        stop_loss=np.where(rng.random(n) < 0.5, close - 10, np.nan),
+        take_profit=np.where(rng.random(n) < 0.5, close + 15, np.nan),
+        slippage=0.25, commission=2.5, point_value=20.0, initial_balance=50_000.0,
+    )
+    a = simulate_signals(high, low, close, use_numba=False, **kwargs)
+    b = simulate_signals(high, low, close, use_numba=True, **kwargs)
+    assert a.num_trades == b.num_trades > 0
+    for field in ("entry_idx", "exit_idx", "side"):
+        np.testing.assert_array_equal(getattr(a, field), getattr(b, field))
+    for field in ("entry_price", "exit_price", "pnl", "mae", "mfe", "equity"):
+        np.testing.assert_allclose(getattr(a, field), getattr(b, field), rtol=1e-12)
+
+
+def test_stop_fills_at_level():
+    close = np.array([100.0, 101.0, 99.0, 98.0])
+    high = close + 0.5
+    low = close - 3.0
+    sim = simulate_signals(
+        high, low, close,
+        entries=np.array([True, False, False, False]), exits=np.zeros(4, dtype=bool),
+        stop_loss=np.array([97.5, np.nan, np.nan, np.nan]),
+        use_numba=False,
+    )
+    assert sim.num_trades == 1
+    assert sim.exit_idx[0] == 2
+    assert sim.exit_price[0] == 97.5
+    assert sim.pnl_points[0] == -2.5
+
+
+def test_no_signals(sample_ohlcv_data, backtest_config):
+    n = len(sample_ohlcv_data)
+    signals = TradeSignal(entries=np.zeros(n, dtype=bool), exits=np.zeros(n, dtype=bool))
+    result = run_signals_backtest(_Signals(signals), sample_ohlcv_data, backtest_config)
+    assert result.trades == []
+    assert (result.equity_values == backtest_config.initial_balance).all()
+
+
+def test_rejects_misaligned_signals(sample_ohlcv_data, backtest_config):
+    signals = TradeSignal(entries=np.zeros(3, dtype=bool), exits=np.zeros(3, dtype=bool))
+    with pytest.raises(ValueError):
+        run_signals_backtest(_Signals(signals), sample_ohlcv_data, backtest_config)
@@ -0,0 +1,248 @@
+"""Tests for the streaming chart-pattern detectors and the /ws/patterns channel."""
+
+import json
+import time
+
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from engine.chart_patterns import (
+    STREAMING_DETECTORS,
+    StreamingFVG,
+    create_streaming_detector,
+    detect_bos_choch,
+    detect_fvg,
+    detect_liquidity_sweeps,
+    detect_order_blocks,
+    detect_swing_points_with_labels,
+    ict_patterns,
+)
+from routers import ws
+
+BATCH = {
+    "fvg": detect_fvg,
+    "order_blocks": detect_order_blocks,
+    "liquidity_sweeps": detect_liquidity_sweeps,
+    "bos_choch": detect_bos_choch,
+    "swing_points": detect_swing_points_with_labels,
+}
+
+
+def _bars(df):
+    return [{"time": t, "open": r.open, "high": r.high, "low": r.low, "close": r.close}
+            for t, r in zip(df.index, df.itertuples())]
+
+
+@pytest.mark.parametrize("name", sorted(STREAMING_DETECTORS))
+def test_snapshot_matches_batch(name, sample_ohlcv_data):
+    snapshot = create_streaming_detector(name).feed(sample_ohlcv_data)
+    assert snapshot.elements == BATCH[name](sample_ohlcv_data).elements
+
+
+@pytest.mark.parametrize("name", sorted(STREAMING_DETECTORS))
+def test_uncapped_snapshot_matches_batch(name, sample_ohlcv_data, monkeypatch):
+    monkeypatch.setattr(ict_patterns, "MAX_ELEMENTS", 100_000)
+    snapshot = create_streaming_detector(name, {"max_elements": 100_000}).feed(sample_ohlcv_data)
+    expected = BATCH[name](sample_ohlcv_data).elements
+    assert snapshot.elements == expected
+
+
+@pytest.mark.parametrize("name", sorted(STREAMING_DETECTORS))
+def test_deltas_track_batch_bar_by_bar(name, sample_ohlcv_data):
+    det = create_streaming_detector(name)
+    client = {el.id: el for el in det.feed(sample_ohlcv_data.iloc[:300]).elements}
+    changed = 0
+    for k, bar in enumerate(_bars(sample_ohlcv_data.iloc[300:]), start=301):
+        delta = det.update(bar)
+        for rid in delta.removed:
+            del client[rid]
+        for el in delta.elements:
+            assert delta.time == bar["time"].timestamp()
+            client[el.id] = el
+        changed += len(delta.elements)
+        if k % 40 == 0:
+            assert det.snapshot().elements == BATCH[name](sample_ohlcv_data.iloc[:k]).elements
+    assert changed > 0
+    assert set(client) == {el.id for el in det.snapshot().elements}
+
+
+def test_params_are_coerced_to_their_defaults_type():
+    det = create_streaming_detector("bos_choch", {"swing_lookback": "3", "trend_swings": 2.0})
+    assert (det.lookback, det.trend_swings) == (3, 2)
+    fvg = create_streaming_detector("fvg", {"min_gap_atr_ratio": "0.5", "show_filled": "false"})
+    assert (fvg.min_gap_atr_ratio, fvg.show_filled) == (0.5, False)
+
+
+@pytest.mark.parametrize("params", [
+    {"swing_lookback": "five"},
+    {"swing_lookback": 2.5},
+    {"swing_lookback": 0},
+    {"swing_lookback": True},
+    {"swing_lookback": None},
+    {"trend_swings": [3]},
+])
+def test_bad_params_raise_value_error(params):
+    with pytest.raises(ValueError):
+        create_streaming_detector("bos_choch", params)
+
+
+def test_fvg_fill_and_expiry_are_deltas():
+    index = pd.date_range("2026-01-05", periods=40, freq="1min", tz="UTC")
+    df = pd.DataFrame({"open": 100.0, "high": 101.0, "low": 99.0, "close": 100.0}, index=index)
+    det = StreamingFVG(max_age_bars=10)
+    det.feed(df.iloc[:20])
+
+    delta = det.update({"time": index[20], "open": 110.0, "high": 111.0, "low": 109.0, "close": 110.0})
+    assert [el.id for el in delta.elements] == ["fvg_bull_20"]  # low 109 over high 101 two bars back
+    assert "(filled)" not in delta.elements[0].props["label"]
+    assert not det.update({"time": index[21], "open": 105.0, "high": 106.0, "low": 101.2, "close": 105.0})
+
+    fill = {"time": index[22], "open": 108.0, "high": 108.9, "low": 100.5, "close": 101.0}
+    delta = det.update(fill)
+    assert [el.id for el in delta.elements] == ["fvg_bull_20"]
+    assert delta.elements[0].props["label"].endswith("(filled)")
+    assert delta.elements[0].props["timeEnd"] == int(index[22].timestamp())
+
+    flat = {"time": None, "open": 101.0, "high": 102.0, "low": 100.0, "close": 101.0}
+    removed = []
+    for k in range(23, 35):
+        removed += det.update({**flat, "time": index[0] + pd.Timedelta(minutes=k)}).removed
+    assert removed == ["fvg_bull_20"]
+    assert det.snapshot().elements == []
+
+
+# ─── /ws/patterns ───
+
+@pytest.fixture
+def live(monkeypatch, sample_ohlcv_data):
+    frames = {"df": sample_ohlcv_data.iloc[:401]}
+
+    async def fake_fetch(symbol, period, interval):
+        return frames["df"]
+
+    monkeypatch.setattr(ws, "fetch_ohlcv", fake_fetch)
+    app = FastAPI()
+    app.include_router(ws.router)
+    with TestClient(app) as client:
+        yield client, frames
+
+
+def test_ws_snapshot_then_pushed_bar_deltas(live, sample_ohlcv_data):
+    client, _ = live
+    names = ["fvg", "order_blocks", "swing_points"]
+    with client.websocket_connect("/ws/patterns") as sock:
+        sock.send_json({"symbol": "NQ=F", "interval": "1d", "detectors": names})
+        snapshot = sock.receive_json()
+        assert snapshot["type"] == "snapshot"
+        history = sample_ohlcv_data.iloc[:400]  # the last fetched bar is still forming
+        expected = [el.to_dict() for name in names for el in BATCH[name](history).elements]
+        assert snapshot["chart_script"]["elements"] == expected
+
+        dets = [create_streaming_detector(name) for name in names]
+        for det in dets:
+            det.feed(history)
+        for bar in _bars(sample_ohlcv_data.iloc[400:460]):
+            deltas = [det.update(bar) for det in dets]
+            payload = {**bar, "time": bar["time"].isoformat()}
+            sock.send_json({"type": "bar", "bar": payload})
+            if any(deltas):
+                message = sock.receive_json()
+                assert message["type"] == "patterns"
+                assert message["script_id"] == snapshot["script_id"]
+                assert message["elements"] == [el.to_dict() for d in deltas for el in d.elements]
+                assert message["removed"] == [rid for d in deltas for rid in d.removed]
+        sock.send_text("ping")
+        assert sock.receive_text() == "pong"
+
+
+def test_ws_polls_for_closed_bars(live, monkeypatch, sample_ohlcv_data):
+    client, frames = live
+    monkeypatch.setattr(ws, "PATTERN_POLL_SECONDS", 0.05)
+    with client.websocket_connect("/ws/patterns") as sock:
+        sock.send_json({"symbol": "NQ=F", "interval": "1d", "detectors": ["swing_points"]})
+        assert sock.receive_json()["time"] == int(sample_ohlcv_data.index[399].timestamp())
+        frames["df"] = sample_ohlcv_data
+        message = sock.receive_json()
+        assert message["type"] == "patterns"
+        det = create_streaming_detector("swing_points")
+        det.feed(sample_ohlcv_data.iloc[:400])
+        first = next(d for bar in _bars(sample_ohlcv_data.iloc[400:499]) if (d := det.update(bar)))
+        assert message["time"] == first.time
+        assert message["elements"] == [el.to_dict() for el in first.elements]
+
+
+def test_ws_polls_while_client_pings(live, monkeypatch, sample_ohlcv_data):
+    client, frames = live
+    monkeypatch.setattr(ws, "PATTERN_POLL_SECONDS", 0.2)
+    with client.websocket_connect("/ws/patterns") as sock:
+        sock.send_json({"symbol": "NQ=F", "interval": "1d", "detectors": ["swing_points"]})
+        sock.receive_json()
+        frames["df"] = sample_ohlcv_data
+        messages = []
+        for _ in range(40):  # a ping every 50ms, well inside the poll interval
+            time.sleep(0.05)
+            sock.send_text("ping")
+            messages.append(sock.receive_text())
+            if messages[-1] != "pong":
+                break
+        assert json.loads(messages[-1])["type"] == "patterns"
+
+
+def test_ws_rejects_unknown_detector(live):
+    client, _ = live
+    with client.websocket_connect("/ws/patterns") as sock:
+        sock.send_json({"detectors": ["fvg", "head_and_shoulders"]})
+        message = sock.receive_json()
+        assert message["type"] == "error"
+        assert "head_and_shoulders" in message["error"]
+
+
+def test_ws_reports_bad_params(live):
+    client, _ = live
+    with client.websocket_connect("/ws/patterns") as sock:
+        sock.send_json({"detectors": ["bos_choch"], "swing_lookback": "five"})
+        message = sock.receive_json()
+        assert message["type"] == "error"
+        assert "swing_lookback" in message["error"]
+
+
+def test_ws_client_gap_resyncs_from_fetch(live, sample_ohlcv_data):
+    client, frames = live
+    names = ["fvg", "swing_points"]
+    with client.websocket_connect("/ws/patterns") as sock:
+        sock.send_json({"symbol": "NQ=F", "interval": "1d", "detectors": names})
+        sock.receive_json()
+        dets = [create_streaming_detector(name) for name in names]
+        for det in dets:
+            det.feed(sample_ohlcv_data.iloc[:400])
+        expected = []
+        for bar in _bars(sample_ohlcv_data.iloc[400:440]):
+            deltas = [det.update(bar) for det in dets]
+            if any(deltas):
+                expected.append([el.to_dict() for d in deltas for el in d.elements])
+        skipped = {**_bars(sample_ohlcv_data.iloc[439:440])[0]}
+        skipped["time"] = skipped["time"].isoformat()
+
+        # The poll has not seen bar 439 yet: the client bar is left to it
+        sock.send_json({"type": "bar", "bar": skipped})
+        sock.send_text("ping")
+        assert sock.receive_text() == "pong"
+
+        frames["df"] = sample_ohlcv_data
+        sock.send_json({"type": "bar", "bar": skipped})
+        received = [sock.receive_json()["elements"] for _ in expected]
+        assert received == expected
+        sock.send_text("ping")
+        assert sock.receive_text() == "pong"
+
+
+@pytest.mark.parametrize("detectors", [5, "fvg", ["fvg", 3]])
+def test_ws_rejects_malformed_detectors(live, detectors):
+    client, _ = live
+    with client.websocket_connect("/ws/patterns") as sock:
+        sock.send_json({"detectors": detectors})
+        message = sock.receive_json()
+        assert message["type"] == "error"
+        assert message["error"].startswith("Unknown detectors:")
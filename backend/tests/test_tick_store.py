@@ -0,0 +1,119 @@
+"""Tests for the day-partitioned tick store."""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data import tick_store
+from data.tick_store import read_day, read_tail, read_tick_csv, sync_ticks, tick_files
+
+
+def _write_ticks(path, start, end, n, seed, extra=()):
+    rng = np.random.default_rng(seed)
+    lo, hi = pd.Timestamp(start, tz="UTC").value, pd.Timestamp(end, tz="UTC").value
+    ts = np.sort(rng.integers(lo, hi, n))
+    extra = np.array([pd.Timestamp(t, tz="UTC").value for t in extra], dtype=np.int64)
+    ts = np.concatenate([ts, extra])
+    pd.DataFrame({
+        "ts_event": pd.DatetimeIndex(ts.view("M8[ns]")).tz_localize("UTC"),
+        "rtype": 0,
+        "price": 21000 + np.round(rng.normal(0, 10, len(ts)) * 4) / 4,
+        "size": rng.integers(1, 20, len(ts)),
+        "side": rng.choice(["A", "B", "N"], len(ts)),
+    }).to_csv(path, index=False)
+
+
+def _reference(data_dir):
+    """The old single in-memory frame."""
+    frames = [read_tick_csv(f) for f in tick_files("nq", data_dir)]
+    return pd.concat(frames).sort_index(kind="stable")
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    data_dir = tmp_path / "databento"
+    data_dir.mkdir()
+    # Ends with a tick exactly on 2026-01-07 midnight
+    _write_ticks(data_dir / "nq_tick_a.csv", "2026-01-05 13:00", "2026-01-06 22:00", 3000, seed=1,
+                 extra=["2026-01-07 00:00:00"])
+    return str(data_dir), str(tmp_path / "ticks")
+
+
+@pytest.mark.parametrize("date", ["2026-01-05", "2026-01-06", "2026-01-07", "2026-02-01"])
+def test_day_matches_loc_slice(dirs, date):
+    data_dir, store_dir = dirs
+    ref = _reference(data_dir)
+    target = pd.Timestamp(date).tz_localize("UTC")
+    expected = ref.loc[target:target + pd.Timedelta(days=1)]
+    got = read_day("nq", date, data_dir, store_dir)
+    assert len(got) == len(expected)
+    if len(expected):
+        pd.testing.assert_frame_equal(got, expected)
+
+
+@pytest.mark.parametrize("limit", [1, 500, 2500, 10_000])
+def test_tail_matches(dirs, limit):
+    data_dir, store_dir = dirs
+    pd.testing.assert_frame_equal(read_tail("nq", limit, data_dir, store_dir),
+                                  _reference(data_dir).tail(limit))
+
+
+def test_new_file_rewrites_only_its_days(dirs):
+    data_dir, store_dir = dirs
+    before = sync_ticks("nq", data_dir, store_dir)["days"]
+    _write_ticks(os.path.join(data_dir, "nq_tick_b.csv"), "2026-01-06 20:00", "2026-01-08 02:00",
+                 1000, seed=2)
+    after = sync_ticks("nq", data_dir, store_dir)["days"]
+
+    assert after["2026-01-05"] == before["2026-01-05"]
+    assert after["2026-01-06"]["segment"] != before["2026-01-06"]["segment"]
+    assert "2026-01-08" in after
+    segments = set(os.listdir(os.path.join(store_dir, "nq")))
+    assert segments == {entry["segment"] for entry in after.values()}
+
+    ref = _reference(data_dir)
+    pd.testing.assert_frame_equal(read_day("nq", "2026-01-06", data_dir, store_dir),
+                                  ref.loc["2026-01-06":"2026-01-07 00:00:00"])
+    pd.testing.assert_frame_equal(read_tail("nq", 10**6, data_dir, store_dir), ref)
+
+
+def test_no_tick_files(tmp_path):
+    assert read_day("nq", "2026-01-05", str(tmp_path), str(tmp_path / "ticks")).empty
+    assert read_tail("nq", 100, str(tmp_path), str(tmp_path / "ticks")).empty
+
+
+def test_concurrent_syncs_keep_every_published_segment(dirs):
+    data_dir, store_dir = dirs
+    barrier = threading.Barrier(4)
+
+    def cold_start():
+        barrier.wait()
+        return sync_ticks("nq", data_dir, store_dir)
+
+    with ThreadPoolExecutor(4) as pool:
+        manifests = list(pool.map(lambda _: cold_start(), range(4)))
+
+    assert all(m == manifests[0] for m in manifests)
+    segments = set(os.listdir(os.path.join(store_dir, "nq")))
+    assert segments == {entry["segment"] for entry in manifests[0]["days"].values()}
+    pd.testing.assert_frame_equal(read_tail("nq", 10**6, data_dir, store_dir), _reference(data_dir))
+
+
+def test_reads_retry_when_a_segment_was_swapped(dirs, monkeypatch):
+    data_dir, store_dir = dirs
+    fresh = sync_ticks("nq", data_dir, store_dir)
+    # A manifest read just before a concurrent sync replaced every segment
+    stale = {**fresh, "days": {day: {**entry, "segment": f"{day}-superseded"}
+                               for day, entry in fresh["days"].items()}}
+    manifests = iter([stale, fresh, stale, fresh])
+    monkeypatch.setattr(tick_store, "sync_ticks", lambda *args: next(manifests))
+
+    reference = _reference(data_dir)
+    target = pd.Timestamp("2026-01-05", tz="UTC")
+    pd.testing.assert_frame_equal(read_day("nq", "2026-01-05", data_dir, store_dir),
+                                  reference.loc[target:target + pd.Timedelta(days=1)])
+    pd.testing.assert_frame_equal(read_tail("nq", 100, data_dir, store_dir), reference.tail(100))
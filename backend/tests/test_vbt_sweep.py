@@ -0,0 +1,78 @@
+"""Tests for the column-stacked parameter sweep in engine.vbt_backtester."""
+
+import numpy as np
+import pytest
+
+from engine import vbt_backtester
+from engine.vbt_backtester import HAS_VBT, run_signals_backtest, run_vbt_backtest, run_vbt_sweep
+from engine.vbt_strategy import TradeSignal, VectorBTStrategy
+
+
+class EMACross(VectorBTStrategy):
+    def generate_signals(self, df):
+        if self.params["fast"] >= self.params["slow"]:
+            raise ValueError("fast must be below slow")
+        fast = df["close"].ewm(span=self.params["fast"], adjust=False).mean()
+        slow = df["close"].ewm(span=self.params["slow"], adjust=False).mean()
+        above = (fast > slow).to_numpy()
+        prev = np.concatenate(([False], above[:-1]))
+        cross_up, cross_dn = above & ~prev, ~above & prev
+        return TradeSignal(entries=cross_up, exits=cross_dn,
+                           short_entries=cross_dn, short_exits=cross_up)
+
+
+class EMACrossStops(EMACross):
+    """EMACross with a fixed-distance stop on odd ``fast`` values only."""
+
+    def generate_signals(self, df):
+        signals = super().generate_signals(df)
+        if self.params["fast"] % 2:
+            close = df["close"].to_numpy()
+            signals.stop_loss = np.where(signals.entries, close - 40, close + 40)
+            signals.take_profit = np.where(signals.entries, close + 60, close - 60)
+        return signals
+
+
+GRID = {"fast": [5, 10, 20], "slow": [10, 30, 50]}
+
+
+def _assert_matches(result, strategy_class, data, config, single_run, abs_tol=None):
+    assert result.total_combos == 9
+    for params, metrics in zip(result.param_combos, result.metrics):
+        if params["fast"] >= params["slow"]:
+            assert metrics == {"params": params, "error": True}
+            continue
+        single = single_run(strategy_class(params), data, config)
+        assert metrics["params"] == params
+        assert {k: v for k, v in metrics.items() if k != "params"} == pytest.approx(single.metrics, abs=abs_tol)
+
+
+@pytest.mark.parametrize("strategy_class", [EMACross, EMACrossStops])
+@pytest.mark.parametrize("max_chunk_bytes", [1, 256 * 1024 * 1024])
+def test_sweep_matches_single_runs(sample_ohlcv_data, backtest_config, monkeypatch,
+                                   strategy_class, max_chunk_bytes):
+    monkeypatch.setattr(vbt_backtester, "HAS_VBT", False)
+    result = run_vbt_sweep(strategy_class, sample_ohlcv_data, backtest_config, GRID,
+                           max_chunk_bytes=max_chunk_bytes)
+    _assert_matches(result, strategy_class, sample_ohlcv_data, backtest_config, run_signals_backtest)
+
+
+@pytest.mark.skipif(not HAS_VBT, reason="vectorbt not installed")
+@pytest.mark.parametrize("strategy_class", [EMACross, EMACrossStops])
+@pytest.mark.parametrize("max_chunk_bytes", [1, 256 * 1024 * 1024])
+def test_vbt_sweep_matches_single_runs(sample_ohlcv_data, backtest_config, strategy_class, max_chunk_bytes):
+    result = run_vbt_sweep(strategy_class, sample_ohlcv_data, backtest_config, GRID,
+                           max_chunk_bytes=max_chunk_bytes)
+    # Column metrics sum trades in a different order than calculate_metrics,
+    # which can flip a rounded average by one cent
+    _assert_matches(result, strategy_class, sample_ohlcv_data, backtest_config, run_vbt_backtest,
+                    abs_tol=0.011)
+
+
+def test_sweep_best_and_heatmap(sample_ohlcv_data, backtest_config):
+    result = run_vbt_sweep(EMACross, sample_ohlcv_data, backtest_config, GRID)
+    valid = [m for m in result.metrics if not m.get("error")]
+    assert len(valid) == 7
+    assert result.best_metrics["sharpe_ratio"] == max(m["sharpe_ratio"] for m in valid)
+    assert result.heatmap_data["x_param"] == "fast"
+    assert len(result.heatmap_data["cells"]) == 7
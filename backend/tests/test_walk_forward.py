@@ -8,7 +8,7 @@ import pytest
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from engine.backtester import BacktestConfig
+from engine.backtester import Backtester, BacktestConfig
 from engine.walk_forward import run_walk_forward
 from engine.strategy import BaseStrategy, Signal
 
@@ -64,6 +64,20 @@ def backtest_config():
 
 PARAM_GRID = {"period": [5, 10, 15]}
 
+# The same strategy as user code, compiled at runtime like the agent tool does
+SIMPLE_BUY_CODE = """
+from engine.strategy import BaseStrategy, Signal
+
+class CompiledBuyStrategy(BaseStrategy):
+    def on_bar(self, bar, history):
+        period = self.params.get("period", 10)
+        if len(history) < period + 2:
+            return None
+        if bar["close"] > history["close"].iloc[-2]:
+            return Signal(action="buy", size=1.0)
+        return Signal(action="close")
+"""
+
 
 # ---------------------------------------------------------------------------
 # Tests
@@ -128,3 +142,134 @@ class TestRunWalkForward:
         )
         for window in result.windows:
             assert "best_params" in window, f"Window missing best_params: {window}"
+
+    def test_parallel_matches_serial(self, sample_ohlcv_data, backtest_config):
+        """Spreading the IS grids over worker processes changes nothing."""
+        kwargs = dict(strategy_class=SimpleBuyStrategy, data=sample_ohlcv_data,
+                      config=backtest_config, param_grid=PARAM_GRID, num_windows=3)
+        serial = run_walk_forward(**kwargs)
+        parallel = run_walk_forward(**kwargs, workers=2)
+        assert parallel.to_dict() == serial.to_dict()
+
+    def test_compiled_strategy_runs_on_workers(self, sample_ohlcv_data, backtest_config,
+                                               monkeypatch):
+        """Unpicklable runtime classes reach the pool as source, not serially."""
+        from agent.sandbox import execute_strategy_code
+        from engine import walk_forward
+
+        compiled = execute_strategy_code(SIMPLE_BUY_CODE)
+        pools = []
+        real_pool = walk_forward.ProcessPoolExecutor
+        monkeypatch.setattr(walk_forward, "ProcessPoolExecutor",
+                            lambda **kw: pools.append(kw) or real_pool(**kw))
+        kwargs = dict(data=sample_ohlcv_data, config=backtest_config,
+                      param_grid=PARAM_GRID, num_windows=3)
+        serial = run_walk_forward(strategy_class=SimpleBuyStrategy, **kwargs)
+        parallel = run_walk_forward(strategy_class=compiled, workers=2,
+                                    strategy_code=SIMPLE_BUY_CODE, **kwargs)
+        assert len(pools) == 1
+        assert pools[0]["initargs"][1] == SIMPLE_BUY_CODE
+        assert parallel.to_dict() == serial.to_dict()
+
+    def test_unpicklable_strategy_without_code_logs_fallback(self, sample_ohlcv_data,
+                                                            backtest_config, caplog):
+        Local = type("Local", (SimpleBuyStrategy,), {})
+        serial = run_walk_forward(strategy_class=SimpleBuyStrategy, data=sample_ohlcv_data,
+                                  config=backtest_config, param_grid=PARAM_GRID, num_windows=3)
+        with caplog.at_level("WARNING", logger="afindr.walk_forward"):
+            result = run_walk_forward(strategy_class=Local, data=sample_ohlcv_data,
+                                      config=backtest_config, param_grid=PARAM_GRID,
+                                      num_windows=3, workers=2)
+        assert "serially" in caplog.text
+        assert result.to_dict() == serial.to_dict()
+
+    def test_progress_reported_per_window(self, sample_ohlcv_data, backtest_config):
+        """on_progress fires once per window, in order."""
+        calls = []
+        result = run_walk_forward(
+            strategy_class=SimpleBuyStrategy,
+            data=sample_ohlcv_data,
+            config=backtest_config,
+            param_grid=PARAM_GRID,
+            num_windows=3,
+            on_progress=lambda done, total, window: calls.append((done, total, window)),
+        )
+        assert [(d, t) for d, t, _ in calls] == [(i + 1, result.num_windows)
+                                                 for i in range(result.num_windows)]
+        assert [w for _, _, w in calls] == result.windows
+
+
+class TestAnchoredWalkForward:
+    """Tests for anchored (expanding) walk-forward."""
+
+    def test_in_sample_starts_at_first_bar(self, sample_ohlcv_data, backtest_config):
+        result = run_walk_forward(
+            strategy_class=SimpleBuyStrategy,
+            data=sample_ohlcv_data,
+            config=backtest_config,
+            param_grid=PARAM_GRID,
+            num_windows=4,
+            anchored=True,
+        )
+        assert result.num_windows == 4
+        first_bar = str(sample_ohlcv_data.index[0])
+        assert all(w["is_start"] == first_bar for w in result.windows)
+        assert [w["is_bars"] for w in result.windows] == sorted(w["is_bars"] for w in result.windows)
+
+    def test_checkpointed_metrics_match_separate_runs(self, sample_ohlcv_data, backtest_config):
+        """IS metrics read off one long run equal a backtest of each prefix."""
+        result = run_walk_forward(
+            strategy_class=SimpleBuyStrategy,
+            data=sample_ohlcv_data,
+            config=backtest_config,
+            param_grid=PARAM_GRID,
+            num_windows=4,
+            anchored=True,
+        )
+        for w in result.windows:
+            prefix = sample_ohlcv_data.iloc[:w["is_bars"]]
+            expected = Backtester(SimpleBuyStrategy(w["best_params"]), prefix, backtest_config).run()
+            assert w["is_metrics"] == expected.metrics
+
+
+class TestWalkForwardTool:
+    """The agent tool streams windows to /ws/backtest/{run_id} and cleans up."""
+
+    def _run(self, monkeypatch, sample_ohlcv_data, args):
+        import asyncio
+        import json
+        from agent import tools
+        from routers import ws
+
+        async def fake_fetch(symbol, period, interval):
+            return sample_ohlcv_data
+
+        sent = []
+
+        class FakeSocket:
+            async def send_json(self, update):
+                sent.append(update)
+
+        monkeypatch.setattr(tools, "fetch_ohlcv", fake_fetch)
+        monkeypatch.setattr(tools.backtest_repo, "insert_backtest_run", lambda **kw: "bt_1")
+        monkeypatch.setattr(tools.backtest_repo, "insert_walk_forward_result", lambda **kw: None)
+        monkeypatch.setitem(ws._connections, "run_wf", FakeSocket())
+        generator = lambda description, history: {"code": SIMPLE_BUY_CODE, "name": "Buy"}
+        result = json.loads(asyncio.run(tools.handle_run_walk_forward(args, generator)))
+        return result, sent, ws._progress
+
+    def test_run_id_returned_and_progress_cleared(self, monkeypatch, sample_ohlcv_data):
+        args = {"strategy_description": "buy up closes", "param_grid": PARAM_GRID,
+                "num_windows": 3, "run_id": "run_wf"}
+        result, sent, progress = self._run(monkeypatch, sample_ohlcv_data, args)
+        assert result["run_id"] == "run_wf"
+        assert [u["type"] for u in sent] == ["progress"] * result["num_windows"] + ["complete"]
+        assert "run_wf" not in progress
+
+    def test_failed_run_reports_error(self, monkeypatch, sample_ohlcv_data):
+        args = {"strategy_description": "buy up closes", "param_grid": PARAM_GRID,
+                "num_windows": 0, "run_id": "run_wf"}
+        result, sent, progress = self._run(monkeypatch, sample_ohlcv_data, args)
+        assert result["run_id"] == "run_wf" and "error" in result
+        assert sent[-1]["type"] == "error"
+        assert "run_wf" not in progress